@@ -0,0 +1,71 @@
+package org.group_mmm;
+
+import net.automatalib.automata.transducers.impl.compact.CompactMealy;
+import net.automatalib.automata.transducers.impl.compact.CompactMealyTransition;
+import net.automatalib.words.Alphabet;
+
+import java.nio.ByteBuffer;
+
+/**
+ * Exporter of a Mealy machine as flat integer arrays.
+ * <p>
+ * Py4J transfers a byte array in one call. By exporting all the transitions as one byte array, we can materialize the
+ * learned Mealy machine in Python with one round trip instead of a few round trips for each transition. The result
+ * is the following big-endian 32-bit integers.
+ * <ol>
+ *     <li>the number of the states N</li>
+ *     <li>the number of the input symbols M</li>
+ *     <li>the initial state, or {@link #UNDEFINED} if there is no initial state</li>
+ *     <li>the M input symbols</li>
+ *     <li>the N * M successors: the successor of the state s by the i-th input symbol is at s * M + i. It is
+ *     {@link #UNDEFINED} if the transition is undefined.</li>
+ *     <li>the N * M outputs in the same order as the successors. It is {@link #UNDEFINED_OUTPUT} if the transition or
+ *     its output is undefined.</li>
+ * </ol>
+ */
+public class MealyExport {
+    public static final int UNDEFINED = -1;
+    public static final int UNDEFINED_OUTPUT = Integer.MIN_VALUE;
+    public static final int HEADER_SIZE = 3;
+
+    private MealyExport() {
+    }
+
+    /**
+     * Export the Mealy machine as flat integer arrays
+     *
+     * @param mealy The exported Mealy machine
+     * @return The Mealy machine packed as big-endian 32-bit integers
+     */
+    public static byte[] export(CompactMealy<Integer, Integer> mealy) {
+        final Alphabet<Integer> alphabet = mealy.getInputAlphabet();
+        final int numStates = mealy.size();
+        final int numInputs = alphabet.size();
+        ByteBuffer buffer = ByteBuffer.allocate(
+                Integer.BYTES * (HEADER_SIZE + numInputs + 2 * numStates * numInputs));
+        buffer.putInt(numStates);
+        buffer.putInt(numInputs);
+        final Integer initialState = mealy.getInitialState();
+        buffer.putInt(initialState == null ? UNDEFINED : initialState);
+        for (int i = 0; i < numInputs; i++) {
+            buffer.putInt(alphabet.getSymbol(i));
+        }
+        final int successorsBegin = buffer.position();
+        final int outputsBegin = successorsBegin + Integer.BYTES * numStates * numInputs;
+        for (int state = 0; state < numStates; state++) {
+            for (int i = 0; i < numInputs; i++) {
+                final int index = Integer.BYTES * (state * numInputs + i);
+                final CompactMealyTransition<Integer> transition = mealy.getTransition(state, i);
+                if (transition == null) {
+                    buffer.putInt(successorsBegin + index, UNDEFINED);
+                    buffer.putInt(outputsBegin + index, UNDEFINED_OUTPUT);
+                    continue;
+                }
+                buffer.putInt(successorsBegin + index, mealy.getSuccessor(transition));
+                final Integer output = mealy.getTransitionOutput(transition);
+                buffer.putInt(outputsBegin + index, output == null ? UNDEFINED_OUTPUT : output);
+            }
+        }
+        return buffer.array();
+    }
+}
@@ -0,0 +1,215 @@
+package org.group_mmm;
+
+import de.learnlib.api.algorithm.PassiveLearningAlgorithm;
+import de.learnlib.api.query.DefaultQuery;
+import net.automatalib.words.Word;
+
+import java.nio.ByteBuffer;
+import java.nio.IntBuffer;
+import java.util.ArrayList;
+import java.util.List;
+
+/**
+ * Decoder of the samples and the traces packed as big-endian 32-bit integers.
+ * <p>
+ * Py4J transfers a byte array in one call while a Java list or array is transferred element by element. By packing
+ * all the samples into three byte arrays, we can add them to the learner with one round trip.
+ * <ul>
+ *     <li>{@code inputs} is the concatenation of all the input words.</li>
+ *     <li>{@code offsets} has one more element than the samples. The i-th input word is
+ *     {@code inputs[offsets[i]]}, ..., {@code inputs[offsets[i + 1] - 1]}.</li>
+ *     <li>{@code outputs} is the output of each sample.</li>
+ * </ul>
+ */
+public class PackedSamples {
+    private PackedSamples() {
+    }
+
+    private static IntBuffer toIntBuffer(byte[] packed) {
+        if (packed.length % Integer.BYTES != 0) {
+            throw new IllegalArgumentException("The length of the packed integers must be a multiple of " + Integer.BYTES);
+        }
+        // ByteBuffer is big-endian by default
+        return ByteBuffer.wrap(packed).asIntBuffer();
+    }
+
+    /**
+     * Decode the packed samples
+     *
+     * @param inputs  The concatenation of the input words
+     * @param offsets The beginning of each input word in inputs followed by the length of inputs
+     * @param outputs The output of each sample
+     * @return The list of the decoded samples
+     */
+    public static List<DefaultQuery<Integer, Word<Integer>>> decode(byte[] inputs, byte[] offsets, byte[] outputs) {
+        IntBuffer inputBuffer = toIntBuffer(inputs);
+        IntBuffer offsetBuffer = toIntBuffer(offsets);
+        IntBuffer outputBuffer = toIntBuffer(outputs);
+        final int size = outputBuffer.remaining();
+        if (offsetBuffer.remaining() != size + 1) {
+            throw new IllegalArgumentException("The number of the offsets must be the number of the outputs plus one");
+        }
+        if (offsetBuffer.get(size) != inputBuffer.remaining()) {
+            throw new IllegalArgumentException("The last offset must be the number of the inputs");
+        }
+        List<DefaultQuery<Integer, Word<Integer>>> samples = new ArrayList<>(size);
+        for (int i = 0; i < size; i++) {
+            final int begin = offsetBuffer.get(i);
+            final int end = offsetBuffer.get(i + 1);
+            if (begin > end) {
+                throw new IllegalArgumentException("The offsets must be non-decreasing");
+            }
+            Integer[] symbols = new Integer[end - begin];
+            for (int j = begin; j < end; j++) {
+                symbols[j - begin] = inputBuffer.get(j);
+            }
+            samples.add(new DefaultQuery<>(Word.fromArray(symbols, 0, symbols.length),
+                    Word.fromLetter(outputBuffer.get(i))));
+        }
+        return samples;
+    }
+
+    /**
+     * Decode the packed traces. Unlike {@link #decode(byte[], byte[], byte[])}, each sample has the output of each
+     * input, i.e., {@code outputs} has the same length and the same offsets as {@code inputs}.
+     *
+     * @param inputs  The concatenation of the input words
+     * @param offsets The beginning of each input word in inputs followed by the length of inputs
+     * @param outputs The concatenation of the output words
+     * @return The list of the decoded traces
+     */
+    public static List<DefaultQuery<Integer, Word<Integer>>> decodeTraces(byte[] inputs, byte[] offsets,
+                                                                         byte[] outputs) {
+        IntBuffer inputBuffer = toIntBuffer(inputs);
+        IntBuffer offsetBuffer = toIntBuffer(offsets);
+        IntBuffer outputBuffer = toIntBuffer(outputs);
+        final int size = offsetBuffer.remaining() - 1;
+        if (size < 0) {
+            throw new IllegalArgumentException("The offsets must be nonempty");
+        }
+        if (outputBuffer.remaining() != inputBuffer.remaining()) {
+            throw new IllegalArgumentException("The number of the outputs must be the number of the inputs");
+        }
+        if (offsetBuffer.get(size) != inputBuffer.remaining()) {
+            throw new IllegalArgumentException("The last offset must be the number of the inputs");
+        }
+        List<DefaultQuery<Integer, Word<Integer>>> traces = new ArrayList<>(size);
+        for (int i = 0; i < size; i++) {
+            final int begin = offsetBuffer.get(i);
+            final int end = offsetBuffer.get(i + 1);
+            if (begin > end) {
+                throw new IllegalArgumentException("The offsets must be non-decreasing");
+            }
+            Integer[] inputSymbols = new Integer[end - begin];
+            Integer[] outputSymbols = new Integer[end - begin];
+            for (int j = begin; j < end; j++) {
+                inputSymbols[j - begin] = inputBuffer.get(j);
+                outputSymbols[j - begin] = outputBuffer.get(j);
+            }
+            traces.add(new DefaultQuery<>(Word.fromArray(inputSymbols, 0, inputSymbols.length),
+                    Word.fromArray(outputSymbols, 0, outputSymbols.length)));
+        }
+        return traces;
+    }
+
+    /**
+     * Decode the packed words, i.e., the input words with the outputs of their suffixes, such as the content of
+     * {@link SampleTrie}. The outputs of the i-th word are {@code outputs[outputOffsets[i]]}, ...,
+     * {@code outputs[outputOffsets[i + 1] - 1]} and they are the outputs of the last letters of the i-th input word.
+     *
+     * @param inputs        The concatenation of the input words
+     * @param offsets       The beginning of each input word in inputs followed by the length of inputs
+     * @param outputs       The concatenation of the output words
+     * @param outputOffsets The beginning of each output word in outputs followed by the length of outputs
+     * @return The list of the decoded words
+     */
+    public static List<DefaultQuery<Integer, Word<Integer>>> decodeWords(byte[] inputs, byte[] offsets,
+                                                                        byte[] outputs, byte[] outputOffsets) {
+        IntBuffer inputBuffer = toIntBuffer(inputs);
+        IntBuffer offsetBuffer = toIntBuffer(offsets);
+        IntBuffer outputBuffer = toIntBuffer(outputs);
+        IntBuffer outputOffsetBuffer = toIntBuffer(outputOffsets);
+        final int size = offsetBuffer.remaining() - 1;
+        if (size < 0 || outputOffsetBuffer.remaining() != size + 1) {
+            throw new IllegalArgumentException("The number of the offsets must be the same and positive");
+        }
+        if (offsetBuffer.get(size) != inputBuffer.remaining() ||
+                outputOffsetBuffer.get(size) != outputBuffer.remaining()) {
+            throw new IllegalArgumentException("The last offset must be the number of the inputs or the outputs");
+        }
+        List<DefaultQuery<Integer, Word<Integer>>> words = new ArrayList<>(size);
+        for (int i = 0; i < size; i++) {
+            final int begin = offsetBuffer.get(i);
+            final int end = offsetBuffer.get(i + 1);
+            final int outputBegin = outputOffsetBuffer.get(i);
+            final int outputEnd = outputOffsetBuffer.get(i + 1);
+            if (begin > end || outputBegin > outputEnd) {
+                throw new IllegalArgumentException("The offsets must be non-decreasing");
+            }
+            if (outputEnd - outputBegin > end - begin) {
+                throw new IllegalArgumentException("The output word must not be longer than the input word");
+            }
+            Integer[] inputSymbols = new Integer[end - begin];
+            for (int j = begin; j < end; j++) {
+                inputSymbols[j - begin] = inputBuffer.get(j);
+            }
+            Integer[] outputSymbols = new Integer[outputEnd - outputBegin];
+            for (int j = outputBegin; j < outputEnd; j++) {
+                outputSymbols[j - outputBegin] = outputBuffer.get(j);
+            }
+            words.add(new DefaultQuery<>(Word.fromArray(inputSymbols, 0, inputSymbols.length),
+                    Word.fromArray(outputSymbols, 0, outputSymbols.length)));
+        }
+        return words;
+    }
+
+    /**
+     * Decode the packed words and add them to the learner
+     *
+     * @param learner       The learner to add the words
+     * @param inputs        The concatenation of the input words
+     * @param offsets       The beginning of each input word in inputs followed by the length of inputs
+     * @param outputs       The concatenation of the output words
+     * @param outputOffsets The beginning of each output word in outputs followed by the length of outputs
+     * @return The number of the added words
+     */
+    public static int addWordsTo(PassiveLearningAlgorithm<?, Integer, Word<Integer>> learner,
+                                 byte[] inputs, byte[] offsets, byte[] outputs, byte[] outputOffsets) {
+        List<DefaultQuery<Integer, Word<Integer>>> words = decodeWords(inputs, offsets, outputs, outputOffsets);
+        learner.addSamples(words);
+        return words.size();
+    }
+
+    /**
+     * Decode the packed traces and add them to the learner. The PTA of the learner is constructed in the time linear
+     * to the length of the traces because the output of each transition is given.
+     *
+     * @param learner The learner to add the traces
+     * @param inputs  The concatenation of the input words
+     * @param offsets The beginning of each input word in inputs followed by the length of inputs
+     * @param outputs The concatenation of the output words
+     * @return The number of the added traces
+     */
+    public static int addTracesTo(PassiveLearningAlgorithm<?, Integer, Word<Integer>> learner,
+                                  byte[] inputs, byte[] offsets, byte[] outputs) {
+        List<DefaultQuery<Integer, Word<Integer>>> traces = decodeTraces(inputs, offsets, outputs);
+        learner.addSamples(traces);
+        return traces.size();
+    }
+
+    /**
+     * Decode the packed samples and add them to the learner
+     *
+     * @param learner The learner to add the samples
+     * @param inputs  The concatenation of the input words
+     * @param offsets The beginning of each input word in inputs followed by the length of inputs
+     * @param outputs The output of each sample
+     * @return The number of the added samples
+     */
+    public static int addTo(PassiveLearningAlgorithm<?, Integer, Word<Integer>> learner,
+                            byte[] inputs, byte[] offsets, byte[] outputs) {
+        List<DefaultQuery<Integer, Word<Integer>>> samples = decode(inputs, offsets, outputs);
+        learner.addSamples(samples);
+        return samples.size();
+    }
+}
@@ -0,0 +1,227 @@
+package org.group_mmm;
+
+import net.automatalib.commons.util.Pair;
+
+import java.util.ArrayList;
+import java.util.Arrays;
+import java.util.Collections;
+import java.util.List;
+import java.util.function.BiConsumer;
+
+/**
+ * Prefix trie of the training samples of Mealy machine learning.
+ * <p>
+ * Each node represents the input word from the root and it has the output of its last letter (if known) and the number
+ * of the samples visiting it. Since the common prefixes are shared, adding the same sample or the same prefix many
+ * times does not increase the size of the trie. The nodes are the integers 0, 1, ... and 0 is the root, i.e., the
+ * empty word.
+ *
+ * @param <O> The output type
+ */
+public class SampleTrie<O> {
+    public static final int ROOT = 0;
+    private static final int NO_CHILD = -1;
+    private static final int INITIAL_CAPACITY = 16;
+    // Approximated sizes in bytes for getMemoryFootprint()
+    private static final int OBJECT_HEADER_BYTES = 16;
+    private static final int REFERENCE_BYTES = 8;
+
+    private final int alphabetSize;
+    // children[node] is allocated when the first child of node is added
+    private int[][] children = new int[INITIAL_CAPACITY][];
+    private Object[] outputs = new Object[INITIAL_CAPACITY];
+    private int[] visits = new int[INITIAL_CAPACITY];
+    private int size = 1;
+    private long numSamples = 0;
+
+    /**
+     * @param alphabetSize The size of the input alphabet. The letters are 0, 1, ..., alphabetSize - 1.
+     */
+    public SampleTrie(int alphabetSize) {
+        this.alphabetSize = alphabetSize;
+    }
+
+    private void ensureCapacity(int capacity) {
+        if (capacity <= visits.length) {
+            return;
+        }
+        final int newCapacity = Math.max(capacity, 2 * visits.length);
+        children = Arrays.copyOf(children, newCapacity);
+        outputs = Arrays.copyOf(outputs, newCapacity);
+        visits = Arrays.copyOf(visits, newCapacity);
+    }
+
+    private int getChild(int node, int letter) {
+        return children[node] == null ? NO_CHILD : children[node][letter];
+    }
+
+    private int getOrCreateChild(int node, int letter) {
+        if (children[node] == null) {
+            children[node] = new int[alphabetSize];
+            Arrays.fill(children[node], NO_CHILD);
+        }
+        if (children[node][letter] == NO_CHILD) {
+            ensureCapacity(size + 1);
+            children[node][letter] = size++;
+        }
+        return children[node][letter];
+    }
+
+    /**
+     * Add an input word and the outputs of its suffix
+     *
+     * @param input   The input word
+     * @param outputs The outputs of the last outputs.size() letters of the input word
+     * @return The node of the input word
+     * @throws IllegalArgumentException if the outputs are longer than the input or inconsistent with the trie. The trie
+     *                                  is not modified in this case.
+     */
+    public int add(int[] input, List<? extends O> outputs) {
+        final int offset = input.length - outputs.size();
+        if (offset < 0) {
+            throw new IllegalArgumentException("The output word must not be longer than the input word");
+        }
+        // Check the word against the existing path first so that a rejected word does not change the trie
+        int node = ROOT;
+        for (int i = 0; i < input.length; i++) {
+            if (input[i] < 0 || input[i] >= alphabetSize) {
+                throw new IllegalArgumentException("The letter " + input[i] + " is not in the alphabet");
+            }
+            if (node == NO_CHILD) {
+                continue;
+            }
+            node = getChild(node, input[i]);
+            if (node != NO_CHILD && i >= offset && this.outputs[node] != null &&
+                    !this.outputs[node].equals(outputs.get(i - offset))) {
+                throw new IllegalArgumentException("Inconsistent outputs for the same input: " +
+                        this.outputs[node] + " and " + outputs.get(i - offset));
+            }
+        }
+        node = ROOT;
+        visits[node]++;
+        for (int i = 0; i < input.length; i++) {
+            node = getOrCreateChild(node, input[i]);
+            visits[node]++;
+            if (i >= offset) {
+                this.outputs[node] = outputs.get(i - offset);
+            }
+        }
+        numSamples++;
+        return node;
+    }
+
+    /**
+     * @return The number of the nodes except for the root
+     */
+    public int size() {
+        return size - 1;
+    }
+
+    /**
+     * @return The number of the added samples including the duplicated ones
+     */
+    public long getNumSamples() {
+        return numSamples;
+    }
+
+    /**
+     * @param node A node of the trie
+     * @return The number of the added samples visiting the node
+     */
+    public int getVisits(int node) {
+        return visits[node];
+    }
+
+    /**
+     * @param node A node of the trie
+     * @return The output of the last letter of the node, or null if it is unknown
+     */
+    @SuppressWarnings("unchecked")
+    public O getOutput(int node) {
+        return (O) outputs[node];
+    }
+
+    /**
+     * @return The approximated memory footprint of the trie in bytes
+     */
+    public long getMemoryFootprint() {
+        long footprint = 3L * (OBJECT_HEADER_BYTES + (long) visits.length * REFERENCE_BYTES);
+        for (int node = 0; node < size; node++) {
+            if (children[node] != null) {
+                footprint += OBJECT_HEADER_BYTES + (long) alphabetSize * Integer.BYTES;
+            }
+        }
+        return footprint;
+    }
+
+    private boolean hasChildWithOutput(int node) {
+        if (children[node] == null) {
+            return false;
+        }
+        for (int child : children[node]) {
+            if (child != NO_CHILD && outputs[child] != null) {
+                return true;
+            }
+        }
+        return false;
+    }
+
+    /**
+     * Enumerate the content of the trie as pairs of an input word and the outputs of its suffix. A word is generated
+     * for each node with an output such that none of its children has an output, and the outputs are of the longest
+     * suffix whose outputs are known. Thus, each node with an output is covered by at least one word, and the number of
+     * the words is at most the number of the leaves.
+     *
+     * @param consumer The consumer of the input word and the outputs of its suffix
+     */
+    public void forEachWord(BiConsumer<int[], List<O>> consumer) {
+        // The path from the root to the current node and the next letter to visit for each node in the path
+        int[] path = new int[INITIAL_CAPACITY];
+        int[] nextLetter = new int[INITIAL_CAPACITY];
+        int[] input = new int[INITIAL_CAPACITY];
+        int depth = 0;
+        path[0] = ROOT;
+        nextLetter[0] = 0;
+        while (depth >= 0) {
+            final int node = path[depth];
+            int letter = nextLetter[depth];
+            while (children[node] != null && letter < alphabetSize && children[node][letter] == NO_CHILD) {
+                letter++;
+            }
+            if (children[node] != null && letter < alphabetSize) {
+                nextLetter[depth] = letter + 1;
+                if (depth + 1 >= path.length) {
+                    path = Arrays.copyOf(path, 2 * path.length);
+                    nextLetter = Arrays.copyOf(nextLetter, 2 * nextLetter.length);
+                    input = Arrays.copyOf(input, 2 * input.length);
+                }
+                input[depth] = letter;
+                depth++;
+                path[depth] = children[node][letter];
+                nextLetter[depth] = 0;
+                continue;
+            }
+            if (outputs[node] != null && !hasChildWithOutput(node)) {
+                int begin = depth;
+                while (begin > 0 && outputs[path[begin]] != null) {
+                    begin--;
+                }
+                List<O> outputWord = new ArrayList<>(depth - begin);
+                for (int i = begin + 1; i <= depth; i++) {
+                    outputWord.add(getOutput(path[i]));
+                }
+                consumer.accept(Arrays.copyOf(input, depth), outputWord);
+            }
+            depth--;
+        }
+    }
+
+    /**
+     * @return The content of the trie generated by {@link #forEachWord(BiConsumer)}
+     */
+    public List<Pair<int[], List<O>>> getWords() {
+        List<Pair<int[], List<O>>> words = new ArrayList<>();
+        forEachWord((input, outputs) -> words.add(Pair.of(input, Collections.unmodifiableList(outputs))));
+        return words;
+    }
+}
@@ -26,6 +26,26 @@ public class StrongBlueFringePTA<SP, TP> extends AbstractBlueFringePTA<SP, TP, S
         this.min_depth = min_depth;
     }
 
+    //@ requires 0 <= min_depth;
+    protected StrongBlueFringePTA(int alphabetSize, int min_depth, StrongBlueFringePTAState<SP, TP> root) {
+        super(alphabetSize, root);
+        assert min_depth >= 0 : "min_depth must be non-negative";
+        this.min_depth = min_depth;
+    }
+
+    /**
+     * Copy the PTA for state merging. This PTA must not be promoted nor merged, i.e., all the states must be white.
+     * The copy takes the time linear to the number of the states, which is cheaper than inserting all the samples
+     * to a new PTA because the common prefixes of the samples are visited only once.
+     *
+     * @param min_depth Threshold of the merging in the copied PTA
+     * @return The copy of this PTA
+     */
+    //@ requires 0 <= min_depth;
+    public StrongBlueFringePTA<SP, TP> copy(int min_depth) {
+        return new StrongBlueFringePTA<>(this.alphabetSize, min_depth, this.root.copySubtree());
+    }
+
     @Override
     @ParametersAreNonnullByDefault
     public RedBlueMerge<SP, TP, StrongBlueFringePTAState<SP, TP>> tryMerge(StrongBlueFringePTAState<SP, TP> qr, StrongBlueFringePTAState<SP, TP> qb) {
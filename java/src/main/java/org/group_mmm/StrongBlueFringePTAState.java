@@ -5,7 +5,10 @@ import de.learnlib.datastructure.pta.pta.BlueFringePTAState;
 import de.learnlib.datastructure.pta.pta.RedBlueMerge;
 import lombok.Getter;
 import net.automatalib.commons.smartcollections.ArrayStorage;
+import net.automatalib.commons.util.Pair;
 
+import java.util.ArrayDeque;
+import java.util.Deque;
 import java.util.HashSet;
 import java.util.Objects;
 import java.util.Set;
@@ -86,6 +89,51 @@ public class StrongBlueFringePTAState<SP, TP> extends AbstractBlueFringePTAState
         }
     }
 
+    /**
+     * Copy the subtree rooted by this state. The copied states are white and the arrays of the successors and the
+     * transition properties are not shared with the original states, so that the state merging on the copy does not
+     * modify the original one. The subtree is traversed without recursion because it can be as deep as the longest
+     * sample.
+     *
+     * @return The copy of this state, which is the root of the copied subtree
+     */
+    StrongBlueFringePTAState<SP, TP> copySubtree() {
+        StrongBlueFringePTAState<SP, TP> rootCopy = this.copyNode(null);
+        Deque<Pair<StrongBlueFringePTAState<SP, TP>, StrongBlueFringePTAState<SP, TP>>> stack = new ArrayDeque<>();
+        stack.push(Pair.of(this, rootCopy));
+        Pair<StrongBlueFringePTAState<SP, TP>, StrongBlueFringePTAState<SP, TP>> currentPair;
+        while ((currentPair = stack.poll()) != null) {
+            StrongBlueFringePTAState<SP, TP> original = currentPair.getFirst(), copy = currentPair.getSecond();
+            if (original.successors == null) {
+                continue;
+            }
+            copy.successors = new ArrayStorage<>(original.successors.size());
+            for (int i = 0; i < original.successors.size(); i++) {
+                StrongBlueFringePTAState<SP, TP> successor = original.successors.get(i);
+                if (successor != null) {
+                    StrongBlueFringePTAState<SP, TP> successorCopy = successor.copyNode(copy);
+                    copy.successors.set(i, successorCopy);
+                    stack.push(Pair.of(successor, successorCopy));
+                }
+            }
+        }
+        return rootCopy;
+    }
+
+    /**
+     * @param parent The parent of the copy
+     * @return The copy of this state without the successors
+     */
+    private StrongBlueFringePTAState<SP, TP> copyNode(StrongBlueFringePTAState<SP, TP> parent) {
+        StrongBlueFringePTAState<SP, TP> copy = new StrongBlueFringePTAState<>();
+        copy.property = this.property;
+        copy.transProperties = (this.transProperties == null) ? null : this.transProperties.clone();
+        copy.parent = parent;
+        copy.parentInput = this.parentInput;
+        copy.height = this.height;
+        return copy;
+    }
+
     @Override
     protected StrongBlueFringePTAState<SP, TP> createState() {
         return new StrongBlueFringePTAState<>();
@@ -14,8 +14,10 @@ import de.learnlib.algorithms.rpni.BlueFringeRPNIMealy;
 import de.learnlib.api.query.DefaultQuery;
 import de.learnlib.datastructure.pta.pta.AbstractBlueFringePTA;
 import de.learnlib.datastructure.pta.pta.BlueFringePTA;
+import de.learnlib.datastructure.pta.pta.BlueFringePTAState;
 import de.learnlib.datastructure.pta.pta.PTATransition;
 import de.learnlib.datastructure.pta.pta.RedBlueMerge;
+import lombok.Getter;
 import lombok.Setter;
 import net.automatalib.automata.transducers.MealyMachine;
 import net.automatalib.automata.transducers.impl.compact.CompactMealy;
@@ -24,14 +26,55 @@ import net.automatalib.words.Alphabet;
 import net.automatalib.words.Word;
 
 import java.util.*;
+import java.util.concurrent.ForkJoinPool;
+import java.util.concurrent.TimeUnit;
 import java.util.stream.Collectors;
 import java.util.stream.Stream;
 
 public class StrongBlueFringeRPNIMealy<I, O> extends BlueFringeRPNIMealy<I, O> {
-    @Setter
+    // The value of deadline when the computation is not time-bounded
+    private static final long NO_DEADLINE = Long.MAX_VALUE;
     protected int min_depth;
     protected int skipMealySize;
-    private final List<Pair<int[], Word<O>>> samples = new ArrayList<>();
+    // The samples are stored in a trie so that the common prefixes of the samples are not duplicated
+    private final SampleTrie<O> samples;
+    // The PTA of all the samples. It is updated when a sample is added and copied for each state merging.
+    private final StrongBlueFringePTA<Void, O> masterPTA;
+    /**
+     * If true, computeModel returns the last hypothesis when all the samples added after it are consistent with it.
+     * <p>
+     * Once a sample is inconsistent, the next computeModel merges the states of a copy of the master PTA from scratch.
+     * Only the whole hypothesis is reused: replaying the merges and promotions of the last computation that the new
+     * samples do not pass through is out of scope. Each of them depends on the states merged before it, so such a
+     * replay may keep a decision the learning from scratch does not take, e.g., a promotion caused by a merge the new
+     * samples undid. The hypothesis of a deterministic learner would then depend on the history of computeModel.
+     */
+    @Getter
+    @Setter
+    protected boolean incremental = false;
+    // The hypothesis returned by the last computeModel, or null if it must be recomputed
+    private MealyMachine<?, I, ?, O> lastModel = null;
+    /**
+     * The number of the calls of computeModel returning the last hypothesis without state merging
+     */
+    @Getter
+    private long numSkippedRelearns = 0;
+    /**
+     * The number of the threads to search for the red state to merge. See {@link #setParallelism(int)}.
+     */
+    @Getter
+    private int parallelism = 0;
+    // The pool of the threads of this learner, or null if the common pool is used or the search is sequential
+    private ForkJoinPool executor = null;
+    // The deadline of the running computation in System.nanoTime(), or NO_DEADLINE
+    private volatile long deadline = NO_DEADLINE;
+    // If the running computation is cancelled
+    private volatile boolean cancelled = false;
+    /**
+     * If the last computeModel stopped the state merging at the deadline or by cancel
+     */
+    @Getter
+    private volatile boolean truncated = false;
 
     /**
      * @param alphabet      The input alphabet of the Mealy machine
@@ -43,37 +86,155 @@ public class StrongBlueFringeRPNIMealy<I, O> extends BlueFringeRPNIMealy<I, O> {
         super(alphabet);
         this.min_depth = minDepth;
         this.skipMealySize = skipMealySize;
+        this.samples = new SampleTrie<>(alphabetSize);
+        this.masterPTA = new StrongBlueFringePTA<>(alphabetSize, 0);
+    }
+
+    /**
+     * Set the threads to search for the red state to merge. The search is reproducible if deterministic is also set
+     * because the first mergeable red state is taken even in the parallel search.
+     *
+     * @param parallelism If it is 0, the parallel search uses the common ForkJoinPool as in BlueFringeRPNIMealy. If it
+     *                    is 1, the search is sequential. Otherwise, this learner uses its own pool of this number of
+     *                    threads so that the learners running at the same time do not share the common pool.
+     */
+    //@ requires 0 <= parallelism;
+    public void setParallelism(int parallelism) {
+        if (parallelism < 0) {
+            throw new IllegalArgumentException("The parallelism must be non-negative");
+        }
+        this.shutdown();
+        this.parallelism = parallelism;
+        this.setParallel(parallelism != 1);
+        if (parallelism > 1) {
+            this.executor = new ForkJoinPool(parallelism);
+        }
+    }
+
+    /**
+     * Shut down the pool of the threads of this learner if any. The search becomes sequential after this.
+     */
+    public void shutdown() {
+        if (this.executor != null) {
+            this.executor.shutdown();
+            this.executor = null;
+            this.parallelism = 1;
+            this.setParallel(false);
+        }
+    }
+
+    /**
+     * @param minDepth Threshold of the merging. The last hypothesis is discarded if it changes.
+     */
+    public void setMin_depth(int minDepth) {
+        if (this.min_depth != minDepth) {
+            this.min_depth = minDepth;
+            this.lastModel = null;
+        }
     }
 
     @Override
     public void addSamples(Collection<? extends DefaultQuery<I, Word<O>>> samples) {
         for (DefaultQuery<I, Word<O>> sample : samples) {
-            this.samples.add(Pair.of(sample.getInput().toIntArray(this.alphabet), sample.getOutput()));
+            final int[] input = sample.getInput().toIntArray(this.alphabet);
+            // The trie rejects an inconsistent sample without modifying itself. We modify the master PTA only after the
+            // trie accepted the sample so that they do not diverge.
+            this.samples.add(input, sample.getOutput().asList());
+            this.masterPTA.addSampleWithTransitionProperties(input, sample.getOutput().asList());
+            // Once a sample is inconsistent, the last hypothesis is discarded and we do not check the other samples
+            if (this.lastModel != null && !isConsistent(this.lastModel, sample.getInput(), sample.getOutput())) {
+                this.lastModel = null;
+            }
         }
     }
 
+    /**
+     * @param mealy  A Mealy machine
+     * @param input  An input word
+     * @param output The outputs of the last output.length() letters of the input word
+     * @return If the Mealy machine has the transitions of the input word and it produces the given outputs
+     */
+    private static <S, I, T, O> boolean isConsistent(MealyMachine<S, I, T, O> mealy, Word<I> input, Word<O> output) {
+        final int offset = input.length() - output.length();
+        S state = mealy.getInitialState();
+        for (int i = 0; i < input.length(); i++) {
+            T transition = state == null ? null : mealy.getTransition(state, input.getSymbol(i));
+            if (transition == null) {
+                return false;
+            }
+            if (i >= offset && !Objects.equals(mealy.getTransitionOutput(transition), output.getSymbol(i - offset))) {
+                return false;
+            }
+            state = mealy.getSuccessor(transition);
+        }
+        return true;
+    }
+
+    /**
+     * @return If the incremental mode is enabled and computeModel returns the last hypothesis without state merging
+     */
+    public boolean isUpToDate() {
+        return this.incremental && this.lastModel != null;
+    }
+
+    /**
+     * @return The deduplicated samples. Each of them is a pair of an input word and the outputs of its suffix.
+     */
     public List<Pair<List<I>, List<O>>> getSamples() {
-        return this.samples.stream().map(pair -> Pair.of(
+        return this.samples.getWords().stream().map(pair -> Pair.of(
                 Arrays.stream(pair.getFirst()).mapToObj(this.alphabet::getSymbol).collect(Collectors.toList()),
-                pair.getSecond().asList())).collect(Collectors.toList());
+                pair.getSecond())).collect(Collectors.toList());
+    }
+
+    /**
+     * @return The number of the added samples including the duplicated ones
+     */
+    public long getNumSamples() {
+        return this.samples.getNumSamples();
+    }
+
+    /**
+     * @return The number of the nodes of the trie storing the samples
+     */
+    public int getNumSampleNodes() {
+        return this.samples.size();
+    }
+
+    /**
+     * @return The approximated memory footprint of the samples in bytes
+     */
+    public long getSampleMemoryFootprint() {
+        return this.samples.getMemoryFootprint();
     }
 
     protected void initializePTAGeneric(AbstractBlueFringePTA<Void, O, ?> pta) {
-        for (Pair<int[], Word<O>> sample : this.samples) {
-            pta.addSampleWithTransitionProperties(sample.getFirst(), sample.getSecond().asList());
-        }
+        this.samples.forEachWord(pta::addSampleWithTransitionProperties);
     }
 
     @Override
     protected void initializePTA(BlueFringePTA<Void, O> pta) {
-        for (Pair<int[], Word<O>> sample : this.samples) {
-            pta.addSampleWithTransitionProperties(sample.getFirst(), sample.getSecond().asList());
-        }
+        this.samples.forEachWord(pta::addSampleWithTransitionProperties);
+    }
+
+    /**
+     * Stop the state merging of the running computation, or the next one if no computation is running. The computation
+     * promotes the remaining blue states and returns a Mealy machine consistent with the samples. This can be called
+     * from another thread.
+     */
+    public void cancel() {
+        this.cancelled = true;
+    }
+
+    /**
+     * @return If the state merging must stop because of the deadline or cancel
+     */
+    private boolean isExpired() {
+        return this.cancelled || (this.deadline != NO_DEADLINE && System.nanoTime() - this.deadline >= 0);
     }
 
     protected MealyMachine<?, I, ?, O> computeModelWithMinDepth() {
-        StrongBlueFringePTA<Void, O> pta = new StrongBlueFringePTA<>(alphabetSize, min_depth);
-        initializePTAGeneric(pta);
+        // We merge the states of a copy so that the master PTA is kept for the next computation
+        StrongBlueFringePTA<Void, O> pta = this.masterPTA.copy(min_depth);
 
         Queue<PTATransition<StrongBlueFringePTAState<Void, O>>> blue = order.createWorklist();
 
@@ -88,6 +249,12 @@ public class StrongBlueFringeRPNIMealy<I, O> extends BlueFringeRPNIMealy<I, O> {
                 pta.promote(qb, blue::offer);
                 continue;
             }
+            // After the deadline, we promote the remaining blue states, which keeps the consistency with the samples
+            if (this.isExpired()) {
+                this.truncated = true;
+                pta.promote(qb, blue::offer);
+                continue;
+            }
 
             Stream<StrongBlueFringePTAState<Void, O>> stream = pta.redStatesStream();
             if (parallel) {
@@ -117,12 +284,99 @@ public class StrongBlueFringeRPNIMealy<I, O> extends BlueFringeRPNIMealy<I, O> {
         return ptaToModel(pta);
     }
 
+    /**
+     * The same as computeModel of BlueFringeRPNIMealy except for the deadline and cancel
+     */
+    protected MealyMachine<?, I, ?, O> computeModelWithoutMinDepth() {
+        BlueFringePTA<Void, O> pta = new BlueFringePTA<>(alphabetSize);
+        initializePTA(pta);
+
+        Queue<PTATransition<BlueFringePTAState<Void, O>>> blue = order.createWorklist();
+
+        pta.init(blue::offer);
+
+        PTATransition<BlueFringePTAState<Void, O>> qbRef;
+        while ((qbRef = blue.poll()) != null) {
+            BlueFringePTAState<Void, O> qb = qbRef.getTarget();
+            assert qb != null;
+            if (this.isExpired()) {
+                this.truncated = true;
+                pta.promote(qb, blue::offer);
+                continue;
+            }
+
+            Stream<BlueFringePTAState<Void, O>> stream = pta.redStatesStream();
+            if (parallel) {
+                stream = stream.parallel();
+            }
+
+            @SuppressWarnings("nullness") // we filter the null merges
+            Stream<RedBlueMerge<Void, O, BlueFringePTAState<Void, O>>> filtered =
+                    stream.map(qr -> tryMerge(pta, qr, qb)).filter(Objects::nonNull);
+
+            Optional<RedBlueMerge<Void, O, BlueFringePTAState<Void, O>>> result =
+                    (deterministic) ? filtered.findFirst() : filtered.findAny();
+
+            if (result.isPresent()) {
+                RedBlueMerge<Void, O, BlueFringePTAState<Void, O>> mod = result.get();
+                mod.apply(pta, blue::offer);
+            } else {
+                pta.promote(qb, blue::offer);
+            }
+        }
+
+        return ptaToModel(pta);
+    }
+
+    /**
+     * Compute a Mealy machine consistent with the samples within the given time. If the time runs out, the state
+     * merging stops and the remaining blue states are promoted, i.e., we obtain the hypothesis merged so far.
+     *
+     * @param timeoutMillis The time limit of the state merging in milliseconds
+     * @see #isTruncated()
+     */
+    public MealyMachine<?, I, ?, O> computeModel(long timeoutMillis) {
+        this.deadline = System.nanoTime() + TimeUnit.MILLISECONDS.toNanos(timeoutMillis);
+        try {
+            return this.computeModel();
+        } finally {
+            this.deadline = NO_DEADLINE;
+        }
+    }
+
+    /**
+     * Compute a Mealy machine consistent with the samples. In the incremental mode, the last hypothesis is returned
+     * without state merging if all the samples added after it are consistent with it. Otherwise, the states of a copy
+     * of the master PTA are merged from scratch. See {@link #incremental} for why the last merges are not replayed.
+     */
     @Override
     public MealyMachine<?, I, ?, O> computeModel() {
+        this.truncated = false;
+        try {
+            if (this.isUpToDate()) {
+                this.numSkippedRelearns++;
+                return this.lastModel;
+            }
+            // The parallel streams started in a task of the pool run on the threads of the pool
+            final MealyMachine<?, I, ?, O> model =
+                    (this.executor == null) ? this.learnModel() : this.executor.submit(this::learnModel).join();
+            // A truncated hypothesis is not reused since it is less general than the one merged until the end
+            if (this.incremental && !this.truncated) {
+                this.lastModel = model;
+            }
+            return model;
+        } finally {
+            // A cancel called before this computation, e.g., while the samples are sent, stops this computation but
+            // it does not affect the later ones
+            this.cancelled = false;
+        }
+    }
+
+    private MealyMachine<?, I, ?, O> learnModel() {
         if (this.min_depth > 0) {
             return this.computeModelWithMinDepth();
         } else {
-            return super.computeModel();
+            return this.computeModelWithoutMinDepth();
         }
     }
 
@@ -12,11 +12,14 @@ package org.group_mmm;
 
 import de.learnlib.datastructure.pta.pta.AbstractBlueFringePTA;
 import de.learnlib.datastructure.pta.pta.AbstractBlueFringePTAState;
+import de.learnlib.datastructure.pta.pta.BasePTAState;
 import de.learnlib.datastructure.pta.pta.RedBlueMerge;
 import net.automatalib.commons.smartcollections.ArrayStorage;
 import net.automatalib.commons.util.Pair;
 
 import javax.annotation.Nullable;
+import java.lang.invoke.MethodHandle;
+import java.lang.invoke.MethodHandles;
 import java.lang.reflect.Field;
 import java.util.*;
 import java.util.logging.Logger;
@@ -25,176 +28,196 @@ import static java.lang.Integer.max;
 
 public class StrongRedBlueMerge<SP, TP, S extends AbstractBlueFringePTAState<SP, TP, S>> extends RedBlueMerge<SP, TP, S> {
     protected int min_depth;
+    // The copy of the private field of the parent class, which is read in every step of the merge
+    private final int alphabetSize;
 
     //@ requires 0 <= min_depth;
     public StrongRedBlueMerge(AbstractBlueFringePTA<SP, TP, S> pta, S qr, S qb, int min_depth) {
         super(pta, qr, qb);
         assert min_depth >= 0 : "min_depth must be non-negative";
         this.min_depth = min_depth;
+        try {
+            this.alphabetSize = (int) Handles.ALPHABET_SIZE.invokeExact((Object) this);
+        } catch (Throwable err) {
+            throw rethrow(err);
+        }
     }
 
-    // We have to use reflection because these properties/methods are private/protected in the parent class
-    int getAlphabetSize() {
-        try {
-            Field field = this.getClass().getSuperclass().getDeclaredField("alphabetSize");
-            field.setAccessible(true);
-            return (int) field.get(this);
-        } catch (NoSuchFieldException | IllegalAccessException err) {
-            Logger.getLogger(StrongRedBlueMerge.class.getName()).warning(err.getMessage());
-            return -1;
+    /**
+     * The handles of the private/protected fields of the parent classes. We have to access them by reflection, but
+     * the lookup is done only once when this holder class is initialized, i.e., lazily at the first merge. Since the
+     * handles are static final, the JIT compiler can inline the accesses in the merge loop. All the reference types
+     * are erased to Object so that the handles can be called by invokeExact.
+     */
+    private static final class Handles {
+        static final MethodHandle ALPHABET_SIZE = getter(RedBlueMerge.class, "alphabetSize");
+        static final MethodHandle QR = getter(RedBlueMerge.class, "qr");
+        static final MethodHandle QB = getter(RedBlueMerge.class, "qb");
+        static final MethodHandle SUCC_MOD = getter(RedBlueMerge.class, "succMod");
+        static final MethodHandle TRANS_PROP_MOD = getter(RedBlueMerge.class, "transPropMod");
+        static final MethodHandle PROP_MOD = getter(RedBlueMerge.class, "propMod");
+        static final MethodHandle MERGED_SETTER = setter(RedBlueMerge.class, "merged");
+        static final MethodHandle PARENT = getter(AbstractBlueFringePTAState.class, "parent");
+        static final MethodHandle PARENT_INPUT = getter(AbstractBlueFringePTAState.class, "parentInput");
+        static final MethodHandle IS_COPY = getter(AbstractBlueFringePTAState.class, "isCopy");
+        static final MethodHandle PROPERTY = getter(BasePTAState.class, "property");
+        static final MethodHandle PROPERTY_SETTER = setter(BasePTAState.class, "property");
+        static final MethodHandle TRANS_PROPERTIES = getter(BasePTAState.class, "transProperties");
+        static final MethodHandle ID = getter(BasePTAState.class, "id");
+        static final MethodHandle SUCCESSORS = getter(BasePTAState.class, "successors");
+
+        private static Field field(Class<?> clazz, String name) {
+            try {
+                Field field = clazz.getDeclaredField(name);
+                field.setAccessible(true);
+                return field;
+            } catch (NoSuchFieldException err) {
+                Logger.getLogger(StrongRedBlueMerge.class.getName()).severe(err.getMessage());
+                throw new IllegalStateException("Unsupported version of LearnLib", err);
+            }
+        }
+
+        private static MethodHandle getter(Class<?> clazz, String name) {
+            try {
+                MethodHandle handle = MethodHandles.lookup().unreflectGetter(field(clazz, name));
+                return handle.asType(handle.type().erase());
+            } catch (IllegalAccessException err) {
+                throw new IllegalStateException(err);
+            }
+        }
+
+        private static MethodHandle setter(Class<?> clazz, String name) {
+            try {
+                MethodHandle handle = MethodHandles.lookup().unreflectSetter(field(clazz, name));
+                return handle.asType(handle.type().erase());
+            } catch (IllegalAccessException err) {
+                throw new IllegalStateException(err);
+            }
+        }
+    }
+
+    private static IllegalStateException rethrow(Throwable err) {
+        if (err instanceof RuntimeException) {
+            throw (RuntimeException) err;
+        } else if (err instanceof Error) {
+            throw (Error) err;
         }
+        return new IllegalStateException(err);
+    }
+
+    int getAlphabetSize() {
+        return this.alphabetSize;
     }
 
-    S getQr() throws NoSuchFieldException, IllegalAccessException {
+    S getQr() {
         try {
-            Field field = this.getClass().getSuperclass().getDeclaredField("qr");
-            field.setAccessible(true);
-            return (S) field.get(this);
-        } catch (NoSuchFieldException | IllegalAccessException err) {
-            Logger.getLogger(StrongRedBlueMerge.class.getName()).warning(err.getMessage());
-            throw err;
+            return (S) (Object) Handles.QR.invokeExact((Object) this);
+        } catch (Throwable err) {
+            throw rethrow(err);
         }
     }
 
-    S getQb() throws NoSuchFieldException, IllegalAccessException {
+    S getQb() {
         try {
-            Field field = this.getClass().getSuperclass().getDeclaredField("qb");
-            field.setAccessible(true);
-            return (S) field.get(this);
-        } catch (NoSuchFieldException | IllegalAccessException err) {
-            Logger.getLogger(StrongRedBlueMerge.class.getName()).warning(err.getMessage());
-            throw err;
+            return (S) (Object) Handles.QB.invokeExact((Object) this);
+        } catch (Throwable err) {
+            throw rethrow(err);
         }
     }
 
-    S getParent(S state) throws NoSuchFieldException, IllegalAccessException {
+    S getParent(S state) {
         try {
-            Field field = state.getClass().getSuperclass().getDeclaredField("parent");
-            field.setAccessible(true);
-            return (S) field.get(state);
-        } catch (NoSuchFieldException | IllegalAccessException err) {
-            Logger.getLogger(StrongRedBlueMerge.class.getName()).warning(err.getMessage());
-            throw err;
+            return (S) (Object) Handles.PARENT.invokeExact((Object) state);
+        } catch (Throwable err) {
+            throw rethrow(err);
         }
     }
 
-    int getParentInput(S state) throws NoSuchFieldException, IllegalAccessException {
+    int getParentInput(S state) {
         try {
-            Field field = state.getClass().getSuperclass().getDeclaredField("parentInput");
-            field.setAccessible(true);
-            return (int) field.get(state);
-        } catch (NoSuchFieldException | IllegalAccessException err) {
-            Logger.getLogger(StrongRedBlueMerge.class.getName()).warning(err.getMessage());
-            throw err;
+            return (int) Handles.PARENT_INPUT.invokeExact((Object) state);
+        } catch (Throwable err) {
+            throw rethrow(err);
         }
     }
 
     SP getProperty(S state) {
         try {
-            Field field = state.getClass().getSuperclass().getSuperclass().getDeclaredField("property");
-            field.setAccessible(true);
-            return (SP) field.get(state);
-        } catch (NoSuchFieldException | IllegalAccessException err) {
-            Logger.getLogger(StrongRedBlueMerge.class.getName()).warning(err.getMessage());
-            return null;
+            return (SP) (Object) Handles.PROPERTY.invokeExact((Object) state);
+        } catch (Throwable err) {
+            throw rethrow(err);
         }
     }
 
     ArrayStorage<TP> getTransPropertiesRefl(S state) {
         try {
-            Field field = state.getClass().getSuperclass().getSuperclass().getDeclaredField("transProperties");
-            field.setAccessible(true);
-            return (ArrayStorage<TP>) field.get(state);
-        } catch (NoSuchFieldException | IllegalAccessException err) {
-            Logger.getLogger(StrongRedBlueMerge.class.getName()).warning(err.getMessage());
-            return null;
+            return (ArrayStorage<TP>) (Object) Handles.TRANS_PROPERTIES.invokeExact((Object) state);
+        } catch (Throwable err) {
+            throw rethrow(err);
         }
     }
 
-    boolean getIsCopy(S state) throws NoSuchFieldException, IllegalAccessException {
+    boolean getIsCopy(S state) {
         try {
-            Field field = state.getClass().getSuperclass().getDeclaredField("isCopy");
-            field.setAccessible(true);
-            return (boolean) field.get(state);
-        } catch (NoSuchFieldException | IllegalAccessException err) {
-            Logger.getLogger(StrongRedBlueMerge.class.getName()).warning(err.getMessage());
-            throw err;
+            return (boolean) Handles.IS_COPY.invokeExact((Object) state);
+        } catch (Throwable err) {
+            throw rethrow(err);
         }
     }
 
     int getId(S state) {
         try {
-            Field field = state.getClass().getSuperclass().getSuperclass().getDeclaredField("id");
-            field.setAccessible(true);
-            return (int) field.get(state);
-        } catch (NoSuchFieldException | IllegalAccessException err) {
-            Logger.getLogger(StrongRedBlueMerge.class.getName()).warning(err.getMessage());
-            return -1;
+            return (int) Handles.ID.invokeExact((Object) state);
+        } catch (Throwable err) {
+            throw rethrow(err);
         }
     }
 
     ArrayStorage<S> getSuccessors(S state) {
         try {
-            Field field = state.getClass().getSuperclass().getSuperclass().getDeclaredField("successors");
-            field.setAccessible(true);
-            return (ArrayStorage<S>) field.get(state);
-        } catch (NoSuchFieldException | IllegalAccessException err) {
-            Logger.getLogger(StrongRedBlueMerge.class.getName()).warning(err.getMessage());
-            return null;
+            return (ArrayStorage<S>) (Object) Handles.SUCCESSORS.invokeExact((Object) state);
+        } catch (Throwable err) {
+            throw rethrow(err);
         }
     }
 
     ArrayStorage<ArrayStorage<S>> getSuccMod() {
         try {
-            Field field = this.getClass().getSuperclass().getDeclaredField("succMod");
-            field.setAccessible(true);
-            return (ArrayStorage<ArrayStorage<S>>) field.get(this);
-        } catch (NoSuchFieldException | IllegalAccessException err) {
-            Logger.getLogger(StrongRedBlueMerge.class.getName()).warning(err.getMessage());
-            return null;
+            return (ArrayStorage<ArrayStorage<S>>) (Object) Handles.SUCC_MOD.invokeExact((Object) this);
+        } catch (Throwable err) {
+            throw rethrow(err);
         }
     }
 
     ArrayStorage<ArrayStorage<TP>> getTransPropMod() {
         try {
-            Field field = this.getClass().getSuperclass().getDeclaredField("transPropMod");
-            field.setAccessible(true);
-            return (ArrayStorage<ArrayStorage<TP>>) field.get(this);
-        } catch (NoSuchFieldException | IllegalAccessException err) {
-            Logger.getLogger(StrongRedBlueMerge.class.getName()).warning(err.getMessage());
-            return null;
+            return (ArrayStorage<ArrayStorage<TP>>) (Object) Handles.TRANS_PROP_MOD.invokeExact((Object) this);
+        } catch (Throwable err) {
+            throw rethrow(err);
         }
     }
 
     ArrayStorage<SP> getPropMod() {
         try {
-            Field field = this.getClass().getSuperclass().getDeclaredField("propMod");
-            field.setAccessible(true);
-            return (ArrayStorage<SP>) field.get(this);
-        } catch (NoSuchFieldException | IllegalAccessException err) {
-            Logger.getLogger(StrongRedBlueMerge.class.getName()).warning(err.getMessage());
-            return null;
+            return (ArrayStorage<SP>) (Object) Handles.PROP_MOD.invokeExact((Object) this);
+        } catch (Throwable err) {
+            throw rethrow(err);
         }
     }
 
     void setMerged(boolean value) {
         try {
-            Field field = this.getClass().getSuperclass().getDeclaredField("merged");
-            field.setAccessible(true);
-            field.set(this, value);
-        } catch (NoSuchFieldException | IllegalAccessException err) {
-            Logger.getLogger(StrongRedBlueMerge.class.getName()).warning(err.getMessage());
+            Handles.MERGED_SETTER.invokeExact((Object) this, value);
+        } catch (Throwable err) {
+            throw rethrow(err);
         }
     }
 
-
     void setProperty(S state, SP property) {
         try {
-            Field field = state.getClass().getDeclaredField("property");
-            field.setAccessible(true);
-            field.set(state, property);
-        } catch (NoSuchFieldException | IllegalAccessException err) {
-            Logger.getLogger(StrongRedBlueMerge.class.getName()).warning(err.getMessage());
+            Handles.PROPERTY_SETTER.invokeExact((Object) state, (Object) property);
+        } catch (Throwable err) {
+            throw rethrow(err);
         }
     }
 
@@ -224,102 +247,96 @@ public class StrongRedBlueMerge<SP, TP, S extends AbstractBlueFringePTAState<SP,
 
     public boolean merge() {
         int largest_depth = 0;
-        try {
-            S qr = getQr(), qb = getQb();
-            this.setMerged(true);
-            // Pruning when the depth of the children is too shallow
-            if (notEnouchChildrenDepth(getQr(), min_depth, getAlphabetSize())) {
-                return false;
-            }
+        S qr = getQr(), qb = getQb();
+        this.setMerged(true);
+        // Pruning when the depth of the children is too shallow
+        if (notEnouchChildrenDepth(getQr(), min_depth, getAlphabetSize())) {
+            return false;
+        }
 
-            if (!mergeRedProperties(qr, qb)) {
-                return false;
-            }
+        if (!mergeRedProperties(qr, qb)) {
+            return false;
+        }
 
-            updateRedTransition(getParent(qb), getParentInput(qb), qr);
+        updateRedTransition(getParent(qb), getParentInput(qb), qr);
 
-            Deque<Pair<FoldRecord<S>, Integer>> stack = new ArrayDeque<>();
-            stack.push(Pair.of(new FoldRecord<>(getQr(), getQb()), 0));
+        Deque<Pair<FoldRecord<S>, Integer>> stack = new ArrayDeque<>();
+        stack.push(Pair.of(new FoldRecord<>(getQr(), getQb()), 0));
 
-            Pair<FoldRecord<S>, Integer> currPair;
-            while ((currPair = stack.peek()) != null) {
-                FoldRecord<S> curr = currPair.getFirst();
-                int depth = currPair.getSecond();
-                int i = ++curr.i;
+        Pair<FoldRecord<S>, Integer> currPair;
+        while ((currPair = stack.peek()) != null) {
+            FoldRecord<S> curr = currPair.getFirst();
+            int depth = currPair.getSecond();
+            int i = ++curr.i;
 
-                if (i == getAlphabetSize()) {
-                    stack.pop();
-                    continue;
-                }
+            if (i == getAlphabetSize()) {
+                stack.pop();
+                continue;
+            }
+
+            S q = curr.q;
+            S r = curr.r;
 
-                S q = curr.q;
-                S r = curr.r;
+            S rSucc = r.getSuccessor(i);
+            if (rSucc != null) {
+                S qSucc = getSucc(q, i);
+                if (qSucc != null) {
+                    if (qSucc.isRed()) {
+                        if (!mergeRedProperties(qSucc, rSucc)) {
+                            return false;
+                        }
+                    } else {
+                        SP rSuccSP = getProperty(rSucc), qSuccSP = getProperty(qSucc);
 
-                S rSucc = r.getSuccessor(i);
-                if (rSucc != null) {
-                    S qSucc = getSucc(q, i);
-                    if (qSucc != null) {
-                        if (qSucc.isRed()) {
-                            if (!mergeRedProperties(qSucc, rSucc)) {
+                        SP newSP = null;
+                        if (qSuccSP == null && rSuccSP != null) {
+                            newSP = rSuccSP;
+                        } else if (rSuccSP != null) { // && qSucc.property != null
+                            if (!Objects.equals(qSuccSP, rSuccSP)) {
                                 return false;
                             }
-                        } else {
-                            SP rSuccSP = getProperty(rSucc), qSuccSP = getProperty(qSucc);
-
-                            SP newSP = null;
-                            if (qSuccSP == null && rSuccSP != null) {
-                                newSP = rSuccSP;
-                            } else if (rSuccSP != null) { // && qSucc.property != null
-                                if (!Objects.equals(qSuccSP, rSuccSP)) {
-                                    return false;
-                                }
-                            }
+                        }
+
+                        ArrayStorage<TP> newTPs = null;
+                        ArrayStorage<TP> rSuccTPs = getTransPropertiesRefl(rSucc);
+                        ArrayStorage<TP> qSuccTPs = getTransPropertiesRefl(qSucc);
 
-                            ArrayStorage<TP> newTPs = null;
-                            ArrayStorage<TP> rSuccTPs = getTransPropertiesRefl(rSucc);
-                            ArrayStorage<TP> qSuccTPs = getTransPropertiesRefl(qSucc);
-
-                            if (rSuccTPs != null) {
-                                if (qSuccTPs != null) {
-                                    ArrayStorage<TP> mergedTPs = mergeTransProperties(qSuccTPs, rSuccTPs);
-                                    if (mergedTPs == null) {
-                                        return false;
-                                    } else if (mergedTPs != qSuccTPs) {
-                                        newTPs = mergedTPs;
-                                    }
-                                } else {
-                                    newTPs = rSuccTPs.clone();
+                        if (rSuccTPs != null) {
+                            if (qSuccTPs != null) {
+                                ArrayStorage<TP> mergedTPs = mergeTransProperties(qSuccTPs, rSuccTPs);
+                                if (mergedTPs == null) {
+                                    return false;
+                                } else if (mergedTPs != qSuccTPs) {
+                                    newTPs = mergedTPs;
                                 }
+                            } else {
+                                newTPs = rSuccTPs.clone();
                             }
+                        }
 
-                            if (newSP != null || newTPs != null) {
-                                qSucc = cloneTopSucc(qSucc, i, stack, newTPs);
-                                if (newSP != null) {
-                                    setProperty(qSucc, newSP);
-                                }
+                        if (newSP != null || newTPs != null) {
+                            qSucc = cloneTopSucc(qSucc, i, stack, newTPs);
+                            if (newSP != null) {
+                                setProperty(qSucc, newSP);
                             }
                         }
+                    }
 
-                        stack.push(Pair.of(new FoldRecord<>(qSucc, rSucc), depth + 1));
-                        largest_depth = max(largest_depth, depth + 1);
+                    stack.push(Pair.of(new FoldRecord<>(qSucc, rSucc), depth + 1));
+                    largest_depth = max(largest_depth, depth + 1);
+                } else {
+                    if (q.isRed()) {
+                        updateRedTransition(q, i, rSucc, r.getTransProperty(i));
                     } else {
-                        if (q.isRed()) {
-                            updateRedTransition(q, i, rSucc, r.getTransProperty(i));
-                        } else {
-                            q = cloneTop(q, stack);
-                            assert getIsCopy(q);
-                            q.setForeignSuccessor(i, rSucc, getAlphabetSize());
-                        }
+                        q = cloneTop(q, stack);
+                        assert getIsCopy(q);
+                        q.setForeignSuccessor(i, rSucc, getAlphabetSize());
                     }
                 }
             }
-            // check the largest common depth
-            return this.min_depth <= largest_depth;
-
-        } catch (IllegalAccessException | NoSuchFieldException err) {
-            Logger.getLogger(StrongRedBlueMerge.class.getName()).warning(err.getMessage());
-            return false;
         }
+        // check the largest common depth
+        return this.min_depth <= largest_depth;
     }
 
     private S cloneTopSucc(S succ, int i, Deque<Pair<FoldRecord<S>, Integer>> stack, @Nullable ArrayStorage<TP> newTPs) {
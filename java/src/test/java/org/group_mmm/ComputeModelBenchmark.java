@@ -0,0 +1,111 @@
+package org.group_mmm;
+
+import de.learnlib.api.query.DefaultQuery;
+import net.automatalib.automata.transducers.MealyMachine;
+import net.automatalib.words.Word;
+import net.automatalib.words.impl.Alphabets;
+
+import java.io.IOException;
+import java.nio.file.Files;
+import java.nio.file.Paths;
+import java.util.ArrayList;
+import java.util.Arrays;
+import java.util.List;
+import java.util.Random;
+import java.util.stream.Collectors;
+
+/**
+ * JMH-style microbenchmark of {@link StrongBlueFringeRPNIMealy#computeModelWithMinDepth()}.
+ * <p>
+ * The learner is run for some warm-up iterations so that the JIT compiler optimizes the merge loop, and then the
+ * throughput is measured over the measurement iterations. The samples are the traces recorded from a random Mealy
+ * machine with a fixed seed, or the traces in a file given as the first argument. Each line of the file is a trace
+ * of the form {@code "i_1 i_2 ... i_n;o_1 o_2 ... o_n"}. Since this class is not a test, surefire does not run it.
+ * We can run it by the following.
+ * <pre>
+ * mvn test-compile exec:java -Dexec.classpathScope=test -Dexec.mainClass=org.group_mmm.ComputeModelBenchmark \
+ *     -Dexec.args="[samples.txt]"
+ * </pre>
+ */
+public class ComputeModelBenchmark {
+    private static final int ALPHABET_SIZE = 4;
+    private static final int NUM_OUTPUTS = 3;
+    private static final int NUM_TARGET_STATES = 30;
+    private static final int NUM_TRACES = 2000;
+    private static final int TRACE_LENGTH = 30;
+    private static final int MIN_DEPTH = 2;
+    private static final int WARMUP_ITERATIONS = 5;
+    private static final int MEASUREMENT_ITERATIONS = 10;
+
+    /**
+     * @return The traces of a random Mealy machine with NUM_TARGET_STATES states
+     */
+    static List<DefaultQuery<Integer, Word<Integer>>> recordTraces(long seed) {
+        Random random = new Random(seed);
+        int[][] successors = new int[NUM_TARGET_STATES][ALPHABET_SIZE];
+        int[][] outputs = new int[NUM_TARGET_STATES][ALPHABET_SIZE];
+        for (int state = 0; state < NUM_TARGET_STATES; state++) {
+            for (int input = 0; input < ALPHABET_SIZE; input++) {
+                successors[state][input] = random.nextInt(NUM_TARGET_STATES);
+                outputs[state][input] = random.nextInt(NUM_OUTPUTS);
+            }
+        }
+        List<DefaultQuery<Integer, Word<Integer>>> traces = new ArrayList<>(NUM_TRACES);
+        for (int trace = 0; trace < NUM_TRACES; trace++) {
+            Integer[] inputWord = new Integer[TRACE_LENGTH];
+            Integer[] outputWord = new Integer[TRACE_LENGTH];
+            int state = 0;
+            for (int i = 0; i < TRACE_LENGTH; i++) {
+                inputWord[i] = random.nextInt(ALPHABET_SIZE);
+                outputWord[i] = outputs[state][inputWord[i]];
+                state = successors[state][inputWord[i]];
+            }
+            traces.add(new DefaultQuery<>(Word.fromSymbols(inputWord), Word.fromSymbols(outputWord)));
+        }
+        return traces;
+    }
+
+    /**
+     * @return The traces in the file. See the class documentation for the format.
+     */
+    static List<DefaultQuery<Integer, Word<Integer>>> loadTraces(String fileName) throws IOException {
+        return Files.readAllLines(Paths.get(fileName)).stream().filter(line -> !line.trim().isEmpty()).map(line -> {
+            String[] pair = line.split(";");
+            return new DefaultQuery<>(parseWord(pair[0]), parseWord(pair[1]));
+        }).collect(Collectors.toList());
+    }
+
+    private static Word<Integer> parseWord(String word) {
+        return Word.fromList(Arrays.stream(word.trim().split("\\s+")).map(Integer::parseInt).collect(Collectors.toList()));
+    }
+
+    public static void main(String[] args) throws IOException {
+        List<DefaultQuery<Integer, Word<Integer>>> traces = args.length > 0 ? loadTraces(args[0]) : recordTraces(0);
+        final int alphabetSize = traces.stream().flatMap(trace -> trace.getInput().asList().stream())
+                .mapToInt(Integer::intValue).max().orElse(0) + 1;
+        StrongBlueFringeRPNIMealy<Integer, Integer> learner =
+                new StrongBlueFringeRPNIMealy<>(Alphabets.integers(0, alphabetSize - 1), MIN_DEPTH, 0);
+        learner.setDeterministic(true);
+        learner.addSamples(traces);
+        System.out.printf("# %d traces, %d sample nodes, min_depth = %d%n", traces.size(),
+                learner.getNumSampleNodes(), MIN_DEPTH);
+
+        for (int i = 0; i < WARMUP_ITERATIONS; i++) {
+            long start = System.nanoTime();
+            MealyMachine<?, Integer, ?, Integer> model = learner.computeModelWithMinDepth();
+            System.out.printf("# Warmup Iteration %d: %.3f ops/s (%d states)%n", i + 1,
+                    1e9 / (System.nanoTime() - start), model.getStates().size());
+        }
+        double[] throughputs = new double[MEASUREMENT_ITERATIONS];
+        for (int i = 0; i < MEASUREMENT_ITERATIONS; i++) {
+            long start = System.nanoTime();
+            learner.computeModelWithMinDepth();
+            throughputs[i] = 1e9 / (System.nanoTime() - start);
+            System.out.printf("Iteration %d: %.3f ops/s%n", i + 1, throughputs[i]);
+        }
+        final double mean = Arrays.stream(throughputs).average().orElse(Double.NaN);
+        final double deviation = Math.sqrt(Arrays.stream(throughputs).map(t -> (t - mean) * (t - mean)).sum() /
+                Math.max(MEASUREMENT_ITERATIONS - 1, 1));
+        System.out.printf("Result \"computeModelWithMinDepth\": %.3f ± %.3f ops/s%n", mean, deviation);
+    }
+}
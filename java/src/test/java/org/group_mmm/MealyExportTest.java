@@ -0,0 +1,33 @@
+package org.group_mmm;
+
+import net.automatalib.automata.transducers.impl.compact.CompactMealy;
+import net.automatalib.words.impl.Alphabets;
+import org.junit.Test;
+
+import java.nio.ByteBuffer;
+import java.nio.IntBuffer;
+
+import static org.junit.Assert.assertEquals;
+
+public class MealyExportTest {
+    @Test
+    public void export() {
+        CompactMealy<Integer, Integer> mealy = new CompactMealy<>(Alphabets.integers(3, 4));
+        final int s0 = mealy.addInitialState();
+        final int s1 = mealy.addState();
+        mealy.addTransition(s0, 3, s1, 7);
+        mealy.addTransition(s0, 4, s0, 8);
+        mealy.addTransition(s1, 4, s0, null);
+
+        IntBuffer exported = ByteBuffer.wrap(MealyExport.export(mealy)).asIntBuffer();
+        int[] expected = new int[]{
+                2, 2, s0,
+                3, 4,
+                s1, s0, MealyExport.UNDEFINED, s0,
+                7, 8, MealyExport.UNDEFINED_OUTPUT, MealyExport.UNDEFINED_OUTPUT};
+        assertEquals(expected.length, exported.remaining());
+        for (int i = 0; i < expected.length; i++) {
+            assertEquals(expected[i], exported.get(i));
+        }
+    }
+}
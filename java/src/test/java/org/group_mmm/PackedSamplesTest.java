@@ -0,0 +1,97 @@
+package org.group_mmm;
+
+import de.learnlib.algorithms.rpni.BlueFringeRPNIMealy;
+import de.learnlib.api.query.DefaultQuery;
+import net.automatalib.serialization.dot.GraphDOT;
+import net.automatalib.words.Word;
+import net.automatalib.words.impl.Alphabets;
+import org.junit.Test;
+
+import java.io.IOException;
+import java.io.StringWriter;
+import java.nio.ByteBuffer;
+import java.util.Arrays;
+import java.util.List;
+
+import static org.junit.Assert.assertEquals;
+import static org.junit.Assert.assertThrows;
+
+public class PackedSamplesTest {
+    private static byte[] pack(int... values) {
+        ByteBuffer buffer = ByteBuffer.allocate(values.length * Integer.BYTES);
+        for (int value : values) {
+            buffer.putInt(value);
+        }
+        return buffer.array();
+    }
+
+    @Test
+    public void decode() {
+        List<DefaultQuery<Integer, Word<Integer>>> samples =
+                PackedSamples.decode(pack(0, 1, 2, 1, 3), pack(0, 2, 2, 5), pack(4, 5, 6));
+        assertEquals(3, samples.size());
+        assertEquals(Word.fromSymbols(0, 1), samples.get(0).getInput());
+        assertEquals(Word.fromLetter(4), samples.get(0).getOutput());
+        assertEquals(Word.epsilon(), samples.get(1).getInput());
+        assertEquals(Word.fromSymbols(2, 1, 3), samples.get(2).getInput());
+        assertEquals(Word.fromLetter(6), samples.get(2).getOutput());
+    }
+
+    @Test
+    public void decodeInvalid() {
+        assertThrows(IllegalArgumentException.class, () -> PackedSamples.decode(pack(0, 1), pack(0, 2), pack(4, 5)));
+        assertThrows(IllegalArgumentException.class, () -> PackedSamples.decode(pack(0, 1), pack(0, 3), pack(4)));
+        assertThrows(IllegalArgumentException.class, () -> PackedSamples.decode(new byte[3], pack(0), pack()));
+    }
+
+    @Test
+    public void addTo() throws IOException {
+        List<List<Integer>> inputs = Arrays.asList(Arrays.asList(0), Arrays.asList(1), Arrays.asList(0, 0),
+                Arrays.asList(0, 1), Arrays.asList(1, 0), Arrays.asList(1, 1), Arrays.asList(1, 0, 0));
+        int[] outputs = new int[]{0, 1, 0, 1, 2, 1, 2};
+        BlueFringeRPNIMealy<Integer, Integer> expectedLearner = new BlueFringeRPNIMealy<>(Alphabets.integers(0, 1));
+        expectedLearner.setDeterministic(true);
+        StrongBlueFringeRPNIMealy<Integer, Integer> learner =
+                new StrongBlueFringeRPNIMealy<>(Alphabets.integers(0, 1), 1, 0);
+        learner.setDeterministic(true);
+        int[] offsets = new int[inputs.size() + 1];
+        int[] flatInputs = inputs.stream().flatMap(List::stream).mapToInt(Integer::intValue).toArray();
+        for (int i = 0; i < inputs.size(); i++) {
+            offsets[i + 1] = offsets[i] + inputs.get(i).size();
+            expectedLearner.addSample(Word.fromList(inputs.get(i)), Word.fromLetter(outputs[i]));
+        }
+        assertEquals(inputs.size(), PackedSamples.addTo(learner, pack(flatInputs), pack(offsets), pack(outputs)));
+        assertEquals(inputs.size(), learner.getNumSamples());
+
+        learner.setMin_depth(0);
+        StringWriter expected = new StringWriter(), actual = new StringWriter();
+        GraphDOT.write(expectedLearner.computeModel(), Alphabets.integers(0, 1), expected);
+        GraphDOT.write(learner.computeModel(), Alphabets.integers(0, 1), actual);
+        assertEquals(expected.toString(), actual.toString());
+    }
+
+    @Test
+    public void addTracesTo() throws IOException {
+        // The traces 0 1 / 0 1 and 1 0 0 / 2 1 2 are the same as the prefix-closed samples
+        BlueFringeRPNIMealy<Integer, Integer> expectedLearner = new BlueFringeRPNIMealy<>(Alphabets.integers(0, 1));
+        expectedLearner.setDeterministic(true);
+        expectedLearner.addSample(Word.fromSymbols(0), Word.fromLetter(0));
+        expectedLearner.addSample(Word.fromSymbols(0, 1), Word.fromLetter(1));
+        expectedLearner.addSample(Word.fromSymbols(1), Word.fromLetter(2));
+        expectedLearner.addSample(Word.fromSymbols(1, 0), Word.fromLetter(1));
+        expectedLearner.addSample(Word.fromSymbols(1, 0, 0), Word.fromLetter(2));
+        for (int minDepth = 0; minDepth < 2; minDepth++) {
+            StrongBlueFringeRPNIMealy<Integer, Integer> learner =
+                    new StrongBlueFringeRPNIMealy<>(Alphabets.integers(0, 1), minDepth, 0);
+            learner.setDeterministic(true);
+            assertEquals(2, PackedSamples.addTracesTo(learner, pack(0, 1, 1, 0, 0), pack(0, 2, 5),
+                    pack(0, 1, 2, 1, 2)));
+            StringWriter expected = new StringWriter(), actual = new StringWriter();
+            GraphDOT.write(expectedLearner.computeModel(), Alphabets.integers(0, 1), expected);
+            GraphDOT.write(learner.computeModel(), Alphabets.integers(0, 1), actual);
+            assertEquals(expected.toString(), actual.toString());
+        }
+        assertThrows(IllegalArgumentException.class,
+                () -> PackedSamples.decodeTraces(pack(0, 1), pack(0, 2), pack(0)));
+    }
+}
@@ -0,0 +1,64 @@
+package org.group_mmm;
+
+import net.automatalib.commons.util.Pair;
+import org.junit.Test;
+
+import java.util.Arrays;
+import java.util.Collections;
+import java.util.List;
+
+import static org.junit.Assert.assertArrayEquals;
+import static org.junit.Assert.assertEquals;
+import static org.junit.Assert.assertThrows;
+
+public class SampleTrieTest {
+    @Test
+    public void deduplicate() {
+        SampleTrie<Integer> trie = new SampleTrie<>(2);
+        for (int i = 0; i < 100; i++) {
+            trie.add(new int[]{0, 1, 1}, Arrays.asList(0, 1, 2));
+        }
+        assertEquals(100, trie.getNumSamples());
+        assertEquals(3, trie.size());
+        final long footprint = trie.getMemoryFootprint();
+        trie.add(new int[]{0, 1}, Collections.singletonList(1));
+        assertEquals(3, trie.size());
+        assertEquals(footprint, trie.getMemoryFootprint());
+        assertEquals(101, trie.getVisits(SampleTrie.ROOT));
+        assertThrows(IllegalArgumentException.class, () -> trie.add(new int[]{0, 1}, Collections.singletonList(0)));
+        assertThrows(IllegalArgumentException.class, () -> trie.add(new int[]{2}, Collections.singletonList(0)));
+    }
+
+    @Test
+    public void rejectWithoutModification() {
+        SampleTrie<Integer> trie = new SampleTrie<>(2);
+        trie.add(new int[]{0, 1}, Arrays.asList(0, 1));
+        // The conflict is at the second letter and the third letter is new
+        assertThrows(IllegalArgumentException.class, () -> trie.add(new int[]{0, 1, 1}, Arrays.asList(0, 0, 2)));
+        assertThrows(IllegalArgumentException.class, () -> trie.add(new int[]{0, 2}, Collections.singletonList(0)));
+        assertEquals(2, trie.size());
+        assertEquals(1, trie.getNumSamples());
+        assertEquals(1, trie.getVisits(SampleTrie.ROOT));
+        assertEquals(1, trie.getWords().size());
+    }
+
+    @Test
+    public void getWords() {
+        SampleTrie<Integer> trie = new SampleTrie<>(2);
+        trie.add(new int[]{0, 1, 1}, Arrays.asList(0, 1, 2));
+        trie.add(new int[]{0, 0}, Collections.singletonList(3));
+        trie.add(new int[]{1, 0, 1}, Collections.singletonList(4));
+        trie.add(new int[]{1}, Collections.singletonList(5));
+        List<Pair<int[], List<Integer>>> words = trie.getWords();
+        assertEquals(4, words.size());
+        assertArrayEquals(new int[]{0, 0}, words.get(0).getFirst());
+        assertEquals(Arrays.asList(0, 3), words.get(0).getSecond());
+        assertArrayEquals(new int[]{0, 1, 1}, words.get(1).getFirst());
+        assertEquals(Arrays.asList(0, 1, 2), words.get(1).getSecond());
+        assertArrayEquals(new int[]{1, 0, 1}, words.get(2).getFirst());
+        assertEquals(Collections.singletonList(4), words.get(2).getSecond());
+        // The word 1 is separated from 1 0 1 because 1 0 has no output
+        assertArrayEquals(new int[]{1}, words.get(3).getFirst());
+        assertEquals(Collections.singletonList(5), words.get(3).getSecond());
+    }
+}
@@ -4,7 +4,9 @@ import com.pholser.junit.quickcheck.Property;
 import com.pholser.junit.quickcheck.generator.InRange;
 import com.pholser.junit.quickcheck.runner.JUnitQuickcheck;
 import de.learnlib.algorithms.rpni.BlueFringeRPNIMealy;
+import de.learnlib.api.query.DefaultQuery;
 import net.automatalib.automata.transducers.MealyMachine;
+import net.automatalib.automata.transducers.impl.compact.CompactMealy;
 import net.automatalib.serialization.dot.GraphDOT;
 import net.automatalib.words.Word;
 import net.automatalib.words.impl.Alphabets;
@@ -13,14 +15,14 @@ import org.junit.runner.RunWith;
 
 import java.io.IOException;
 import java.io.StringWriter;
+import java.util.ArrayList;
 import java.util.Arrays;
 import java.util.HashMap;
 import java.util.List;
 import java.util.Map;
 import java.util.stream.Collectors;
 
-import static org.junit.Assert.assertEquals;
-import static org.junit.Assert.assertThrows;
+import static org.junit.Assert.*;
 
 @RunWith(JUnitQuickcheck.class)
 public class StrongBlueFringeRPNIMealyTest {
@@ -92,4 +94,149 @@ public class StrongBlueFringeRPNIMealyTest {
 
         }
     }
-}
\ No newline at end of file
+
+    @Test
+    public void computeModelIncremental() {
+        StrongBlueFringeRPNIMealy<Integer, Integer> learner = new StrongBlueFringeRPNIMealy<>(Alphabets.integers(0, 1), 0, 0);
+        learner.setDeterministic(true);
+        learner.setIncremental(true);
+        // The output is the last input
+        learner.addSample(Word.fromSymbols(0, 0), Word.fromSymbols(0, 0));
+        learner.addSample(Word.fromSymbols(0, 1), Word.fromSymbols(0, 1));
+        learner.addSample(Word.fromSymbols(1, 0), Word.fromSymbols(1, 0));
+        learner.addSample(Word.fromSymbols(1, 1), Word.fromSymbols(1, 1));
+        MealyMachine<?, Integer, ?, Integer> model = learner.computeModel();
+        assertTrue(learner.isUpToDate());
+        assertEquals(0, learner.getNumSkippedRelearns());
+
+        // A consistent sample does not change the hypothesis
+        learner.addSample(Word.fromSymbols(0, 1, 1, 0), Word.fromSymbols(0, 1, 1, 0));
+        assertTrue(learner.isUpToDate());
+        assertSame(model, learner.computeModel());
+        assertEquals(1, learner.getNumSkippedRelearns());
+
+        // An inconsistent sample invalidates the hypothesis
+        learner.addSample(Word.fromSymbols(1, 1, 1), Word.fromSymbols(0));
+        assertFalse(learner.isUpToDate());
+        MealyMachine<?, Integer, ?, Integer> relearned = learner.computeModel();
+        assertNotSame(model, relearned);
+        assertEquals(Word.fromSymbols(0), relearned.computeOutput(Word.fromSymbols(1, 1, 1)).suffix(1));
+        assertEquals(1, learner.getNumSkippedRelearns());
+    }
+
+    @Test
+    public void computeModelIncrementalFromScratch() throws IOException {
+        List<Integer> alphabet = Arrays.asList(0, 1);
+        StrongBlueFringeRPNIMealy<Integer, Integer> learner = new StrongBlueFringeRPNIMealy<>(Alphabets.integers(0, 1), 0, 0);
+        learner.setDeterministic(true);
+        learner.setIncremental(true);
+        learner.addSample(Word.fromSymbols(0), Word.fromSymbols(0));
+        learner.addSample(Word.fromSymbols(0, 1, 1), Word.fromSymbols(0, 1, 0));
+        MealyMachine<?, Integer, ?, Integer> model = learner.computeModel();
+        // 0 is merged into the initial state, which then outputs 1 for 1, and 01 is promoted because it outputs 0 for 1
+        assertEquals(2, model.size());
+        assertNotEquals(model.getInitialState(), model.getState(Word.fromSymbols(0, 1)));
+
+        // The new sample does not pass through 01, but 0 is no longer merged into the initial state
+        learner.addSample(Word.fromSymbols(1), Word.fromSymbols(0));
+        assertFalse(learner.isUpToDate());
+        MealyMachine<?, Integer, ?, Integer> relearned = learner.computeModel();
+        // From scratch, 01 is merged into the initial state because the promotion of 01 was caused by the undone merge
+        assertEquals(2, relearned.size());
+        assertEquals(relearned.getInitialState(), relearned.getState(Word.fromSymbols(0, 1)));
+
+        // A replay of the promotion of 01 gives another hypothesis consistent with the samples
+        CompactMealy<Integer, Integer> replayed = new CompactMealy<>(Alphabets.integers(0, 1));
+        final int s0 = replayed.addInitialState();
+        final int s1 = replayed.addState();
+        final int s2 = replayed.addState();
+        replayed.addTransition(s0, 0, s1, 0);
+        replayed.addTransition(s0, 1, s0, 0);
+        replayed.addTransition(s1, 1, s2, 1);
+        replayed.addTransition(s2, 1, s0, 0);
+        learner.getSamples().forEach(pair -> {
+            Word<Integer> output = Word.fromList(pair.getSecond());
+            assertEquals(output, replayed.computeOutput(Word.fromList(pair.getFirst())).suffix(output.length()));
+            assertEquals(output, relearned.computeOutput(Word.fromList(pair.getFirst())).suffix(output.length()));
+        });
+        assertNotEquals(replayed.size(), relearned.size());
+
+        // The relearned hypothesis does not depend on the history of computeModel
+        StrongBlueFringeRPNIMealy<Integer, Integer> freshLearner = new StrongBlueFringeRPNIMealy<>(Alphabets.integers(0, 1), 0, 0);
+        freshLearner.setDeterministic(true);
+        freshLearner.addSamples(learner.getSamples().stream().map(pair -> new DefaultQuery<>(
+                Word.fromList(pair.getFirst()), Word.fromList(pair.getSecond()))).collect(Collectors.toList()));
+        StringWriter relearnedStringWriter = new StringWriter(), freshStringWriter = new StringWriter();
+        GraphDOT.write(relearned, alphabet, relearnedStringWriter);
+        GraphDOT.write(freshLearner.computeModel(), alphabet, freshStringWriter);
+        assertEquals(freshStringWriter.toString(), relearnedStringWriter.toString());
+    }
+
+    @Property
+    public void computeModelWithMasterPTA(List<List<@InRange(min = "0", max = "1") Integer>> inputs) throws IOException {
+        List<Integer> alphabet = Arrays.asList(0, 1);
+        StrongBlueFringeRPNIMealy<Integer, Integer> learner = new StrongBlueFringeRPNIMealy<>(Alphabets.integers(0, 1), 2, 0);
+        learner.setDeterministic(true);
+        for (int i = 0; i < inputs.size(); i++) {
+            if (inputs.get(i).isEmpty()) {
+                continue;
+            }
+            // The output is the number of 1 modulo 3
+            Word<Integer> inputWord = Word.fromList(inputs.get(i));
+            List<Integer> outputs = new ArrayList<>();
+            int count = 0;
+            for (int c : inputs.get(i)) {
+                count = (count + c) % 3;
+                outputs.add(count);
+            }
+            learner.addSample(inputWord, Word.fromList(outputs));
+            // The master PTA must not be modified by the state merging
+            MealyMachine<?, Integer, ?, Integer> model = learner.computeModel();
+            StrongBlueFringeRPNIMealy<Integer, Integer> freshLearner = new StrongBlueFringeRPNIMealy<>(Alphabets.integers(0, 1), 2, 0);
+            freshLearner.setDeterministic(true);
+            freshLearner.addSamples(learner.getSamples().stream().map(pair -> new DefaultQuery<>(
+                    Word.fromList(pair.getFirst()), Word.fromList(pair.getSecond()))).collect(Collectors.toList()));
+            StringWriter modelStringWriter = new StringWriter(), freshStringWriter = new StringWriter();
+            GraphDOT.write(model, alphabet, modelStringWriter);
+            GraphDOT.write(freshLearner.computeModel(), alphabet, freshStringWriter);
+            assertEquals(freshStringWriter.toString(), modelStringWriter.toString());
+        }
+    }
+
+    @Test
+    public void computeModelWithOwnPool() throws IOException {
+        List<Integer> alphabet = Arrays.asList(0, 1, 2, 3);
+        List<String> dots = new ArrayList<>();
+        for (int parallelism : new int[]{1, 4}) {
+            StrongBlueFringeRPNIMealy<Integer, Integer> learner = new StrongBlueFringeRPNIMealy<>(Alphabets.integers(0, 3), 1, 0);
+            learner.setDeterministic(true);
+            learner.setParallelism(parallelism);
+            learner.addSamples(ComputeModelBenchmark.recordTraces(0).subList(0, 200));
+            StringWriter writer = new StringWriter();
+            GraphDOT.write(learner.computeModel(), alphabet, writer);
+            dots.add(writer.toString());
+            learner.shutdown();
+            assertEquals(1, learner.getParallelism());
+        }
+        assertEquals(dots.get(0), dots.get(1));
+    }
+
+    @Test
+    public void computeModelWithDeadline() {
+        List<DefaultQuery<Integer, Word<Integer>>> traces = ComputeModelBenchmark.recordTraces(0).subList(0, 100);
+        for (int minDepth = 0; minDepth < 3; minDepth++) {
+            StrongBlueFringeRPNIMealy<Integer, Integer> learner = new StrongBlueFringeRPNIMealy<>(Alphabets.integers(0, 3), minDepth, 0);
+            learner.setDeterministic(true);
+            learner.addSamples(traces);
+            MealyMachine<?, Integer, ?, Integer> merged = learner.computeModel(60000);
+            assertFalse(learner.isTruncated());
+            // With no time, no states are merged
+            MealyMachine<?, Integer, ?, Integer> truncated = learner.computeModel(0);
+            assertTrue(learner.isTruncated());
+            assertTrue(truncated.size() > merged.size());
+            for (DefaultQuery<Integer, Word<Integer>> trace : traces) {
+                assertEquals(trace.getOutput(), truncated.computeOutput(trace.getInput()));
+            }
+        }
+    }
+}
@@ -12,9 +12,10 @@ from stable_baselines3.common.evaluation import evaluate_policy
 from stable_baselines3.common.monitor import Monitor
 from stable_baselines3.common.vec_env import VecTransposeImage, DummyVecEnv, VecEnv, sync_envs_normalization
 
+from src.logic import GatewayPool
 from src.shields.evaluation_shield import EvaluationShield
 from src.wrappers.shield_callbacks import SaveBestShieldCallback
-from src.wrappers.shield_policy import shield_policy
+from src.wrappers.shield_policy import shield_policy, shield_evaluation_mode
 from src.wrappers.shield_wrappers import PreemptiveShieldWrapper
 
 
@@ -91,16 +92,18 @@ class EvalCallback(callbacks.EvalCallback):
             self._is_success_buffer = []
             self._is_crash_buffer = []
 
-            episode_rewards, episode_lengths = evaluate_policy(
-                self.model,
-                self.eval_env,
-                n_eval_episodes=self.n_eval_episodes,
-                render=self.render,
-                deterministic=self.deterministic,
-                return_episode_rewards=True,
-                warn=self.warn,
-                callback=self._log_success_callback,
-            )
+            # The shielded policy uses the shield of the evaluation environment
+            with shield_evaluation_mode(self.model):
+                episode_rewards, episode_lengths = evaluate_policy(
+                    self.model,
+                    self.eval_env,
+                    n_eval_episodes=self.n_eval_episodes,
+                    render=self.render,
+                    deterministic=self.deterministic,
+                    return_episode_rewards=True,
+                    warn=self.warn,
+                    callback=self._log_success_callback,
+                )
 
             if self.log_path is not None:
                 self.evaluations_timesteps.append(self.num_timesteps)
@@ -184,12 +187,12 @@ def run(shield, ltl_formula, depths, game, penalties, total_steps, learning_rate
         label = f'{shield.__name__}'
         # quick hack, probably better to use is instance here..
         if 'Adaptive' in label:
-            gateway = launch_gateway_on_available_port()
+            gateway_pool = GatewayPool(1, launcher=launch_gateway_on_available_port)
             dlabel = f'{label}'
 
             env = shield(env=Monitor(gym.make(game)),
                          ltl_formula=ltl_formula,
-                         gateway=gateway,
+                         gateway=gateway_pool,
                          max_shield_life=shield_life)
 
             # Creating second environment to be used in evaluation callback
@@ -204,14 +207,18 @@ def run(shield, ltl_formula, depths, game, penalties, total_steps, learning_rate
                   callback=callback,
                   eval_env=eval_env)
 
-            gateway.close()
+            eval_env.close()
+            env.close()
+            env.shield.close()
+            gateway_pool.close()
         elif 'Dynamic' in label:
+            # The JVM is launched once and reused for all the depths
+            gateway_pool = GatewayPool(1, launcher=launch_gateway_on_available_port)
             for depth in depths:
-                gateway = launch_gateway_on_available_port()
                 dlabel = f'{label}-depth{depth}'
                 env = shield(env=Monitor(gym.make(game)),
                              ltl_formula=ltl_formula,
-                             gateway=gateway,
+                             gateway=gateway_pool,
                              min_depth=depth,
                              max_shield_life=shield_life)
 
@@ -226,7 +233,11 @@ def run(shield, ltl_formula, depths, game, penalties, total_steps, learning_rate
                       learning_rate=learning_rate,
                       callback=callback,
                       eval_env=eval_env)
-                gateway.close()
+                eval_env.close()
+                env.close()
+                env.shield.close()
+                gateway_pool.check_health()
+            gateway_pool.close()
         else:
             env = shield(env=Monitor(gym.make(game)), ltl_formula=ltl_formula)
             train(env=env,
@@ -0,0 +1,69 @@
+"""
+Compare the construction and solving of the safety games from random reactive systems for each solver.
+
+Usage (from the python directory):
+    python -m benchmarks.shield_performance.construct_and_solve_game --sizes 1000 10000 100000
+"""
+import argparse
+import random
+import time
+from typing import List
+
+from benchmarks.shield_performance.incremental_reconstruction import evaluate_output, make_dfa
+from src.logic import construct_and_solve_game, SafetyGameSolver
+from src.logic.local_safety_game import LocalSafetyGame
+from src.model import ReactiveSystem
+
+__author__ = "Masaki Waga <masakiwaga@gmail.com>"
+__status__ = "experimental"
+__version__ = "0.0.1"
+__date__ = "18 October 2026"
+
+
+def make_random_reactive_system(num_states: int, num_player1_actions: int, num_player2_actions: int,
+                                unsafe_ratio: float, seed: int) -> ReactiveSystem:
+    """
+    Make a random reactive system. The output is 1 (i.e., unsafe for G(!p)) with the probability unsafe_ratio.
+    """
+    rng = random.Random(seed)
+    player1_alphabet = list(range(num_player1_actions))
+    player2_alphabet = list(range(num_player2_actions))
+    reactive_system = ReactiveSystem(player1_alphabet, player2_alphabet, [0, 1])
+    for state in range(1, num_states + 1):
+        for p1_action in player1_alphabet:
+            for p2_action in player2_alphabet:
+                output = 1 if rng.random() < unsafe_ratio else 0
+                reactive_system.addTransition(state, p1_action, p2_action, output, rng.randint(1, num_states))
+    return reactive_system
+
+
+def main(sizes: List[int], num_player1_actions: int, num_player2_actions: int, unsafe_ratio: float,
+         seed: int) -> None:
+    dfa = make_dfa()
+    print('rs_states,solver,game_states,initial_winning,seconds')
+    for size in sizes:
+        reactive_system = make_random_reactive_system(size, num_player1_actions, num_player2_actions,
+                                                      unsafe_ratio, seed)
+        for solver in SafetyGameSolver:
+            start = time.perf_counter()
+            game, win_set, _ = construct_and_solve_game(reactive_system, dfa, evaluate_output, solver)
+            elapsed = time.perf_counter() - start
+            if isinstance(game, LocalSafetyGame):
+                game_states = len(game.expanded)
+            else:
+                game_states = len(game.state_mapper) + 1
+            print(f'{size},{solver.name},{game_states},{game.getInitialState() in win_set},{elapsed:.3f}',
+                  flush=True)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Compare the construction and solving of the safety games')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10 ** 3, 10 ** 4, 10 ** 5],
+                        help='the numbers of the states of the random reactive systems')
+    parser.add_argument('--player1-actions', type=int, default=4, help='the size of the alphabet of player 1')
+    parser.add_argument('--player2-actions', type=int, default=2, help='the size of the alphabet of player 2')
+    parser.add_argument('--unsafe-ratio', type=float, default=0.1,
+                        help='the ratio of the transitions with unsafe outputs')
+    parser.add_argument('--seed', type=int, default=0, help='the seed of the random number generator')
+    args = parser.parse_args()
+    main(args.sizes, args.player1_actions, args.player2_actions, args.unsafe_ratio, args.seed)
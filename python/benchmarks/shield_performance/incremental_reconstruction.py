@@ -0,0 +1,84 @@
+"""
+Compare the incremental reconstruction of the safety game with the reconstruction from scratch.
+
+Usage (from the python directory):
+    python -m benchmarks.shield_performance.incremental_reconstruction --rounds 20 --episodes 100
+"""
+import argparse
+import random
+import time
+from typing import Callable
+
+from src.logic import solve_game, SafetyGameSolver, IncrementalSafetyGameSolver
+from src.model import DFA, ReactiveSystem, SafetyGame
+
+__author__ = "Masaki Waga <masakiwaga@gmail.com>"
+__status__ = "experimental"
+__version__ = "0.0.1"
+__date__ = "18 October 2026"
+
+
+def evaluate_output(output: int) -> Callable[[str], bool]:
+    return lambda ap: output == 1
+
+
+def make_dfa() -> DFA:
+    """
+    The DFA for G(!p), where p holds iff the output is 1
+    """
+    dfa = DFA(['p'])
+    dfa.addTransition(1, {'p': False}, 1)
+    dfa.addTransition(1, {'p': True}, 2)
+    dfa.addTransition(2, {'p': False}, 2)
+    dfa.addTransition(2, {'p': True}, 2)
+    dfa.addSafeState(1)
+    return dfa
+
+
+def main(rounds: int, episodes: int, episode_length: int, num_actions: int, seed: int) -> None:
+    rng = random.Random(seed)
+    dfa = make_dfa()
+    player1_alphabet = list(range(num_actions))
+    player2_alphabet = [0, 1]
+    # The reactive system grows as the PTA in PTADynamicShield without merging
+    reactive_system = ReactiveSystem(player1_alphabet, player2_alphabet, [0, 1])
+    incremental_solver = IncrementalSafetyGameSolver(dfa, evaluate_output)
+    next_state = 2
+    print('round,rs_states,game_states,scratch_seconds,incremental_seconds')
+    for round_index in range(rounds):
+        for _ in range(episodes):
+            state = reactive_system.getInitialState()
+            for _ in range(episode_length):
+                p1_action, p2_action = rng.choice(player1_alphabet), rng.choice(player2_alphabet)
+                if state in reactive_system.transitions and \
+                        (p1_action, p2_action) in reactive_system.transitions[state]:
+                    state = reactive_system.getSuccessor(state, p1_action, p2_action)
+                else:
+                    output = 1 if rng.random() < 0.05 else 0
+                    reactive_system.addTransition(state, p1_action, p2_action, output, next_state)
+                    state = next_state
+                    next_state += 1
+                    if output == 1:
+                        break
+
+        start = time.perf_counter()
+        game = SafetyGame.fromReactiveSystemAndDFA(reactive_system, dfa, evaluate_output)
+        solve_game(game, SafetyGameSolver.WORKLIST)
+        scratch_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        incremental_game, _, _ = incremental_solver.solve(reactive_system)
+        incremental_time = time.perf_counter() - start
+        print(f'{round_index},{len(reactive_system.transitions)},{len(incremental_game.state_mapper)},'
+              f'{scratch_time:.3f},{incremental_time:.3f}', flush=True)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Compare the incremental and the scratch reconstruction')
+    parser.add_argument('--rounds', type=int, default=20, help='the number of the reconstructions')
+    parser.add_argument('--episodes', type=int, default=100, help='the number of the episodes between reconstructions')
+    parser.add_argument('--episode-length', type=int, default=50, help='the maximum length of an episode')
+    parser.add_argument('--actions', type=int, default=4, help='the size of the alphabet of player 1')
+    parser.add_argument('--seed', type=int, default=0, help='the seed of the random number generator')
+    args = parser.parse_args()
+    main(args.rounds, args.episodes, args.episode_length, args.actions, args.seed)
@@ -0,0 +1,81 @@
+"""
+Compare the transfer of the training samples to the JVM learner letter by letter with the bulk transfer.
+
+The Java gateway must be running (see the README in the repository root).
+
+Usage (from the python directory):
+    python -m benchmarks.shield_performance.sample_transfer --samples 100 1000 10000
+"""
+import argparse
+import random
+import time
+from typing import List, Tuple
+
+from py4j.java_gateway import JavaGateway
+
+from src.logic import PassiveLearning
+
+__author__ = "Masaki Waga <masakiwaga@gmail.com>"
+__status__ = "experimental"
+__version__ = "0.0.1"
+__date__ = "18 October 2026"
+
+
+class RoundTripCounter:
+    """
+    Count the commands sent to the JVM, i.e., the Py4J round trips
+    """
+
+    def __init__(self, gateway: JavaGateway) -> None:
+        self.count = 0
+        self.client = gateway._gateway_client
+        self.original_send_command = self.client.send_command
+
+        def send_command(*args, **kwargs):
+            self.count += 1
+            return self.original_send_command(*args, **kwargs)
+
+        self.client.send_command = send_command
+
+
+def make_samples(num_samples: int, length: int, num_actions: int, rng: random.Random) -> List[Tuple[List[int], int]]:
+    """
+    Make the samples as in DynamicShield, i.e., all the prefixes of random episodes
+    """
+    samples: List[Tuple[List[int], int]] = []
+    while len(samples) < num_samples:
+        episode = [rng.randrange(num_actions) for _ in range(length)]
+        for end in range(1, length + 1):
+            samples.append((episode[:end], episode[end - 1] % 2))
+    return samples[:num_samples]
+
+
+def main(sizes: List[int], length: int, num_actions: int, seed: int) -> None:
+    gateway = JavaGateway()
+    counter = RoundTripCounter(gateway)
+    print('samples,letters,transfer,round_trips,seconds')
+    for size in sizes:
+        samples = make_samples(size, length, num_actions, random.Random(seed))
+        letters = sum(len(input_word) for input_word, _ in samples)
+        for bulk_transfer in [False, True]:
+            learner = PassiveLearning(gateway, 0, num_actions - 1, min_depth=1, bulk_transfer=bulk_transfer)
+            counter.count = 0
+            start = time.perf_counter()
+            if bulk_transfer:
+                learner._send_samples(samples)
+            else:
+                learner._send_samples_per_letter(samples)
+            elapsed = time.perf_counter() - start
+            print(f'{size},{letters},{"bulk" if bulk_transfer else "per_letter"},{counter.count},{elapsed:.3f}',
+                  flush=True)
+    gateway.close()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Compare the transfer of the samples to the JVM learner')
+    parser.add_argument('--samples', type=int, nargs='+', default=[100, 1000, 10000], help='the number of the samples')
+    parser.add_argument('--length', type=int, default=50, help='the length of the random episodes')
+    parser.add_argument('--actions', type=int, default=4, help='the size of the input alphabet')
+    parser.add_argument('--seed', type=int, default=0, help='the seed of the random number generator')
+    args = parser.parse_args()
+    main(args.samples, args.length, args.actions, args.seed)
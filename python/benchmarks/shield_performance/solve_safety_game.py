@@ -0,0 +1,80 @@
+"""
+Compare the safety game solvers on random safety games.
+
+Usage (from the python directory):
+    python -m benchmarks.shield_performance.solve_safety_game --sizes 1000 10000 100000 1000000
+"""
+import argparse
+import random
+import time
+from typing import List
+
+from src.logic import solve_game, SafetyGameSolver
+from src.model import SafetyGame, ArraySafetyGame
+
+__author__ = "Masaki Waga <masakiwaga@gmail.com>"
+__status__ = "experimental"
+__version__ = "0.0.1"
+__date__ = "18 October 2026"
+
+
+def make_random_game(num_states: int, num_player1_actions: int, num_player2_actions: int,
+                     unsafe_ratio: float, locality: int, seed: int) -> SafetyGame:
+    """
+    Make a random safety game.
+
+    The successors of each state are chosen from the next `locality` states. This makes long chains of the losing
+    states, which is the typical worst case of the fixpoint iteration.
+
+    Args:
+        num_states: int : the number of the states
+        num_player1_actions: int : the size of the alphabet of player 1
+        num_player2_actions: int : the size of the alphabet of player 2
+        unsafe_ratio: float : the ratio of the unsafe states
+        locality: int : the successors of the state q are chosen from q + 1, q + 2, ..., q + locality
+        seed: int : the seed of the random number generator
+    """
+    rng = random.Random(seed)
+    player1_alphabet = list(range(num_player1_actions))
+    player2_alphabet = list(range(num_player2_actions))
+    game = SafetyGame(player1_alphabet, player2_alphabet)
+    game.setSafeStates([0, 1] + [state for state in range(2, num_states) if rng.random() >= unsafe_ratio])
+    for state in range(1, num_states):
+        for p1_action in player1_alphabet:
+            for p2_action in player2_alphabet:
+                game.add_transition(state, p1_action, p2_action, (state + rng.randint(1, locality)) % num_states)
+    return game
+
+
+def main(sizes: List[int], num_player1_actions: int, num_player2_actions: int, unsafe_ratio: float,
+         locality: int, max_fixpoint_size: int, seed: int) -> None:
+    print('states,transitions,solver,winning_states,seconds')
+    for size in sizes:
+        game = make_random_game(size, num_player1_actions, num_player2_actions, unsafe_ratio, locality, seed)
+        # The vectorized solver is measured on ArraySafetyGame because the shields construct it directly
+        array_game = ArraySafetyGame.fromSafetyGame(game)
+        for solver in SafetyGameSolver:
+            if solver == SafetyGameSolver.FIXPOINT and size > max_fixpoint_size:
+                continue
+            solved_game = array_game if solver == SafetyGameSolver.VECTORIZED else game
+            start = time.perf_counter()
+            win_set, _ = solve_game(solved_game, solver)
+            elapsed = time.perf_counter() - start
+            print(f'{size},{len(game.transitions)},{solver.name},{len(win_set)},{elapsed:.3f}', flush=True)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Compare the safety game solvers on random safety games')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6],
+                        help='the numbers of the states of the benchmarked games')
+    parser.add_argument('--player1-actions', type=int, default=4, help='the size of the alphabet of player 1')
+    parser.add_argument('--player2-actions', type=int, default=2, help='the size of the alphabet of player 2')
+    parser.add_argument('--unsafe-ratio', type=float, default=0.05, help='the ratio of the unsafe states')
+    parser.add_argument('--locality', type=int, default=16,
+                        help='the successors of each state are chosen from the next LOCALITY states')
+    parser.add_argument('--max-fixpoint-size', type=int, default=10 ** 5,
+                        help='skip the fixpoint solver for the games larger than this')
+    parser.add_argument('--seed', type=int, default=0, help='the seed of the random number generator')
+    args = parser.parse_args()
+    main(args.sizes, args.player1_actions, args.player2_actions, args.unsafe_ratio, args.locality,
+         args.max_fixpoint_size, args.seed)
@@ -1,4 +1,8 @@
 from .ltl2dfa_translator import is_safety, ltl_to_dfa_spot
+from .gateway_pool import GatewayPool
 from .passive_learning import PassiveLearning
-from .solve_safety_game import solve_game
+from .solve_safety_game import solve_game, construct_and_solve_game, SafetyGameSolver
 from .blue_fringe_rpni import BlueFringeRPNI
+from .incremental_safety_game import IncrementalSafetyGameSolver
+from .dfa_cache import DFACache
+from .union_find_rpni import UnionFindRPNI
@@ -1,24 +1,65 @@
+from collections import deque
 from copy import deepcopy
 from logging import getLogger
-from typing import List, Tuple, Optional, Set, Dict
+from typing import List, Tuple, Optional, Set, Dict, Deque, Union
 
-from src.model import PTA
+from src.model import PTA, ArrayPTA
 from src.model import ReactiveSystem
 
 LOGGER = getLogger(__name__)
 
 
+Predecessors = Dict[int, Set[Tuple[int, Tuple[int, int]]]]
+
+
+def _build_predecessors(reactive_system: ReactiveSystem) -> Predecessors:
+    """
+        Returns the map from each state to the pairs of the source and the action of its incoming transitions
+    """
+    predecessors: Predecessors = dict()
+    for source, transitions in reactive_system.transitions.items():
+        for action, target in transitions.items():
+            predecessors.setdefault(target, set()).add((source, action))
+    return predecessors
+
+
 class CheckMergeability:
+    """
+        Mergeability check with the memo tables shared by the checks of many blue states.
+
+        The output compatibility and the unmergeable pairs do not depend on the order of the traversal, and they are
+        kept until the states are modified by a merge. After merging states, run invalidate with the touched states so
+        that only the affected entries are removed. The mergeable depth of the other pairs depends on the pairs visited
+        in the traversal, and it is kept only for the current blue state, i.e., until start_blue_state is called.
+    """
+
     def __init__(self, reactive_system: ReactiveSystem) -> None:
         self._reactive_system = reactive_system
         self._compatibility_memo: Dict[Tuple[int, int], bool] = dict()
         self._mergeable_depth_memo: Dict[Tuple[int, int], Optional[int]] = dict()
+        self._traversal_dependent_pairs: Set[Tuple[int, int]] = set()
+        self._mergeable_depth_persistent_memo: Dict[Tuple[int, int], int] = dict()
+        self._unmergeable_pairs: Set[Tuple[int, int]] = set()
+        # The keys of the persistent memo tables containing each state
+        self._memo_keys: Dict[int, Set[Tuple[int, int]]] = dict()
+
+    def start_blue_state(self) -> None:
+        """
+            Clear the memo of the mergeable depth depending on the traversal for the previous blue state
+        """
+        self._mergeable_depth_memo.clear()
+        self._traversal_dependent_pairs.clear()
+
+    def _register(self, red_state: int, blue_state: int) -> None:
+        self._memo_keys.setdefault(red_state, set()).add((red_state, blue_state))
+        self._memo_keys.setdefault(blue_state, set()).add((red_state, blue_state))
 
     def output_compatible(self, red_state: int, blue_state: int) -> bool:
         if red_state == blue_state:
             return True
         if (red_state, blue_state) in self._compatibility_memo:
             return self._compatibility_memo[red_state, blue_state]
+        self._register(red_state, blue_state)
         if red_state not in self._reactive_system.output or blue_state not in self._reactive_system.output:
             self._compatibility_memo[red_state, blue_state] = True
             return True
@@ -28,12 +69,26 @@ class CheckMergeability:
         self._compatibility_memo[red_state, blue_state] = result
         return result
 
+    def _memoize_depth(self, red_state: int, blue_state: int, depth: Optional[int],
+                       depends_on_traversal: bool) -> Optional[int]:
+        self._mergeable_depth_memo[red_state, blue_state] = depth
+        if depth is None:
+            self._register(red_state, blue_state)
+            self._unmergeable_pairs.add((red_state, blue_state))
+        elif depends_on_traversal:
+            self._traversal_dependent_pairs.add((red_state, blue_state))
+        else:
+            self._register(red_state, blue_state)
+            self._mergeable_depth_persistent_memo[red_state, blue_state] = depth
+        return depth
+
     def mergeable_depth(self, red_state: int, blue_state: int,
                         visited_pair: Optional[Set[Tuple[int, int]]] = None) -> Optional[int]:
         """
-            Decide if blue_state is mergeable to red_state and returns the depth of the matching if mergeable
+            Decide if blue_state is mergeable to red_state and returns the depth of the matching if mergeable.
+            The matching is traversed with an explicit stack so that the depth of the PTA is not limited by the
+            recursion limit of Python.
             Args
-                _reactive_system:
                 red_state:
                 blue_state:
                 visited_pair:
@@ -43,93 +98,214 @@ class CheckMergeability:
         """
         if visited_pair is None:
             visited_pair = set()
-        if (red_state, blue_state) in self._mergeable_depth_memo:
-            return self._mergeable_depth_memo[red_state, blue_state]
-        if red_state == blue_state or (red_state, blue_state) in visited_pair:
-            self._mergeable_depth_memo[red_state, blue_state] = 1
-            return 1
-        visited_pair.add((red_state, blue_state))
-        visited_pair.add((blue_state, red_state))
-        # Returns None if we cannot merge red_state and blue_state
-        if not self.output_compatible(red_state, blue_state):
-            self._mergeable_depth_memo[red_state, blue_state] = None
-            return None
-        if red_state not in self._reactive_system.transitions or blue_state not in self._reactive_system.transitions:
-            self._mergeable_depth_memo[red_state, blue_state] = 1
-            return 1
-        max_depth: int = 1
-        for action in self._reactive_system.transitions[red_state].keys() & \
-                      self._reactive_system.transitions[blue_state].keys():
-            depth: Optional[int]
-            depth = self.mergeable_depth(self._reactive_system.transitions[red_state][action],
-                                         self._reactive_system.transitions[blue_state][action],
-                                         visited_pair)
-            if depth is None:
-                self._mergeable_depth_memo[red_state, blue_state] = None
-                return None
-            max_depth = max(max_depth, depth + 1)
-        self._mergeable_depth_memo[red_state, blue_state] = max_depth
-        return max_depth
+        transitions = self._reactive_system.transitions
+        # Each frame is [red_state, blue_state, the iterator of the common actions, the maximum depth so far,
+        #                if the depth so far depends on the pairs visited before]
+        stack: List[list] = []
+        pair: Optional[Tuple[int, int]] = (red_state, blue_state)
+        result: Optional[int] = None
+        # If result is cut by a pair visited before
+        depends_on_traversal = False
+        while True:
+            if pair is not None:
+                # Call for the pair
+                red, blue = pair
+                pair = None
+                depends_on_traversal = False
+                if (red, blue) in self._unmergeable_pairs:
+                    result = None
+                elif (red, blue) in self._mergeable_depth_persistent_memo:
+                    result = self._mergeable_depth_persistent_memo[red, blue]
+                elif (red, blue) in self._mergeable_depth_memo:
+                    result = self._mergeable_depth_memo[red, blue]
+                    depends_on_traversal = (red, blue) in self._traversal_dependent_pairs
+                elif red == blue:
+                    result = self._memoize_depth(red, blue, 1, False)
+                elif (red, blue) in visited_pair:
+                    depends_on_traversal = True
+                    result = self._memoize_depth(red, blue, 1, True)
+                else:
+                    visited_pair.add((red, blue))
+                    visited_pair.add((blue, red))
+                    # Returns None if we cannot merge red and blue
+                    if not self.output_compatible(red, blue):
+                        result = self._memoize_depth(red, blue, None, False)
+                    elif red not in transitions or blue not in transitions:
+                        result = self._memoize_depth(red, blue, 1, False)
+                    else:
+                        frame = [red, blue, iter(transitions[red].keys() & transitions[blue].keys()), 1, False]
+                        # Go to the first common action
+                        action = next(frame[2], None)
+                        if action is None:
+                            result = self._memoize_depth(red, blue, 1, False)
+                        else:
+                            stack.append(frame)
+                            pair = (transitions[red][action], transitions[blue][action])
+                            continue
+            # Return the result to the caller
+            if not stack:
+                return result
+            frame = stack[-1]
+            if result is None:
+                stack.pop()
+                result = self._memoize_depth(frame[0], frame[1], None, False)
+                continue
+            frame[3] = max(frame[3], result + 1)
+            frame[4] = frame[4] or depends_on_traversal
+            action = next(frame[2], None)
+            if action is None:
+                stack.pop()
+                depends_on_traversal = frame[4]
+                result = self._memoize_depth(frame[0], frame[1], frame[3], depends_on_traversal)
+            else:
+                pair = (transitions[frame[0]][action], transitions[frame[1]][action])
+
+    def invalidate(self, touched_states: Set[int], predecessors: Predecessors) -> None:
+        """
+            Remove the memo entries affected by the modification of touched_states. The compatibility depends only on
+            the states in the pair while the mergeability depends on their successors. Thus, we remove the
+            unmergeable pairs containing an ancestor of a touched state.
+            Args
+                touched_states: the states whose outputs or transitions are modified
+                predecessors: the incoming transitions of each state
+        """
+        transitions = self._reactive_system.transitions
+        ancestors: Set[int] = set(touched_states)
+        stack: List[int] = list(touched_states)
+        while stack:
+            state = stack.pop()
+            for source, action in predecessors.get(state, ()):
+                if source not in ancestors and transitions.get(source, {}).get(action) == state:
+                    ancestors.add(source)
+                    stack.append(source)
+        for state in ancestors:
+            for key in self._memo_keys.pop(state, ()):
+                self._compatibility_memo.pop(key, None)
+                self._mergeable_depth_persistent_memo.pop(key, None)
+                self._unmergeable_pairs.discard(key)
+        self.start_blue_state()
+        self._traversal_dependent_pairs.clear()
 
 
 def _merge(reactive_system: ReactiveSystem, red_state: int, blue_state: int,
-           visited_blue_states=None) -> None:
+           visited_blue_states=None, predecessors: Optional[Predecessors] = None,
+           touched_states: Optional[Set[int]] = None) -> None:
     """
         Merge blue_state to red_state in _reactive_system
         Note: we do not check if blue_state is mergeable to red_state. please check by _mergeable_depth beforehand
+        Note: the merge of the successors is handled with an explicit stack instead of the recursion.
+        Args
+            predecessors: the incoming transitions of each state. If it is given, it is updated and used to redirect
+                the incoming transitions of the merged states. Otherwise, we scan all the transitions.
+            touched_states: if it is given, the states whose outputs or transitions are modified are added.
     """
     if visited_blue_states is None:
         visited_blue_states = set()
-    # mergeable_depth = _mergeable_depth(_reactive_system, red_state, blue_state)
-    # if mergeable_depth is None or red_state == blue_state:
-    #    return
-    # merge the outputs
-    if blue_state in reactive_system.output:
-        for action in reactive_system.output[blue_state]:
-            if red_state in reactive_system.output:
-                reactive_system.output[red_state][action] = reactive_system.output[blue_state][action]
+    if touched_states is None:
+        touched_states = set()
+    transitions = reactive_system.transitions
+
+    def enter(red: int, blue: int) -> Optional[list]:
+        """
+            Merge the outputs and returns the frame to merge the transitions if necessary
+        """
+        touched_states.add(red)
+        touched_states.add(blue)
+        # merge the outputs
+        if blue in reactive_system.output:
+            for action in reactive_system.output[blue]:
+                if red in reactive_system.output:
+                    reactive_system.output[red][action] = reactive_system.output[blue][action]
+                else:
+                    reactive_system.output[red] = {action: reactive_system.output[blue][action]}
+            del reactive_system.output[blue]
+        if blue in transitions and blue not in visited_blue_states:
+            visited_blue_states.add(blue)
+            # [red, blue, the available actions in the last iteration, the iterator of the available actions]
+            return [red, blue, None, iter(())]
+        return None
+
+    def redirect(red: int, blue: int) -> None:
+        if predecessors is None:
+            for source in transitions:
+                for action in transitions[source]:
+                    if transitions[source][action] == blue:
+                        transitions[source][action] = red
+                        touched_states.add(source)
+            return
+        for source, action in predecessors.pop(blue, ()):
+            if transitions.get(source, {}).get(action) == blue:
+                transitions[source][action] = red
+                predecessors.setdefault(red, set()).add((source, action))
+                touched_states.add(source)
+
+    stack: List[list] = []
+    frame = enter(red_state, blue_state)
+    if frame is None:
+        redirect(red_state, blue_state)
+        return
+    stack.append(frame)
+    while stack:
+        frame = stack[-1]
+        red, blue = frame[0], frame[1]
+        action = next(frame[3], None)
+        if action is None:
+            # merge the transitions until no new action is available
+            if frame[2] != set(transitions[blue].keys()):
+                frame[2] = set(transitions[blue].keys())
+                frame[3] = iter(frame[2])
+                continue
+            del transitions[blue]
+            stack.pop()
+            redirect(red, blue)
+            continue
+        if red not in transitions:
+            transitions[red] = dict()
+        if action in transitions[red]:
+            child_red, child_blue = transitions[red][action], transitions[blue][action]
+            child_frame = enter(child_red, child_blue)
+            if child_frame is None:
+                redirect(child_red, child_blue)
             else:
-                reactive_system.output[red_state] = {action: reactive_system.output[blue_state][action]}
-        del reactive_system.output[blue_state]
-
-    # merge the transitions
-    if blue_state in reactive_system.transitions:
-        if blue_state not in visited_blue_states:
-            visited_blue_states.add(blue_state)
-            last_available_actions = set()
-            while last_available_actions != set(reactive_system.transitions[blue_state].keys()):
-                last_available_actions = set(reactive_system.transitions[blue_state].keys())
-                for action in last_available_actions:
-                    if red_state not in reactive_system.transitions:
-                        reactive_system.transitions[red_state] = dict()
-                    if action in reactive_system.transitions[red_state]:
-                        _merge(reactive_system, reactive_system.transitions[red_state][action],
-                               reactive_system.transitions[blue_state][action], visited_blue_states)
-                    else:
-                        reactive_system.transitions[red_state][action] = reactive_system.transitions[blue_state][action]
-            del reactive_system.transitions[blue_state]
-    for source in reactive_system.transitions:
-        for action in reactive_system.transitions[source]:
-            if reactive_system.transitions[source][action] == blue_state:
-                reactive_system.transitions[source][action] = red_state
+                stack.append(child_frame)
+        else:
+            transitions[red][action] = transitions[blue][action]
+            if predecessors is not None:
+                predecessors.setdefault(transitions[blue][action], set()).add((red, action))
 
 
 class BlueFringeRPNI:
-    def __init__(self, player1_alphabet: List[int], player2_alphabet: List[int], output_alphabet: List[int]) -> None:
-        self.pta: PTA = PTA(player1_alphabet, player2_alphabet, output_alphabet)
+    def __init__(self, player1_alphabet: List[int], player2_alphabet: List[int], output_alphabet: List[int],
+                 array_pta: bool = False) -> None:
+        """
+        The constructor
+        Args:
+            player1_alphabet: List[int] : the actions of player 1
+            player2_alphabet: List[int] : the actions of player 2
+            output_alphabet: List[int] : the outputs
+            array_pta: bool : store the training data in ArrayPTA instead of PTA
+        """
+        pta_class = ArrayPTA if array_pta else PTA
+        self.pta: Union[PTA, ArrayPTA] = pta_class(player1_alphabet, player2_alphabet, output_alphabet)
 
     def addSample(self, input_word: List[Tuple[int, int]], output_action: int) -> None:
         self.pta.addSample(input_word, output_action)
 
+    def addTrace(self, input_word: List[Tuple[int, int]], output_word: List[int]) -> None:
+        self.pta.addTrace(input_word, output_word)
+
     def compute_model(self, min_depth: int = 0) -> ReactiveSystem:
-        reactive_system: ReactiveSystem = deepcopy(self.pta)
-        blue_states: List[int] = reactive_system.getStates()
+        reactive_system: ReactiveSystem = self.pta.toPTA() if isinstance(self.pta, ArrayPTA) else deepcopy(self.pta)
+        blue_states: Deque[int] = deque(reactive_system.getStates())
         red_states: List[int] = []
+        predecessors = _build_predecessors(reactive_system)
+        # The memo tables are shared by the blue states and invalidated only for the states touched by a merge
+        mergeability_checker = CheckMergeability(reactive_system)
         while len(blue_states) > 0:
             # pick from the root
-            blue_state: int = blue_states.pop(0)
+            blue_state: int = blue_states.popleft()
             mergeable_states: List[Tuple[int, int]] = []
-            mergeability_checker = CheckMergeability(reactive_system)
+            mergeability_checker.start_blue_state()
             # Perhaps this exhaustive comparison is slow
             for red_state in red_states:
                 depth = mergeability_checker.mergeable_depth(red_state, blue_state)
@@ -139,8 +315,10 @@ class BlueFringeRPNI:
             if len(mergeable_states) > 0:
                 _, red_state = sorted(mergeable_states, reverse=True)[0]
                 visited_blue_states = set()
-                _merge(reactive_system, red_state, blue_state, visited_blue_states)
-                blue_states = [blue_state for blue_state in blue_states if blue_state not in visited_blue_states]
+                touched_states = set()
+                _merge(reactive_system, red_state, blue_state, visited_blue_states, predecessors, touched_states)
+                mergeability_checker.invalidate(touched_states, predecessors)
+                blue_states = deque(blue_state for blue_state in blue_states if blue_state not in visited_blue_states)
             else:
                 red_states.append(blue_state)
                 continue
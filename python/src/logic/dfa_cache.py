@@ -0,0 +1,131 @@
+import hashlib
+import json
+import os
+import tempfile
+from logging import getLogger
+from typing import Dict, Optional, Callable
+
+from src.model import DFA
+
+__author__ = "Masaki Waga <masakiwaga@gmail.com>"
+__status__ = "experimental"
+__version__ = "0.0.1"
+__date__ = "18 October 2026"
+
+LOGGER = getLogger(__name__)
+
+# The environment variable to specify the directory of the disk cache. If it is set to the empty string, the disk
+# cache is disabled.
+CACHE_DIR_ENVIRONMENT_VARIABLE = 'DYNAMIC_SHIELDING_CACHE_DIR'
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'dynamic-shielding', 'ltl2dfa')
+# Increment this when the serialized form changes
+SERIALIZATION_VERSION = 1
+
+
+def dfa_to_dict(dfa: DFA) -> dict:
+    """
+    Serialize a DFA into a JSON-compatible dictionary
+    """
+    return {'alphabet': list(dfa.getAlphabet()),
+            'initial_state': dfa.getInitialState(),
+            'safe_states': list(dfa.safeStates),
+            'transitions': [[source, sorted([ap, value] for ap, value in guard), target]
+                            for source, guarded_targets in dfa.transitions.items()
+                            for guard, target in guarded_targets.items()]}
+
+
+def dfa_from_dict(serialized: dict) -> DFA:
+    """
+    Deserialize a DFA serialized by dfa_to_dict
+    """
+    dfa = DFA(list(serialized['alphabet']))
+    dfa.setInitialState(serialized['initial_state'])
+    dfa.setSafeStates(list(serialized['safe_states']))
+    for source, guard, target in serialized['transitions']:
+        dfa.addTransition(source, {ap: value for ap, value in guard}, target)
+    return dfa
+
+
+class DFACache:
+    """
+    The content-addressed cache of the DFAs translated from LTL formulas.
+
+    The key is the SHA-256 hash of the formula and the version of the translator. The translated DFAs are kept in
+    the serialized form both in memory and, if a directory is given, on disk as JSON files. Each lookup returns a new
+    DFA because DFA is mutable.
+    """
+
+    def __init__(self, directory: Optional[str] = None) -> None:
+        """
+        The constructor
+        Args:
+            directory: Optional[str] : the directory of the disk cache. If it is None, only the memory cache is used.
+        """
+        self.directory = directory
+        self.memory: Dict[str, dict] = {}
+
+    @staticmethod
+    def key(formula: str, translator_version: str) -> str:
+        return hashlib.sha256(
+            f'{SERIALIZATION_VERSION}\0{translator_version}\0{formula}'.encode('utf-8')).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f'{key}.json')
+
+    def _load(self, key: str) -> Optional[dict]:
+        if self.directory is None or not os.path.exists(self._path(key)):
+            return None
+        try:
+            with open(self._path(key), 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            LOGGER.warning(f'Failed to read the cached DFA {self._path(key)}: {e}')
+            return None
+
+    def _store(self, key: str, serialized: dict) -> None:
+        if self.directory is None:
+            return
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            # Write to a temporary file first so that concurrent readers never see a partial file
+            file_descriptor, temporary_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+            with os.fdopen(file_descriptor, 'w') as f:
+                json.dump(serialized, f, separators=(',', ':'))
+            os.replace(temporary_path, self._path(key))
+        except OSError as e:
+            LOGGER.warning(f'Failed to write the cached DFA to {self.directory}: {e}')
+
+    def get(self, formula: str, translator_version: str, translate: Callable[[str], DFA]) -> DFA:
+        """
+        Returns the DFA for the formula. It is translated by translate only if it is not cached.
+        Args:
+            formula: str : the LTL formula
+            translator_version: str : the version of the translator
+            translate: Callable[[str], DFA] : the translator from an LTL formula to a DFA
+        Returns:
+            A new DFA for the formula
+        """
+        key = self.key(formula, translator_version)
+        serialized = self.memory.get(key)
+        if serialized is None:
+            serialized = self._load(key)
+            if serialized is None:
+                LOGGER.debug(f'Translate {formula} to a DFA')
+                serialized = dfa_to_dict(translate(formula))
+                self._store(key, serialized)
+            self.memory[key] = serialized
+        return dfa_from_dict(serialized)
+
+    def clear(self) -> None:
+        """
+        Clear the memory cache. The disk cache is kept.
+        """
+        self.memory.clear()
+
+
+def default_cache_directory() -> Optional[str]:
+    directory = os.environ.get(CACHE_DIR_ENVIRONMENT_VARIABLE, DEFAULT_CACHE_DIR)
+    return directory if directory != '' else None
+
+
+DEFAULT_DFA_CACHE = DFACache(default_cache_directory())
@@ -0,0 +1,140 @@
+import threading
+from logging import getLogger
+from typing import List, Callable, Optional
+
+from py4j.java_gateway import JavaGateway
+from py4j.protocol import Py4JError
+
+__author__ = "Masaki Waga <masakiwaga@gmail.com>"
+__status__ = "experimental"
+__version__ = "0.0.1"
+__date__ = "18 October 2026"
+
+LOGGER = getLogger(__name__)
+
+
+class GatewayPool:
+    """
+    The class for a bounded pool of JVM gateways shared by many learners.
+
+    The JVMs are started in advance and kept warm, so a learner leases one of them instead of launching a JVM and
+    loading LearnLib for each run. Each lease takes the gateway with the fewest leases, and the ties are broken in the
+    round-robin order. Thus, the learners, and their computeModel calls, are dispatched evenly to the JVMs. A leased
+    gateway is checked by a trivial Java call and relaunched if it does not respond.
+
+    Usage:
+      pool = GatewayPool(4, jarpath='../java/target/learnlib-py4j-example-1.0-SNAPSHOT.jar')
+      learner = PassiveLearning(pool, 0, 10)  # The learner leases a gateway
+      ...
+      learner.close()  # The learner returns the gateway
+      pool.close()
+    """
+
+    def __init__(self, size: int, jarpath: str = '', launcher: Optional[Callable[[], JavaGateway]] = None) -> None:
+        """
+        The constructor. The JVMs are launched here.
+
+        :param size: int : the number of the JVMs
+        :param jarpath: str : the path to the jar file of the Java learners. This is used only when launcher is None.
+        :param launcher: Optional[Callable[[], JavaGateway]] : the function to launch a JVM and returns its gateway.
+          If it is None, JavaGateway.launch_gateway on an available port is used.
+        """
+        assert size > 0, 'The size of the gateway pool must be positive'
+        self.jarpath = jarpath
+        self.launcher = launcher if launcher is not None else self._launch
+        self.lock = threading.Lock()
+        self.gateways: List[JavaGateway] = [self.launcher() for _ in range(size)]
+        # self.leases[i] is the number of the learners using self.gateways[i]
+        self.leases: List[int] = [0] * size
+        # The index of the gateway checked first in the next lease
+        self.next_index: int = 0
+
+    def _launch(self) -> JavaGateway:
+        return JavaGateway.launch_gateway(port=0, jarpath=self.jarpath, die_on_exit=True)
+
+    def __len__(self) -> int:
+        return len(self.gateways)
+
+    def __enter__(self) -> 'GatewayPool':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    @staticmethod
+    def is_alive(gateway: JavaGateway) -> bool:
+        """
+        Returns if the JVM of the gateway responds to a trivial Java call
+        """
+        try:
+            gateway.jvm.java.lang.System.currentTimeMillis()
+            return True
+        except Py4JError:
+            return False
+
+    def _relaunch(self, index: int) -> None:
+        LOGGER.warning(f'The JVM of gateway {index} does not respond. We relaunch it.')
+        try:
+            self.gateways[index].shutdown()
+        except Py4JError:
+            pass
+        self.gateways[index] = self.launcher()
+        # The learners leasing the old gateway do not return it to this slot
+        self.leases[index] = 0
+
+    def lease(self) -> JavaGateway:
+        """
+        Lease a gateway. The leased gateway must be returned by release when it is not used any more.
+
+        :return: the healthy gateway with the fewest leases
+        """
+        with self.lock:
+            size = len(self.gateways)
+            order = [(self.next_index + offset) % size for offset in range(size)]
+            index = min(order, key=lambda i: self.leases[i])
+            self.next_index = (index + 1) % size
+            if not self.is_alive(self.gateways[index]):
+                self._relaunch(index)
+            self.leases[index] += 1
+            return self.gateways[index]
+
+    def release(self, gateway: JavaGateway) -> None:
+        """
+        Return a leased gateway to the pool. The Java objects made through the gateway must not be used after this.
+        """
+        with self.lock:
+            for index, pooled_gateway in enumerate(self.gateways):
+                if pooled_gateway is gateway:
+                    assert self.leases[index] > 0, 'The gateway is not leased'
+                    self.leases[index] -= 1
+                    return
+        # The gateway was relaunched while it was leased
+        LOGGER.debug('A released gateway is not in the pool')
+
+    def check_health(self) -> int:
+        """
+        Relaunch the JVMs not responding. The learners leasing a relaunched JVM lose their Java objects, so this should
+        be called between runs.
+
+        :return: the number of the relaunched JVMs
+        """
+        relaunched = 0
+        with self.lock:
+            for index, gateway in enumerate(self.gateways):
+                if not self.is_alive(gateway):
+                    self._relaunch(index)
+                    relaunched += 1
+        return relaunched
+
+    def close(self) -> None:
+        """
+        Shut down all the JVMs
+        """
+        with self.lock:
+            for gateway in self.gateways:
+                try:
+                    gateway.shutdown()
+                except Py4JError:
+                    pass
+            self.gateways.clear()
+            self.leases.clear()
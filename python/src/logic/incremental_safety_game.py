@@ -0,0 +1,243 @@
+import itertools
+from logging import getLogger
+from typing import List, Dict, Tuple, Set, Callable, Optional, Union
+
+from src.logic.solve_safety_game import solve_game, SafetyGameSolver
+from src.model import SafetyGame, DFA, ReactiveSystem, CompiledDFA
+from src.model.compiled_dfa import compile_dfa
+from src.model.safety_game import SafetyGameFromReactiveSystem
+
+__author__ = "Masaki Waga <masakiwaga@gmail.com>"
+__status__ = "experimental"
+__version__ = "0.0.1"
+__date__ = "18 October 2026"
+
+LOGGER = getLogger(__name__)
+
+
+class IncrementalSafetyGameSolver:
+    """
+    The class to construct and solve the safety games for a sequence of reactive systems incrementally.
+
+    The safety game of the previous reactive system is kept and updated in place. When a new reactive system is given,
+    we compare it with the previous one state by state and re-expand only the product states whose reactive system
+    component is changed. Then, we re-solve only the backward cone of the changed product states, i.e., the states
+    that can reach them. The other states keep their winning status and strategy because their reachable part of the
+    game is not changed.
+
+    Usage:
+      1. make an instance solver of IncrementalSafetyGameSolver for the specification DFA
+      2. run safety_game, win_set, win_strategy = solver.solve(reactive_system) for each learned reactive system
+
+    .. NOTE::
+        The returned safety game, winning states, and winning strategy are updated in place by the next call of solve.
+    """
+
+    def __init__(self, dfa: Union[DFA, CompiledDFA], evaluate_output: Callable[[int], Callable[[str], bool]],
+                 solver: SafetyGameSolver = SafetyGameSolver.WORKLIST,
+                 max_changed_ratio: float = 0.5, max_stale_ratio: float = 0.5) -> None:
+        """
+        The constructor
+        Args:
+            dfa: Union[DFA, CompiledDFA] : the DFA of the specification. It is compiled with evaluate_output unless it
+              is already compiled.
+            evaluate_output: Callable[[int], Callable[[str], bool]] : The function to evaluate the output of the
+              reactive system
+            solver: SafetyGameSolver : the algorithm to solve the safety game when it is solved from scratch
+            max_changed_ratio: float : we construct the safety game from scratch if more than this ratio of the
+              states of the reactive system are changed
+            max_stale_ratio: float : we construct the safety game from scratch if more than this ratio of the states
+              of the safety game are for the removed states of the reactive system. Such states are unreachable but
+              kept in the incrementally updated safety game.
+        """
+        self.dfa = compile_dfa(dfa, evaluate_output)
+        self.evaluate_output = evaluate_output
+        self.solver = solver
+        self.max_changed_ratio = max_changed_ratio
+        self.max_stale_ratio = max_stale_ratio
+        self.safety_game: Optional[SafetyGameFromReactiveSystem] = None
+        self.win_set: Set[int] = set()
+        self.win_strategy: Dict[int, List[int]] = {}
+        self.safe_states: Set[int] = set()
+        # The snapshot of the previous reactive system
+        self.previous_transitions: Dict[int, Dict[Tuple[int, int], int]] = {}
+        self.previous_output: Dict[int, Dict[Tuple[int, int], int]] = {}
+        self.previous_initial_state: Optional[int] = None
+        self.previous_alphabets: Optional[Tuple[List[int], List[int]]] = None
+        # product_states[rs_state] is the states of the safety game whose reactive system component is rs_state
+        self.product_states: Dict[int, Set[int]] = {}
+        # The number of the states of the safety game for the removed states of the reactive system
+        self.stale_states: int = 0
+
+    def solve(self, reactive_system: ReactiveSystem) -> \
+            Tuple[SafetyGameFromReactiveSystem, Set[int], Dict[int, List[int]]]:
+        """
+        Construct and solve the safety game for the given reactive system
+        Args:
+            reactive_system: ReactiveSystem : the learned reactive system
+        Returns:
+            The triple of the safety game, the set of the winning states, and the winning strategy
+        """
+        changed_rs_states = self._changed_states(reactive_system)
+        if changed_rs_states is None or len(self.safe_states) == 0 or \
+                len(changed_rs_states) > self.max_changed_ratio * max(len(self.previous_transitions), 1) or \
+                self.stale_states > self.max_stale_ratio * len(self.safety_game.state_mapper):
+            self._construct(reactive_system)
+        else:
+            self._update(reactive_system, changed_rs_states)
+        self._take_snapshot(reactive_system)
+        return self.safety_game, self.win_set, self.win_strategy
+
+    def _changed_states(self, reactive_system: ReactiveSystem) -> Optional[Set[int]]:
+        """
+        Returns the states of the reactive system whose transitions or outputs are different from the previous
+        reactive system, or None if the reactive systems are not comparable.
+        """
+        if self.safety_game is None or self.previous_initial_state != reactive_system.getInitialState() or \
+                self.previous_alphabets != (reactive_system.getPlayer1Alphabet(),
+                                            reactive_system.getPlayer2Alphabet()):
+            return None
+        changed: Set[int] = set()
+        for rs_state in set(self.previous_transitions.keys()) | set(reactive_system.transitions.keys()):
+            if self.previous_transitions.get(rs_state) != reactive_system.transitions.get(rs_state) or \
+                    self.previous_output.get(rs_state) != reactive_system.output.get(rs_state):
+                changed.add(rs_state)
+        return changed
+
+    def _take_snapshot(self, reactive_system: ReactiveSystem) -> None:
+        self.previous_transitions = {state: dict(transitions)
+                                     for state, transitions in reactive_system.transitions.items()}
+        self.previous_output = {state: dict(output) for state, output in reactive_system.output.items()}
+        self.previous_initial_state = reactive_system.getInitialState()
+        self.previous_alphabets = (list(reactive_system.getPlayer1Alphabet()),
+                                   list(reactive_system.getPlayer2Alphabet()))
+
+    def _construct(self, reactive_system: ReactiveSystem) -> None:
+        """
+        Construct and solve the safety game from scratch
+        """
+        LOGGER.debug('Construct the safety game from scratch')
+        self.safety_game = SafetyGame.fromReactiveSystemAndDFA(reactive_system, self.dfa, self.evaluate_output)
+        self.win_set, self.win_strategy = solve_game(self.safety_game, self.solver)
+        self.safe_states = set(self.safety_game.safeStates)
+        self.product_states = {}
+        for state, (rs_state, _) in self.safety_game.inverse_state_mapper.items():
+            self.product_states.setdefault(rs_state, set()).add(state)
+        self.stale_states = 0
+
+    def _update(self, reactive_system: ReactiveSystem, changed_rs_states: Set[int]) -> None:
+        """
+        Update the safety game and its solution for the changed states of the reactive system
+        """
+        game = self.safety_game
+        # The product states with changed outgoing transitions
+        changed_states: Set[int] = set()
+        for rs_state in changed_rs_states:
+            changed_states |= self.product_states.get(rs_state, set())
+            if rs_state not in reactive_system.transitions:
+                self.stale_states += len(self.product_states.get(rs_state, set()))
+        LOGGER.debug(f'Update {len(changed_states)} states of the safety game incrementally')
+        new_states: List[int] = list(changed_states)
+        while len(new_states) > 0:
+            new_state = new_states.pop()
+            (rs_state, dfa_state) = game.inverse_state_mapper[new_state]
+            for (p1_action, p2_action) in itertools.product(game.p1_alphabet, game.p2_alphabet):
+                game.remove_transition(new_state, p1_action, p2_action)
+                try:
+                    rs_output: int = reactive_system.getOutput(rs_state, p1_action, p2_action)
+                    rs_next: int = reactive_system.getSuccessor(rs_state, p1_action, p2_action)
+                except KeyError:
+                    # Transition to sink state (unexplored)
+                    game.add_transition(new_state, p1_action, p2_action, game.unexplored_state)
+                    continue
+                dfa_successor: int = self.dfa.getSuccessor(dfa_state, rs_output)
+                if (rs_next, dfa_successor) not in game.state_mapper:
+                    # when the target state is new
+                    added_state = self._add_state(rs_next, dfa_successor)
+                    changed_states.add(added_state)
+                    new_states.append(added_state)
+                game.add_transition(new_state, p1_action, p2_action, game.state_mapper[rs_next, dfa_successor])
+
+        cone = self._backward_cone(changed_states)
+        LOGGER.debug(f'Re-solve {len(cone)} states of the safety game')
+        self.win_set -= cone
+        for state in cone:
+            self.win_strategy.pop(state, None)
+        cone_win_set, cone_win_strategy = self._solve_cone(cone)
+        self.win_set |= cone_win_set
+        self.win_strategy.update(cone_win_strategy)
+
+    def _add_state(self, rs_state: int, dfa_state: int) -> int:
+        game = self.safety_game
+        added_state = len(game.state_mapper) + 1
+        game.state_mapper[rs_state, dfa_state] = added_state
+        game.inverse_state_mapper[added_state] = (rs_state, dfa_state)
+        self.product_states.setdefault(rs_state, set()).add(added_state)
+        if self.dfa.isSafe(dfa_state):
+            game.addSafeState(added_state)
+            self.safe_states.add(added_state)
+        return added_state
+
+    def _backward_cone(self, states: Set[int]) -> Set[int]:
+        """
+        Returns the states that can reach the given states
+        """
+        game = self.safety_game
+        cone = set(states)
+        to_visit = list(states)
+        while len(to_visit) > 0:
+            target = to_visit.pop()
+            for (p1_action, p2_action) in itertools.product(game.p1_alphabet, game.p2_alphabet):
+                for source in game.getPredecessors(target, p1_action, p2_action):
+                    if source not in cone:
+                        cone.add(source)
+                        to_visit.append(source)
+        return cone
+
+    def _solve_cone(self, cone: Set[int]) -> Tuple[Set[int], Dict[int, List[int]]]:
+        """
+        Solve the safety game restricted to the cone by the backward propagation as in solve_game_worklist.
+        The winning status of the states outside the cone is given by self.win_set.
+        """
+        game = self.safety_game
+        action_1 = game.getPlayer1Alphabet()
+        action_2 = game.getPlayer2Alphabet()
+        cone_win_set: Set[int] = cone & self.safe_states
+
+        def is_bad(target: int) -> bool:
+            return target not in cone_win_set if target in cone else target not in self.win_set
+
+        bad_successors: Dict[Tuple[int, int], int] = {}
+        safe_actions: Dict[int, int] = {}
+        losing_states: List[int] = []
+        for q in cone_win_set:
+            safe_actions[q] = 0
+            for a in action_1:
+                if (q, a) in game.power_transitions:
+                    bad_successors[q, a] = sum(1 for target in game.power_transitions[q, a] if is_bad(target))
+                    if bad_successors[q, a] == 0:
+                        safe_actions[q] += 1
+            if safe_actions[q] == 0:
+                losing_states.append(q)
+        for q in losing_states:
+            cone_win_set.discard(q)
+
+        while len(losing_states) > 0:
+            target = losing_states.pop()
+            for a in action_1:
+                sources: Set[int] = set()
+                for b in action_2:
+                    sources.update(game.getPredecessors(target, a, b))
+                for q in sources:
+                    if q not in cone_win_set:
+                        continue
+                    bad_successors[q, a] += 1
+                    if bad_successors[q, a] == 1:
+                        safe_actions[q] -= 1
+                        if safe_actions[q] == 0:
+                            cone_win_set.discard(q)
+                            losing_states.append(q)
+
+        cone_win_strategy: Dict[int, List[int]] = {q: [a for a in action_1 if bad_successors.get((q, a)) == 0]
+                                                   for q in cone_win_set}
+        return cone_win_set, cone_win_strategy
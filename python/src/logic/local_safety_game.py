@@ -0,0 +1,229 @@
+import itertools
+from logging import getLogger
+from typing import List, Dict, Tuple, Set, Callable, Union
+
+from src.model import DFA, ReactiveSystem, CompiledDFA
+from src.model.compiled_dfa import compile_dfa
+from src.model.safety_game import SafetyGameFromReactiveSystem
+
+__author__ = "Masaki Waga <masakiwaga@gmail.com>"
+__status__ = "experimental"
+__version__ = "0.0.1"
+__date__ = "18 October 2026"
+
+LOGGER = getLogger(__name__)
+
+
+class LocalSafetyGame(SafetyGameFromReactiveSystem):
+    """
+    The safety game of a reactive system and a DFA constructed on the fly while it is solved.
+
+    The product states are expanded starting from the initial state, and each expanded state is solved by the
+    backward propagation of the losing states as in solve_game_worklist. We do not expand the following states.
+      - The unsafe states. They are losing.
+      - The irrelevant states. A state is irrelevant if, for each transition (q, a, b) to it, q is losing or the action
+        a is already known to be losing at q. The status of such a state does not change the winning states found so
+        far or their strategies.
+    The exploration stops once the initial state is known to be losing. The remaining states are explored only if
+    the local solving is resumed.
+
+    The winning states and the winning strategy are the same as those of the eagerly constructed safety game for all
+    the expanded states. When the game moves to an unexpanded state by getSuccessor, e.g., by a player 1 action
+    outside the winning strategy, the local solving is resumed from that state and the results are added to win_set
+    and win_strategy in place.
+
+    Usage:
+      1. make an instance game = LocalSafetyGame(reactive_system, dfa, evaluate_output)
+      2. run game.solve() to obtain the winning states and the winning strategy
+    """
+    # The winning strategy grows in place when the local solving is resumed, so it must not be compiled into tables
+    solved_lazily: bool = True
+
+    def __init__(self, reactive_system: ReactiveSystem, dfa: Union[DFA, CompiledDFA],
+                 evaluate_output: Callable[[int], Callable[[str], bool]]) -> None:
+        """
+        The constructor
+        Args:
+            reactive_system: ReactiveSystem : the given ReactiveSystem
+            dfa: Union[DFA, CompiledDFA] : the given DFA. It is compiled unless it is already compiled.
+            evaluate_output: Callable[[str], Callable[[str], bool]] : given a string `output` for an output of the reactive system and an string `AP` representing an atomic proposition, evaluate_output(output)(AP) is returns if `AP` is satisfied in `output`
+        """
+        super(LocalSafetyGame, self).__init__(reactive_system.getPlayer1Alphabet(),
+                                              reactive_system.getPlayer2Alphabet())
+        self.reactive_system = reactive_system
+        self.dfa = compile_dfa(dfa, evaluate_output)
+        self.evaluate_output = evaluate_output
+        self.state_mapper = {}
+        self.inverse_state_mapper = {}
+        self.expanded: Set[int] = set()
+        self.losing: Set[int] = set()
+        self.win_set: Set[int] = set()
+        self.win_strategy: Dict[int, List[int]] = {}
+        # successors[q, a] is the set of the successors of the expanded state q by the player 1 action a
+        self.successors: Dict[Tuple[int, int], Set[int]] = {}
+        # bad_successors[q, a] is the number of the losing states in successors[q, a]
+        self.bad_successors: Dict[Tuple[int, int], int] = {}
+        # safe_actions[q] is the number of the actions a such that bad_successors[q, a] == 0
+        self.safe_actions: Dict[int, int] = {}
+        # The states to be expanded and the expanded states that are not known to be winning or losing
+        self.to_visit: List[int] = []
+        self.undecided: List[int] = []
+        self.setInitialState(self._add_state(reactive_system.getInitialState(), dfa.getInitialState()))
+        # The unexplored state has self loop with all transitions (anything may happen). We regard it as safe unless
+        # the game is already losing at the initial state.
+        self.safeStates = [self.initial_state] if self.isSafe(self.initial_state) else []
+        if len(self.safeStates) > 0:
+            self.safeStates.append(self.unexplored_state)
+            self.win_set.add(self.unexplored_state)
+            self.win_strategy[self.unexplored_state] = list(self.p1_alphabet)
+        else:
+            self.losing.add(self.unexplored_state)
+        self.expanded.add(self.unexplored_state)
+
+    def _add_state(self, reactive_system_state: int, dfa_state: int) -> int:
+        added_state = len(self.state_mapper) + 1
+        self.state_mapper[reactive_system_state, dfa_state] = added_state
+        self.inverse_state_mapper[added_state] = (reactive_system_state, dfa_state)
+        return added_state
+
+    def isSafe(self, state: int) -> bool:
+        if state in self.inverse_state_mapper:
+            return self.dfa.isSafe(self.inverse_state_mapper[state][1])
+        return state in self.safeStates
+
+    def expand(self, state: int) -> List[int]:
+        """
+        Add the outgoing transitions of the given state
+        Args:
+            state: int : the expanded state
+        Returns:
+            The list of the successors of the given state
+        """
+        (rs_state, dfa_state) = self.inverse_state_mapper[state]
+        successors: List[int] = []
+        for (p1_action, p2_action) in itertools.product(self.p1_alphabet, self.p2_alphabet):
+            try:
+                rs_output: int = self.reactive_system.getOutput(rs_state, p1_action, p2_action)
+                rs_next: int = self.reactive_system.getSuccessor(rs_state, p1_action, p2_action)
+            except KeyError:
+                # Transition to sink state (unexplored)
+                self.add_transition(state, p1_action, p2_action, self.unexplored_state)
+                successors.append(self.unexplored_state)
+                continue
+            dfa_successor: int = self.dfa.getSuccessor(dfa_state, rs_output)
+            if (rs_next, dfa_successor) in self.state_mapper:
+                next_state = self.state_mapper[rs_next, dfa_successor]
+            else:
+                next_state = self._add_state(rs_next, dfa_successor)
+                if self.isSafe(next_state):
+                    self.safeStates.append(next_state)
+            self.add_transition(state, p1_action, p2_action, next_state)
+            successors.append(next_state)
+        self.expanded.add(state)
+        return successors
+
+    def _set_losing(self, state: int) -> None:
+        """
+        Mark the state as losing and propagate it backward
+        """
+        losing_states = [state]
+        self.losing.add(state)
+        while len(losing_states) > 0:
+            target = losing_states.pop()
+            for a in self.p1_alphabet:
+                sources: Set[int] = set()
+                for b in self.p2_alphabet:
+                    sources.update(self.getPredecessors(target, a, b))
+                for q in sources:
+                    if q in self.losing or (q, a) not in self.bad_successors or target not in self.successors[q, a]:
+                        continue
+                    self.bad_successors[q, a] += 1
+                    if self.bad_successors[q, a] == 1:
+                        self.safe_actions[q] -= 1
+                        if self.safe_actions[q] == 0:
+                            self.losing.add(q)
+                            losing_states.append(q)
+
+    def _is_relevant(self, state: int) -> bool:
+        """
+        Returns if there is a transition (q, a, b) to the state such that neither q nor a is known to be losing
+        """
+        for a in self.p1_alphabet:
+            for b in self.p2_alphabet:
+                for q in self.getPredecessors(state, a, b):
+                    if q not in self.losing and self.bad_successors.get((q, a)) == 0:
+                        return True
+        return False
+
+    def _expand_and_count(self, state: int) -> None:
+        """
+        Expand the state and initialize its counters
+        """
+        self.expand(state)
+        self.safe_actions[state] = 0
+        for a in self.p1_alphabet:
+            targets = {self.transitions[state, a, b] for b in self.p2_alphabet}
+            self.successors[state, a] = targets
+            self.bad_successors[state, a] = sum(1 for target in targets if target in self.losing)
+            if self.bad_successors[state, a] == 0:
+                self.safe_actions[state] += 1
+
+    def is_decided(self, state: int) -> bool:
+        return state in self.win_set or state in self.losing
+
+    def solve(self, root: int = None) -> Tuple[Set[int], Dict[int, List[int]]]:
+        """
+        Explore and solve the safety game from the given root state, which is the initial state by default.
+        The exploration stops when the root state is known to be losing. The remaining states are explored when the
+        local solving is resumed.
+        Returns:
+            The pair of the set of the winning states and the winning strategy. They are updated in place when the
+            local solving is resumed.
+        """
+        if root is None:
+            root = self.initial_state
+        self.to_visit.append(root)
+        while len(self.to_visit) > 0 and root not in self.losing:
+            state = self.to_visit.pop()
+            if state in self.expanded or state in self.losing:
+                continue
+            if not self.isSafe(state):
+                self._set_losing(state)
+                continue
+            if state != root and not self._is_relevant(state):
+                continue
+            self._expand_and_count(state)
+            self.undecided.append(state)
+            if self.safe_actions[state] == 0:
+                self._set_losing(state)
+            else:
+                # The successors by the actions that are not known to be losing are relevant.
+                for a in self.p1_alphabet:
+                    if self.bad_successors[state, a] == 0:
+                        self.to_visit.extend(target for target in self.successors[state, a]
+                                             if target not in self.expanded)
+        if len(self.to_visit) == 0:
+            # Each undecided state that is not losing is winning because all the successors by the actions that are
+            # not known to be losing are expanded.
+            for state in self.undecided:
+                if state not in self.losing:
+                    self.win_set.add(state)
+                    self.win_strategy[state] = [a for a in self.p1_alphabet if self.bad_successors[state, a] == 0]
+            self.undecided.clear()
+        LOGGER.debug(f'{len(self.expanded)} states are expanded in the local safety game')
+        return self.win_set, self.win_strategy
+
+    def hasSuccessor(self, src: int, player1_action: int, player2_action: int) -> bool:
+        if src in self.inverse_state_mapper and src not in self.expanded:
+            self.expand(src)
+        return super(LocalSafetyGame, self).hasSuccessor(src, player1_action, player2_action)
+
+    def getSuccessor(self, src: int, player1_action: int, player2_action: int) -> int:
+        if src in self.inverse_state_mapper and src not in self.expanded:
+            self.expand(src)
+        target = super(LocalSafetyGame, self).getSuccessor(src, player1_action, player2_action)
+        if not self.is_decided(target):
+            # We resume the local solving from the target
+            self.solve(target)
+        return target
+
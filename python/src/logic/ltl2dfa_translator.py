@@ -1,6 +1,8 @@
-from typing import List, Tuple, Dict, Set
+from typing import List, Tuple, Dict, Set, Optional
+import pyeda
 import spot
 from src.model import DFA
+from src.logic.dfa_cache import DFACache, DEFAULT_DFA_CACHE
 from pyeda.inter import *
 from pyeda.boolalg.expr import * 
 from pyeda.boolalg.expr import _One, _Zero
@@ -10,6 +12,9 @@ __status__ = "experimental"
 __version__ = "0.0.1"
 __date__    = "26 September 2020"
 
+# The translation result depends on the versions of Spot and PyEDA. Increment __version__ when the translation changes.
+TRANSLATOR_VERSION = f'{__version__}-spot{spot.version()}-pyeda{getattr(pyeda, "__version__", "unknown")}'
+
 def is_safety(formula: str) -> bool:
     """Returns a bool to indicate whether a LTL formula is a safety formula."""
     return spot.formula(formula).is_syntactic_safety()
@@ -58,8 +63,24 @@ def _expr2dict(node: Expression) -> List[Dict[str, bool]]:
     raise Exception("Cannot deal with node " + str(node))
 
 
+def ltl_to_dfa_spot(formula: str, cache: Optional[DFACache] = DEFAULT_DFA_CACHE) -> DFA:
+    """
+    Translate an LTL formula to a DFA. The result is cached in memory and on disk (see src.logic.dfa_cache).
+
+    Args:
+        formula: str : the LTL formula
+        cache: Optional[DFACache] : the cache of the translation results. If it is None, the formula is always
+          translated.
+    Returns:
+        A new DFA for the formula
+    """
+    if cache is None:
+        return _translate_ltl_to_dfa_spot(formula)
+    return cache.get(formula, TRANSLATOR_VERSION, _translate_ltl_to_dfa_spot)
+
+
 # Info: check here https://spot.lrde.epita.fr/tut21.html#orgc69204a
-def ltl_to_dfa_spot(formula: str) -> DFA:
+def _translate_ltl_to_dfa_spot(formula: str) -> DFA:
     aut = spot.translate(formula, 'monitor', 'det') 
     bdict = aut.get_dict()
     
@@ -2,9 +2,7 @@ from copy import deepcopy
 from logging import getLogger
 from typing import Set, List, Dict, Tuple
 
-from py4j.protocol import Py4JJavaError
-
-from src.exceptions.shielding_exceptions import UnknownOutputError
+from src.exceptions.shielding_exceptions import UnknownOutputError, UnknownStateError
 from src.model import MealyMachine
 
 __author__ = "Masaki Waga <masakiwaga@gmail.com>"
@@ -40,6 +38,6 @@ def make_transition_cover(mealy: MealyMachine) -> List[Tuple[List[int], int]]:
                 if successor not in visited_states:
                     accessors[successor] = tmp
                     new_states.append(successor)
-            except (Py4JJavaError, UnknownOutputError):
+            except (UnknownOutputError, UnknownStateError):
                 pass
     return result
@@ -1,11 +1,12 @@
 import threading
-from copy import deepcopy
 from logging import getLogger
-from typing import List, Tuple, Union
+from typing import List, Tuple, Union, Optional
 
+import numpy as np
 from py4j.java_gateway import JavaGateway
 
-from src.model import MealyMachine
+from src.logic.gateway_pool import GatewayPool
+from src.model import MealyMachine, SampleTrie
 
 __author__ = "Masaki Waga <masakiwaga@gmail.com>"
 __status__ = "experimental"
@@ -15,20 +16,71 @@ __date__ = "11 August 2020"
 LOGGER = getLogger(__name__)
 
 
+def pack_samples(samples: Union[List[Tuple[str, str]], List[Tuple[List[int], int]]]) -> Tuple[bytes, bytes, bytes]:
+    """
+    Pack the samples into big-endian 32-bit integers so that they are sent to Java in one Py4J call.
+    See org.group_mmm.PackedSamples for the format.
+
+    :param samples: the list of the pairs of an input word and an output character
+    :return: the triple of the packed input words, the offsets of the input words, and the outputs
+    """
+    offsets = np.zeros(len(samples) + 1, dtype='>i4')
+    outputs = np.empty(len(samples), dtype='>i4')
+    flat_inputs: List[int] = []
+    for index, (input_sample, output_sample) in enumerate(samples):
+        if type(input_sample) == str:
+            flat_inputs.extend(map(ord, input_sample))
+        else:
+            flat_inputs.extend(map(int, input_sample))
+        offsets[index + 1] = len(flat_inputs)
+        outputs[index] = ord(output_sample) if type(output_sample) == str else int(output_sample)
+    return np.asarray(flat_inputs, dtype='>i4').tobytes(), offsets.tobytes(), outputs.tobytes()
+
+
+def pack_words(words: List[Tuple[List[int], List[int]]]) -> Tuple[bytes, bytes, bytes, bytes]:
+    """
+    Pack the input words with the outputs of their suffixes, e.g., the content of SampleTrie, into big-endian 32-bit
+    integers so that they are sent to Java in one Py4J call. See org.group_mmm.PackedSamples.decodeWords for the format.
+
+    :param words: the list of the pairs of an input word and the outputs of its suffix
+    :return: the quadruple of the packed input words, their offsets, the packed output words, and their offsets
+    """
+    offsets = np.zeros(len(words) + 1, dtype='>i4')
+    offsets[1:] = np.cumsum([len(input_word) for input_word, _ in words])
+    output_offsets = np.zeros(len(words) + 1, dtype='>i4')
+    output_offsets[1:] = np.cumsum([len(output_word) for _, output_word in words])
+    flat_inputs = [int(c) for input_word, _ in words for c in input_word]
+    flat_outputs = [int(c) for _, output_word in words for c in output_word]
+    return np.asarray(flat_inputs, dtype='>i4').tobytes(), offsets.tobytes(), \
+        np.asarray(flat_outputs, dtype='>i4').tobytes(), output_offsets.tobytes()
+
+
 class PassiveLearning:
     min_depth: int
     skip_mealy_size: int
 
-    def __init__(self, gateway: JavaGateway, alphabet_start: Union[str, int], alphabet_end: Union[str, int],
-                 min_depth: int = 0, skip_mealy_size: int = 0) -> None:
+    def __init__(self, gateway: Union[JavaGateway, GatewayPool],
+                 alphabet_start: Union[str, int], alphabet_end: Union[str, int],
+                 min_depth: int = 0, skip_mealy_size: int = 0, bulk_transfer: bool = True,
+                 incremental: bool = False, parallelism: Optional[int] = None,
+                 deterministic: bool = False) -> None:
         """
         The class for passive Mealy machine learning using LearnLib (https://learnlib.de/projects/automatalib/).
 
-        :param gateway: JavaGateway : The java gateway of py4j
+        :param gateway: Union[JavaGateway, GatewayPool] : The java gateway of py4j, or the pool to lease a gateway
+            from. A leased gateway is returned to the pool by close().
         :param alphabet_start: Union[str, int] : The beginning character of the input alphabet of the Mealy machine
         :param alphabet_end: Union[str, int] : The end character of the input alphabet of the Mealy machine
         :param skip_mealy_size: int : We do not merge the states if the Mealy machine is smaller than this
         :param min_depth: int : We do not merge the states if there is not common children of at least this depth
+        :param bulk_transfer: bool : Send all the pending samples to Java in one Py4J call. If it is False, each
+            sample is sent letter by letter.
+        :param incremental: bool : Reuse the last Mealy machine if all the samples added after it are consistent with
+            it. Otherwise, the Mealy machine is learned from scratch.
+        :param parallelism: Optional[int] : The number of the threads of this learner to search for the states to merge.
+            If it is 1, the search is sequential. If it is None, the search is parallel on the common thread pool of
+            the JVM, which is shared by all the learners on the same gateway.
+        :param deterministic: bool : Make the merges reproducible even if the search is parallel
 
         .. NOTE::
             This class assumes that the LearnLib JVM gateway is running. We can construct gateway by the following.
@@ -37,21 +89,27 @@ class PassiveLearning:
             The constructed alphabet includes both alphabet_start and alphabet_end. For example, if alphabet_start = 1
             and alphabet_end = 3, the constructed alphabet is [1, 2, 3].
         """
-        self.gateway = gateway
+        self.gateway_pool: Optional[GatewayPool] = gateway if isinstance(gateway, GatewayPool) else None
+        self.gateway: JavaGateway = self.gateway_pool.lease() if self.gateway_pool is not None else gateway
         self.alphabet = self._construct_alphabet(alphabet_start, alphabet_end)
         self.__min_depth = min_depth
         self.skip_mealy_size = skip_mealy_size
+        self.bulk_transfer = bulk_transfer
+        self.incremental = incremental
+        assert parallelism is None or parallelism > 0, 'The parallelism must be positive'
+        self.parallelism = parallelism
+        self.deterministic = deterministic
+        # The Mealy machine returned by the last computeMealy. It is reused in the incremental mode.
+        self.last_mealy: Optional[MealyMachine] = None
+        # If cancel is called in the running computeMealy and if the state merging is running in Java.
+        # They are accessed under the lock.
+        self.cancel_requested: bool = False
+        self.merging: bool = False
         # Lock for the mutual exclusion in the access to Java
         self.lock = threading.Lock()
-        # List of the samples that is not added to the learner due to the lock
-        self.sample_pool = []
-        if self.min_depth <= 0:
-            if self.min_depth < 0:
-                LOGGER.warning(f"negative min_depth is given. We let min_depth = 0: min_depth = {self.min_depth}")
-            self.learner = self.gateway.jvm.de.learnlib.algorithms.rpni.BlueFringeRPNIMealy(self.alphabet)
-        else:
-            self.learner = self.gateway.jvm.org.group_mmm.StrongBlueFringeRPNIMealy(self.alphabet, self.min_depth,
-                                                                                    self.skip_mealy_size)
+        # Trie of the samples that are not added to the learner yet. The same prefixes are stored only once.
+        self.sample_pool = SampleTrie()
+        self.learner = self._construct_learner()
 
     def reset(self, alphabet_start: Union[str, int], alphabet_end: Union[str, int]) -> None:
         """
@@ -61,13 +119,35 @@ class PassiveLearning:
         :param alphabet_end: Union[str, int] : The end character of the input alphabet of the Mealy machine
         """
         self.alphabet = self._construct_alphabet(alphabet_start, alphabet_end)
-        if self.min_depth <= 0:
-            if self.min_depth < 0:
-                LOGGER.warning(f"negative min_depth is given. We let min_depth = 0: min_depth = {self.min_depth}")
-            self.learner = self.gateway.jvm.de.learnlib.algorithms.rpni.BlueFringeRPNIMealy(self.alphabet)
-        else:
-            self.learner = self.gateway.jvm.org.group_mmm.StrongBlueFringeRPNIMealy(self.alphabet, self.min_depth,
-                                                                                    self.skip_mealy_size)
+        self.learner.shutdown()
+        self.learner = self._construct_learner()
+        self.last_mealy = None
+
+    def close(self) -> None:
+        """
+        Shut down the threads of the learner and return the leased gateway to the pool. The learner must not be used
+        after this.
+        """
+        self.learner.shutdown()
+        if self.gateway_pool is not None:
+            self.gateway_pool.release(self.gateway)
+            self.gateway_pool = None
+
+    def _construct_learner(self):
+        """
+        Construct the learner in Java. We use StrongBlueFringeRPNIMealy even if min_depth is 0, where it behaves as
+        BlueFringeRPNIMealy, because it stores the samples in a trie without duplicating the common prefixes.
+        """
+        if self.min_depth < 0:
+            LOGGER.warning(f"negative min_depth is given. We let min_depth = 0: min_depth = {self.min_depth}")
+        learner = self.gateway.jvm.org.group_mmm.StrongBlueFringeRPNIMealy(self.alphabet, max(self.min_depth, 0),
+                                                                           self.skip_mealy_size)
+        if self.incremental:
+            learner.setIncremental(True)
+        if self.parallelism is not None:
+            learner.setParallelism(self.parallelism)
+        learner.setDeterministic(self.deterministic)
+        return learner
 
     def _construct_alphabet(self, alphabet_start: Union[str, int], alphabet_end: Union[str, int]):
         assert type(alphabet_start) == type(alphabet_end), 'Inconsistent start and end type of the alphabet'
@@ -84,9 +164,21 @@ class PassiveLearning:
         :param input_word: str : an input word
         :param output_char: str : the expected output word for input_word
         """
-        self.lock.acquire()
-        self.sample_pool.append((input_word, output_char))
-        self.lock.release()
+        with self.lock:
+            self.sample_pool.addSample(input_word, output_char)
+
+    def addTrace(self, input_word: List[int], output_word: List[int]) -> None:
+        """
+        Add a trace, i.e., an input word and the output for each of its letters. This is equivalent to adding all the
+        prefixes of the trace by addSample, but the trace is sent to Java and inserted into the PTA in the time linear
+        to its length.
+
+        :param input_word: List[int] : an input word
+        :param output_word: List[int] : the output for each letter of input_word
+        """
+        assert len(input_word) == len(output_word), 'The input and the output of a trace must have the same length'
+        with self.lock:
+            self.sample_pool.addTrace(input_word, output_word)
 
     def addSamples(self, training_data: Union[List[Tuple[str, str]], List[Tuple[List[int], int]]]) -> None:
         """
@@ -99,26 +191,112 @@ class PassiveLearning:
             self.addSample(inputWord, outputChar)
 
     def getSamples(self) -> List[Tuple[List[int], int]]:
-        if self.min_depth <= 0:
-            raise NotImplementedError('getSamples is implemented only for StrongBlueFringeRPNIMealy')
-        return [(list(java_pair.getFirst()), java_pair.getSecond()[0]) for java_pair in self.learner.getSamples()]
+        """
+        Returns the samples added to the learner without duplication. The samples not used in computeMealy yet are not
+        included.
+        """
+        samples = SampleTrie()
+        for java_pair in self.learner.getSamples():
+            samples.addWord(list(java_pair.getFirst()), list(java_pair.getSecond()))
+        return list(samples.samples())
 
-    def computeMealy(self) -> MealyMachine:
+    def getNumSamples(self) -> int:
+        """
+        Returns the number of the added samples including the duplicated ones. A trace is counted as one sample.
+        """
+        with self.lock:
+            num_pending_samples = self.sample_pool.getNumSamples()
+        return num_pending_samples + self.learner.getNumSamples()
+
+    def getMemoryFootprint(self) -> int:
+        """
+        Returns the approximated memory footprint of the samples in Python and Java in bytes
+        """
+        with self.lock:
+            pending_footprint = self.sample_pool.getMemoryFootprint()
+        return pending_footprint + self.learner.getSampleMemoryFootprint()
+
+    def computeMealy(self, timeout: Optional[float] = None) -> MealyMachine:
         """
         Constructs a Mealy machine from the current training data
         Warning: Given the same input, the computed mealy machine might be different, because the construction of the
         mealy machine is done in parallel, which may produce different results. To make the result deterministic, the
-        parameter deterministic shall be True. However, this may impact the performance of the algorithm.
+        parameter deterministic of the constructor shall be True. However, this may impact the performance of the
+        algorithm.
         For more info check: https://github.com/LearnLib/learnlib/blob/develop/algorithms/passive/rpni/src/main/java/de/learnlib/algorithms/rpni/AbstractBlueFringeRPNI.java
+        In the incremental mode, the new samples are checked against the last Mealy machine in Java, and if they are
+        all consistent, the last Mealy machine is returned without state merging nor exporting it from Java.
+        Args:
+            timeout: Optional[float] : The time limit of the state merging in seconds. When the time runs out, the
+              remaining states are not merged, i.e., the Mealy machine merged so far is returned. It is still
+              consistent with the training data but it may be larger than the one without the time limit.
         Returns:
             The constructed Mealy machine
         """
-        self.lock.acquire()
-        LOGGER.debug('started computeModel by LearnLib')
-        sample_pool = deepcopy(self.sample_pool)
-        self.sample_pool.clear()
-        self.lock.release()
-        for input_sample, output_sample in sample_pool:
+        with self.lock:
+            LOGGER.debug('started computeModel by LearnLib')
+            sample_pool, self.sample_pool = self.sample_pool, SampleTrie()
+            self.cancel_requested = False
+        if self.bulk_transfer:
+            self._send_words(list(sample_pool.words()))
+        else:
+            self._send_samples_per_letter(list(sample_pool.samples()))
+        if self.incremental and self.last_mealy is not None and self.learner.isUpToDate():
+            LOGGER.debug('the last Mealy machine is consistent with the new samples')
+            return self.last_mealy
+        with self.lock:
+            # If cancel is called while the samples are sent, we do not merge the states at all
+            if self.cancel_requested:
+                timeout = 0
+            self.merging = True
+        try:
+            if timeout is None:
+                model = self.learner.computeModel()
+            else:
+                model = self.learner.computeModel(max(int(timeout * 1000), 0))
+        finally:
+            with self.lock:
+                self.merging = False
+        if self.learner.isTruncated():
+            LOGGER.info('the state merging is stopped before it finishes')
+        mealy = MealyMachine(self.gateway, model)
+        self.last_mealy = mealy
+        return mealy
+
+    def cancel(self) -> None:
+        """
+        Stop the state merging of the running computeMealy. The running computeMealy returns the Mealy machine merged so
+        far. This is meant to be called from another thread and it does nothing if computeMealy is not running.
+        """
+        with self.lock:
+            self.cancel_requested = True
+            if self.merging:
+                self.learner.cancel()
+
+    def _send_samples(self, samples: Union[List[Tuple[str, str]], List[Tuple[List[int], int]]]) -> None:
+        """
+        Send the samples to the learner in one Py4J call
+        """
+        if len(samples) == 0:
+            return
+        inputs, offsets, outputs = pack_samples(samples)
+        self.gateway.jvm.org.group_mmm.PackedSamples.addTo(self.learner, inputs, offsets, outputs)
+
+    def _send_words(self, words: List[Tuple[List[int], List[int]]]) -> None:
+        """
+        Send the input words with the outputs of their suffixes to the learner in one Py4J call
+        """
+        if len(words) == 0:
+            return
+        inputs, offsets, outputs, output_offsets = pack_words(words)
+        self.gateway.jvm.org.group_mmm.PackedSamples.addWordsTo(self.learner, inputs, offsets, outputs,
+                                                                output_offsets)
+
+    def _send_samples_per_letter(self, samples: Union[List[Tuple[str, str]], List[Tuple[List[int], int]]]) -> None:
+        """
+        Send the samples to the learner letter by letter. This makes one Py4J call for each letter.
+        """
+        for input_sample, output_sample in samples:
             java_input_word = self.gateway.jvm.net.automatalib.words.Word.epsilon()
             if type(input_sample) == str:
                 for elem in input_sample:
@@ -132,8 +310,6 @@ class PassiveLearning:
                 java_output: int = int(output_sample)
             self.learner.addSample(java_input_word,
                                    self.gateway.jvm.net.automatalib.words.Word.fromLetter(java_output))
-        mealy = MealyMachine(self.gateway, self.learner.computeModel())
-        return mealy
 
     @property
     def min_depth(self) -> int:
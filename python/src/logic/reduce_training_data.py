@@ -2,11 +2,12 @@ from copy import deepcopy
 from logging import getLogger
 from typing import Set, List, Dict, Tuple, Optional, Generator
 
-from py4j.protocol import Py4JJavaError
+import numpy as np
 from tryalgo.partition_refinement import PartitionRefinement
 
-from src.exceptions.shielding_exceptions import UnknownOutputError
+from src.exceptions.shielding_exceptions import UnknownOutputError, UnknownStateError
 from src.model import MealyMachine
+from src.model.mealy_machine import UNDEFINED
 
 __author__ = "Masaki Waga <masakiwaga@gmail.com>"
 __status__ = "experimental"
@@ -29,16 +30,11 @@ class ReduceTrainingData:
         # This initialization works because list(range(len(mealy.getStates())) == list(mealy.getStates())
         self.partition = PartitionRefinement(len(self.mealy.getStates()))
         self.reversed_transitions = dict()
-        for source in self.mealy.getStates():
-            for action in self.mealy.getInputAlphabet():
-                try:
-                    target = self.mealy.getSuccessor(source, action)
-                    if (target, action) in self.reversed_transitions:
-                        self.reversed_transitions[target, action].add(source)
-                    else:
-                        self.reversed_transitions[target, action] = {source}
-                except (ValueError, Py4JJavaError, UnknownOutputError):
-                    pass
+        input_alphabet = self.mealy.getInputAlphabet()
+        sources, char_ids = np.nonzero(self.mealy.successors != UNDEFINED)
+        for source, char_id, target in zip(sources.tolist(), char_ids.tolist(),
+                                           self.mealy.successors[sources, char_ids].tolist()):
+            self.reversed_transitions.setdefault((target, input_alphabet[char_id]), set()).add(source)
 
     def filter_redundant_samples(self, samples: List[Tuple[List[int], int]]) -> \
             Generator[Tuple[List[int], int], None, None]:
@@ -50,7 +46,7 @@ class ReduceTrainingData:
                     target = self.mealy.getSuccessor(source, action)
                     enhanced_separation_sequences[source] += [[action] + separation_sequence for separation_sequence in
                                                               separation_sequences[target]]
-                except (ValueError, Py4JJavaError, UnknownOutputError):
+                except (ValueError, UnknownOutputError, UnknownStateError):
                     pass
         unvisited_successors: List[Set[int]] = [set() for _ in self.mealy.getStates()]
         for source in range(len(self.mealy.getStates())):
@@ -58,7 +54,7 @@ class ReduceTrainingData:
                 try:
                     self.mealy.getSuccessor(source, action)
                     unvisited_successors[source].add(action)
-                except (ValueError, Py4JJavaError, UnknownOutputError):
+                except (ValueError, UnknownOutputError, UnknownStateError):
                     pass
         for (input_word, output_char) in samples:
             state = self.mealy.getInitialState()
@@ -76,7 +72,7 @@ class ReduceTrainingData:
                         yield input_word, output_char
                 try:
                     state = self.mealy.getSuccessor(state, input_word[i])
-                except (ValueError, Py4JJavaError, UnknownOutputError):
+                except (ValueError, UnknownOutputError, UnknownStateError):
                     pass
 
     def make_separation_sequences(self) -> List[List[List[int]]]:
@@ -137,7 +133,7 @@ class ReduceTrainingData:
                 try:
                     if mealy.getOutput(s1, action) != mealy.getOutput(s2, action):
                         return action
-                except (ValueError, Py4JJavaError, UnknownOutputError):
+                except (ValueError, UnknownOutputError, UnknownStateError):
                     pass
             return None
 
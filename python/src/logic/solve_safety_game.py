@@ -1,11 +1,57 @@
-from typing import Dict, Set, List, Tuple
+from enum import Enum, auto
+from typing import Dict, Set, List, Tuple, Callable, Union
 
-from src.model import SafetyGame
+import numpy as np
+
+from src.logic.local_safety_game import LocalSafetyGame
+from src.model import SafetyGame, ArraySafetyGame, ReactiveSystem, DFA, CompiledDFA, StrategyTable
+from src.model.array_safety_game import UNDEFINED
+
+
+class SafetyGameSolver(Enum):
+    """
+    The enum to specify the algorithm to solve safety games
+    """
+    # Iterate the controllable predecessor until the fixpoint is reached
+    FIXPOINT = auto()
+    # Propagate the losing states backward using the counters of the bad successors
+    WORKLIST = auto()
+    # Iterate the controllable predecessor on the NumPy arrays of ArraySafetyGame
+    VECTORIZED = auto()
+    # Construct the safety game on the fly while solving it. See LocalSafetyGame.
+    ON_THE_FLY = auto()
+
+
+def solve_game(game, solver: SafetyGameSolver = SafetyGameSolver.FIXPOINT) -> Tuple[Set[int], Dict[int, List[int]]]:
+    """
+    Solve the given safety game
+
+    Args:
+        game: SafetyGame : the safety game to solve
+        solver: SafetyGameSolver : the algorithm to solve the game
+    Returns:
+        The pair of the set of the winning states and the winning strategy, i.e., the mapping from each winning state
+        to the list of the player 1 actions keeping the game in the winning states
+    """
+    if solver == SafetyGameSolver.FIXPOINT:
+        return solve_game_fixpoint(game)
+    elif solver == SafetyGameSolver.WORKLIST:
+        return solve_game_worklist(game)
+    elif solver == SafetyGameSolver.VECTORIZED:
+        return solve_game_vectorized(game)
+    elif solver == SafetyGameSolver.ON_THE_FLY:
+        if isinstance(game, LocalSafetyGame):
+            return game.solve()
+        # The game is already constructed. We solve it by the backward propagation, which is what LocalSafetyGame
+        # does during the construction.
+        return solve_game_worklist(game)
+    else:
+        raise ValueError(f'Unknown safety game solver: {solver}')
 
 
 # This is an easy function. We can add this in safety_game.py after discussing about types.
 
-def solve_game(game) -> Tuple[Set[int], Dict[int, List[int]]]:
+def solve_game_fixpoint(game) -> Tuple[Set[int], Dict[int, List[int]]]:
     #  Is transition_function a total function? I assume that it is
     #  http://www.lsv.fr/~dwb/graph-games-pi.pdf page 6
     #  https://pdfs.semanticscholar.org/a0cb/c864a25e0c2c8e90f483c31b59a7cf63d735.pdf page 36
@@ -38,6 +84,162 @@ def solve_game(game) -> Tuple[Set[int], Dict[int, List[int]]]:
     return win_set, win_strategy
 
 
+def solve_game_worklist(game) -> Tuple[Set[int], Dict[int, List[int]]]:
+    """
+    Solve the safety game by the backward propagation of the losing states.
+
+    For each pair (q, a) of a state and a player 1 action, we count the successors of (q, a) outside the current
+    winning states. A state is losing when no player 1 action has zero such successors. When a state becomes losing,
+    only its predecessors (obtained by game.reverseTransitions) are updated. Therefore, each transition is handled at
+    most twice: once when the counters are initialized and once when its target becomes losing.
+
+    Args:
+        game: SafetyGame : the safety game to solve
+    Returns:
+        The same pair as solve_game_fixpoint
+    """
+    win_set: Set[int] = set(game.safeStates)
+    action_1 = game.getPlayer1Alphabet()
+    action_2 = game.getPlayer2Alphabet()
+    # bad_successors[q, a] is the number of the distinct successors of (q, a) outside win_set
+    bad_successors: Dict[Tuple[int, int], int] = {}
+    # safe_actions[q] is the number of the actions a such that bad_successors[q, a] == 0
+    safe_actions: Dict[int, int] = {}
+    losing_states: List[int] = []
+    for q in win_set:
+        safe_actions[q] = 0
+        for a in action_1:
+            if (q, a) in game.power_transitions:
+                bad_successors[q, a] = len(game.power_transitions[q, a].difference(win_set))
+                if bad_successors[q, a] == 0:
+                    safe_actions[q] += 1
+        if safe_actions[q] == 0:
+            losing_states.append(q)
+    for q in losing_states:
+        win_set.discard(q)
+
+    while len(losing_states) > 0:
+        target = losing_states.pop()
+        for a in action_1:
+            # The predecessors are deduplicated over the player 2 actions because the counters are for the distinct
+            # successors
+            sources: Set[int] = set()
+            for b in action_2:
+                sources.update(game.getPredecessors(target, a, b))
+            for q in sources:
+                if q not in win_set:
+                    continue
+                bad_successors[q, a] += 1
+                if bad_successors[q, a] == 1:
+                    safe_actions[q] -= 1
+                    if safe_actions[q] == 0:
+                        win_set.discard(q)
+                        losing_states.append(q)
+
+    win_strategy: Dict[int, List[int]] = {q: [a for a in action_1 if bad_successors.get((q, a)) == 0]
+                                          for q in win_set}
+    return win_set, win_strategy
+
+
+def solve_game_vectorized(game) -> Tuple[Set[int], Dict[int, List[int]]]:
+    """
+    Solve the safety game by the fixpoint iteration on the successor table of ArraySafetyGame. Each iteration is
+    a constant number of NumPy operations over the whole table.
+
+    Args:
+        game: Union[SafetyGame, ArraySafetyGame] : the safety game to solve. A SafetyGame is converted to an
+          ArraySafetyGame first.
+    Returns:
+        The same pair as solve_game_fixpoint
+    """
+    if not isinstance(game, ArraySafetyGame):
+        game = ArraySafetyGame.fromSafetyGame(game)
+    win, good_actions = _solve_arrays(game)
+    win_states = np.flatnonzero(win)
+    p1_alphabet = game.getPlayer1Alphabet()
+    win_strategy: Dict[int, List[int]] = {
+        q: [p1_alphabet[i] for i in np.flatnonzero(actions).tolist()]
+        for q, actions in zip(win_states.tolist(), good_actions[win_states])}
+    return set(win_states.tolist()), win_strategy
+
+
+def _solve_arrays(game: ArraySafetyGame) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Returns the boolean mask of the winning states and the boolean mask of the player 1 actions keeping the game in
+    the winning states of shape [states, |P1|]
+    """
+    successors = game.successors
+    defined = successors != UNDEFINED
+    # available[q, i] is true iff there is a transition from q by the i-th action of player 1
+    available = defined.any(axis=2)
+    # We use the index 0 for the undefined transitions. They are ignored by the mask `defined`.
+    targets = np.where(defined, successors, 0)
+    win = game.safe.copy()
+    while True:
+        # good_actions[q, i] is true iff the i-th action of player 1 keeps the game in win at q
+        good_actions = available & (win[targets] | ~defined).all(axis=2)
+        pre_win = win & good_actions.any(axis=1)
+        if np.array_equal(win, pre_win):
+            break
+        win = pre_win
+    return win, good_actions
+
+
+def construct_and_solve_game(reactive_system: ReactiveSystem, dfa: Union[DFA, CompiledDFA],
+                             evaluate_output: Callable[[int], Callable[[str], bool]],
+                             solver: SafetyGameSolver = SafetyGameSolver.FIXPOINT) -> \
+        Tuple[Union[SafetyGame, ArraySafetyGame, LocalSafetyGame], Set[int], Dict[int, List[int]]]:
+    """
+    Construct the safety game from a reactive system and a DFA and solve it. The representation of the safety game
+    is chosen according to the solver: ArraySafetyGame for SafetyGameSolver.VECTORIZED, LocalSafetyGame for
+    SafetyGameSolver.ON_THE_FLY, and SafetyGame otherwise.
+
+    Args:
+        reactive_system: ReactiveSystem : the given ReactiveSystem
+        dfa: Union[DFA, CompiledDFA] : the given DFA. It is compiled unless it is already compiled.
+        evaluate_output: Callable[[int], Callable[[str], bool]] : the function to evaluate the output of the
+          reactive system
+        solver: SafetyGameSolver : the algorithm to solve the game
+    Returns:
+        The triple of the safety game, the set of the winning states, and the winning strategy
+    """
+    if solver == SafetyGameSolver.VECTORIZED:
+        safety_game = ArraySafetyGame.fromReactiveSystemAndDFA(reactive_system, dfa, evaluate_output)
+    elif solver == SafetyGameSolver.ON_THE_FLY:
+        safety_game = LocalSafetyGame(reactive_system, dfa, evaluate_output)
+    else:
+        safety_game = SafetyGame.fromReactiveSystemAndDFA(reactive_system, dfa, evaluate_output)
+    win_set, win_strategy = solve_game(safety_game, solver)
+    return safety_game, win_set, win_strategy
+
+
+def construct_and_solve_strategy_table(reactive_system: ReactiveSystem, dfas: List[CompiledDFA]) -> \
+        Tuple[int, ArraySafetyGame, StrategyTable]:
+    """
+    Construct and solve the safety games for the DFAs in order until the initial state is winning. The games are
+    represented by ArraySafetyGame and solved by SafetyGameSolver.VECTORIZED, and the strategy is represented by
+    StrategyTable. Since the result consists of a few NumPy arrays, this function is suitable to run in a worker
+    process. The state mappers of the game are dropped to keep the result compact.
+
+    Args:
+        reactive_system: ReactiveSystem : the given ReactiveSystem
+        dfas: List[CompiledDFA] : the DFAs in the order of the priority. Since the function to evaluate the outputs is
+          not picklable, they must be compiled for all the outputs of reactive_system in advance.
+    Returns:
+        The triple of the index of the first DFA whose game is winning (len(dfas) if there is no such DFA), the last
+        constructed safety game, and its winning strategy
+    """
+    index = 0
+    for dfa in dfas:
+        safety_game = ArraySafetyGame.fromReactiveSystemAndDFA(reactive_system, dfa, dfa.evaluate_output)
+        win, good_actions = _solve_arrays(safety_game)
+        if win[safety_game.getInitialState()]:
+            break
+        index += 1
+    safety_game.state_mapper, safety_game.inverse_state_mapper = {}, {}
+    return index, safety_game, StrategyTable(safety_game.getPlayer1Alphabet(), win, good_actions & win[:, np.newaxis])
+
+
 def test_dummy():
     # build a dummy game, for testing only
     dummy_actions_a = [1, 2]
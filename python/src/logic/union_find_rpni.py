@@ -0,0 +1,192 @@
+from collections import deque
+from logging import getLogger
+from typing import List, Tuple, Dict, Optional
+
+from src.logic.blue_fringe_rpni import BlueFringeRPNI
+from src.model import PTA, ReactiveSystem
+
+__author__ = "Masaki Waga <masakiwaga@gmail.com>"
+__status__ = "experimental"
+__version__ = "0.0.1"
+__date__ = "18 October 2026"
+
+LOGGER = getLogger(__name__)
+
+
+class ArrayPTAMerger:
+    """
+    The class for state merging of a PTA using union-find.
+
+    The states of the PTA are renumbered to 0, 1, ..., n - 1 and the transitions and the outputs are stored in lists
+    indexed by the states. A merged state is represented by the representative of its equivalence class, and the
+    transitions keep the original targets, which are resolved by find. Thus, a merge does not redirect the incoming
+    transitions. Every modification in a merge attempt is recorded in an undo log so that a failed attempt is rolled
+    back in the time linear to its own modifications.
+    """
+
+    def __init__(self, pta: PTA) -> None:
+        self.state_ids: List[int] = sorted(pta.getStates())
+        if pta.getInitialState() not in self.state_ids:
+            self.state_ids.insert(0, pta.getInitialState())
+        index: Dict[int, int] = {state: i for i, state in enumerate(self.state_ids)}
+        self.initial_state: int = index[pta.getInitialState()]
+        self.actions: List[Tuple[int, int]] = []
+        action_index: Dict[Tuple[int, int], int] = {}
+        # self.transitions[state][action] is the (possibly merged) target of the transition
+        self.transitions: List[Dict[int, int]] = [{} for _ in self.state_ids]
+        # self.outputs[state][action] is the output of the transition
+        self.outputs: List[Dict[int, int]] = [{} for _ in self.state_ids]
+        for source, transitions in pta.transitions.items():
+            for action, target in transitions.items():
+                if action not in action_index:
+                    action_index[action] = len(self.actions)
+                    self.actions.append(action)
+                self.transitions[index[source]][action_index[action]] = index[target]
+                self.outputs[index[source]][action_index[action]] = pta.output[source][action]
+        self.parent: List[int] = list(range(len(self.state_ids)))
+        # The states that got new transitions in the last successful merge
+        self.extended_states: List[int] = []
+        # The undo log of the current merge attempt. Each entry is (kind, index, key, value).
+        self._undo_log: List[Tuple[str, int, int, Optional[int]]] = []
+        self._in_attempt: bool = False
+
+    def find(self, state: int) -> int:
+        """
+        Returns the representative of the state with path compression
+        """
+        root = state
+        while self.parent[root] != root:
+            root = self.parent[root]
+        while self.parent[state] != root:
+            if self._in_attempt:
+                self._undo_log.append(('parent', state, 0, self.parent[state]))
+            self.parent[state], state = root, self.parent[state]
+        return root
+
+    def try_merge(self, red_state: int, blue_state: int, min_depth: int) -> bool:
+        """
+        Try to merge blue_state to red_state. The merge is applied if the outputs are consistent and the depth of the
+        matched subgraphs is at least min_depth. Otherwise, the merge is rolled back.
+        Args:
+            red_state: the representative of a red state
+            blue_state: the representative of a blue state
+            min_depth: the minimum depth of the matched subgraphs
+        Returns:
+            True if the merge is applied
+        """
+        self._in_attempt = True
+        depth = 1
+        # The pairs to be folded with their depth in the matched subgraphs
+        worklist: List[Tuple[int, int, int]] = [(red_state, blue_state, 1)]
+        while worklist:
+            red, blue, level = worklist.pop()
+            red, blue = self.find(red), self.find(blue)
+            if red == blue:
+                continue
+            depth = max(depth, level)
+            self._undo_log.append(('parent', blue, 0, blue))
+            self.parent[blue] = red
+            red_outputs = self.outputs[red]
+            for action, output in self.outputs[blue].items():
+                if action not in red_outputs:
+                    self._undo_log.append(('output', red, action, None))
+                    red_outputs[action] = output
+                elif red_outputs[action] != output:
+                    self._rollback()
+                    return False
+            red_transitions = self.transitions[red]
+            for action, target in self.transitions[blue].items():
+                if action in red_transitions:
+                    worklist.append((red_transitions[action], target, level + 1))
+                else:
+                    self._undo_log.append(('transition', red, action, None))
+                    red_transitions[action] = target
+        if depth < min_depth:
+            self._rollback()
+            return False
+        self.extended_states = [index for kind, index, _, _ in self._undo_log if kind == 'transition']
+        self._undo_log.clear()
+        self._in_attempt = False
+        return True
+
+    def _rollback(self) -> None:
+        for kind, index, key, value in reversed(self._undo_log):
+            if kind == 'parent':
+                self.parent[index] = value
+            elif kind == 'output':
+                del self.outputs[index][key]
+            else:
+                del self.transitions[index][key]
+        self._undo_log.clear()
+        self._in_attempt = False
+
+    def to_reactive_system(self, pta: PTA) -> ReactiveSystem:
+        """
+        Returns the reactive system of the merged states reachable from the initial state.
+        The states are named by the original states of the representatives.
+        """
+        reactive_system = ReactiveSystem(pta.player1Alphabet, pta.player2Alphabet, pta.outputAlphabet)
+        initial_state = self.find(self.initial_state)
+        reactive_system.setInitialState(self.state_ids[initial_state])
+        visited = {initial_state}
+        stack = [initial_state]
+        while stack:
+            source = stack.pop()
+            for action, target in self.transitions[source].items():
+                target = self.find(target)
+                player1_action, player2_action = self.actions[action]
+                reactive_system.addTransition(self.state_ids[source], player1_action, player2_action,
+                                              self.outputs[source][action], self.state_ids[target])
+                if target not in visited:
+                    visited.add(target)
+                    stack.append(target)
+        return reactive_system
+
+
+class UnionFindRPNI(BlueFringeRPNI):
+    """
+    The class for passive learning by state merging using union-find. This has the same interface as BlueFringeRPNI,
+    but it is a different learner rather than a drop-in replacement: the learned reactive system may differ as
+    explained below, and so may the shield learned with it.
+
+    As in BlueFringeRPNI, the states are visited from the root, and each of them is merged to the first red state such
+    that the merge is consistent and the depth of the matched subgraphs is at least min_depth. Otherwise, it becomes
+    red. The states are visited in the breadth-first order of the merged graph, i.e., the blue states are the
+    successors of the red states, and their subgraphs are still trees of the PTA. Thus, the representative of each
+    folded pair is the state on the red side and the red states are never merged away. Unlike BlueFringeRPNI, the PTA
+    is not copied, the incoming transitions are not redirected, and a failed merge attempt is rolled back by the undo
+    log. Since the consistency is checked in the merge itself, the outputs of the merged states are never overwritten
+    and the learned reactive system is always consistent with the training data.
+
+    The learned reactive system is often not the same as the one by BlueFringeRPNI, even in the number of the states.
+      - BlueFringeRPNI visits all the states of the PTA in the order of their IDs, which is the order of their
+        creation, while we visit only the blue states in the breadth-first order. The order decides which red state a
+        state is merged to.
+      - BlueFringeRPNI checks the mergeability by comparing the subtree of the blue state with the red state without
+        folding the states matched in the comparison, and its merge overwrites the conflicting outputs. Thus, it may
+        accept a merge that we reject, and its result may be inconsistent with the training data.
+    Both learners return the PTA itself if no merge is possible, e.g., if min_depth is larger than the PTA.
+    """
+
+    def compute_model(self, min_depth: int = 0) -> ReactiveSystem:
+        merger = ArrayPTAMerger(self.pta)
+        red_states: List[int] = []
+        red_set = set()
+        queue = deque([merger.initial_state])
+        while queue:
+            blue_state = merger.find(queue.popleft())
+            if blue_state in red_set:
+                continue
+            for red_state in red_states:
+                if merger.try_merge(red_state, blue_state, min_depth):
+                    # The new transitions of the red states lead to new blue states
+                    for state in merger.extended_states:
+                        if merger.find(state) in red_set:
+                            queue.extend(merger.transitions[state].values())
+                    break
+            else:
+                red_states.append(blue_state)
+                red_set.add(blue_state)
+                queue.extend(merger.transitions[blue_state].values())
+        LOGGER.debug(f'merged {len(merger.state_ids)} states into {len(red_states)} red states')
+        return merger.to_reactive_system(self.pta)
@@ -1,5 +1,10 @@
 from .dfa import DFA
+from .compiled_dfa import CompiledDFA
 from .mealy_machine import MealyMachine
 from .reactive_system import ReactiveSystem
 from .safety_game import SafetyGame
 from .pta import PTA
+from .array_pta import ArrayPTA
+from .sample_trie import SampleTrie
+from .array_safety_game import ArraySafetyGame
+from .strategy_table import StrategyTable
@@ -0,0 +1,251 @@
+from collections.abc import Mapping
+from typing import List, Tuple, Dict, Iterator, Hashable
+
+import numpy as np
+
+from src.exceptions.shielding_exceptions import InvalidInputError
+from src.model import ReactiveSystem, PTA
+
+__author__ = "Masaki Waga <masakiwaga@gmail.com>"
+__status__ = "experimental"
+__version__ = "0.0.1"
+__date__ = "18 October 2026"
+
+# The value in the successor and output tables for the undefined transitions
+UNDEFINED: int = -1
+INITIAL_CAPACITY: int = 16
+
+
+class ArrayPTA(ReactiveSystem):
+    """
+    The class for prefix tree acceptor (PTA) represented by NumPy arrays. This class provides the same interface and
+    the same numbering of the states as PTA.
+
+    The states are the rows of a successor table of shape [capacity, actions] and an output table of the same shape,
+    where the actions are the pairs of the actions of player 1 and 2 appeared so far (at most |P1|·|P2|) and the
+    undefined transitions are UNDEFINED. The output table holds the indices of the outputs in output_values. A new
+    state is allocated by a running counter, and the tables grow geometrically in both dimensions. Thus, adding a
+    sample takes the time linear to its length rather than to the size of the PTA.
+
+    Since the transitions are stored in the tables, transitions and output are read-only views with the same interface
+    as ReactiveSystem.transitions and ReactiveSystem.output. Use toPTA to obtain a mutable copy.
+    """
+
+    def __init__(self, player1_alphabet: List[int], player2_alphabet: List[int], output_alphabet: List[int]) -> None:
+        # We do not call the constructor of ReactiveSystem because transitions and output are views
+        self.player1Alphabet: List[int] = player1_alphabet
+        self.player2Alphabet: List[int] = player2_alphabet
+        self.outputAlphabet: List[int] = output_alphabet
+        self.initialState: int = 1
+        # self.actions[column] is the pair of the actions of player 1 and 2 of the column of the tables
+        self.actions: List[Tuple[int, int]] = []
+        self.action_index: Dict[Tuple[int, int], int] = {}
+        # self.output_values[index] is the output represented by index in the output table
+        self.output_values: List[Hashable] = []
+        self.output_index: Dict[Hashable, int] = {}
+        self.successors: np.ndarray = np.full((INITIAL_CAPACITY, 1), UNDEFINED, dtype=np.int32)
+        self.outputs: np.ndarray = np.full((INITIAL_CAPACITY, 1), UNDEFINED, dtype=np.int32)
+        # The state allocated next. The states 0 and 1 are reserved for the sink and the root.
+        self.next_state: int = 2
+
+    @property
+    def transitions(self) -> "_TransitionView":
+        """
+        The read-only view of the transitions with the same interface as ReactiveSystem.transitions
+        """
+        return _TransitionView(self, self.successors, lambda target: target)
+
+    @property
+    def output(self) -> "_TransitionView":
+        """
+        The read-only view of the outputs with the same interface as ReactiveSystem.output
+        """
+        return _TransitionView(self, self.outputs, self.output_values.__getitem__)
+
+    def _grow(self, num_states: int, num_actions: int) -> None:
+        """
+        Grow the tables geometrically so that they have at least num_states rows and num_actions columns
+        """
+        capacity, width = self.successors.shape
+        if num_states <= capacity and num_actions <= width:
+            return
+        if num_states > capacity:
+            capacity = max(num_states, 2 * capacity)
+        if num_actions > width:
+            width = max(num_actions, 2 * width)
+        for name in ['successors', 'outputs']:
+            old = getattr(self, name)
+            new = np.full((capacity, width), UNDEFINED, dtype=np.int32)
+            new[:old.shape[0], :old.shape[1]] = old
+            setattr(self, name, new)
+
+    def _action_column(self, player1_action: int, player2_action: int) -> int:
+        column = self.action_index.get((player1_action, player2_action))
+        if column is None:
+            column = len(self.actions)
+            self.action_index[player1_action, player2_action] = column
+            self.actions.append((player1_action, player2_action))
+            self._grow(self.successors.shape[0], column + 1)
+        return column
+
+    def _output_value_index(self, output: Hashable) -> int:
+        index = self.output_index.get(output)
+        if index is None:
+            index = len(self.output_values)
+            self.output_index[output] = index
+            self.output_values.append(output)
+        return index
+
+    def addTransition(self, source: int, player1_action: int, player2_action: int, output: int, target: int) -> None:
+        """
+        Adds a transition
+        Args:
+            source: int : the source state
+            player1_action: int : the action of player 1
+            player2_action: int : the action of player 2
+            output: the output of the transition
+            target: int : the target state
+        """
+        column = self._action_column(player1_action, player2_action)
+        self._grow(max(source, target) + 1, column + 1)
+        self.successors[source, column] = target
+        self.outputs[source, column] = self._output_value_index(output)
+        self.next_state = max(self.next_state, source + 1, target + 1)
+
+    def _add_step(self, state: int, player1_action: int, player2_action: int, output_action: int) -> int:
+        """
+        Add a transition from an existing state and returns its target. The target is a new state if there is no such
+        transition. Otherwise, the output of the transition is overwritten as in PTA.
+        """
+        if player2_action not in self.player2Alphabet:
+            self.player2Alphabet.append(player2_action)
+        column = self._action_column(player1_action, player2_action)
+        target = int(self.successors[state, column])
+        if target == UNDEFINED:
+            target = self.next_state
+            self.next_state += 1
+            self._grow(self.next_state, column + 1)
+            self.successors[state, column] = target
+        self.outputs[state, column] = self._output_value_index(output_action)
+        return target
+
+    def addSample(self, input_word: List[Tuple[int, int]], output_action: int) -> None:
+        state: int = self.initialState
+        for player1_action, player2_action in input_word[:-1]:
+            column = self.action_index.get((player1_action, player2_action))
+            if column is None or self.successors[state, column] == UNDEFINED:
+                raise InvalidInputError("The input to the PTA must be prefix closed")
+            state = int(self.successors[state, column])
+        player1_action, player2_action = input_word[-1]
+        self._add_step(state, player1_action, player2_action, output_action)
+
+    def addTrace(self, input_word: List[Tuple[int, int]], output_word: List[int]) -> None:
+        """
+        Add a trace, i.e., a sample with the output of each transition. This is equivalent to adding all the prefixes
+        of the trace by addSample.
+        Args:
+            input_word: List[Tuple[int, int]] : the input word
+            output_word: List[int] : the outputs for each transition of input_word
+        """
+        if len(input_word) != len(output_word):
+            raise InvalidInputError("The input and the output of a trace must have the same length")
+        state: int = self.initialState
+        for (player1_action, player2_action), output_action in zip(input_word, output_word):
+            state = self._add_step(state, player1_action, player2_action, output_action)
+
+    def getStates(self) -> List[int]:
+        """
+        Returns the states appearing in the transitions
+        Returns:
+            The list of the states represented by integers
+        """
+        successors = self.successors[:self.next_state]
+        defined = successors != UNDEFINED
+        has_transition = defined.any(axis=1)
+        has_transition[successors[defined]] = True
+        return np.flatnonzero(has_transition).tolist()
+
+    def _column(self, src: int, player1_action: int, player2_action: int) -> int:
+        """
+        Returns the column of the transition
+        Raises:
+            KeyError: if the transition does not exist
+        """
+        column = self.action_index.get((player1_action, player2_action))
+        if column is None or not 0 <= src < self.next_state or self.successors[src, column] == UNDEFINED:
+            raise KeyError((src, player1_action, player2_action))
+        return column
+
+    def getSuccessor(self, src: int, player1_action: int, player2_action: int) -> int:
+        """
+        Returns the next state
+        Args:
+            src: int : the source state
+            player1_action: int : the action of player 1
+            player2_action: int : the action of player 2
+        Returns:
+            The next state after the transition
+        Raises:
+            KeyError: if the transition does not exist
+        """
+        return int(self.successors[src, self._column(src, player1_action, player2_action)])
+
+    def getOutput(self, src: int, player1_action: int, player2_action: int) -> int:
+        """
+        Returns the output of the transition
+        Args:
+            src: int : the source state
+            player1_action: int : the action of player 1
+            player2_action: int : the action of player 2
+        Returns:
+            The output character
+        Raises:
+            KeyError: if the transition does not exist
+        """
+        return self.output_values[self.outputs[src, self._column(src, player1_action, player2_action)]]
+
+    def toPTA(self) -> PTA:
+        """
+        Returns a PTA with the same states and transitions. The returned PTA does not share the data with self.
+        """
+        pta = PTA(list(self.player1Alphabet), list(self.player2Alphabet), list(self.outputAlphabet))
+        pta.setInitialState(self.initialState)
+        sources, columns = np.nonzero(self.successors[:self.next_state] != UNDEFINED)
+        targets = self.successors[sources, columns]
+        # Since the states are allocated in the insertion order, this is the insertion order of the transitions in PTA
+        order = np.argsort(targets, kind='stable')
+        sources, columns, targets = sources[order], columns[order], targets[order]
+        outputs = self.outputs[sources, columns].tolist()
+        for source, column, target, output in zip(sources.tolist(), columns.tolist(), targets.tolist(), outputs):
+            player1_action, player2_action = self.actions[column]
+            pta.addTransition(source, player1_action, player2_action, self.output_values[output], target)
+        return pta
+
+
+class _TransitionView(Mapping):
+    """
+    The read-only view of a table of ArrayPTA, i.e., view[src][(player1_action, player2_action)] is the value of the
+    transition. Only the states with at least one transition are the keys.
+    """
+
+    def __init__(self, pta: ArrayPTA, table: np.ndarray, to_value) -> None:
+        self.pta = pta
+        self.table = table
+        self.to_value = to_value
+
+    def __getitem__(self, src: int) -> Dict[Tuple[int, int], int]:
+        if not isinstance(src, (int, np.integer)) or not 0 <= src < self.pta.next_state:
+            raise KeyError(src)
+        columns = np.flatnonzero(self.table[src, :len(self.pta.actions)] != UNDEFINED)
+        if len(columns) == 0:
+            raise KeyError(src)
+        # The transitions are in the insertion order as in PTA
+        columns = columns[np.argsort(self.pta.successors[src, columns], kind='stable')]
+        values = self.table[src, columns].tolist()
+        return {self.pta.actions[column]: self.to_value(value) for column, value in zip(columns.tolist(), values)}
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(np.flatnonzero((self.table[:self.pta.next_state] != UNDEFINED).any(axis=1)).tolist())
+
+    def __len__(self) -> int:
+        return int((self.table[:self.pta.next_state] != UNDEFINED).any(axis=1).sum())
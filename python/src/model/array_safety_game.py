@@ -0,0 +1,341 @@
+from collections.abc import Mapping
+from logging import getLogger
+from typing import List, Dict, Tuple, Set, Callable, Optional, Iterator, Union
+
+import numpy as np
+
+from src.model import DFA, ReactiveSystem
+from src.model.compiled_dfa import CompiledDFA, compile_dfa
+
+__author__ = "Masaki Waga <masakiwaga@gmail.com>"
+__status__ = "experimental"
+__version__ = "0.0.1"
+__date__ = "18 October 2026"
+
+LOGGER = getLogger(__name__)
+
+# The value in the successor table for the undefined transitions
+UNDEFINED: int = -1
+
+
+class ArraySafetyGame:
+    """
+    The class for safety game represented by NumPy arrays. This class provides the same interface as SafetyGame.
+
+    The states are the integers 0, 1, ..., n - 1 and the actions are identified by their positions in the alphabets.
+    The transitions are represented by a dense successor table of shape [states, |P1|, |P2|], where the undefined
+    transitions are UNDEFINED. The predecessors are represented in the compressed sparse row (CSR) format and
+    constructed lazily.
+    """
+
+    def __init__(self, player1_alphabet: List[int], player2_alphabet: List[int],
+                 successors: np.ndarray, safe: np.ndarray,
+                 initial_state: int = 1, unexplored_state: int = 0) -> None:
+        """
+        The constructor
+        Args:
+            player1_alphabet: List[int] : the actions of player 1
+            player2_alphabet: List[int] : the actions of player 2
+            successors: np.ndarray : successors[q, i, j] is the successor of q by the i-th action of player 1 and the
+              j-th action of player 2, or UNDEFINED if there is no such transition
+            safe: np.ndarray : the boolean mask of the safe states
+            initial_state: int : the initial state
+            unexplored_state: int : the unexplored state
+        """
+        assert successors.shape[1:] == (len(player1_alphabet), len(player2_alphabet))
+        assert safe.shape == (successors.shape[0],)
+        self.p1_alphabet: List[int] = player1_alphabet
+        self.p2_alphabet: List[int] = player2_alphabet
+        self.p1_index: Dict[int, int] = {action: index for index, action in enumerate(player1_alphabet)}
+        self.p2_index: Dict[int, int] = {action: index for index, action in enumerate(player2_alphabet)}
+        self.successors: np.ndarray = successors.astype(np.int32, copy=False)
+        self.safe: np.ndarray = safe.astype(bool, copy=False)
+        self.initial_state: int = initial_state
+        self.unexplored_state: int = unexplored_state
+        self.inverse_state_mapper: Dict[int, Tuple[int, int]] = {}
+        # The predecessors in the CSR format. The predecessors of q are the transitions
+        # (predecessor_sources[k], predecessor_p1[k], predecessor_p2[k]) for
+        # predecessor_offsets[q] <= k < predecessor_offsets[q + 1]
+        self._predecessor_offsets: Optional[np.ndarray] = None
+        self._predecessor_sources: Optional[np.ndarray] = None
+        self._predecessor_p1: Optional[np.ndarray] = None
+        self._predecessor_p2: Optional[np.ndarray] = None
+
+    @property
+    def num_states(self) -> int:
+        return self.successors.shape[0]
+
+    @property
+    def safeStates(self) -> List[int]:
+        return np.flatnonzero(self.safe).tolist()
+
+    @property
+    def power_transitions(self) -> "_PowerTransitions":
+        """
+        The view of the transitions with the same interface as SafetyGame.power_transitions
+        """
+        return _PowerTransitions(self)
+
+    @property
+    def transitions(self) -> "_Transitions":
+        """
+        The view of the transitions with the same interface as SafetyGame.transitions
+        """
+        return _Transitions(self)
+
+    def setInitialState(self, initial_state: int) -> None:
+        self.initial_state = initial_state
+
+    def getStates(self) -> List[int]:
+        """
+        Returns the states appearing in the transitions
+        Returns:
+            The list of the states represented by integers
+        """
+        defined = self.successors != UNDEFINED
+        has_transition = defined.reshape(self.num_states, -1).any(axis=1)
+        has_transition[self.successors[defined]] = True
+        return np.flatnonzero(has_transition).tolist()
+
+    def getInitialState(self) -> int:
+        return self.initial_state
+
+    def isUnexploredState(self, state) -> bool:
+        return state == self.unexplored_state
+
+    def getPlayer1Alphabet(self) -> List[int]:
+        return self.p1_alphabet
+
+    def getPlayer2Alphabet(self) -> List[int]:
+        return self.p2_alphabet
+
+    def getSuccessor(self, src: int, player1_action: int, player2_action: int) -> int:
+        """
+        Returns the next state
+        Args:
+            src: int : the source state
+            player1_action: int : the action of player1
+            player2_action: int : the action of player2
+        Returns:
+            The next state after the transition
+        Raises:
+            KeyError: if the transition does not exist
+        """
+        if not self.hasSuccessor(src, player1_action, player2_action):
+            raise KeyError((src, player1_action, player2_action))
+        return int(self.successors[src, self.p1_index[player1_action], self.p2_index[player2_action]])
+
+    def hasSuccessor(self, src: int, player1_action: int, player2_action: int) -> bool:
+        """
+        Returns if the transition exists
+        Args:
+            src: int : the source state
+            player1_action: int : the action of player1
+            player2_action: int : the action of player2
+        Returns:
+            The true if the transition exists, false otherwise
+        """
+        return 0 <= src < self.num_states and player1_action in self.p1_index and \
+            player2_action in self.p2_index and \
+            self.successors[src, self.p1_index[player1_action], self.p2_index[player2_action]] != UNDEFINED
+
+    def _construct_predecessors(self) -> None:
+        flat_successors = self.successors.reshape(-1)
+        transition_indices = np.flatnonzero(flat_successors != UNDEFINED)
+        targets = flat_successors[transition_indices]
+        order = np.argsort(targets, kind='stable')
+        transition_indices = transition_indices[order]
+        num_p1, num_p2 = len(self.p1_alphabet), len(self.p2_alphabet)
+        self._predecessor_offsets = np.zeros(self.num_states + 1, dtype=np.int64)
+        np.cumsum(np.bincount(targets, minlength=self.num_states), out=self._predecessor_offsets[1:])
+        self._predecessor_sources = (transition_indices // (num_p1 * num_p2)).astype(np.int32)
+        self._predecessor_p1 = ((transition_indices // num_p2) % num_p1).astype(np.int32)
+        self._predecessor_p2 = (transition_indices % num_p2).astype(np.int32)
+
+    def predecessor_arrays(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Returns the predecessors in the CSR format
+        Returns:
+            The tuple (offsets, sources, player1_indices, player2_indices). The transitions to q are
+            (sources[k], player1_indices[k], player2_indices[k]) for offsets[q] <= k < offsets[q + 1].
+        """
+        if self._predecessor_offsets is None:
+            self._construct_predecessors()
+        return self._predecessor_offsets, self._predecessor_sources, self._predecessor_p1, self._predecessor_p2
+
+    def getPredecessors(self, tgt: int, player1_action: int, player2_action: int) -> Set[int]:
+        """
+        Returns the predecessor states
+        Args:
+            tgt: int : the target state in the transition
+            player1_action: int : the action of player1
+            player2_action: int : the action of player2
+        Returns:
+            The predecessor states before the transition
+        """
+        if not 0 <= tgt < self.num_states or player1_action not in self.p1_index or \
+                player2_action not in self.p2_index:
+            return set()
+        offsets, sources, p1_indices, p2_indices = self.predecessor_arrays()
+        begin, end = offsets[tgt], offsets[tgt + 1]
+        matched = (p1_indices[begin:end] == self.p1_index[player1_action]) & \
+                  (p2_indices[begin:end] == self.p2_index[player2_action])
+        return set(sources[begin:end][matched].tolist())
+
+    def isSafe(self, state: int) -> bool:
+        """
+        Returns if the given state is safe or not
+        Args:
+            state: int : the state to be checked
+        Returns:
+            True if the given state is an safe state
+        """
+        return 0 <= state < self.num_states and bool(self.safe[state])
+
+    @classmethod
+    def fromSafetyGame(cls, safety_game) -> "ArraySafetyGame":
+        """
+        Convert a SafetyGame to an ArraySafetyGame. The states must be non-negative integers.
+        """
+        p1_index = {action: index for index, action in enumerate(safety_game.getPlayer1Alphabet())}
+        p2_index = {action: index for index, action in enumerate(safety_game.getPlayer2Alphabet())}
+        num_states = 1 + max([safety_game.getInitialState(), safety_game.unexplored_state] +
+                             list(safety_game.safeStates) + safety_game.getStates())
+        successors = np.full((num_states, len(p1_index), len(p2_index)), UNDEFINED, dtype=np.int32)
+        for (src, player1_action, player2_action), target in safety_game.transitions.items():
+            successors[src, p1_index[player1_action], p2_index[player2_action]] = target
+        safe = np.zeros(num_states, dtype=bool)
+        safe[list(safety_game.safeStates)] = True
+        game = cls(safety_game.getPlayer1Alphabet(), safety_game.getPlayer2Alphabet(), successors, safe,
+                   safety_game.getInitialState(), safety_game.unexplored_state)
+        game.inverse_state_mapper = dict(safety_game.inverse_state_mapper)
+        if hasattr(safety_game, 'state_mapper'):
+            game.state_mapper = dict(safety_game.state_mapper)
+        return game
+
+    @classmethod
+    def fromReactiveSystemAndDFA(cls, reactive_system: ReactiveSystem,
+                                 dfa: Union[DFA, CompiledDFA],
+                                 evaluate_output: Callable[[int], Callable[[str], bool]]) -> "ArraySafetyGame":
+        """
+        Construct a safety game from a reactive system and a DFA. The constructed game is equivalent to the one by
+        SafetyGame.fromReactiveSystemAndDFA up to the numbering of the states.
+        Args:
+            reactive_system: ReactiveSystem : the given ReactiveSystem
+            dfa: Union[DFA, CompiledDFA] : the given DFA. It is compiled unless it is already compiled.
+            evaluate_output: Callable[[str], Callable[[str], bool]] : given a string `output` for an output of the reactive system and an string `AP` representing an atomic proposition, evaluate_output(output)(AP) is returns if `AP` is satisfied in `output`
+        """
+        dfa = compile_dfa(dfa, evaluate_output)
+        p1_alphabet = reactive_system.getPlayer1Alphabet()
+        p2_alphabet = reactive_system.getPlayer2Alphabet()
+        unexplored_state = 0
+        # maps the pair (reactive_system_state, added_dfa_state) to the corresponding state of safety_game
+        state_mapper: Dict[Tuple[int, int], int] = {}
+        inverse_state_mapper: Dict[int, Tuple[int, int]] = {}
+        successors = np.full((1024, len(p1_alphabet), len(p2_alphabet)), UNDEFINED, dtype=np.int32)
+
+        def add_state(reactive_system_state: int, added_dfa_state: int) -> int:
+            nonlocal successors
+            added_state = len(state_mapper) + 1
+            if added_state >= successors.shape[0]:
+                grown = np.full((2 * successors.shape[0],) + successors.shape[1:], UNDEFINED, dtype=np.int32)
+                grown[:successors.shape[0]] = successors
+                successors = grown
+            state_mapper[reactive_system_state, added_dfa_state] = added_state
+            inverse_state_mapper[added_state] = (reactive_system_state, added_dfa_state)
+            return added_state
+
+        initial_state = add_state(reactive_system.getInitialState(), dfa.getInitialState())
+        # The states are expanded in the order of the numbering
+        next_expanded = initial_state
+        while next_expanded <= len(state_mapper):
+            new_state = next_expanded
+            next_expanded += 1
+            (rs_state, dfa_state) = inverse_state_mapper[new_state]
+            for p1_index, p1_action in enumerate(p1_alphabet):
+                for p2_index, p2_action in enumerate(p2_alphabet):
+                    try:
+                        rs_output: int = reactive_system.getOutput(rs_state, p1_action, p2_action)
+                        rs_next: int = reactive_system.getSuccessor(rs_state, p1_action, p2_action)
+                    except KeyError:
+                        # Transition to sink state (unexplored)
+                        successors[new_state, p1_index, p2_index] = unexplored_state
+                        continue
+                    dfa_successor: int = dfa.getSuccessor(dfa_state, rs_output)
+                    if (rs_next, dfa_successor) in state_mapper:
+                        next_state = state_mapper[rs_next, dfa_successor]
+                    else:
+                        next_state = add_state(rs_next, dfa_successor)
+                    successors[new_state, p1_index, p2_index] = next_state
+
+        num_states = len(state_mapper) + 1
+        successors = successors[:num_states].copy()
+        # Unexplored state has self loop with all transitions (anything may happen)
+        successors[unexplored_state] = unexplored_state
+        safe = np.zeros(num_states, dtype=bool)
+        for state, (_, dfa_state) in inverse_state_mapper.items():
+            safe[state] = dfa.isSafe(dfa_state)
+        # Do not add unexplored state as winning when the game is already losing
+        safe[unexplored_state] = safe.any()
+
+        game = cls(p1_alphabet, p2_alphabet, successors, safe, initial_state, unexplored_state)
+        game.state_mapper = state_mapper
+        game.inverse_state_mapper = inverse_state_mapper
+        return game
+
+
+class _PowerTransitions(Mapping):
+    """
+    The read-only view of ArraySafetyGame with the same interface as SafetyGame.power_transitions, i.e.,
+    view[src, player1_action] is the set of the successors of src by player1_action
+    """
+
+    def __init__(self, game: ArraySafetyGame) -> None:
+        self.game = game
+
+    def __getitem__(self, key: Tuple[int, int]) -> Set[int]:
+        src, player1_action = key
+        if not 0 <= src < self.game.num_states or player1_action not in self.game.p1_index:
+            raise KeyError(key)
+        targets = self.game.successors[src, self.game.p1_index[player1_action]]
+        targets = targets[targets != UNDEFINED]
+        if len(targets) == 0:
+            raise KeyError(key)
+        return set(targets.tolist())
+
+    def __contains__(self, key) -> bool:
+        src, player1_action = key
+        return 0 <= src < self.game.num_states and player1_action in self.game.p1_index and \
+            bool((self.game.successors[src, self.game.p1_index[player1_action]] != UNDEFINED).any())
+
+    def __iter__(self) -> Iterator[Tuple[int, int]]:
+        sources, p1_indices = np.nonzero((self.game.successors != UNDEFINED).any(axis=2))
+        for src, p1_index in zip(sources.tolist(), p1_indices.tolist()):
+            yield src, self.game.p1_alphabet[p1_index]
+
+    def __len__(self) -> int:
+        return int((self.game.successors != UNDEFINED).any(axis=2).sum())
+
+
+class _Transitions(Mapping):
+    """
+    The read-only view of ArraySafetyGame with the same interface as SafetyGame.transitions, i.e.,
+    view[src, player1_action, player2_action] is the successor
+    """
+
+    def __init__(self, game: ArraySafetyGame) -> None:
+        self.game = game
+
+    def __getitem__(self, key: Tuple[int, int, int]) -> int:
+        return self.game.getSuccessor(*key)
+
+    def __contains__(self, key) -> bool:
+        return self.game.hasSuccessor(*key)
+
+    def __iter__(self) -> Iterator[Tuple[int, int, int]]:
+        sources, p1_indices, p2_indices = np.nonzero(self.game.successors != UNDEFINED)
+        for src, p1_index, p2_index in zip(sources.tolist(), p1_indices.tolist(), p2_indices.tolist()):
+            yield src, self.game.p1_alphabet[p1_index], self.game.p2_alphabet[p2_index]
+
+    def __len__(self) -> int:
+        return int((self.game.successors != UNDEFINED).sum())
@@ -0,0 +1,141 @@
+from typing import List, Dict, Callable, Optional, Union, Iterable
+
+import numpy as np
+
+from src.model.dfa import DFA
+
+__author__ = "Masaki Waga <masakiwaga@gmail.com>"
+__status__ = "experimental"
+__version__ = "0.0.1"
+__date__ = "18 October 2026"
+
+
+class CompiledDFA:
+    """
+    A DFA compiled with the function to evaluate the outputs of the reactive system.
+
+    For each output, the successors of all the DFA states are precomputed by evaluating each atomic proposition only
+    once. Then, getSuccessor is one dictionary lookup and one list lookup. The outputs not in the given output
+    alphabet are compiled when they first appear.
+
+    Note:
+        As in DFA, the states are 1-origin integers and the sink state is the number of the states plus one.
+    """
+
+    def __init__(self, dfa: DFA, evaluate_output: Callable[[int], Callable[[str], bool]],
+                 output_alphabet: Optional[List[int]] = None) -> None:
+        """
+        The constructor
+        Args:
+            dfa: DFA : the compiled DFA
+            evaluate_output: Callable[[int], Callable[[str], bool]] : given an output of the reactive system and an
+              atomic proposition AP, evaluate_output(output)(AP) returns if AP is satisfied in output
+            output_alphabet: Optional[List[int]] : the outputs compiled in advance
+        """
+        self.alphabet: List[str] = dfa.getAlphabet()
+        self.evaluate_output = evaluate_output
+        self.initial_state: int = dfa.getInitialState()
+        self.states: List[int] = sorted(dfa.getStates())
+        self.sink_state: int = dfa.getSinkState()
+        self.safe_states = frozenset(dfa.safeStates)
+        self.num_rows: int = max(self.states + [self.sink_state]) + 1
+        # transitions[state] is the list of the pairs of the guard and the target
+        self.transitions = {state: [(dict(guard), target) for guard, target in dfa.transitions[state].items()]
+                            for state in dfa.transitions}
+        # columns[output][state] is the successor of state by output
+        self.columns: Dict[int, List[int]] = {}
+        # The outputs in the order of the columns of table
+        self.outputs: List[int] = []
+        for output in output_alphabet or []:
+            self._compile_output(output)
+
+    def _compile_output(self, output: int) -> List[int]:
+        valuation = self.evaluate_output(output)
+        values = {ap: valuation(ap) for ap in self.alphabet}
+        # The sink state and the states without outgoing transitions go to the sink state
+        column = [self.sink_state] * self.num_rows
+        for state, guarded_targets in self.transitions.items():
+            for guard, target in guarded_targets:
+                if all(values[ap] == value for ap, value in guard.items()):
+                    column[state] = target
+                    break
+        self.columns[output] = column
+        self.outputs.append(output)
+        return column
+
+    def compileOutputs(self, outputs: Iterable[int]) -> None:
+        """
+        Compile the given outputs unless they are already compiled. Since evaluate_output is dropped in pickling, this
+        must be called for all the outputs used after unpickling.
+        """
+        for output in outputs:
+            if output not in self.columns:
+                self._compile_output(output)
+
+    def withOutputs(self, outputs: Iterable[int]) -> "CompiledDFA":
+        """
+        Returns a copy of this DFA compiling the given outputs. This DFA is not modified, so this can be called while
+        another thread reads it.
+        """
+        compiled = CompiledDFA.__new__(CompiledDFA)
+        compiled.__dict__.update(self.__dict__)
+        # The existing columns are never modified and only the containers are copied
+        compiled.columns = dict(self.columns)
+        compiled.outputs = list(self.outputs)
+        compiled.compileOutputs(outputs)
+        return compiled
+
+    def getInitialState(self) -> int:
+        return self.initial_state
+
+    def getSinkState(self) -> int:
+        return self.sink_state
+
+    def getSuccessor(self, src: int, output: int) -> int:
+        """
+        Returns the next state
+        Args:
+            src: int : the source state
+            output: int : the output of the reactive system
+        Returns:
+            The next state after the transition
+        """
+        column = self.columns.get(output)
+        if column is None:
+            if self.evaluate_output is None:
+                raise KeyError(f'Output {output} is not compiled')
+            column = self._compile_output(output)
+        return column[src]
+
+    def isSafe(self, state: int) -> bool:
+        return state in self.safe_states
+
+    @property
+    def table(self) -> np.ndarray:
+        """
+        The transition table of shape [states, outputs]. table[state, i] is the successor of state by
+        self.outputs[i]. The row 0 is unused because the states are 1-origin.
+        """
+        if len(self.outputs) == 0:
+            return np.zeros((self.num_rows, 0), dtype=np.int32)
+        return np.array([self.columns[output] for output in self.outputs], dtype=np.int32).T
+
+    @property
+    def output_index(self) -> Dict[int, int]:
+        return {output: index for index, output in enumerate(self.outputs)}
+
+    def __getstate__(self) -> dict:
+        # evaluate_output is often a lambda, which is not picklable. The unpickled DFA only knows the compiled outputs.
+        state = self.__dict__.copy()
+        state['evaluate_output'] = None
+        return state
+
+
+def compile_dfa(dfa: Union[DFA, CompiledDFA], evaluate_output: Callable[[int], Callable[[str], bool]],
+                output_alphabet: Optional[List[int]] = None) -> CompiledDFA:
+    """
+    Returns the compiled DFA. If dfa is already compiled, it is returned as it is.
+    """
+    if isinstance(dfa, CompiledDFA):
+        return dfa
+    return dfa.compile(evaluate_output, output_alphabet)
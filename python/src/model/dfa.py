@@ -1,5 +1,5 @@
 import itertools
-from typing import List, Tuple, Dict, FrozenSet, Callable
+from typing import List, Tuple, Dict, FrozenSet, Callable, Optional
 
 __author__ = "Masaki Waga <masakiwaga@gmail.com>"
 __status__ = "experimental"
@@ -25,6 +25,8 @@ class DFA:
         self.safeStates: List[int] = []
         # self.transition[current_state][action] is the target_state
         self.transitions: Dict[int, Dict[FrozenSet[Tuple[str, bool]], int]] = {}
+        # The cache of getStates. It is cleared when the transitions are changed.
+        self._states: Optional[List[int]] = None
 
     def setInitialState(self, initialState: int):
         self.initialState = initialState
@@ -37,6 +39,7 @@ class DFA:
 
     def setTransitions(self, transitions: Dict[int, Dict[FrozenSet[Tuple[str, bool]], int]]):
         self.transitions = transitions
+        self._states = None
 
     def addTransition(self, source: int, guard: Dict[str, bool], target: int) -> None:
         """
@@ -49,6 +52,7 @@ class DFA:
         if source not in self.transitions:
             self.transitions[source] = dict()
         self.transitions[source][frozenset(guard.items())] = target
+        self._states = None
 
     def getStates(self) -> List[int]:
         """
@@ -56,9 +60,11 @@ class DFA:
         Returns:
             The list of the states represented by integers
         """
-        return list(set(itertools.chain.from_iterable(
-            map(lambda transition: list(map(lambda tr: tr[1], transition[1].items())) + [transition[0]],
-                self.transitions.items()))))
+        if self._states is None:
+            self._states = list(set(itertools.chain.from_iterable(
+                map(lambda transition: list(map(lambda tr: tr[1], transition[1].items())) + [transition[0]],
+                    self.transitions.items()))))
+        return list(self._states)
 
     def getInitialState(self) -> int:
         """
@@ -100,13 +106,28 @@ class DFA:
         """
         if src == self.getSinkState():
             # when we are at the sink state, we stay at the sink state.
-            return len(self.getStates()) + 1
+            return self.getSinkState()
         for guard_set, target in self.transitions[src].items():
             if all(map(lambda tpl: valuation(tpl[0]) == tpl[1], guard_set)):
                 return target
         # if there is not successor state, go to the sink state
         return self.getSinkState()
 
+    def compile(self, evaluate_output: Callable[[int], Callable[[str], bool]],
+                output_alphabet: Optional[List[int]] = None) -> "CompiledDFA":
+        """
+        Compile the DFA into the transition table indexed by the outputs of the reactive system
+        Args:
+            evaluate_output: Callable[[int], Callable[[str], bool]] : given an output of the reactive system and an
+              atomic proposition AP, evaluate_output(output)(AP) returns if AP is satisfied in output
+            output_alphabet: Optional[List[int]] : the outputs compiled in advance. The other outputs are compiled
+              when they first appear.
+        Returns:
+            The compiled DFA
+        """
+        from src.model.compiled_dfa import CompiledDFA
+        return CompiledDFA(self, evaluate_output, output_alphabet)
+
     def isSafe(self, state: int) -> bool:
         """
         Returns if the given state is safe or not
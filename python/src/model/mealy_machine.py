@@ -1,24 +1,31 @@
-from typing import List
+from typing import List, Optional, Dict
 
+import numpy as np
 from py4j.java_gateway import JavaGateway
-from py4j.protocol import Py4JJavaError
 
-from src.exceptions.shielding_exceptions import UnknownOutputError
+from src.exceptions.shielding_exceptions import UnknownOutputError, UnknownStateError
 
 __author__ = "Masaki Waga <masakiwaga@gmail.com>"
 __status__ = "experimental"
 __version__ = "0.0.1"
 __date__ = "06 August 2020"
 
+# The sentinels in the arrays exported by org.group_mmm.MealyExport
+UNDEFINED = -1
+UNDEFINED_OUTPUT = -2 ** 31
+
 
 class MealyMachine:
     """
     The Mealy Machine class wrapping the CompactMealy in automatalib (https://learnlib.de/projects/automatalib/) in Java. Mealy machine is constructed by PassiveLearning.computeMealy.
+
+    The transitions are exported from Java by one Py4J call (see org.group_mmm.MealyExport) and the other methods
+    except getDot do not access Java.
     Note:
         This class assumes that the LearnLib JVM gateway is running.
     """
 
-    def __init__(self, gateway: JavaGateway, mealy) -> None:
+    def __init__(self, gateway: Optional[JavaGateway], mealy) -> None:
         """
         The constructor
         Args:
@@ -30,7 +37,51 @@ class MealyMachine:
         """
         self.gateway = gateway
         self.mealy = mealy
-        self.inputAlphabet: List[int] = list(self.mealy.getInputAlphabet())
+        if mealy is not None:
+            self._unpack(gateway.jvm.org.group_mmm.MealyExport.export(mealy))
+        else:
+            self._set_arrays([], UNDEFINED, np.zeros((0, 0)), np.zeros((0, 0)))
+
+    def _unpack(self, packed: bytes) -> None:
+        """
+        Materialize the Mealy machine from the arrays exported by org.group_mmm.MealyExport
+        """
+        values = np.frombuffer(packed, dtype='>i4')
+        num_states, num_inputs, initial_state = values[:3].tolist()
+        begin = 3 + num_inputs
+        end = begin + num_states * num_inputs
+        self._set_arrays(values[3:begin].tolist(), initial_state,
+                         values[begin:end].reshape(num_states, num_inputs),
+                         values[end:end + num_states * num_inputs].reshape(num_states, num_inputs))
+
+    def _set_arrays(self, input_alphabet: List[int], initial_state: int, successors: np.ndarray,
+                    outputs: np.ndarray) -> None:
+        self.inputAlphabet: List[int] = list(input_alphabet)
+        self.char_ids: Dict[int, int] = {c: char_id for char_id, c in enumerate(self.inputAlphabet)}
+        self.initial_state: int = initial_state
+        # successors[state, char_id] and outputs[state, char_id] are the successor and the output of the transition
+        self.successors: np.ndarray = successors.astype(np.int32)
+        self.outputs: np.ndarray = outputs.astype(np.int32)
+        # Python lists are faster than numpy arrays for the lookup of one element
+        self._successor_list: List[List[int]] = self.successors.tolist()
+        self._output_list: List[List[int]] = self.outputs.tolist()
+
+    @classmethod
+    def fromArrays(cls, input_alphabet: List[int], initial_state: int, successors: np.ndarray,
+                   outputs: np.ndarray) -> "MealyMachine":
+        """
+        Construct a Mealy machine from the arrays without Java
+        Args:
+            input_alphabet: List[int] : the input alphabet
+            initial_state: int : the initial state
+            successors: np.ndarray : successors[state, i] is the successor of state by input_alphabet[i], or
+              UNDEFINED if the transition is undefined
+            outputs: np.ndarray : outputs[state, i] is the output of the transition of state by input_alphabet[i], or
+              UNDEFINED_OUTPUT if the output is undefined
+        """
+        mealy = cls(None, None)
+        mealy._set_arrays(input_alphabet, initial_state, np.asarray(successors), np.asarray(outputs))
+        return mealy
 
     def getStates(self) -> List[int]:
         """
@@ -38,7 +89,7 @@ class MealyMachine:
         Returns:
             The list of the states represented by integers
         """
-        return self.mealy.getStates()
+        return list(range(self.successors.shape[0]))
 
     def getInitialState(self) -> int:
         """
@@ -46,7 +97,7 @@ class MealyMachine:
         Returns:
             The initial state represented by an integer
         """
-        return self.mealy.getInitialState()
+        return self.initial_state
 
     def getStateId(self, state: int) -> int:
         """
@@ -56,7 +107,7 @@ class MealyMachine:
         Returns:
             ID of LearnLib representing the state.
         """
-        return self.mealy.getStateId(state)
+        return state
 
     def getInputAlphabet(self) -> List[int]:
         """
@@ -74,7 +125,9 @@ class MealyMachine:
         Return:
             ID of LearnLib representing the character.
         """
-        return self.inputAlphabet.index(c)
+        if c not in self.char_ids:
+            raise ValueError(f'{c} is not in the input alphabet')
+        return self.char_ids[c]
 
     def getOutputAlphabet(self) -> List[int]:
         """
@@ -82,15 +135,8 @@ class MealyMachine:
         Returns:
             The list of strings representing the output alphabet
         """
-        output: List[int] = []
-        for state in self.getStates():
-            for input_action in self.getInputAlphabet():
-                try:
-                    output.append(self.getOutput(state, input_action))
-                except UnknownOutputError:
-                    pass  # The output of a transition might be unknown.
-
-        return list(set(output))
+        # The output of a transition might be unknown.
+        return np.unique(self.outputs[self.outputs != UNDEFINED_OUTPUT]).tolist()
 
     def getSuccessor(self, src: int, c: int) -> int:
         """
@@ -101,8 +147,10 @@ class MealyMachine:
         Returns:
             The next state after the transition
         """
-        transition = self.mealy.getTransition(self.getStateId(src), self.getCharId(c))
-        return self.mealy.getSuccessor(transition)
+        char_id = self.getCharId(c)
+        if not 0 <= src < len(self._successor_list) or self._successor_list[src][char_id] == UNDEFINED:
+            raise UnknownStateError
+        return self._successor_list[src][char_id]
 
     def getOutput(self, src: int, c: int) -> int:
         """
@@ -113,14 +161,10 @@ class MealyMachine:
         Returns:
             The output character of the transition
         """
-        try:
-            transition = self.mealy.getTransition(self.getStateId(src), self.getCharId(c))
-            output = self.mealy.getTransitionOutput(transition)
-            if output is None:
-                raise UnknownOutputError
-        except Py4JJavaError:
+        char_id = self.getCharId(c)
+        if not 0 <= src < len(self._output_list) or self._output_list[src][char_id] == UNDEFINED_OUTPUT:
             raise UnknownOutputError
-        return output
+        return self._output_list[src][char_id]
 
     def getDot(self) -> str:
         """
@@ -1,4 +1,4 @@
-from typing import List, Tuple
+from typing import List, Tuple, Set
 
 from src.exceptions.shielding_exceptions import InvalidInputError
 from src.model import ReactiveSystem
@@ -17,6 +17,20 @@ class PTA(ReactiveSystem):
 
     def __init__(self, player1_alphabet: List[int], player2_alphabet: List[int], output_alphabet: List[int]) -> None:
         super().__init__(player1_alphabet, player2_alphabet, output_alphabet)
+        # The states appearing in the transitions, i.e., the states returned by getStates. We keep them so that a new
+        # state is numbered without enumerating the transitions.
+        self.state_set: Set[int] = set()
+
+    def addTransition(self, source: int, player1_action: int, player2_action: int, output: int, target: int) -> None:
+        super().addTransition(source, player1_action, player2_action, output, target)
+        self.state_set.add(source)
+        self.state_set.add(target)
+
+    def _new_state(self) -> int:
+        """
+        Returns the state to be added next. The states are numbered 2, 3, ... in the order of their addition.
+        """
+        return len(self.state_set) + 1 if len(self.state_set) > 0 else 2
 
     def addSample(self, input_word: List[Tuple[int, int]], output_action: int) -> None:
         state: int = self.initialState
@@ -30,8 +44,27 @@ class PTA(ReactiveSystem):
             self.player2Alphabet.append(player2_action)
         if state in self.transitions and (player1_action, player2_action) in self.transitions[state]:
             target = self.transitions[state][player1_action, player2_action]
-        elif len(self.getStates()) == 0:
-            target = 2
         else:
-            target = len(self.getStates()) + 1
+            target = self._new_state()
         self.addTransition(state, player1_action, player2_action, output_action, target)
+
+    def addTrace(self, input_word: List[Tuple[int, int]], output_word: List[int]) -> None:
+        """
+        Add a trace, i.e., a sample with the output of each transition. This is equivalent to adding all the prefixes
+        of the trace by addSample, but it takes the time linear to the length of the trace.
+        Args:
+            input_word: List[Tuple[int, int]] : the input word
+            output_word: List[int] : the outputs for each transition of input_word
+        """
+        if len(input_word) != len(output_word):
+            raise InvalidInputError("The input and the output of a trace must have the same length")
+        state: int = self.initialState
+        for (player1_action, player2_action), output_action in zip(input_word, output_word):
+            if player2_action not in self.player2Alphabet:
+                self.player2Alphabet.append(player2_action)
+            if state in self.transitions and (player1_action, player2_action) in self.transitions[state]:
+                target = self.transitions[state][player1_action, player2_action]
+            else:
+                target = self._new_state()
+            self.addTransition(state, player1_action, player2_action, output_action, target)
+            state = target
@@ -1,8 +1,10 @@
 import itertools
 from typing import List, Dict, Tuple, Callable
 
-from src.exceptions.shielding_exceptions import UnknownOutputError
+import numpy as np
+
 from src.model import MealyMachine
+from src.model.mealy_machine import UNDEFINED, UNDEFINED_OUTPUT
 
 __author__ = "Masaki Waga <masakiwaga@gmail.com>, Ezequiel Castellano <ezequiel.castellano@gmail.com>"
 __status__ = "experimental"
@@ -139,16 +141,14 @@ class ReactiveSystem:
             map(list, map(set, list(zip(*map(alphabet_mapper, mealy.getInputAlphabet()))))))
         output_alphabet: List[int] = mealy.getOutputAlphabet()
         reactive_system = ReactiveSystem(player1_alphabet, player2_alphabet, output_alphabet)
-        for source in mealy.getStates():
-            for action in mealy.getInputAlphabet():
-                try:
-                    output = mealy.getOutput(source, action)
-                    target = mealy.getSuccessor(source, action)
-                    action1, action2 = alphabet_mapper(action)
-                    reactive_system.addTransition(source, action1, action2, output, target)
-                except UnknownOutputError:
-                    # This transition was not explored...
-                    continue
+        split_actions = [alphabet_mapper(action) for action in mealy.getInputAlphabet()]
+        # The transitions with unknown outputs were not explored...
+        sources, char_ids = np.nonzero((mealy.outputs != UNDEFINED_OUTPUT) & (mealy.successors != UNDEFINED))
+        for source, char_id, output, target in zip(sources.tolist(), char_ids.tolist(),
+                                                   mealy.outputs[sources, char_ids].tolist(),
+                                                   mealy.successors[sources, char_ids].tolist()):
+            action1, action2 = split_actions[char_id]
+            reactive_system.addTransition(source, action1, action2, output, target)
 
         reactive_system.setInitialState(mealy.getInitialState())
         return reactive_system
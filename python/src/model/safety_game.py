@@ -1,8 +1,9 @@
 import itertools
 from logging import getLogger
-from typing import List, Dict, Tuple, Set, Callable
+from typing import List, Dict, Tuple, Set, Callable, Union
 
 from src.model import DFA, ReactiveSystem
+from src.model.compiled_dfa import CompiledDFA, compile_dfa
 
 __author__ = "Masaki Waga <masakiwaga@gmail.com>"
 __status__ = "experimental"
@@ -74,6 +75,25 @@ class SafetyGame:
         else:
             self.power_transitions[source, player1_action] = {target}
 
+    def remove_transition(self, source: int, player1_action: int, player2_action: int) -> None:
+        """
+        remove a transition if it exists
+        Args:
+            source: int : the source state
+            player1_action: str : the action of player1
+            player2_action: str : the action of player2
+        """
+        if (source, player1_action, player2_action) not in self.transitions:
+            return
+        target = self.transitions.pop((source, player1_action, player2_action))
+        self.reverseTransitions[(target, player1_action, player2_action)].discard(source)
+        remaining_targets = {self.transitions[source, player1_action, action]
+                             for action in self.p2_alphabet if (source, player1_action, action) in self.transitions}
+        if len(remaining_targets) > 0:
+            self.power_transitions[source, player1_action] = remaining_targets
+        else:
+            self.power_transitions.pop((source, player1_action), None)
+
     def getStates(self) -> List[int]:
         """
         Returns the states of the Mealy machine
@@ -182,16 +202,17 @@ class SafetyGame:
 
     @classmethod
     def fromReactiveSystemAndDFA(cls, reactive_system: ReactiveSystem,
-                                 dfa: DFA,
+                                 dfa: Union[DFA, CompiledDFA],
                                  evaluate_output: Callable[
                                      [int], Callable[[str], bool]]) -> "SafetyGameFromReactiveSystem":
         """
         Construct a safety game from a reactive system and a DFA
         Args:
             reactive_system: ReactiveSystem : the given ReactiveSystem
-            dfa: DFA : the given DFA
+            dfa: Union[DFA, CompiledDFA] : the given DFA. It is compiled unless it is already compiled.
             evaluate_output: Callable[[str], Callable[[str], bool]] : given a string `output` for an output of the reactive system and an string `AP` representing an atomic proposition, evaluate_output(output)(AP) is returns if `AP` is satisfied in `output`
         """
+        dfa = compile_dfa(dfa, evaluate_output)
         safety_game = SafetyGameFromReactiveSystem(reactive_system.getPlayer1Alphabet(),
                                                    reactive_system.getPlayer2Alphabet())
         # maps the pair (reactive_system_state, added_dfa_state) to the corresponding state of safety_game
@@ -224,7 +245,7 @@ class SafetyGame:
                     # Transition to sink state (unexplored)
                     safety_game.add_transition(new_state, p1_action, p2_action, safety_game.unexplored_state)
                     continue
-                dfa_successor: int = dfa.getSuccessor(dfa_state, evaluate_output(rs_output))
+                dfa_successor: int = dfa.getSuccessor(dfa_state, rs_output)
                 if (rs_next, dfa_successor) in safety_game.state_mapper:
                     # when the target state is not new
                     next_state = safety_game.state_mapper[(rs_next, dfa_successor)]
@@ -0,0 +1,186 @@
+import sys
+from typing import List, Tuple, Dict, Optional, Iterator, Union
+
+from src.exceptions.shielding_exceptions import InvalidInputError
+
+__author__ = "Masaki Waga <masakiwaga@gmail.com>"
+__status__ = "experimental"
+__version__ = "0.0.1"
+__date__ = "18 October 2026"
+
+
+class SampleTrie:
+    """
+    The class for a prefix trie of the training samples of Mealy machine learning.
+    Each node represents the input word from the root and it has the output of its last letter (if known) and the number
+    of the samples visiting it. Since the common prefixes are shared, adding the same sample or the same prefix many
+    times does not increase the size of the trie.
+
+    The nodes are the integers 0, 1, ... and 0 is the root, i.e., the empty word.
+    """
+
+    ROOT: int = 0
+
+    def __init__(self) -> None:
+        # self.children[node][letter] is the child of node by letter
+        self.children: List[Dict[int, int]] = [{}]
+        # self.outputs[node] is the output of the last letter of node. It is None if it is not known.
+        self.outputs: List[Optional[int]] = [None]
+        # self.visits[node] is the number of the added samples visiting node
+        self.visits: List[int] = [0]
+        self.num_samples: int = 0
+
+    def __len__(self) -> int:
+        """
+        Returns the number of the nodes except for the root
+        """
+        return len(self.children) - 1
+
+    @staticmethod
+    def _to_int(letter: Union[str, int]) -> int:
+        return ord(letter) if type(letter) == str else int(letter)
+
+    def addSample(self, input_word: Union[str, List[int]], output_char: Union[str, int]) -> int:
+        """
+        Add a sample, i.e., an input word and the output of its last letter
+        Args:
+            input_word: the input word
+            output_char: the output of the last letter of input_word
+        Returns:
+            The node of input_word
+        """
+        return self.addWord(input_word, [output_char])
+
+    def addTrace(self, input_word: List[int], output_word: List[int]) -> int:
+        """
+        Add a trace, i.e., an input word and the output of each of its letters
+        Args:
+            input_word: the input word
+            output_word: the output of each letter of input_word
+        Returns:
+            The node of input_word
+        """
+        if len(input_word) != len(output_word):
+            raise InvalidInputError("The input and the output of a trace must have the same length")
+        return self.addWord(input_word, output_word)
+
+    def addWord(self, input_word: Union[str, List[int]], output_word: Union[str, List[int]]) -> int:
+        """
+        Add an input word and the outputs of its last len(output_word) letters
+        Args:
+            input_word: the input word
+            output_word: the outputs of the suffix of input_word
+        Returns:
+            The node of input_word
+        """
+        offset = len(input_word) - len(output_word)
+        if offset < 0:
+            raise InvalidInputError("The output word must not be longer than the input word")
+        letters = [self._to_int(letter) for letter in input_word]
+        outputs = [None] * offset + [self._to_int(output) for output in output_word]
+        # Check the word against the existing path first so that a rejected word does not change the trie
+        node = self.ROOT
+        for letter, output in zip(letters, outputs):
+            node = self.children[node].get(letter)
+            if node is None:
+                break
+            if output is not None and self.outputs[node] is not None and self.outputs[node] != output:
+                raise InvalidInputError(f"Inconsistent outputs for the same input: {self.outputs[node]} and "
+                                        f"{output}")
+        node = self.ROOT
+        self.visits[node] += 1
+        for letter, output in zip(letters, outputs):
+            child = self.children[node].get(letter)
+            if child is None:
+                child = len(self.children)
+                self.children[node][letter] = child
+                self.children.append({})
+                self.outputs.append(None)
+                self.visits.append(0)
+            node = child
+            self.visits[node] += 1
+            if output is not None:
+                self.outputs[node] = output
+        self.num_samples += 1
+        return node
+
+    def getNode(self, input_word: Union[str, List[int]]) -> Optional[int]:
+        """
+        Returns the node of the input word or None if it is not in the trie
+        """
+        node = self.ROOT
+        for letter in input_word:
+            node = self.children[node].get(self._to_int(letter))
+            if node is None:
+                return None
+        return node
+
+    def getOutput(self, input_word: Union[str, List[int]]) -> Optional[int]:
+        """
+        Returns the output of the last letter of the input word or None if it is unknown
+        """
+        node = self.getNode(input_word)
+        return None if node is None else self.outputs[node]
+
+    def getVisits(self, input_word: Union[str, List[int]]) -> int:
+        """
+        Returns the number of the added samples visiting the input word
+        """
+        node = self.getNode(input_word)
+        return 0 if node is None else self.visits[node]
+
+    def getNumSamples(self) -> int:
+        """
+        Returns the number of the added samples including the duplicated ones
+        """
+        return self.num_samples
+
+    def getMemoryFootprint(self) -> int:
+        """
+        Returns the approximated memory footprint of the trie in bytes
+        """
+        return sys.getsizeof(self.children) + sys.getsizeof(self.outputs) + sys.getsizeof(self.visits) + \
+            sum(map(sys.getsizeof, self.children))
+
+    def words(self) -> Iterator[Tuple[List[int], List[int]]]:
+        """
+        Enumerate the content of the trie as pairs of an input word and the outputs of its suffix.
+        A word is generated for each node with an output such that none of its children has an output, and the outputs
+        are of the longest suffix whose outputs are known. Thus, each node with an output is covered by at least one
+        word, and the number of the words is at most the number of the leaves.
+        """
+        input_word: List[int] = []
+        stack: List[Tuple[int, Iterator[Tuple[int, int]]]] = [(self.ROOT, iter(self.children[self.ROOT].items()))]
+        while stack:
+            node, remaining_children = stack[-1]
+            next_child = next(remaining_children, None)
+            if next_child is not None:
+                letter, child = next_child
+                input_word.append(letter)
+                stack.append((child, iter(self.children[child].items())))
+                continue
+            stack.pop()
+            if self.outputs[node] is not None and \
+                    all(self.outputs[child] is None for child in self.children[node].values()):
+                output_word: List[int] = []
+                for ancestor, _ in reversed(stack + [(node, None)]):
+                    if self.outputs[ancestor] is None:
+                        break
+                    output_word.append(self.outputs[ancestor])
+                output_word.reverse()
+                yield list(input_word), output_word
+            if input_word:
+                input_word.pop()
+
+    def samples(self) -> Iterator[Tuple[List[int], int]]:
+        """
+        Enumerate the content of the trie as pairs of an input word and the output of its last letter.
+        Each input word with a known output is generated exactly once.
+        """
+        stack: List[Tuple[int, List[int]]] = [(self.ROOT, [])]
+        while stack:
+            node, input_word = stack.pop()
+            if self.outputs[node] is not None:
+                yield input_word, self.outputs[node]
+            for letter, child in self.children[node].items():
+                stack.append((child, input_word + [letter]))
@@ -0,0 +1,113 @@
+from collections.abc import Mapping, Set as AbstractSet
+from typing import List, Dict, Iterator, Set
+
+import numpy as np
+
+__author__ = "Masaki Waga <masakiwaga@gmail.com>"
+__status__ = "experimental"
+__version__ = "0.0.1"
+__date__ = "18 October 2026"
+
+
+class StrategyTable:
+    """
+    The class for a winning strategy of a safety game represented by NumPy arrays.
+
+    The states are the integers 0, 1, ..., n - 1 and the actions of player 1 are identified by their positions in the
+    alphabet. winning[q] is true iff q is a winning state and safe_actions[q, i] is true iff the i-th action of player 1
+    keeps the game in the winning states at q. Since it consists of two arrays, it is cheap to pickle and to send to
+    another process. win_set and win_strategy are read-only views with the same interface as the pair returned by
+    solve_game.
+    """
+
+    def __init__(self, player1_alphabet: List[int], winning: np.ndarray, safe_actions: np.ndarray) -> None:
+        assert safe_actions.shape == (winning.shape[0], len(player1_alphabet))
+        self.p1_alphabet: List[int] = player1_alphabet
+        self.winning: np.ndarray = winning.astype(bool, copy=False)
+        self.safe_actions: np.ndarray = safe_actions.astype(bool, copy=False)
+
+    @property
+    def num_states(self) -> int:
+        return self.winning.shape[0]
+
+    @property
+    def win_set(self) -> "_WinSet":
+        """
+        The view of the winning states with the same interface as the set returned by solve_game
+        """
+        return _WinSet(self)
+
+    @property
+    def win_strategy(self) -> "_WinStrategy":
+        """
+        The view of the winning strategy with the same interface as the dictionary returned by solve_game
+        """
+        return _WinStrategy(self)
+
+    @classmethod
+    def fromStrategy(cls, player1_alphabet: List[int], num_states: int, win_set: Set[int],
+                     win_strategy: Dict[int, List[int]]) -> "StrategyTable":
+        """
+        Convert the pair returned by solve_game to a StrategyTable. The states must be less than num_states.
+        """
+        p1_index = {action: index for index, action in enumerate(player1_alphabet)}
+        winning = np.zeros(num_states, dtype=bool)
+        winning[list(win_set)] = True
+        safe_actions = np.zeros((num_states, len(player1_alphabet)), dtype=bool)
+        for state, actions in win_strategy.items():
+            safe_actions[state, [p1_index[action] for action in actions]] = True
+        return cls(player1_alphabet, winning, safe_actions)
+
+
+class _WinSet(AbstractSet):
+    """
+    The read-only view of the winning states of StrategyTable
+    """
+
+    def __init__(self, table: StrategyTable) -> None:
+        self.table = table
+
+    def __contains__(self, state) -> bool:
+        return 0 <= state < self.table.num_states and bool(self.table.winning[state])
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(np.flatnonzero(self.table.winning).tolist())
+
+    def __len__(self) -> int:
+        return int(self.table.winning.sum())
+
+    def __repr__(self) -> str:
+        return repr(set(self))
+
+
+class _WinStrategy(Mapping):
+    """
+    The read-only view of the winning strategy of StrategyTable, i.e., view[q] is the list of the player 1 actions
+    keeping the game in the winning states at a winning state q. The lists are cached because the shields look up
+    the current state at every step.
+    """
+
+    def __init__(self, table: StrategyTable) -> None:
+        self.table = table
+        self.cache: Dict[int, List[int]] = {}
+
+    def __getitem__(self, state: int) -> List[int]:
+        actions = self.cache.get(state)
+        if actions is None:
+            if state not in self.table.win_set:
+                raise KeyError(state)
+            actions = [self.table.p1_alphabet[index] for index in np.flatnonzero(self.table.safe_actions[state])]
+            self.cache[state] = actions
+        return actions
+
+    def __contains__(self, state) -> bool:
+        return state in self.table.win_set
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self.table.win_set)
+
+    def __len__(self) -> int:
+        return len(self.table.win_set)
+
+    def __repr__(self) -> str:
+        return repr(dict(self))
@@ -1,4 +1,4 @@
-from .abstract_dynamic_shield import UpdateShield
+from .abstract_dynamic_shield import UpdateShield, ReconstructionBackend
 from .abstract_shield import AbstractShield
 from .dynamic_shield import DynamicShield
 from .safe_padding import SafePadding
@@ -6,3 +6,6 @@ from .adaptive_dynamic_shield import AdaptiveDynamicShield
 from .generic_shield import GenericDynamicShield, GenericAdaptiveDynamicShield, GenericSafePadding
 from .pta_dynamic_shield import PTADynamicShield
 from .static_shield import StaticShield
+from .vectorized_shield import VectorizedShield
+from .shield_tables import ShieldTables
+from .shared_shield import SharedShieldPublisher, SharedShieldSubscriber
@@ -1,14 +1,17 @@
 import logging
+import multiprocessing
 import pickle
 from abc import abstractmethod
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, wait
 from enum import Enum, auto
 from logging import getLogger
 from typing import List, Union, Callable, Tuple, Optional
 
 from src.exceptions.shielding_exceptions import UnsafeStateError, UnknownStateError
-from src.logic import ltl_to_dfa_spot, solve_game
-from src.model import SafetyGame, DFA, ReactiveSystem
+from src.logic import ltl_to_dfa_spot, solve_game, construct_and_solve_game, SafetyGameSolver
+from src.logic.incremental_safety_game import IncrementalSafetyGameSolver
+from src.logic.solve_safety_game import construct_and_solve_strategy_table
+from src.model import SafetyGame, DFA, ReactiveSystem, CompiledDFA, ArraySafetyGame, StrategyTable
 from src.shields.abstract_shield import AbstractShield
 
 logging.basicConfig(format='%(asctime)s %(name)s %(levelname)s: %(message)s', level=logging.WARN)
@@ -34,6 +37,17 @@ class ShieldLifeType(Enum):
     STEPS = auto()
 
 
+class ReconstructionBackend(Enum):
+    """
+    The enum to specify where to construct and solve the safety game in the shield reconstruction
+    """
+    # Construct and solve the safety game in the thread calling reconstructShield
+    THREAD = auto()
+    # Construct and solve the safety game in a worker process and receive the successor table and the strategy table.
+    # With concurrent_reconstruction, the thread calling reconstructShield only swaps in the received shield.
+    PROCESS = auto()
+
+
 class AbstractDynamicShield(AbstractShield):
     """
     An abstract class for shields with passive automata learning.
@@ -50,7 +64,9 @@ class AbstractDynamicShield(AbstractShield):
                  evaluateOutput: Callable[[int], Callable[[str], bool]],
                  update_shield: UpdateShield = UpdateShield.RESET, concurrent_reconstruction=False,
                  shield_life_type: ShieldLifeType = ShieldLifeType.EPISODES,
-                 max_shield_life: int = 100, not_use_deviating_shield=False):
+                 max_shield_life: int = 100, not_use_deviating_shield=False,
+                 solver: SafetyGameSolver = SafetyGameSolver.FIXPOINT, incremental_reconstruction=False,
+                 reconstruction_backend: ReconstructionBackend = ReconstructionBackend.THREAD):
 
         """
         The constructor
@@ -63,15 +79,26 @@ class AbstractDynamicShield(AbstractShield):
           shield_life_type: ShieldLifeType: determines if the shield_life is measured in episodes or steps
           max_shield_life: int: The number of the maximum episodes/steps to refresh the learned shield. This is used only when concurrent_reconstruction = True
           not_use_deviating_shield: bool: Do not use the shield if the system behavior is not the same as the learned reactive system until `reset` is called.
+          solver: SafetyGameSolver: The algorithm to solve the safety games in the shield reconstruction
+          incremental_reconstruction: bool: Update the previous safety game and re-solve only the part affected by the
+            change of the learned reactive system instead of constructing and solving the safety game from scratch.
+          reconstruction_backend: ReconstructionBackend: where to construct and solve the safety game. With
+            ReconstructionBackend.PROCESS, the game is always solved by SafetyGameSolver.VECTORIZED in a worker process
+            and incremental_reconstruction is not supported.
         """
         if isinstance(ltl_formula, list):
             self.dfa: List[DFA] = [ltl_to_dfa_spot(formula) for formula in ltl_formula]
+            self.compiled_dfa: List[CompiledDFA] = [dfa.compile(evaluateOutput) for dfa in self.dfa]
         else:
             self.dfa: DFA = ltl_to_dfa_spot(ltl_formula)
+            self.compiled_dfa: List[CompiledDFA] = [self.dfa.compile(evaluateOutput)]
 
         self.ltl_formula = ltl_formula
         self.evaluateOutput = evaluateOutput
         self.history: List[Tuple[int, int]] = []
+        # The outputs in the current episode and the number of the steps already given to add_trace
+        self.output_history: List[int] = []
+        self.flushed_history_length: int = 0
         self.update_shield = update_shield
         self.concurrent_reconstruction = concurrent_reconstruction
         self.future = None
@@ -85,6 +112,18 @@ class AbstractDynamicShield(AbstractShield):
         self.consistent: bool = True
         self.consistent_from_latest_construction = True
         self.not_use_deviating_shield = not_use_deviating_shield
+        self.solver = solver
+        self.incremental_solvers: Optional[List[IncrementalSafetyGameSolver]] = None
+        self.reconstruction_backend = reconstruction_backend
+        self.process_executor: Optional[ProcessPoolExecutor] = None
+        if reconstruction_backend == ReconstructionBackend.PROCESS:
+            assert not incremental_reconstruction, 'incremental_reconstruction is not supported in the worker process'
+            # We do not fork because the JVM of py4j and the threads of the learner are not fork-safe
+            self.process_executor = ProcessPoolExecutor(max_workers=1,
+                                                        mp_context=multiprocessing.get_context('spawn'))
+        if incremental_reconstruction:
+            self.incremental_solvers = [IncrementalSafetyGameSolver(dfa, self.evaluateOutput, solver)
+                                        for dfa in self.compiled_dfa]
         safety_game = SafetyGame(player1_alphabet, player2_alphabet)
         win_set, win_strategy = solve_game(safety_game)
         assert win_set == {0, 1}
@@ -96,42 +135,155 @@ class AbstractDynamicShield(AbstractShield):
     def reconstruct_reactive_system(self) -> ReactiveSystem:
         pass
 
-    def reconstructShield(self) -> None:
+    def cancel_reconstruct_reactive_system(self) -> None:
+        """
+        Make the running reconstruct_reactive_system return as soon as possible. This is called from the main thread
+        when the shield life runs out before the concurrent reconstruction finishes. By default, this does nothing and
+        we wait for the reconstruction.
+        """
+        pass
+
+    def close(self) -> None:
+        """
+        Stop the concurrent reconstruction and wait for it, and then shut down the worker process of
+        ReconstructionBackend.PROCESS. The subclasses release their resources, e.g., the gateway of the learner, after
+        this so that the running reconstruction does not use them. The shield must not be reconstructed after this.
+        """
+        if self.future is not None:
+            if not self.future.cancel() and not self.future.done():
+                self.cancel_reconstruct_reactive_system()
+            # We do not raise the exception of the cancelled reconstruction
+            wait([self.future])
+            self.future = None
+        self.executor.shutdown(wait=True)
+        if self.process_executor is not None:
+            self.process_executor.shutdown(wait=True)
+            self.process_executor = None
+
+    @abstractmethod
+    def add_trace(self, input_word: List[Tuple[int, int]], output_word: List[int]) -> None:
+        """
+        Add the trace of the current episode to the training data
+        Args:
+            input_word: List[Tuple[int, int]] : the pairs of the actions of player 1 and 2
+            output_word: List[int] : the output of each step
+        """
+        pass
+
+    def finish_episode(self, input_word: List[Tuple[int, int]], output_word: List[int],
+                       flushed_length: int = 0) -> None:
+        """
+        Add a finished episode to the training data. This is called once for each finished episode, by reset for the
+        episode of this shield and by VectorizedShield for the episodes of its environments. The subclasses keeping
+        statistics of the episodes override this.
+        Args:
+            input_word: List[Tuple[int, int]] : the pairs of the actions of player 1 and 2
+            output_word: List[int] : the output of each step
+            flushed_length: int : the number of the steps already added by flush_trace. The episode is not added
+              again unless it has more steps.
+        """
+        if len(input_word) > flushed_length:
+            self.add_trace(input_word, output_word)
+
+    def flush_trace(self) -> None:
+        """
+        Add the current episode to the training data if it has new steps. The episode is buffered in move and added
+        as one trace instead of adding each of its prefixes.
+        """
+        if len(self.history) > self.flushed_history_length:
+            self.add_trace(list(self.history), list(self.output_history))
+            self.flushed_history_length = len(self.history)
+
+    def _construct_and_solve_game(self, index: int = 0) -> None:
+        """
+        Construct and solve the safety game for the current reactive system and the index-th DFA
+        """
+        if self.incremental_solvers is not None:
+            self.safety_game, self.win_set, self.win_strategy = \
+                self.incremental_solvers[index].solve(self.reactive_system)
+        else:
+            self.safety_game, self.win_set, self.win_strategy = construct_and_solve_game(
+                self.reactive_system, self.compiled_dfa[index], self.evaluateOutput, self.solver)
+
+    def _reconstruct(self) -> Union[ReactiveSystem, Tuple[ReactiveSystem, Tuple[int, ArraySafetyGame, StrategyTable]]]:
+        """
+        Learn the reactive system. With ReconstructionBackend.PROCESS, this also constructs and solves the safety games
+        in the worker process and returns the learned reactive system and the result of
+        construct_and_solve_strategy_table.
+        """
+        reactive_system = self.reconstruct_reactive_system()
+        if self.reconstruction_backend != ReconstructionBackend.PROCESS:
+            return reactive_system
+        # The worker process cannot evaluate the outputs because evaluateOutput is not picklable. We compile them in
+        # a copy because the main thread may be reading self.compiled_dfa.
+        outputs = {output for transitions in reactive_system.output.values() for output in transitions.values()}
+        compiled_dfa = [dfa.withOutputs(outputs) for dfa in self.compiled_dfa]
+        # This thread waits for the worker process without holding the GIL
+        return reactive_system, self.process_executor.submit(construct_and_solve_strategy_table, reactive_system,
+                                                             compiled_dfa).result()
+
+    def _swap_in(self, index: int, safety_game: ArraySafetyGame, strategy_table: StrategyTable) -> None:
+        """
+        Use the safety game and the strategy constructed by construct_and_solve_strategy_table
+        """
+        self.safety_game = safety_game
+        self.win_set = strategy_table.win_set
+        self.win_strategy = strategy_table.win_strategy
+        LOGGER.debug(f'Size of safety game: {safety_game.num_states}')
+        if index < len(self.compiled_dfa):
+            ltl_formula = self.ltl_formula[index] if isinstance(self.ltl_formula, list) else self.ltl_formula
+            LOGGER.info(f'Enforced formula: {ltl_formula}')
+        elif isinstance(self.dfa, list):
+            LOGGER.error(f'Failed to construct shield!! Use the previous shield')
+        else:
+            LOGGER.warning(f'Failed to construct shield!!')
+
+    def reconstructShield(self, finished_episodes: int = 1) -> None:
         """
         Reconstruct the shield using the current training data
+        Args:
+            finished_episodes: int : the number of the episodes finished since the last call. The shield life measured
+              in episodes is decreased by this while the concurrent reconstruction is running.
         Warning: Given the same input, the produced shield might be different. This is because the mealy machine given
         to the safety game algorithm might differ due to the parallel execution of computeMealy.
         See more details in passive_learning.py.
         """
+        self.flush_trace()
         if self.reactive_system is not None and self.consistent_from_latest_construction:
             LOGGER.info('Reactive system is reused')
             return
         if self.concurrent_reconstruction:
             if self.future is None:
                 assert self._debug_double_initialization_flag is False, 'self.future should be None only once'
-                self.future = self.executor.submit(self.reconstruct_reactive_system)
+                self.future = self.executor.submit(self._reconstruct)
                 self.consistent_from_latest_construction = True
                 return
             elif self.future.done() or self.current_shield_life <= 0:
+                if not self.future.done():
+                    LOGGER.debug('Cancel automata learning because the shield life runs out')
+                    self.cancel_reconstruct_reactive_system()
                 LOGGER.debug('Retrieve automata learning result')
-                self.reactive_system = self.future.result()
+                result = self.future.result()
                 LOGGER.debug('Submit automata reconstruction')
-                self.future = self.executor.submit(self.reconstruct_reactive_system)
+                self.future = self.executor.submit(self._reconstruct)
                 self.consistent_from_latest_construction = True
                 self.current_shield_life = self.max_shield_life
                 self.consistent_from_latest_construction = True
             else:
                 if self.shield_life_type == ShieldLifeType.EPISODES:
-                    self.current_shield_life -= 1
+                    self.current_shield_life -= finished_episodes
                 return
         else:
-            self.reactive_system = self.reconstruct_reactive_system()
+            result = self._reconstruct()
         LOGGER.info('Reactive system is updated')
-        if isinstance(self.dfa, list):
+        if self.reconstruction_backend == ReconstructionBackend.PROCESS:
+            self.reactive_system, solved = result
+            self._swap_in(*solved)
+        elif isinstance(self.dfa, list):
+            self.reactive_system = result
             index = 0
-            for dfa in self.dfa:
-                self.safety_game = SafetyGame.fromReactiveSystemAndDFA(self.reactive_system, dfa, self.evaluateOutput)
-                self.win_set, self.win_strategy = solve_game(self.safety_game)
+            for _ in self.dfa:
+                self._construct_and_solve_game(index)
                 if self.safety_game.getInitialState() in self.win_set:
                     LOGGER.info(f'Enforced formula: {self.ltl_formula[index]}')
                     break
@@ -141,9 +293,9 @@ class AbstractDynamicShield(AbstractShield):
             LOGGER.debug(f'Size of safety game: {len(self.safety_game.getStates())}')
             # move to the state in the reconstructed safety game
         else:
-            self.safety_game = SafetyGame.fromReactiveSystemAndDFA(self.reactive_system, self.dfa, self.evaluateOutput)
+            self.reactive_system = result
+            self._construct_and_solve_game()
             LOGGER.debug(f'Size of safety game: {len(self.safety_game.getStates())}')
-            self.win_set, self.win_strategy = solve_game(self.safety_game)
             if self.safety_game.getInitialState() in self.win_set:
                 LOGGER.info(f'Enforced formula: {self.ltl_formula}')
             else:
@@ -158,7 +310,11 @@ class AbstractDynamicShield(AbstractShield):
         Reset the current execution and restart the Shield state
         """
         LOGGER.debug(f'Latest history: {self.history}')
+        if len(self.history) > 0:
+            self.finish_episode(list(self.history), list(self.output_history), self.flushed_history_length)
         self.history.clear()
+        self.output_history.clear()
+        self.flushed_history_length = 0
         self.state = self.safety_game.getInitialState()
         self.consistent = True
         if self.reactive_system is not None:
@@ -198,6 +354,7 @@ class AbstractDynamicShield(AbstractShield):
             output: str : the output of the transition in MDP
         """
         self.history.append((player1_action, player2_action))
+        self.output_history.append(output)
         if self.reactive_system is not None and self.reactive_system_state is not None and self.consistent:
             try:
                 if output != self.reactive_system.getOutput(self.reactive_system_state, player1_action, player2_action):
@@ -1,7 +1,8 @@
+import operator
 import random
 from abc import ABCMeta, abstractmethod
 from logging import getLogger
-from typing import List, Set, Dict
+from typing import List, Set, Dict, Optional
 
 import numpy as np
 
@@ -31,9 +32,13 @@ class AbstractShield(metaclass=ABCMeta):
     The abstract class of a shield.
     """
     win_set: Set[int]  # The winning states
-    win_strategy: Dict[int, List[int]]  # win_strategy[s] is the winning actions at state s
     state: int  # the current state in the safety game
     safety_game: SafetyGame
+    # The tables compiled from win_strategy by compile_strategy. They are None if they are not used.
+    strategy_compiled: bool
+    strategy_mask: Optional[np.ndarray]  # strategy_mask[s, a] is True iff the action a is winning at state s
+    strategy_bits: Optional[List[int]]  # the bit a of strategy_bits[s] is 1 iff the action a is winning at state s
+    fallback_actions: Optional[List[Optional[List[int]]]]  # win_strategy[s] or None if s is not winning
 
     def __init__(self, safety_game: SafetyGame, win_set: Set[int], win_strategy: Dict[int, List[int]]) -> None:
         """
@@ -45,6 +50,55 @@ class AbstractShield(metaclass=ABCMeta):
         self.state = self.safety_game.getInitialState()
         self.reset()
 
+    @property
+    def win_strategy(self) -> Dict[int, List[int]]:
+        """
+        The winning strategy, i.e., win_strategy[s] is the winning actions at state s
+        """
+        return self._win_strategy
+
+    @win_strategy.setter
+    def win_strategy(self, win_strategy: Dict[int, List[int]]) -> None:
+        self._win_strategy = win_strategy
+        # The tables are compiled again when they are used next time
+        self.strategy_compiled = False
+
+    def compile_strategy(self) -> None:
+        """
+        Compile win_strategy into the tables looked up by preemptive and tick. This is called when the tables are used
+        for the first time after win_strategy is replaced. Since an in-place update of win_strategy is not tracked, we
+        do not compile the strategy of a safety game declaring solved_lazily, e.g., LocalSafetyGame, whose strategy
+        grows when the local solving is resumed. We also do not compile it if the states or the actions are not
+        non-negative integers. Then, win_strategy is used as it is.
+        """
+        strategy_mask, strategy_bits, fallback_actions = None, None, None
+        states = list(self.win_strategy.keys())
+        actions = {action for safe_actions in self.win_strategy.values() for action in safe_actions}
+        if not getattr(self.safety_game, 'solved_lazily', False) and len(states) > 0 and \
+                all(isinstance(value, (int, np.integer)) and value >= 0 for value in states + list(actions)):
+            num_states = int(max(states)) + 1
+            strategy_mask = np.zeros((num_states, int(max(actions, default=-1)) + 1), dtype=bool)
+            strategy_bits = [0] * num_states
+            fallback_actions = [None] * num_states
+            for state, safe_actions in self.win_strategy.items():
+                strategy_mask[state, safe_actions] = True
+                strategy_bits[state] = sum(1 << int(action) for action in set(safe_actions))
+                fallback_actions[state] = safe_actions
+            # The rows are returned by preemptive_mask
+            strategy_mask.setflags(write=False)
+        self.strategy_mask, self.strategy_bits, self.fallback_actions = strategy_mask, strategy_bits, fallback_actions
+        self.strategy_compiled = True
+
+    def _current_safe_actions(self) -> Optional[List[int]]:
+        """
+        Returns the list of the safe actions at the current state, or None if the current state is not winning
+        """
+        if not self.strategy_compiled:
+            self.compile_strategy()
+        if self.fallback_actions is not None:
+            return self.fallback_actions[self.state] if 0 <= self.state < len(self.fallback_actions) else None
+        return self.win_strategy.get(self.state)
+
     @abstractmethod
     def reset(self) -> None:
         """
@@ -70,9 +124,34 @@ class AbstractShield(metaclass=ABCMeta):
         Returns:
           returns the list of the safe actions at the current state.
         """
-        if not self.current_is_winning():
+        safe_actions = self._current_safe_actions()
+        if safe_actions is None:
             raise UnsafeStateError("The current state is not safe according to the shield.")
-        return self.win_strategy[self.state]
+        return safe_actions
+
+    def preemptive_mask(self, num_actions: int) -> np.ndarray:
+        """
+        The method for preemptive shielding returning a boolean mask instead of a list
+        Args:
+          num_actions: int : the number of the actions of player 1, which must be 0, 1, ..., num_actions - 1
+        Returns:
+          returns the read-only array such that mask[a] is True iff the action a is safe at the current state.
+        """
+        safe_actions = self.preemptive()
+        from_compiled_row = self.strategy_compiled and self.fallback_actions is not None and \
+            0 <= self.state < len(self.fallback_actions) and self.fallback_actions[self.state] is safe_actions
+        if not from_compiled_row:
+            # The strategy is not compiled or the subclass returns other actions, e.g., a deviating dynamic shield
+            mask = np.zeros(num_actions, dtype=bool)
+            mask[[action for action in safe_actions if 0 <= action < num_actions]] = True
+            mask.setflags(write=False)
+            return mask
+        if self.strategy_mask.shape[1] < num_actions:
+            # The actions that are winning nowhere are padded once so that each row is returned without copying
+            strategy_mask = np.pad(self.strategy_mask, ((0, 0), (0, num_actions - self.strategy_mask.shape[1])))
+            strategy_mask.setflags(write=False)
+            self.strategy_mask = strategy_mask
+        return self.strategy_mask[self.state, :num_actions]
 
     @monitor_inconsistency
     def postposed(self, player1_action: int) -> int:
@@ -93,22 +172,29 @@ class AbstractShield(metaclass=ABCMeta):
         Returns:
           returns player1_action if player1_action is safe. Otherwise returns one of the safe actions.
         """
-
-        if type(player1_action) == int:
-            player1_transformed_action: int = player1_action
-        elif type(player1_action) == np.int64:
-            player1_transformed_action: int = int(player1_action)
-        else:
+        try:
+            player1_transformed_action: int = operator.index(player1_action)
+        except TypeError:
             raise ValueError(f'An action must be either int. Got {type(player1_action)}')
 
-        if self.state in self.win_set:
-            if player1_transformed_action in self.win_strategy[self.state]:
-                return player1_transformed_action
+        if not self.strategy_compiled:
+            self.compile_strategy()
+        if self.strategy_bits is None:
+            if self.state in self.win_set:
+                if player1_transformed_action in self.win_strategy[self.state]:
+                    return player1_transformed_action
+                else:
+                    return random.choice(self.win_strategy[self.state])
             else:
-                return random.choice(self.win_strategy[self.state])
-        else:
+                # returns player1_action when there is no safe actions
+                return player1_transformed_action
+        if not 0 <= self.state < len(self.strategy_bits) or self.fallback_actions[self.state] is None:
             # returns player1_action when there is no safe actions
             return player1_transformed_action
+        if player1_transformed_action >= 0 and self.strategy_bits[self.state] >> player1_transformed_action & 1:
+            return player1_transformed_action
+        else:
+            return random.choice(self.fallback_actions[self.state])
 
     def move(self, player1_action: int, player2_action: int, output: int = None) -> None:
         """
@@ -1,11 +1,12 @@
 import math
-from typing import List, Tuple, Callable, Union
+from typing import List, Tuple, Callable, Union, Optional
 
 from py4j.java_gateway import JavaGateway
 
+from src.logic import SafetyGameSolver, GatewayPool
 from src.model import ReactiveSystem
 from src.shields import DynamicShield
-from src.shields.abstract_dynamic_shield import ShieldLifeType, UpdateShield
+from src.shields.abstract_dynamic_shield import ShieldLifeType, UpdateShield, ReconstructionBackend
 
 
 class AdaptiveDynamicShield(DynamicShield):
@@ -13,7 +14,7 @@ class AdaptiveDynamicShield(DynamicShield):
     Dynamic shield with adaptive min_depth
     """
 
-    def __init__(self, ltl_formula: Union[str, List[str]], gateway: JavaGateway,
+    def __init__(self, ltl_formula: Union[str, List[str]], gateway: Union[JavaGateway, GatewayPool],
                  alphabet_start: int, alphabet_end: int,
                  alphabet_mapper: Callable[[int], Tuple[int, int]],
                  evaluate_output: Callable[[int], Callable[[str], bool]],
@@ -25,10 +26,14 @@ class AdaptiveDynamicShield(DynamicShield):
                  concurrent_reconstruction=False, max_shield_life=100,
                  not_use_deviating_shield=False, skip_mealy_size: int = 0,
                  factor: float = 1.0, discard_min_duration: int = 20,
-                 max_min_depth: int = 10):
+                 max_min_depth: int = 10, solver: SafetyGameSolver = SafetyGameSolver.FIXPOINT,
+                 incremental_reconstruction=False,
+                 reconstruction_backend: ReconstructionBackend = ReconstructionBackend.THREAD,
+                 incremental_learning: bool = False, learner_parallelism: Optional[int] = None,
+                 deterministic_learning: bool = False, learning_timeout: Optional[float] = None):
         """
         :param ltl_formula: str : the LTL formula for the shielded specification
-        :param gateway: JavaGateway : The java gateway of py4j
+        :param gateway: Union[JavaGateway, GatewayPool] : The java gateway of py4j or the pool to lease it from
         :param alphabet_start: int : The beginning character of the input alphabet of the Mealy machine
         :param alphabet_end: int : The end character of the input alphabet of the Mealy machine
         :param alphabet_mapper: Callable[[str],(str, str)] : a callable that defines how to split the alphabet
@@ -47,6 +52,13 @@ class AdaptiveDynamicShield(DynamicShield):
         :param skip_mealy_size: int : We do not merge the states if the Mealy machine is smaller than this
         :param factor: We should increase this when the proposition is the same in most of the positions in the arena.
         :param discard_min_duration:
+        :param solver: SafetyGameSolver : the algorithm to solve the safety games in the shield reconstruction
+        :param incremental_reconstruction: bool : construct and solve the safety game incrementally from the previous one
+        :param reconstruction_backend: ReconstructionBackend : where to construct and solve the safety game
+        :param incremental_learning: bool : reuse the last Mealy machine if the new samples are consistent with it
+        :param learner_parallelism: Optional[int] : the number of the threads of the learner. See PassiveLearning.
+        :param deterministic_learning: bool : make the learned Mealy machine reproducible
+        :param learning_timeout: Optional[float] : the time limit of the state merging in each reconstruction in seconds
 
         .. NOTE::
             The constructed alphabet includes both alphabet_start and alphabet_end. For example, if alphabet_start = 1
@@ -61,7 +73,10 @@ class AdaptiveDynamicShield(DynamicShield):
         super(AdaptiveDynamicShield, self).__init__(ltl_formula, gateway, alphabet_start, alphabet_end, alphabet_mapper,
                                                     evaluate_output, reverse_alphabet_mapper, reverse_output_mapper,
                                                     update_shield, shield_life_type, 1, concurrent_reconstruction,
-                                                    max_shield_life, not_use_deviating_shield, skip_mealy_size)
+                                                    max_shield_life, not_use_deviating_shield, skip_mealy_size,
+                                                    solver, incremental_reconstruction, reconstruction_backend,
+                                                    incremental_learning, learner_parallelism, deterministic_learning,
+                                                    learning_timeout)
 
     def compute_min_depth(self) -> int:
         mean_episode_length = sum(self.episode_lengths) / len(self.episode_lengths)
@@ -84,7 +99,8 @@ class AdaptiveDynamicShield(DynamicShield):
             self.smallest_min_depth = self.learner.min_depth
         return super(AdaptiveDynamicShield, self).reconstruct_reactive_system()
 
-    def reset(self) -> None:
-        if len(self.history) > 0:
-            self.episode_lengths.append(len(self.history))
-        super(AdaptiveDynamicShield, self).reset()
+    def finish_episode(self, input_word: List[Tuple[int, int]], output_word: List[int],
+                       flushed_length: int = 0) -> None:
+        if len(input_word) > 0:
+            self.episode_lengths.append(len(input_word))
+        super(AdaptiveDynamicShield, self).finish_episode(input_word, output_word, flushed_length)
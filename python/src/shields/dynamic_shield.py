@@ -4,11 +4,12 @@ from typing import Callable, Tuple, List, Union, Optional
 
 from py4j.java_gateway import JavaGateway
 
-from src.logic import PassiveLearning
+from src.logic import PassiveLearning, SafetyGameSolver, GatewayPool
 from src.logic.make_transition_cover import make_transition_cover
 from src.logic.reduce_training_data import ReduceTrainingData
 from src.model import ReactiveSystem, MealyMachine
-from src.shields.abstract_dynamic_shield import AbstractDynamicShield, UpdateShield, ShieldLifeType
+from src.shields.abstract_dynamic_shield import AbstractDynamicShield, UpdateShield, ShieldLifeType, \
+    ReconstructionBackend
 
 LOGGER = getLogger(__name__)
 
@@ -31,7 +32,7 @@ class DynamicShield(AbstractDynamicShield):
       7. at the beginning of each episode (i.e., when we reset the play and go back to the initial state of the arena), run dynamic_shield.reset().
     """
 
-    def __init__(self, ltl_formula: Union[str, List[str]], gateway: JavaGateway,
+    def __init__(self, ltl_formula: Union[str, List[str]], gateway: Union[JavaGateway, GatewayPool],
                  alphabet_start: int, alphabet_end: int,
                  alphabet_mapper: Callable[[int], Tuple[int, int]],
                  evaluate_output: Callable[[int], Callable[[str], bool]],
@@ -40,10 +41,14 @@ class DynamicShield(AbstractDynamicShield):
                  update_shield: UpdateShield = UpdateShield.RESET,
                  shield_life_type: ShieldLifeType = ShieldLifeType.EPISODES,
                  min_depth: int = 0, concurrent_reconstruction=False, max_shield_life=100,
-                 not_use_deviating_shield=False, skip_mealy_size: int = 0):
+                 not_use_deviating_shield=False, skip_mealy_size: int = 0,
+                 solver: SafetyGameSolver = SafetyGameSolver.FIXPOINT, incremental_reconstruction=False,
+                 reconstruction_backend: ReconstructionBackend = ReconstructionBackend.THREAD,
+                 incremental_learning: bool = False, learner_parallelism: Optional[int] = None,
+                 deterministic_learning: bool = False, learning_timeout: Optional[float] = None):
         """
         :param ltl_formula: str : the LTL formula for the shielded specification
-        :param gateway: JavaGateway : The java gateway of py4j
+        :param gateway: Union[JavaGateway, GatewayPool] : The java gateway of py4j or the pool to lease it from
         :param alphabet_start: int : The beginning character of the input alphabet of the Mealy machine
         :param alphabet_end: int : The end character of the input alphabet of the Mealy machine
         :param alphabet_mapper: Callable[[str],(str, str)] : a callable that defines how to split the alphabet
@@ -56,13 +61,23 @@ class DynamicShield(AbstractDynamicShield):
         :param max_shield_life: int: The number of the maximum episodes/steps to refresh the learned shield. This is used only when concurrent_reconstruction = True
         :param not_use_deviating_shield: bool: Do not use the shield if the system behavior is not the same as the learned reactive system until `reset` is called.
         :param skip_mealy_size: int : We do not merge the states if the Mealy machine is smaller than this
+        :param solver: SafetyGameSolver : the algorithm to solve the safety games in the shield reconstruction
+        :param incremental_reconstruction: bool : construct and solve the safety game incrementally from the previous one
+        :param reconstruction_backend: ReconstructionBackend : where to construct and solve the safety game
+        :param incremental_learning: bool : reuse the last Mealy machine if the new samples are consistent with it
+        :param learner_parallelism: Optional[int] : the number of the threads of the learner. See PassiveLearning.
+        :param deterministic_learning: bool : make the learned Mealy machine reproducible
+        :param learning_timeout: Optional[float] : the time limit of the state merging in each reconstruction in seconds
 
         .. NOTE::
             The constructed alphabet includes both alphabet_start and alphabet_end. For example, if alphabet_start = 1
             and alphabet_end = 3, the constructed alphabet is [1, 2, 3].
         """
         self.learner: PassiveLearning = PassiveLearning(gateway, alphabet_start, alphabet_end,
-                                                        min_depth=min_depth, skip_mealy_size=skip_mealy_size)
+                                                        min_depth=min_depth, skip_mealy_size=skip_mealy_size,
+                                                        incremental=incremental_learning,
+                                                        parallelism=learner_parallelism,
+                                                        deterministic=deterministic_learning)
         self.alphabetMapper = alphabet_mapper
         self.reverse_alphabet_mapper = reverse_alphabet_mapper
         self.reverse_output_mapper = reverse_output_mapper
@@ -77,13 +92,27 @@ class DynamicShield(AbstractDynamicShield):
         super(DynamicShield, self).__init__(ltl_formula, player1_alphabet, player2_alphabet,
                                             evaluate_output, update_shield, concurrent_reconstruction,
                                             shield_life_type, max_shield_life,
-                                            not_use_deviating_shield=not_use_deviating_shield)
+                                            not_use_deviating_shield=not_use_deviating_shield, solver=solver,
+                                            incremental_reconstruction=incremental_reconstruction,
+                                            reconstruction_backend=reconstruction_backend)
         self.mealy: Optional[MealyMachine] = None
+        self.learning_timeout = learning_timeout
+
+    def close(self) -> None:
+        """
+        Stop the concurrent reconstruction and return the gateway to the pool if it is leased from a GatewayPool. The
+        shield must not be reconstructed after this.
+        """
+        super(DynamicShield, self).close()
+        self.learner.close()
 
     def reconstruct_reactive_system(self) -> ReactiveSystem:
-        self.mealy = self.learner.computeMealy()
+        self.mealy = self.learner.computeMealy(self.learning_timeout)
         return ReactiveSystem.fromMealyMachine(self.mealy, self.alphabetMapper)
 
+    def cancel_reconstruct_reactive_system(self) -> None:
+        self.learner.cancel()
+
     def addSample(self, input_word: List[int], output_char: int) -> None:
         """
         Add a training pair
@@ -101,21 +130,19 @@ class DynamicShield(AbstractDynamicShield):
         """
         self.learner.addSamples(training_data)
 
-    def move(self, player1_action: int, player2_action: int, output: int) -> None:
+    def add_trace(self, input_word: List[Tuple[int, int]], output_word: List[int]) -> None:
         """
-        Move the current state of the safety game
+        Add a trace
         Args:
-            player1_action: str : the action by player 1 in MDP
-            player2_action: str : the action by player 2 in MDP
-            output: str : the output of the transition in MDP
+            input_word: List[Tuple[int, int]] : the pairs of the actions of player 1 and 2
+            output_word: List[int] : the output of each step
         """
-        mealy_actions: List[int] = []
-        for (player1_history_action, player2_history_action) in self.history + [(player1_action, player2_action)]:
-            mealy_actions.append(self.reverse_alphabet_mapper(player1_history_action, player2_history_action))
-        self.learner.addSample(mealy_actions, self.reverse_output_mapper(output))
-        super(DynamicShield, self).move(player1_action, player2_action, output)
+        self.learner.addTrace([self.reverse_alphabet_mapper(player1_action, player2_action)
+                               for player1_action, player2_action in input_word],
+                              [self.reverse_output_mapper(output) for output in output_word])
 
     def return_transition_cover(self) -> List[Tuple[List[int], int]]:
+        self.flush_trace()
         if self.future is None:
             mealy = self.learner.computeMealy()
         else:
@@ -125,6 +152,7 @@ class DynamicShield(AbstractDynamicShield):
         return make_transition_cover(mealy)
 
     def return_nonredundant_training_data(self) -> List[Tuple[List[int], int]]:
+        self.flush_trace()
         if self.future is None:
             mealy = self.learner.computeMealy()
         else:
@@ -142,6 +170,7 @@ class DynamicShield(AbstractDynamicShield):
             pickle.dump(self.return_transition_cover(), f)
 
     def save_full_samples(self, pickle_filename: str) -> None:
+        self.flush_trace()
         with open(pickle_filename, mode='wb') as f:
             pickle.dump(self.learner.getSamples(), f)
 
@@ -1,24 +1,36 @@
 from benchmarks.common.generic import AbstractInputOutputManager
 from src.shields import DynamicShield, AdaptiveDynamicShield, SafePadding
-from src.shields.abstract_dynamic_shield import ShieldLifeType
+from src.logic import SafetyGameSolver, GatewayPool
+from src.shields.abstract_dynamic_shield import ShieldLifeType, ReconstructionBackend
 from py4j.java_gateway import JavaGateway
-from typing import Tuple
+from typing import Tuple, Union, Optional
 
 
 class GenericDynamicShield(DynamicShield):
-    def __init__(self, ltl_formula: str, gateway: JavaGateway, io_manager: AbstractInputOutputManager,
+    def __init__(self, ltl_formula: str, gateway: Union[JavaGateway, GatewayPool], io_manager: AbstractInputOutputManager,
                  shield_life_type: ShieldLifeType = ShieldLifeType.EPISODES, max_shield_life: int = 100,
-                 min_depth: int = 0, concurrent_reconstruction=True, not_use_deviating_shield=False) -> None:
+                 min_depth: int = 0, concurrent_reconstruction=True, not_use_deviating_shield=False,
+                 solver: SafetyGameSolver = SafetyGameSolver.FIXPOINT, incremental_reconstruction=False,
+                 reconstruction_backend: ReconstructionBackend = ReconstructionBackend.THREAD,
+                 incremental_learning: bool = False, learner_parallelism: Optional[int] = None,
+                 deterministic_learning: bool = False, learning_timeout: Optional[float] = None) -> None:
         """
            The constructor
            Args:
             ltl_formula: str : the LTL formula for the shielded specification
-            gateway: JavaGateway : the java gateway of py4j
+            gateway: Union[JavaGateway, GatewayPool] : the java gateway of py4j or the pool to lease it from
             io_manager: AbstractInputOutputManager: defines input/output mappings
             shield_life_type: ShieldLifeType: determines if the shield_life is measured in episodes or steps
             max_shield_life: int: The number of the maximum episodes/steps to refresh the learned shield.
                                   This is used only when concurrent_reconstruction = True
             min_depth : int: the minimum depth we require to merge
+            solver: SafetyGameSolver: the algorithm to solve the safety games in the shield reconstruction
+            incremental_reconstruction: bool: construct and solve the safety game incrementally from the previous one
+            reconstruction_backend: ReconstructionBackend: where to construct and solve the safety game
+            incremental_learning: bool: reuse the last Mealy machine if the new samples are consistent with it
+            learner_parallelism: Optional[int]: the number of the threads of the learner. See PassiveLearning.
+            deterministic_learning: bool: make the learned Mealy machine reproducible
+            learning_timeout: Optional[float]: the time limit of the state merging in each reconstruction in seconds
         """
 
         self.io_manager = io_manager
@@ -34,23 +46,41 @@ class GenericDynamicShield(DynamicShield):
                                concurrent_reconstruction=concurrent_reconstruction,
                                min_depth=min_depth,
                                shield_life_type=shield_life_type,
-                               max_shield_life=max_shield_life)
+                               max_shield_life=max_shield_life,
+                               solver=solver,
+                               incremental_reconstruction=incremental_reconstruction,
+                               reconstruction_backend=reconstruction_backend,
+                               incremental_learning=incremental_learning,
+                               learner_parallelism=learner_parallelism,
+                               deterministic_learning=deterministic_learning,
+                               learning_timeout=learning_timeout)
 
 
 class GenericAdaptiveDynamicShield(AdaptiveDynamicShield):
-    def __init__(self, ltl_formula: str, gateway: JavaGateway, io_manager: AbstractInputOutputManager,
+    def __init__(self, ltl_formula: str, gateway: Union[JavaGateway, GatewayPool], io_manager: AbstractInputOutputManager,
                  max_episode_length, shield_life_type: ShieldLifeType = ShieldLifeType.EPISODES,
-                 max_shield_life: int = 100, concurrent_reconstruction=True, not_use_deviating_shield=False) -> None:
+                 max_shield_life: int = 100, concurrent_reconstruction=True, not_use_deviating_shield=False,
+                 solver: SafetyGameSolver = SafetyGameSolver.FIXPOINT, incremental_reconstruction=False,
+                 reconstruction_backend: ReconstructionBackend = ReconstructionBackend.THREAD,
+                 incremental_learning: bool = False, learner_parallelism: Optional[int] = None,
+                 deterministic_learning: bool = False, learning_timeout: Optional[float] = None) -> None:
         """
            The constructor
            Args:
             ltl_formula: str : the LTL formula for the shielded specification
-            gateway: JavaGateway : the java gateway of py4j
+            gateway: Union[JavaGateway, GatewayPool] : the java gateway of py4j or the pool to lease it from
             io_manager: AbstractInputOutputManager: defines input/output mappings
             max_episode_length: maximum number of steps per episode
             shield_life_type: ShieldLifeType: determines if the shield_life is measured in episodes or steps
             max_shield_life: int: The number of the maximum episodes/steps to refresh the learned shield.
                                   This is used only when concurrent_reconstruction = True
+            solver: SafetyGameSolver: the algorithm to solve the safety games in the shield reconstruction
+            incremental_reconstruction: bool: construct and solve the safety game incrementally from the previous one
+            reconstruction_backend: ReconstructionBackend: where to construct and solve the safety game
+            incremental_learning: bool: reuse the last Mealy machine if the new samples are consistent with it
+            learner_parallelism: Optional[int]: the number of the threads of the learner. See PassiveLearning.
+            deterministic_learning: bool: make the learned Mealy machine reproducible
+            learning_timeout: Optional[float]: the time limit of the state merging in each reconstruction in seconds
         """
 
         self.io_manager = io_manager
@@ -66,7 +96,14 @@ class GenericAdaptiveDynamicShield(AdaptiveDynamicShield):
                                        concurrent_reconstruction=concurrent_reconstruction,
                                        shield_life_type=shield_life_type,
                                        max_shield_life=max_shield_life,
-                                       max_episode_length=max_episode_length)
+                                       max_episode_length=max_episode_length,
+                                       solver=solver,
+                                       incremental_reconstruction=incremental_reconstruction,
+                                       reconstruction_backend=reconstruction_backend,
+                                       incremental_learning=incremental_learning,
+                                       learner_parallelism=learner_parallelism,
+                                       deterministic_learning=deterministic_learning,
+                                       learning_timeout=learning_timeout)
 
 
 class GenericSafePadding(SafePadding):
@@ -2,9 +2,9 @@ from copy import deepcopy
 from logging import getLogger
 from typing import Callable, Tuple, List, Union
 
-from src.logic import BlueFringeRPNI
+from src.logic import BlueFringeRPNI, UnionFindRPNI, SafetyGameSolver
 from src.model import ReactiveSystem
-from src.shields.abstract_dynamic_shield import AbstractDynamicShield, UpdateShield
+from src.shields.abstract_dynamic_shield import AbstractDynamicShield, UpdateShield, ReconstructionBackend
 
 LOGGER = getLogger(__name__)
 
@@ -31,7 +31,10 @@ class PTADynamicShield(AbstractDynamicShield):
                  player1_alphabet: List[int], player2_alphabet: List[int], output_alphabet: List[int],
                  evaluate_output: Callable[[int], Callable[[str], bool]],
                  update_shield: UpdateShield = UpdateShield.RESET,
-                 min_depth: int = 999999999999999, no_merging: bool = True):
+                 min_depth: int = 999999999999999, no_merging: bool = True,
+                 solver: SafetyGameSolver = SafetyGameSolver.FIXPOINT, incremental_reconstruction: bool = False,
+                 union_find_merging: bool = False, array_pta: bool = False,
+                 reconstruction_backend: ReconstructionBackend = ReconstructionBackend.THREAD):
         """
         The constructor
         Args:
@@ -42,16 +45,26 @@ class PTADynamicShield(AbstractDynamicShield):
           evaluate_output: Callable[[str], Callable[[str], bool]] : The function to evaluate the output of the reactive system
           update_shield: UpdateShield: specify where to reconstruct the shield
           min_depth: int : minimum depth of the state merging (by default, we do not merge states)
+          solver: SafetyGameSolver : the algorithm to solve the safety games in the shield reconstruction
+          incremental_reconstruction: bool : construct and solve the safety game incrementally from the previous one
+          union_find_merging: bool : merge the states by UnionFindRPNI instead of BlueFringeRPNI. It is a different
+            learner, which is always consistent with the training data, and the learned shield may differ.
+          array_pta: bool : store the training data in ArrayPTA, whose insertion does not depend on the size of the PTA
+          reconstruction_backend: ReconstructionBackend : where to construct and solve the safety game
         """
         self.player1_alphabet: List[int] = player1_alphabet
         self.player2_alphabet: List[int] = player2_alphabet
         self.output_alphabet: List[int] = output_alphabet
         assert len(player2_alphabet) > 0, "player2_alphabet must be nonempty"
-        self.learner: BlueFringeRPNI = BlueFringeRPNI(player1_alphabet, player2_alphabet, output_alphabet)
+        learner_class = UnionFindRPNI if union_find_merging else BlueFringeRPNI
+        self.learner: BlueFringeRPNI = learner_class(player1_alphabet, player2_alphabet, output_alphabet,
+                                                      array_pta=array_pta)
         self.min_depth: int = min_depth
         self.no_merging = no_merging
         super(PTADynamicShield, self).__init__(ltl_formula, player1_alphabet, player2_alphabet,
-                                               evaluate_output, update_shield)
+                                               evaluate_output, update_shield, solver=solver,
+                                               incremental_reconstruction=incremental_reconstruction,
+                                               reconstruction_backend=reconstruction_backend)
 
     def reconstruct_reactive_system(self) -> ReactiveSystem:
         if self.no_merging:
@@ -77,13 +90,11 @@ class PTADynamicShield(AbstractDynamicShield):
         for input_word, output_action in training_data:
             self.learner.addSample(input_word, output_action)
 
-    def move(self, player1_action: int, player2_action: int, output: int) -> None:
+    def add_trace(self, input_word: List[Tuple[int, int]], output_word: List[int]) -> None:
         """
-        Move the current state of the safety game
+        Add a trace
         Args:
-            player1_action: str : the action by player 1 in MDP
-            player2_action: str : the action by player 2 in MDP
-            output: str : the output of the transition in MDP
+            input_word: List[Tuple[int, int]] : the pairs of the actions of player 1 and 2
+            output_word: List[int] : the output of each step
         """
-        self.addSample(self.history + [(player1_action, player2_action)], output)
-        super(PTADynamicShield, self).move(player1_action, player2_action, output)
+        self.learner.addTrace(input_word, output_word)
@@ -1,11 +1,11 @@
 import pickle
 from abc import ABC, abstractmethod
 from logging import getLogger
-from typing import List, Union, Callable, Set, Tuple, Dict
+from typing import List, Union, Callable, Set, Tuple, Dict, Optional
 
 from src.logic import ltl_to_dfa_spot
 from src.logic.mdp_learner import MDPLearner
-from src.model import DFA
+from src.model import DFA, CompiledDFA
 from src.model.mdp import MDP
 
 LOGGER = getLogger(__name__)
@@ -16,13 +16,16 @@ class AbstractSafePadding(ABC):
                  evaluate_output: Callable[[int], Callable[[str], bool]],
                  horizon: Callable[[int], int] = lambda _: 1,
                  rank: Callable[[int], int] = lambda _: 10000,
-                 critical_probability: float = 1.0):
+                 critical_probability: float = 1.0,
+                 output_alphabet: Optional[List[int]] = None):
         assert horizon(1) > 0, 'Horizon must be positive'
         if isinstance(ltl_formula, list):
             self.dfa: List[DFA] = [ltl_to_dfa_spot(formula) for formula in ltl_formula]
+            self.compiled_dfa: List[CompiledDFA] = [dfa.compile(evaluate_output, output_alphabet) for dfa in self.dfa]
             self.current_dfa_state = [dfa.getInitialState() for dfa in self.dfa]
         else:
             self.dfa: DFA = ltl_to_dfa_spot(ltl_formula)
+            self.compiled_dfa: CompiledDFA = self.dfa.compile(evaluate_output, output_alphabet)
             self.current_dfa_state = self.dfa.getInitialState()
         self.evaluate_output = evaluate_output
         self.horizon = horizon
@@ -47,14 +50,14 @@ class AbstractSafePadding(ABC):
     def is_safe_dfa_state_list(self, dfa_state_list: List[int]) -> List[bool]:
         if not isinstance(self.dfa, list):
             raise RuntimeError
-        return [dfa_state_list[i] in self.dfa[i].safeStates for i in range(len(self.dfa))]
+        return [self.compiled_dfa[i].isSafe(dfa_state_list[i]) for i in range(len(self.compiled_dfa))]
 
     def get_successors_dfa(self, dfa_state_list: Union[List[int], int], output: int) -> Union[List[int], int]:
-        if not isinstance(self.dfa, list):
-            return self.dfa.getSuccessor(dfa_state_list, self.evaluate_output(output))
+        if not isinstance(self.compiled_dfa, list):
+            return self.compiled_dfa.getSuccessor(dfa_state_list, output)
         else:
-            return [self.dfa[i].getSuccessor(dfa_state_list[i], self.evaluate_output(output))
-                    for i in range(len(self.dfa))]
+            return [self.compiled_dfa[i].getSuccessor(dfa_state_list[i], output)
+                    for i in range(len(self.compiled_dfa))]
 
     def compute_bounded_safe_states(self, mdp: MDP, initial_mdp_state: int, initial_dfa_state, horizon: int) -> \
             Set[int]:
@@ -64,7 +67,7 @@ class AbstractSafePadding(ABC):
         while len(queue) > 0:
             mdp_state, dfa_state, distance = queue.pop(0)
             if (isinstance(dfa_state, list) and all(self.is_safe_dfa_state_list(dfa_state))) or \
-                    (not isinstance(dfa_state, list) and dfa_state in self.dfa.safeStates):
+                    (not isinstance(dfa_state, list) and self.compiled_dfa.isSafe(dfa_state)):
                 safe_states.add(mdp_state)
                 if distance < horizon:
                     for player1_action in mdp.getPlayer1Alphabet():
@@ -162,7 +165,8 @@ class SafePadding(AbstractSafePadding):
         """
         super().__init__(ltl_formula,
                          evaluate_output=evaluate_output,
-                         horizon=horizon, rank=rank, critical_probability=critical_probability)
+                         horizon=horizon, rank=rank, critical_probability=critical_probability,
+                         output_alphabet=output_alphabet)
         self.mdp_learner = MDPLearner(player1_alphabet, player2_alphabet, output_alphabet)
         self.reset()
 
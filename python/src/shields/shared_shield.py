@@ -0,0 +1,169 @@
+from logging import getLogger
+from multiprocessing.shared_memory import SharedMemory
+from typing import Optional
+
+import numpy as np
+
+from src.shields.shield_tables import ShieldTables
+
+__author__ = "Masaki Waga <masakiwaga@gmail.com>"
+__status__ = "experimental"
+__version__ = "0.0.1"
+__date__ = "18 October 2026"
+
+LOGGER = getLogger(__name__)
+
+
+def _attach(name: str) -> SharedMemory:
+    """
+    Attach to an existing shared memory segment without tracking it where possible. Before Python 3.13, the segment is
+    registered to the resource tracker, which is shared with the parent process in the processes started by
+    multiprocessing. Since the registration is idempotent, the segments are unlinked only by the publisher.
+    """
+    try:
+        return SharedMemory(name=name, track=False)
+    except TypeError:
+        # track is not supported before Python 3.13
+        return SharedMemory(name=name)
+
+
+def _segment_name(name: str, generation: int) -> str:
+    return f'{name}_{generation}'
+
+
+class SharedShieldPublisher:
+    """
+    The class to publish the tables of a shield to other processes, e.g., the workers of SubprocVecEnv, through shared
+    memory.
+
+    Each published version of the tables is a generation. The tables of a generation are written to a new shared memory
+    segment, and then the generation counter in the control segment is updated. Thus, a subscriber never sees a
+    partially written generation. The segment of the previous generation is unlinked when a new generation is
+    published. The subscribers already mapping it keep using it until they switch to the new generation.
+
+    Usage:
+      publisher = SharedShieldPublisher('my_shield')
+      publisher.publish(ShieldTables.fromShield(shield, num_actions))  # In the learner process
+      ...
+      subscriber = SharedShieldSubscriber('my_shield')  # In a worker process
+      tables = subscriber.poll()
+      ...
+      publisher.close()
+    """
+
+    def __init__(self, name: str) -> None:
+        """
+        The constructor. The control segment is created here.
+
+        :param name: str : the name of the control segment. The segments of the generations are named name_generation.
+        """
+        self.name = name
+        self.control = SharedMemory(name=name, create=True, size=8)
+        # The generation counter. 0 means that nothing is published yet.
+        self.generation = np.ndarray((1,), dtype=np.int64, buffer=self.control.buf)
+        self.generation[0] = 0
+        self.segment: Optional[SharedMemory] = None
+
+    def publish(self, tables: ShieldTables) -> int:
+        """
+        Publish the tables as a new generation
+
+        :param tables: ShieldTables : the published tables
+        :return: the generation of the published tables
+        """
+        generation = int(self.generation[0]) + 1
+        segment = SharedMemory(name=_segment_name(self.name, generation), create=True, size=tables.nbytes)
+        tables.write(segment.buf)
+        # The subscribers switch to the new generation after this
+        self.generation[0] = generation
+        if self.segment is not None:
+            self.segment.close()
+            self.segment.unlink()
+        self.segment = segment
+        LOGGER.debug(f'Published generation {generation} of the shield: {tables.num_states} states')
+        return generation
+
+    def close(self) -> None:
+        """
+        Unlink all the segments. The subscribers mapping them can keep using them.
+        """
+        if self.segment is not None:
+            self.segment.close()
+            self.segment.unlink()
+            self.segment = None
+        if self.control is not None:
+            del self.generation
+            self.control.close()
+            self.control.unlink()
+            self.control = None
+
+    def __enter__(self) -> 'SharedShieldPublisher':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+
+class SharedShieldSubscriber:
+    """
+    The class to read the tables published by SharedShieldPublisher. The tables are mapped without copying.
+    """
+
+    def __init__(self, name: str) -> None:
+        """
+        The constructor
+
+        :param name: str : the name given to SharedShieldPublisher
+        """
+        self.name = name
+        self.control = _attach(name)
+        self.published_generation = np.ndarray((1,), dtype=np.int64, buffer=self.control.buf)
+        # The generation of self.tables. 0 means that no tables are read yet.
+        self.generation: int = 0
+        self.segment: Optional[SharedMemory] = None
+        # The segment of the previous generation. Closing a segment unmaps it even if a view of its tables is alive,
+        # so it is kept open until the next switch, when the user has replaced the previous tables.
+        self.retired_segment: Optional[SharedMemory] = None
+        self.tables: Optional[ShieldTables] = None
+
+    def poll(self) -> Optional[ShieldTables]:
+        """
+        Switch to the latest generation if a new generation is published. This should be called at the boundaries of
+        the episodes because the states of the old tables are not valid in the new tables. The tables of the previous
+        generation and their views remain valid until the next switch, so they must be dropped before it.
+
+        :return: the tables of the latest generation if they are new, and None otherwise
+        """
+        while True:
+            generation = int(self.published_generation[0])
+            if generation == self.generation:
+                return None
+            try:
+                segment = _attach(_segment_name(self.name, generation))
+                break
+            except FileNotFoundError:
+                # The generation is unlinked because a newer generation is published in the meantime
+                continue
+        if self.retired_segment is not None:
+            self.retired_segment.close()
+        self.retired_segment = self.segment
+        self.tables = ShieldTables.fromBuffer(segment.buf)
+        self.segment = segment
+        self.generation = generation
+        LOGGER.debug(f'Switched to generation {generation} of the shield')
+        return self.tables
+
+    def close(self) -> None:
+        """
+        Close all the segments. The tables read from this subscriber and their views must not be used after this.
+        """
+        self.tables = None
+        for segment in [self.retired_segment, self.segment]:
+            if segment is not None:
+                segment.close()
+        self.retired_segment = None
+        self.segment = None
+        if self.control is not None:
+            del self.published_generation
+            self.control.close()
+            self.control = None
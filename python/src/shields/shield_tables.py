@@ -0,0 +1,170 @@
+from typing import Dict
+
+import numpy as np
+
+from src.model import ArraySafetyGame
+from src.model.array_safety_game import UNDEFINED
+from src.shields.abstract_shield import AbstractShield
+
+__author__ = "Masaki Waga <masakiwaga@gmail.com>"
+__status__ = "experimental"
+__version__ = "0.0.1"
+__date__ = "18 October 2026"
+
+# The number of the int64 fields in the header of the buffer
+HEADER_SIZE: int = 8
+
+
+def _align(offset: int) -> int:
+    return (offset + 7) // 8 * 8
+
+
+def _alphabet_indices(alphabet: np.ndarray, sorter: np.ndarray, actions: np.ndarray) -> np.ndarray:
+    """
+    Returns the positions of the actions in the alphabet, or -1 for the actions not in the alphabet
+    Args:
+        alphabet: np.ndarray : the alphabet
+        sorter: np.ndarray : the indices sorting the alphabet
+        actions: np.ndarray : the actions
+    """
+    positions = np.minimum(np.searchsorted(alphabet, actions, sorter=sorter), len(alphabet) - 1)
+    indices = sorter[positions]
+    return np.where(alphabet[indices] == actions, indices, -1)
+
+
+class ShieldTables:
+    """
+    The class for the tables of a shield compiled for the lookups without the shield object.
+
+    The tables are the successor table of the safety game of shape [states, |P1|, |P2|] as in ArraySafetyGame, the
+    action masks of shape [states, num_actions] such that action_masks[q, a] is True iff the action a is winning at q,
+    and the boolean mask of the winning states. Since they are NumPy arrays, they can be written to a buffer, e.g., a
+    shared memory, and read from it without copying.
+    """
+
+    def __init__(self, successors: np.ndarray, action_masks: np.ndarray, winning: np.ndarray, initial_state: int,
+                 player1_alphabet: np.ndarray, player2_alphabet: np.ndarray) -> None:
+        assert successors.shape == (winning.shape[0], len(player1_alphabet), len(player2_alphabet))
+        assert action_masks.shape[0] == winning.shape[0]
+        self.successors: np.ndarray = successors
+        self.action_masks: np.ndarray = action_masks
+        self.winning: np.ndarray = winning
+        self.initial_state: int = initial_state
+        self.p1_alphabet: np.ndarray = player1_alphabet
+        self.p1_sorter: np.ndarray = np.argsort(player1_alphabet, kind='stable')
+        self.p2_alphabet: np.ndarray = player2_alphabet
+        self.p2_sorter: np.ndarray = np.argsort(player2_alphabet, kind='stable')
+        self.p1_index: Dict[int, int] = {action: index for index, action in enumerate(player1_alphabet.tolist())}
+        self.p2_index: Dict[int, int] = {action: index for index, action in enumerate(player2_alphabet.tolist())}
+
+    @property
+    def num_states(self) -> int:
+        return self.winning.shape[0]
+
+    @property
+    def num_actions(self) -> int:
+        return self.action_masks.shape[1]
+
+    @classmethod
+    def fromShield(cls, shield: AbstractShield, num_actions: int) -> "ShieldTables":
+        """
+        Compile the safety game and the winning strategy of the shield
+        Args:
+            shield: AbstractShield : the shield
+            num_actions: int : the number of the actions of player 1, which must be 0, 1, ..., num_actions - 1
+        Raises:
+            ValueError: if the shield cannot be compiled
+        """
+        if not shield.strategy_compiled:
+            shield.compile_strategy()
+        safety_game = shield.safety_game
+        if getattr(safety_game, 'solved_lazily', False) or shield.strategy_mask is None:
+            raise ValueError('The shield cannot be compiled. The safety game must be solved eagerly and its states '
+                             'and the actions of player 1 must be non-negative integers.')
+        if not isinstance(safety_game, ArraySafetyGame):
+            safety_game = ArraySafetyGame.fromSafetyGame(safety_game)
+        num_states = safety_game.num_states
+        rows = min(num_states, shield.strategy_mask.shape[0])
+        columns = min(num_actions, shield.strategy_mask.shape[1])
+        action_masks = np.zeros((num_states, num_actions), dtype=bool)
+        action_masks[:rows, :columns] = shield.strategy_mask[:rows, :columns]
+        winning = np.zeros(num_states, dtype=bool)
+        winning[:rows] = [actions is not None for actions in shield.fallback_actions[:rows]]
+        return cls(safety_game.successors, action_masks, winning, safety_game.getInitialState(),
+                   np.asarray(safety_game.getPlayer1Alphabet()), np.asarray(safety_game.getPlayer2Alphabet()))
+
+    def successors_of(self, states: np.ndarray, player1_actions: np.ndarray, player2_actions: np.ndarray) -> \
+            np.ndarray:
+        """
+        Returns the successors of the states. The state does not change if the transition is not in the safety game,
+        as in AbstractShield.move.
+        """
+        player1_indices = _alphabet_indices(self.p1_alphabet, self.p1_sorter, player1_actions)
+        player2_indices = _alphabet_indices(self.p2_alphabet, self.p2_sorter, player2_actions)
+        known = np.flatnonzero((player1_indices >= 0) & (player2_indices >= 0))
+        targets = self.successors[states[known], player1_indices[known], player2_indices[known]]
+        defined = targets != UNDEFINED
+        successors = states.copy()
+        successors[known[defined]] = targets[defined]
+        return successors
+
+    def successor(self, state: int, player1_action: int, player2_action: int) -> int:
+        """
+        Returns the successor of a state. The state does not change if the transition is not in the safety game.
+        """
+        player1_index = self.p1_index.get(player1_action)
+        player2_index = self.p2_index.get(player2_action)
+        if player1_index is None or player2_index is None:
+            return state
+        target = int(self.successors[state, player1_index, player2_index])
+        return state if target == UNDEFINED else target
+
+    def _layout(self):
+        """
+        Returns the offsets of the arrays in the buffer and the size of the buffer
+        """
+        offsets = [HEADER_SIZE * 8]
+        for array in [self.p1_alphabet, self.p2_alphabet, self.winning, self.action_masks, self.successors]:
+            offsets.append(_align(offsets[-1] + array.size * array.itemsize))
+        return offsets[:-1], offsets[-1]
+
+    @property
+    def nbytes(self) -> int:
+        """
+        The size of the buffer to write the tables
+        """
+        return self._layout()[1]
+
+    def write(self, buffer) -> None:
+        """
+        Write the tables to a buffer of at least nbytes bytes. The actions must be integers.
+        """
+        if not all(np.issubdtype(alphabet.dtype, np.integer) for alphabet in [self.p1_alphabet, self.p2_alphabet]):
+            raise ValueError('The actions must be integers to write the tables')
+        offsets, _ = self._layout()
+        header = np.ndarray((HEADER_SIZE,), dtype=np.int64, buffer=buffer)
+        header[:] = [self.num_states, len(self.p1_alphabet), len(self.p2_alphabet), self.num_actions,
+                     self.initial_state, 0, 0, 0]
+        arrays = [self.p1_alphabet.astype(np.int64), self.p2_alphabet.astype(np.int64), self.winning,
+                  self.action_masks, self.successors.astype(np.int32)]
+        for offset, array in zip(offsets, arrays):
+            np.ndarray(array.shape, dtype=array.dtype, buffer=buffer, offset=offset)[...] = array
+
+    @classmethod
+    def fromBuffer(cls, buffer) -> "ShieldTables":
+        """
+        Read the tables written by write. The arrays are read-only views of the buffer, i.e., they are not copied.
+        """
+        num_states, num_p1, num_p2, num_actions, initial_state = \
+            np.ndarray((HEADER_SIZE,), dtype=np.int64, buffer=buffer)[:5].tolist()
+        shapes = [((num_p1,), np.int64), ((num_p2,), np.int64), ((num_states,), np.bool_),
+                  ((num_states, num_actions), np.bool_), ((num_states, num_p1, num_p2), np.int32)]
+        offset = HEADER_SIZE * 8
+        arrays = []
+        for shape, dtype in shapes:
+            array = np.ndarray(shape, dtype=dtype, buffer=buffer, offset=offset)
+            array.flags.writeable = False
+            arrays.append(array)
+            offset = _align(offset + array.nbytes)
+        p1_alphabet, p2_alphabet, winning, action_masks, successors = arrays
+        return cls(successors, action_masks, winning, initial_state, p1_alphabet, p2_alphabet)
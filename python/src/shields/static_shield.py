@@ -1,8 +1,8 @@
 import pickle
 from typing import Callable, Union, List
 
-from src.logic import ltl_to_dfa_spot, solve_game
-from src.model import ReactiveSystem, SafetyGame, DFA
+from src.logic import ltl_to_dfa_spot, construct_and_solve_game, SafetyGameSolver
+from src.model import ReactiveSystem, CompiledDFA
 from src.shields.abstract_shield import AbstractShield
 
 __author__ = "Masaki Waga <masakiwaga@gmail.com>"
@@ -24,7 +24,8 @@ class StaticShield(AbstractShield):
     """
 
     def __init__(self, ltl_formula: Union[str, List[str]], reactive_system: ReactiveSystem,
-                 evaluate_output: Callable[[int], Callable[[str], bool]]):
+                 evaluate_output: Callable[[int], Callable[[str], bool]],
+                 solver: SafetyGameSolver = SafetyGameSolver.FIXPOINT):
         """
         The constructor
 
@@ -34,19 +35,22 @@ class StaticShield(AbstractShield):
           evaluate_output: Callable[[str], Callable[[str], bool]] :  given a string `output` for an output of the
           reactive system and an string `AP` representing an atomic proposition, evaluate_output(output)(AP) is returns
           if `AP` is satisfied in `output`
+          solver: SafetyGameSolver : the algorithm to solve the safety game
         """
         if isinstance(ltl_formula, list):
             for formula in ltl_formula:
-                dfa: DFA = ltl_to_dfa_spot(formula)
-                safety_game = SafetyGame.fromReactiveSystemAndDFA(reactive_system, dfa, evaluate_output)
-                win_set, win_strategy = solve_game(safety_game)
+                dfa: CompiledDFA = ltl_to_dfa_spot(formula).compile(evaluate_output,
+                                                                    reactive_system.getOutputAlphabet())
+                safety_game, win_set, win_strategy = construct_and_solve_game(reactive_system, dfa, evaluate_output,
+                                                                              solver)
                 if safety_game.getInitialState() in win_set:
                     super().__init__(safety_game, win_set, win_strategy)
                     break
         else:
-            dfa: DFA = ltl_to_dfa_spot(ltl_formula)
-            safety_game = SafetyGame.fromReactiveSystemAndDFA(reactive_system, dfa, evaluate_output)
-            win_set, win_strategy = solve_game(safety_game)
+            dfa: CompiledDFA = ltl_to_dfa_spot(ltl_formula).compile(evaluate_output,
+                                                                    reactive_system.getOutputAlphabet())
+            safety_game, win_set, win_strategy = construct_and_solve_game(reactive_system, dfa, evaluate_output,
+                                                                          solver)
             super().__init__(safety_game, win_set, win_strategy)
 
     def reset(self) -> None:
@@ -0,0 +1,204 @@
+from logging import getLogger
+from typing import List, Tuple, Optional, Sequence
+
+import numpy as np
+
+from src.shields.abstract_dynamic_shield import AbstractDynamicShield, UpdateShield, ShieldLifeType
+from src.shields.abstract_shield import AbstractShield
+from src.shields.shield_tables import ShieldTables
+
+__author__ = "Masaki Waga <masakiwaga@gmail.com>"
+__status__ = "experimental"
+__version__ = "0.0.1"
+__date__ = "18 October 2026"
+
+LOGGER = getLogger(__name__)
+
+
+class VectorizedShield:
+    """
+    The class for a preemptive shield shared by N environments, e.g., the environments of DummyVecEnv.
+
+    Instead of making one shield for each environment, we keep one shield and the vector of the current states of the
+    N environments in its safety game. The safety game and the winning strategy of the shield are compiled into a
+    successor table and an action mask table, so move_batch and preemptive_batch are NumPy operations over all the
+    environments. If the shield is a dynamic shield, each finished episode is given to its finish_episode, so the
+    shield learns and keeps its statistics, e.g., the episode lengths of AdaptiveDynamicShield, as if the episodes were
+    run one by one. The shield is reconstructed at most once per move_batch, and then the current states are recomputed
+    from the current episodes of the environments.
+
+    The reactive system is checked against the observed outputs only from the beginning of each episode, as in
+    AbstractDynamicShield.move. Since the consistency is shared by the environments, not_use_deviating_shield is not
+    supported.
+
+    Usage:
+      shield = VectorizedShield(DynamicShield(...), num_envs=8, num_actions=env.action_space.n)
+      masks = shield.preemptive_batch()  # masks[i, a] is True iff the action a is safe in the i-th environment
+      ...
+      shield.move_batch(player1_actions, player2_actions, outputs, dones)
+    """
+
+    def __init__(self, shield: AbstractShield, num_envs: int, num_actions: int) -> None:
+        """
+        The constructor
+        Args:
+            shield: AbstractShield : the shared shield
+            num_envs: int : the number of the environments
+            num_actions: int : the number of the actions of player 1, which must be 0, 1, ..., num_actions - 1
+        """
+        assert num_envs > 0, 'The number of the environments must be positive'
+        self.shield = shield
+        self.num_envs = num_envs
+        self.num_actions = num_actions
+        self.learning = isinstance(shield, AbstractDynamicShield)
+        if self.learning:
+            assert not shield.not_use_deviating_shield, 'not_use_deviating_shield is not supported'
+        # The current episode of each environment
+        self.histories: List[List[Tuple[int, int]]] = [[] for _ in range(num_envs)]
+        self.output_histories: List[List[int]] = [[] for _ in range(num_envs)]
+        # The current state of each environment in the reactive system of the shield, or None if it is unknown
+        self.reactive_system_states: List[Optional[int]] = [None] * num_envs
+        self.reactive_system = None
+        # The tables compiled from the shield. source_mask is the strategy_mask of the shield they are compiled from.
+        self.source_mask: Optional[np.ndarray] = None
+        self.tables: Optional[ShieldTables] = None
+        self.states: np.ndarray = np.zeros(num_envs, dtype=np.int64)
+        self._refresh()
+        self.states[:] = self.tables.initial_state
+        self._reset_reactive_system_states(range(num_envs))
+
+    def _refresh(self) -> bool:
+        """
+        Compile the tables again if the shield is updated. For a dynamic shield, the current states are recomputed from
+        the current episodes.
+        Returns:
+            True if the tables are compiled again
+        """
+        if not self.shield.strategy_compiled:
+            self.shield.compile_strategy()
+        if self.shield.strategy_mask is not None and self.shield.strategy_mask is self.source_mask:
+            return False
+        self.tables = ShieldTables.fromShield(self.shield, self.num_actions)
+        self.source_mask = self.shield.strategy_mask
+        LOGGER.debug(f'The vectorized shield is compiled: {self.tables.num_states} states')
+        if not self.learning:
+            # The safety game of a static shield does not change
+            return True
+        # Replay the current episodes in the new safety game
+        self.states[:] = self.tables.initial_state
+        lengths = np.array([len(history) for history in self.histories])
+        for step in range(int(lengths.max(initial=0))):
+            envs = np.flatnonzero(lengths > step)
+            player1_actions = np.array([self.histories[env][step][0] for env in envs])
+            player2_actions = np.array([self.histories[env][step][1] for env in envs])
+            self.states[envs] = self.tables.successors_of(self.states[envs], player1_actions, player2_actions)
+        return True
+
+    def _reset_reactive_system_states(self, envs) -> None:
+        """
+        Restart the given environments from the initial state of the reactive system of the shield
+        """
+        reactive_system = self.shield.reactive_system if self.learning else None
+        self.reactive_system = reactive_system
+        for env in envs:
+            self.reactive_system_states[env] = \
+                reactive_system.getInitialState() if reactive_system is not None else None
+
+    def _check_consistency(self, player1_actions: List[int], player2_actions: List[int], outputs: List[int]) -> None:
+        """
+        Check the outputs against the reactive system of the shield. This is skipped once an inconsistency is found
+        because the reactive system is learned again anyway.
+        """
+        reactive_system = self.shield.reactive_system
+        if reactive_system is None or not self.shield.consistent_from_latest_construction:
+            return
+        for env, state in enumerate(self.reactive_system_states):
+            if state is None:
+                continue
+            try:
+                if outputs[env] != reactive_system.getOutput(state, player1_actions[env], player2_actions[env]):
+                    self.shield.consistent_from_latest_construction = False
+                    return
+                self.reactive_system_states[env] = reactive_system.getSuccessor(state, player1_actions[env],
+                                                                                player2_actions[env])
+            except KeyError:
+                self.shield.consistent_from_latest_construction = False
+                return
+
+    def preemptive_batch(self) -> np.ndarray:
+        """
+        The method for preemptive shielding of all the environments
+        Returns:
+            The boolean array of shape [num_envs, num_actions] such that the element (i, a) is True iff the action a is
+            safe in the i-th environment. All the actions are disabled in the environments at losing states.
+        """
+        self._refresh()
+        return self.tables.action_masks[self.states]
+
+    def winning_batch(self) -> np.ndarray:
+        """
+        Returns the boolean array of shape [num_envs] such that the i-th element is True iff the i-th environment is at
+        a winning state
+        """
+        self._refresh()
+        return self.tables.winning[self.states]
+
+    def move_batch(self, player1_actions: Sequence[int], player2_actions: Sequence[int], outputs: Sequence[int],
+                   dones: Sequence[bool]) -> None:
+        """
+        Move the current states of all the environments
+        Args:
+            player1_actions: Sequence[int] : the action by player 1 in each environment
+            player2_actions: Sequence[int] : the action by player 2 in each environment
+            outputs: Sequence[int] : the output of the transition in each environment
+            dones: Sequence[bool] : if the episode of each environment is finished by the transition
+        """
+        self._refresh()
+        player1_actions = np.asarray(player1_actions)
+        player2_actions = np.asarray(player2_actions)
+        dones = np.asarray(dones, dtype=bool)
+        assert player1_actions.shape == player2_actions.shape == dones.shape == (self.num_envs,)
+        self.states = self.tables.successors_of(self.states, player1_actions, player2_actions)
+        if not self.learning:
+            self.states[dones] = self.tables.initial_state
+            return
+        player1_list, player2_list = player1_actions.tolist(), player2_actions.tolist()
+        output_list = np.asarray(outputs).tolist()
+        self._check_consistency(player1_list, player2_list, output_list)
+        for env in range(self.num_envs):
+            self.histories[env].append((player1_list[env], player2_list[env]))
+            self.output_histories[env].append(output_list[env])
+        # The finished episodes are given to the shared shield as if they were finished by its reset
+        finished = np.flatnonzero(dones).tolist()
+        for env in finished:
+            self.shield.finish_episode(self.histories[env], self.output_histories[env])
+            self.histories[env] = []
+            self.output_histories[env] = []
+        self.states[dones] = self.tables.initial_state
+        self._reset_reactive_system_states(finished)
+        if self.shield.shield_life_type == ShieldLifeType.STEPS:
+            self.shield.current_shield_life -= self.num_envs
+        if self.shield.update_shield == UpdateShield.MOVE or \
+                (self.shield.update_shield == UpdateShield.RESET and len(finished) > 0):
+            self.shield.reconstructShield(len(finished))
+            self._refresh()
+            if self.shield.reactive_system is not self.reactive_system:
+                # We check the current episodes against the new reactive system from the next episodes
+                self._reset_reactive_system_states(range(self.num_envs))
+                for env in range(self.num_envs):
+                    if len(self.histories[env]) > 0:
+                        self.reactive_system_states[env] = None
+
+    def reset(self) -> None:
+        """
+        Finish the current episodes of all the environments and restart them from the initial state
+        """
+        self._refresh()
+        if self.learning:
+            for env in range(self.num_envs):
+                if len(self.histories[env]) > 0:
+                    self.shield.finish_episode(self.histories[env], self.output_histories[env])
+                self.histories[env] = []
+                self.output_histories[env] = []
+            self._reset_reactive_system_states(range(self.num_envs))
+        self.states[:] = self.tables.initial_state
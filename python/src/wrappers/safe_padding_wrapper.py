@@ -2,6 +2,7 @@ from logging import getLogger
 from typing import List
 
 import gym
+import numpy as np
 
 from src.exceptions.shielding_exceptions import UnsafeStateError
 from src.shields.safe_padding import AbstractSafePadding
@@ -34,14 +35,14 @@ class SafePaddingWrapper(gym.Wrapper):
 
         return next_state, reward, done, info
 
-    def get_shield_disabled_actions(self):
+    def get_shield_action_mask(self) -> np.ndarray:
         """
-        This method returns the actions that are not allowed by the safe padding
-        It assumes that the actions space is Discrete(n).
+        This method returns the boolean mask of the actions allowed by the safe padding, i.e., mask[a] is True iff the
+        action a is allowed. It assumes that the actions space is Discrete(n).
         """
+        num_actions = self.env.action_space.n
         try:
             allowed = self.safe_padding.preemptive()
-            self.disabled_actions = [action for action in range(self.env.action_space.n) if action not in allowed]
         except UnsafeStateError as e:
             LOGGER.fatal(f'We are in an unsafe state according to the shield, which should not happen...')
             if not self.no_pdb:
@@ -49,5 +50,16 @@ class SafePaddingWrapper(gym.Wrapper):
                 pdb.set_trace()
                 raise e
             else:
-                return []
-        return self.disabled_actions
+                return np.ones(num_actions, dtype=bool)
+        mask = np.zeros(num_actions, dtype=bool)
+        mask[[action for action in allowed if 0 <= action < num_actions]] = True
+        self.disabled_actions = np.flatnonzero(~mask).tolist()
+        return mask
+
+    def get_shield_disabled_actions(self):
+        """
+        This method returns the actions that are not allowed by the safe padding
+        It assumes that the actions space is Discrete(n).
+        """
+        mask = self.get_shield_action_mask()
+        return np.flatnonzero(~mask).tolist()
@@ -0,0 +1,81 @@
+from logging import getLogger
+from typing import Optional, List
+
+import gym
+import numpy as np
+
+from src.shields.shared_shield import SharedShieldSubscriber
+
+LOGGER = getLogger(__name__)
+
+
+class SharedPreemptiveShieldWrapper(gym.Wrapper):
+    """
+    Preemptive shield reading the tables published by SharedShieldPublisher, e.g., in the workers of SubprocVecEnv.
+
+    The worker does not hold a shield object. It only maps the latest tables and tracks its current state in them. A new
+    generation of the tables is used from the next episode. Until the first generation is published, all the actions
+    are allowed.
+
+    Usage:
+      # In the learner process
+      publisher = SharedShieldPublisher('my_shield')
+      publisher.publish(ShieldTables.fromShield(shield, env.action_space.n))
+      # In each worker process
+      env = SharedPreemptiveShieldWrapper(make_env(), 'my_shield')
+    """
+
+    def __init__(self, env, name: str):
+        super().__init__(env)
+        self.env = env
+        self.subscriber = SharedShieldSubscriber(name)
+        self.tables = self.subscriber.poll()
+        self.state: Optional[int] = None if self.tables is None else self.tables.initial_state
+        # action_mask[a] is False iff the action a is disabled by the shield
+        self.action_mask: Optional[np.ndarray] = None
+
+    def get_shield_action_mask(self) -> np.ndarray:
+        """
+        This method returns the boolean mask of the actions allowed by the shield, i.e., mask[a] is True iff the
+        action a is allowed. It assumes that the actions space is Discrete(n).
+        The mask is a read-only view of the shared memory.
+        """
+        if self.tables is None:
+            self.action_mask = np.ones(self.env.action_space.n, dtype=bool)
+        else:
+            self.action_mask = self.tables.action_masks[self.state]
+        return self.action_mask
+
+    def get_shield_disabled_actions(self) -> List[int]:
+        """
+        This method returns the actions that are not allowed by the shield
+        It assumes that the actions space is Discrete(n).
+        """
+        return np.flatnonzero(~self.get_shield_action_mask()).tolist()
+
+    def reset(self, **kwargs):
+        # Switch to the latest generation at the boundary of the episodes
+        # The mask of the last step is a view of the current tables, which may be released at the next switch
+        self.action_mask = None
+        tables = self.subscriber.poll()
+        if tables is not None:
+            self.tables = tables
+        if self.tables is not None:
+            self.state = self.tables.initial_state
+        return self.env.reset(**kwargs)
+
+    def step(self, action):
+        """ This method makes sure that we actually do not receive an unwanted action."""
+        if self.action_mask is not None and self.action_mask.any() and not self.action_mask[action]:
+            raise Exception(
+                "We wanted to block action {}, but it was still injected. How could this happen?".format(action))
+        next_state, reward, done, info = self.env.step(action)
+        if self.tables is not None:
+            self.state = self.tables.successor(self.state, info['p1_action'], info['p2_action'])
+        return next_state, reward, done, info
+
+    def close(self):
+        self.action_mask = None
+        self.tables = None
+        self.subscriber.close()
+        return super().close()
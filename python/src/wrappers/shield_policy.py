@@ -1,7 +1,8 @@
-import traceback
+from contextlib import contextmanager
 from types import MethodType
-from typing import Optional, Union
+from typing import Optional, Union, Iterator
 
+import numpy as np
 import torch as th
 from stable_baselines3.common.distributions import (
     BernoulliDistribution,
@@ -13,11 +14,22 @@ from stable_baselines3.common.distributions import (
 )
 
 from src.wrappers.safe_padding_wrapper import SafePaddingWrapper
-from src.wrappers.shield_wrappers import PreemptiveShieldWrapper
+from src.wrappers.shield_wrappers import PreemptiveShieldWrapper, get_action_masks
 
 
 def shield_policy(model, eval_env: Optional[Union[PreemptiveShieldWrapper, SafePaddingWrapper]] = None,
                   force_eval: bool = False):
+    """
+    Patch the policy of the model so that it does not choose the actions disabled by the preemptive shield.
+
+    In the evaluation mode, the shield of eval_env is used, or no shield is used if eval_env is None. The evaluation
+    mode is switched by shield_evaluation_mode, e.g., EvalCallback in benchmarks/common/train.py enables it during
+    evaluate_policy.
+
+    :param model: the model whose environments are wrapped with PreemptiveShieldWrapper
+    :param eval_env: the environment whose shield is used in the evaluation mode
+    :param force_eval: if True, the policy is always in the evaluation mode
+    """
     assert eval_env is None or isinstance(eval_env, PreemptiveShieldWrapper) or \
            isinstance(eval_env, SafePaddingWrapper), "eval_env must be a PreemptiveShieldWrapper or SafePaddingWrapper"
 
@@ -25,23 +37,22 @@ def shield_policy(model, eval_env: Optional[Union[PreemptiveShieldWrapper, SafeP
     def preemptive_fixed(self, latent_pi: th.Tensor, latent_sde: Optional[th.Tensor] = None) -> Distribution:
         mean_actions = self.action_net(latent_pi)
 
-        # HERE we access the environment and ask for the disabled_actions actions
-        # The environment must be wrapped with PreemptiveShieldWrapper (gym.Wrapper)
+        # HERE we access the environments and ask for the masks of the allowed actions
+        # The environments must be wrapped with PreemptiveShieldWrapper (gym.Wrapper)
         # - - - - - - - - - - - - - - - - - - - - - - - -
-        for idx, env in enumerate(self.environments):
-            # We do not use shield in the evaluation.
-            if force_eval or any(map(lambda frame: 'stable_baselines3/common/evaluation.py' in frame.filename and
-                                                   'evaluate_policy' in frame.name,
-                                     traceback.extract_stack())):
-                if eval_env is not None:
-                    disabled = eval_env.get_shield_disabled_actions()
-                else:
-                    disabled = []
-            else:
-                disabled = env.get_shield_disabled_actions()
-            if len(disabled) < len(mean_actions[idx]):
-                for dis in disabled:
-                    mean_actions[idx][dis] = float('-inf')
+        # We do not use the shield of the training environments in the evaluation.
+        if self.shield_eval_mode:
+            masks = None if eval_env is None else np.tile(eval_env.get_shield_action_mask(), (len(mean_actions), 1))
+        else:
+            masks = get_action_masks(self.shielded_env)
+        if masks is not None:
+            # The i-th row of masks is for the i-th row of mean_actions, and the other rows are not masked
+            mask = th.ones(mean_actions.shape, dtype=th.bool, device=mean_actions.device)
+            rows = min(masks.shape[0], mask.shape[0])
+            mask[:rows] = th.as_tensor(masks[:rows], device=mean_actions.device)
+            # We do not disable the actions if all of them are disabled
+            mask |= ~mask.any(dim=1, keepdim=True)
+            mean_actions = mean_actions.masked_fill(~mask, float('-inf'))
         # - - - - - - - - - - - - - - - - - - - - - - - -
 
         if isinstance(self.action_dist, DiagGaussianDistribution):
@@ -60,5 +71,29 @@ def shield_policy(model, eval_env: Optional[Union[PreemptiveShieldWrapper, SafeP
         else:
             raise ValueError("Invalid action distribution")
 
-    model.policy.environments = model.env.envs
+    model.policy.shielded_env = model.env
+    model.policy.shield_eval_mode = force_eval
     model.policy._get_action_dist_from_latent = MethodType(preemptive_fixed, model.policy)
+
+
+@contextmanager
+def shield_evaluation_mode(model, enabled: bool = True) -> Iterator[None]:
+    """
+    The context manager to switch the policy patched by shield_policy to the evaluation mode in the block.
+    This does nothing if the policy is not patched.
+
+    Usage:
+      with shield_evaluation_mode(model):
+          evaluate_policy(model, eval_env)
+    """
+    policy = model.policy
+    if not hasattr(policy, 'shield_eval_mode'):
+        yield
+        return
+    previous_mode = policy.shield_eval_mode
+    # With force_eval, the policy is always in the evaluation mode
+    policy.shield_eval_mode = enabled or previous_mode
+    try:
+        yield
+    finally:
+        policy.shield_eval_mode = previous_mode
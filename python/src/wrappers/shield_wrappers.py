@@ -3,6 +3,7 @@ from logging import getLogger
 from typing import Optional, List
 
 import gym
+import numpy as np
 
 from src.exceptions.shielding_exceptions import UnsafeStateError
 from src.shields import DynamicShield
@@ -113,22 +114,21 @@ class PostposedShieldWrapper(AbstractShieldWrapper):
 
 class PreemptiveShieldWrapper(AbstractShieldWrapper):
     def __init__(self, env, shield, punish=False, debug=False, no_pdb=False):
-        # actions that will by disabled by preemptive shield
-        self.disabled_actions = None
+        # action_mask[a] is False iff the action a is disabled by preemptive shield
+        self.action_mask: Optional[np.ndarray] = None
         self.no_pdb = no_pdb
         super().__init__(env, shield, punish, debug)
 
-    def get_shield_disabled_actions(self):
+    def get_shield_action_mask(self) -> np.ndarray:
         """
-        This method returns the actions that are not allowed by the shield
-        It assumes that the actions space is Discrete(n).
+        This method returns the boolean mask of the actions allowed by the shield, i.e., mask[a] is True iff the
+        action a is allowed. It assumes that the actions space is Discrete(n).
+        The mask is cached by the shield and must not be modified.
         """
         try:
-            allowed = self.shield.preemptive()
-            assert len(allowed) > 0, 'No actions are allowed by the shield'
-            self.disabled_actions = [action for action in range(self.env.action_space.n) if action not in allowed]
+            self.action_mask = self.shield.preemptive_mask(self.env.action_space.n)
             # The following assertion may fail when the alphabet in the arena and the dynamic shield are inconsistent.
-            assert len(self.disabled_actions) < self.env.action_space.n, \
+            assert self.action_mask.any(), \
                 'All actions are disabled by the shield. ' \
                 'Please check that the alphabet in the arena and the dynamic shield are consistent'
         except UnsafeStateError as e:
@@ -138,19 +138,40 @@ class PreemptiveShieldWrapper(AbstractShieldWrapper):
                 pdb.set_trace()
                 raise e
             else:
-                return []
-        return self.disabled_actions
+                return np.ones(self.env.action_space.n, dtype=bool)
+        return self.action_mask
+
+    def get_shield_disabled_actions(self) -> List[int]:
+        """
+        This method returns the actions that are not allowed by the shield
+        It assumes that the actions space is Discrete(n).
+        """
+        return np.flatnonzero(~self.get_shield_action_mask()).tolist()
 
     def step(self, action):
         """ This method makes sure that we actually do not receive an unwanted action."""
-        assert len(self.disabled_actions) < self.env.action_space.n, 'All actions are disabled by the shield'
-        if action in self.disabled_actions:
-            print(self.disabled_actions)
+        assert self.action_mask.any(), 'All actions are disabled by the shield'
+        if not self.action_mask[action]:
+            print(np.flatnonzero(~self.action_mask).tolist())
             raise Exception(
                 "We wanted to block action {}, but it was still injected. How could this happen?".format(action))
         return super().step(action)
 
 
+def get_action_masks(venv) -> np.ndarray:
+    """
+    Returns the masks of the actions allowed by the shields of all the environments of a vectorized environment.
+    Either the vectorized environment has get_action_masks, e.g., VecPreemptiveShieldWrapper, or each environment is
+    wrapped with PreemptiveShieldWrapper or SafePaddingWrapper.
+
+    :param venv: the vectorized environment, e.g., DummyVecEnv of stable-baselines3
+    :return: the boolean array of shape [n_envs, n_actions]
+    """
+    if hasattr(venv, 'get_action_masks'):
+        return venv.get_action_masks()
+    return np.stack(venv.env_method('get_shield_action_mask'))
+
+
 class BlockingShieldWrapper(AbstractShieldWrapper):
     """ Postposed shield blocking the execution of unsafe actions
 
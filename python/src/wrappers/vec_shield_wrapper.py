@@ -0,0 +1,75 @@
+from logging import getLogger
+from typing import Optional
+
+import numpy as np
+from stable_baselines3.common.vec_env import VecEnv, VecEnvWrapper
+
+from src.shields.abstract_shield import AbstractShield
+from src.shields.shared_shield import SharedShieldPublisher
+from src.shields.shield_tables import ShieldTables
+from src.shields.vectorized_shield import VectorizedShield
+
+LOGGER = getLogger(__name__)
+
+
+class VecPreemptiveShieldWrapper(VecEnvWrapper):
+    """
+    Preemptive shield for a vectorized environment. Unlike wrapping each environment with PreemptiveShieldWrapper, all
+    the environments share one shield through VectorizedShield, so a dynamic shield learns from the traces of all of
+    them with one learner.
+
+    Usage:
+      venv = VecPreemptiveShieldWrapper(DummyVecEnv([make_env] * 8), DynamicShield(...))
+      model = PPO('MlpPolicy', venv)
+      shield_policy(model)
+
+    If a publisher is given, the tables of the shield are published whenever the shield is updated, so that the
+    workers wrapped with SharedPreemptiveShieldWrapper use the latest shield.
+    """
+
+    def __init__(self, venv: VecEnv, shield: AbstractShield, publisher: Optional[SharedShieldPublisher] = None):
+        super().__init__(venv)
+        self.shield = VectorizedShield(shield, venv.num_envs, venv.action_space.n)
+        # action_masks[i, a] is False iff the action a is disabled by the shield in the i-th environment
+        self.action_masks: Optional[np.ndarray] = None
+        self.publisher = publisher
+        self.published_tables: Optional[ShieldTables] = None
+        self.publish()
+
+    def publish(self) -> None:
+        """
+        Publish the tables of the shield if they are updated after the last publication
+        """
+        if self.publisher is not None and self.shield.tables is not self.published_tables:
+            self.publisher.publish(self.shield.tables)
+            self.published_tables = self.shield.tables
+
+    def get_action_masks(self) -> np.ndarray:
+        """
+        This method returns the masks of the actions allowed by the shield as an array of shape [n_envs, n_actions].
+        It assumes that the actions space is Discrete(n).
+        """
+        self.action_masks = self.shield.preemptive_batch()
+        return self.action_masks
+
+    def reset(self):
+        self.shield.reset()
+        return self.venv.reset()
+
+    def step_async(self, actions: np.ndarray) -> None:
+        """ This method makes sure that we actually do not receive an unwanted action."""
+        if self.action_masks is not None:
+            # We do not block any action if all of them are disabled
+            blocked = ~self.action_masks[np.arange(self.num_envs), actions] & self.action_masks.any(axis=1)
+            if blocked.any():
+                raise Exception("We wanted to block actions {}, but they were still injected. How could this happen?"
+                                .format(np.asarray(actions)[blocked].tolist()))
+        self.venv.step_async(actions)
+
+    def step_wait(self):
+        observations, rewards, dones, infos = self.venv.step_wait()
+        # Update the shield. The environments are reset automatically when they are done.
+        self.shield.move_batch([info['p1_action'] for info in infos], [info['p2_action'] for info in infos],
+                               [info['output'] for info in infos], dones)
+        self.publish()
+        return observations, rewards, dones, infos
@@ -0,0 +1,27 @@
+from typing import Callable
+
+from src.model import DFA
+
+
+def evaluate_output(output: int) -> Callable[[str], bool]:
+    """
+    Evaluate the atomic propositions on an output: the upper bit is p and the lower bit is q.
+    """
+    return lambda ap: output // 2 == 1 if ap == 'p' else output % 2 == 1
+
+
+def make_dfa() -> DFA:
+    """
+    Make the DFA of the property that, once q holds without p, p must hold from the next step on.
+    """
+    dfa = DFA(['p', 'q'])
+    dfa.addTransition(1, {'p': True}, 1)
+    dfa.addTransition(1, {'p': False, 'q': False}, 1)
+    dfa.addTransition(1, {'p': False, 'q': True}, 2)
+    dfa.addTransition(2, {'p': True}, 2)
+    dfa.addTransition(2, {'p': False}, 3)
+    dfa.addTransition(3, {'p': True}, 3)
+    dfa.addTransition(3, {'p': False}, 3)
+    dfa.addSafeState(1)
+    dfa.addSafeState(2)
+    return dfa
@@ -0,0 +1,73 @@
+import random
+import unittest
+
+from src.exceptions.shielding_exceptions import InvalidInputError
+from src.model import DFA, SafetyGame, PTA, ArrayPTA
+from test.safety_game_helpers import evaluate_output
+
+
+class TestArrayPTA(unittest.TestCase):
+    def setUp(self) -> None:
+        random.seed(0)
+        self.expected = PTA([1, 2], [0], [0b00, 0b01, 0b10, 0b11])
+        self.pta = ArrayPTA([1, 2], [0], [0b00, 0b01, 0b10, 0b11])
+        for _ in range(30):
+            length = random.randint(1, 8)
+            # The player 2 actions 3 and 4 are added dynamically
+            input_word = [(random.choice([1, 2]), random.choice([0, 0, 3, 4])) for _ in range(length)]
+            output_word = [random.choice([0b00, 0b01, 0b10, 0b11]) for _ in range(length)]
+            self.expected.addTrace(input_word, output_word)
+            self.pta.addTrace(input_word, output_word)
+
+    def test_addTrace(self):
+        self.assertEqual(sorted(self.expected.getStates()), self.pta.getStates())
+        self.assertEqual(self.expected.transitions, self.pta.transitions)
+        self.assertEqual(self.expected.output, self.pta.output)
+        self.assertEqual(self.expected.player2Alphabet, self.pta.player2Alphabet)
+        self.assertEqual(len(self.expected.transitions), len(self.pta.transitions))
+        pta = self.pta.toPTA()
+        self.assertEqual(self.expected.transitions, pta.transitions)
+        self.assertEqual(self.expected.output, pta.output)
+
+    def test_addSample(self):
+        training_data = [("a", "0"), ("b", "b"), ("aa", "0"), ("ab", "b"), ("ba", "1"), ("bb", "b"), ("baa", "1"),
+                         ("bab", "b"), ("bba", "0"), ("bbb", "b"), ("ba", "0")]
+        expected = PTA(['a', 'b', 'c'], ['*'], ['0', '1'])
+        pta = ArrayPTA(['a', 'b', 'c'], ['*'], ['0', '1'])
+        for player1_actions, output in training_data:
+            input_word = list(map(lambda x: (x, '*'), player1_actions))
+            expected.addSample(input_word, output)
+            pta.addSample(input_word, output)
+        self.assertEqual(expected.transitions, pta.transitions)
+        self.assertEqual(expected.output, pta.output)
+        self.assertEqual('0', pta.getOutput(pta.getSuccessor(1, 'b', '*'), 'a', '*'))
+        with self.assertRaises(KeyError):
+            pta.getSuccessor(1, 'c', '*')
+        with self.assertRaises(InvalidInputError):
+            pta.addSample([('c', '*'), ('a', '*')], '0')
+
+    def test_growth(self):
+        pta = ArrayPTA([0, 1], [0], [0, 1])
+        pta.addTrace([(0, 0)] * 1000, [0] * 1000)
+        self.assertEqual(list(range(1, 1002)), pta.getStates())
+        self.assertEqual(1001, pta.getSuccessor(1000, 0, 0))
+        self.assertLess(pta.successors.shape[0], 2 * 1002)
+
+    def test_fromReactiveSystemAndDFA(self):
+        dfa = DFA(['p', 'q'])
+        dfa.addTransition(1, {'p': True}, 1)
+        dfa.addTransition(1, {'p': False, 'q': False}, 1)
+        dfa.addTransition(1, {'p': False, 'q': True}, 2)
+        dfa.addTransition(2, {'p': True}, 2)
+        dfa.addTransition(2, {'p': False}, 1)
+        dfa.addSafeState(1)
+
+        expected = SafetyGame.fromReactiveSystemAndDFA(self.expected, dfa, evaluate_output)
+        game = SafetyGame.fromReactiveSystemAndDFA(self.pta, dfa, evaluate_output)
+        self.assertEqual(expected.state_mapper, game.state_mapper)
+        self.assertEqual(expected.transitions, game.transitions)
+        self.assertEqual(set(expected.safeStates), set(game.safeStates))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+import unittest
+
+from src.model import DFA, SafetyGame, ReactiveSystem, ArraySafetyGame
+from test.safety_game_helpers import evaluate_output
+
+
+class TestArraySafetyGame(unittest.TestCase):
+    def setUp(self) -> None:
+        self.reactive_system = ReactiveSystem([1, 2], [0, 3], [0b00, 0b01, 0b10, 0b11])
+        self.reactive_system.addTransition(1, 1, 0, 0b11, 2)
+        self.reactive_system.addTransition(1, 2, 0, 0b01, 3)
+        self.reactive_system.addTransition(1, 2, 3, 0b01, 1)
+        self.reactive_system.addTransition(2, 1, 0, 0b00, 1)
+        self.reactive_system.addTransition(2, 2, 0, 0b10, 3)
+        self.reactive_system.addTransition(3, 1, 0, 0b11, 1)
+        self.reactive_system.addTransition(3, 2, 0, 0b00, 2)
+
+        self.dfa = DFA(['p', 'q'])
+        self.dfa.addTransition(1, {'p': True}, 1)
+        self.dfa.addTransition(1, {'p': False, 'q': False}, 1)
+        self.dfa.addTransition(1, {'p': False, 'q': True}, 2)
+        self.dfa.addTransition(2, {'p': True}, 2)
+        self.dfa.addTransition(2, {'p': False}, 1)
+        self.dfa.addSafeState(1)
+
+    def test_fromReactiveSystemAndDFA(self):
+        expected = SafetyGame.fromReactiveSystemAndDFA(self.reactive_system, self.dfa, evaluate_output)
+        game = ArraySafetyGame.fromReactiveSystemAndDFA(self.reactive_system, self.dfa, evaluate_output)
+        self.assertEqual(expected.getInitialState(), game.getInitialState())
+        self.assertEqual(set(expected.state_mapper.keys()), set(game.state_mapper.keys()))
+        self.assertEqual(len(expected.getStates()), len(game.getStates()))
+        self.assertEqual(len(expected.transitions), len(game.transitions))
+
+        def rename(state: int) -> int:
+            # map the state of expected to the corresponding state of game
+            if expected.isUnexploredState(state):
+                return game.unexplored_state
+            return game.state_mapper[expected.inverse_state_mapper[state]]
+
+        for (src, p1_action, p2_action), target in expected.transitions.items():
+            self.assertTrue(game.hasSuccessor(rename(src), p1_action, p2_action))
+            self.assertEqual(rename(target), game.getSuccessor(rename(src), p1_action, p2_action))
+        for state in expected.getStates():
+            self.assertEqual(expected.isSafe(state), game.isSafe(rename(state)))
+        for (src, p1_action) in expected.power_transitions.keys():
+            targets = {rename(expected.getSuccessor(src, p1_action, p2_action)) for p2_action in [0, 3]
+                       if expected.hasSuccessor(src, p1_action, p2_action)}
+            self.assertEqual(targets, game.power_transitions[rename(src), p1_action])
+
+    def test_getPredecessors(self):
+        safety_game = SafetyGame([1, 2], [0])
+        safety_game.add_transition(2, 1, 0, 3)
+        safety_game.add_transition(2, 2, 0, 2)
+        safety_game.add_transition(3, 1, 0, 3)
+        safety_game.add_transition(3, 2, 0, 2)
+        game = ArraySafetyGame.fromSafetyGame(safety_game)
+        for target in safety_game.getStates():
+            for p1_action in [1, 2]:
+                self.assertEqual(safety_game.getPredecessors(target, p1_action, 0),
+                                 game.getPredecessors(target, p1_action, 0))
+        self.assertEqual(set(), game.getPredecessors(4, 1, 0))
+        self.assertEqual(set(), game.getPredecessors(2, 3, 0))
+
+    def test_undefined_transition(self):
+        safety_game = SafetyGame([1, 2], [0, 1])
+        safety_game.add_transition(2, 1, 0, 3)
+        game = ArraySafetyGame.fromSafetyGame(safety_game)
+        self.assertTrue(game.hasSuccessor(2, 1, 0))
+        self.assertFalse(game.hasSuccessor(2, 1, 1))
+        self.assertFalse(game.hasSuccessor(3, 1, 0))
+        self.assertFalse(game.hasSuccessor(10, 1, 0))
+        self.assertNotIn((2, 2), game.power_transitions)
+        with self.assertRaises(KeyError):
+            game.getSuccessor(2, 1, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
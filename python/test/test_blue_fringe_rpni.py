@@ -1,7 +1,10 @@
+import sys
 import unittest
+from copy import deepcopy
 
 from benchmarks.grid_world.grid_world_arena import make_two_robots_grid_world_mdp
 from src.logic import BlueFringeRPNI
+from src.logic.blue_fringe_rpni import CheckMergeability, _build_predecessors, _merge
 from src.model import ReactiveSystem
 
 
@@ -60,6 +63,38 @@ class TestBlueFringeRPNI(unittest.TestCase):
                     state = reactive_system.getSuccessor(state, player1_action, '*')
                 self.assertEqual(output_action, reactive_system.getOutput(state, player1_actions[-1], '*'))
 
+    def test_deep_pta(self):
+        # The PTA is deeper than the recursion limit of Python
+        depth = sys.getrecursionlimit() * 2
+        learner = BlueFringeRPNI([0, 1], [0], [0, 1])
+        learner.addTrace([(0, 0)] * depth, [0] * depth)
+        learner.addTrace([(1, 0)] + [(0, 0)] * depth, [1] + [0] * (depth - 1) + [1])
+        checker = CheckMergeability(learner.pta)
+        self.assertEqual(depth, checker.mergeable_depth(learner.pta.getInitialState(), 2))
+        # The state after 1 is not mergeable due to the last output
+        self.assertIsNone(checker.mergeable_depth(learner.pta.getInitialState(), depth + 2))
+        reactive_system = deepcopy(learner.pta)
+        _merge(reactive_system, reactive_system.getInitialState(), 2)
+        self.assertEqual(reactive_system.getInitialState(),
+                         reactive_system.getSuccessor(reactive_system.getInitialState(), 0, 0))
+
+    def test_invalidate(self):
+        learner = BlueFringeRPNI([0, 1], [0], [0, 1])
+        learner.addTrace([(0, 0), (1, 0), (1, 0)], [0, 1, 1])
+        learner.addTrace([(1, 0), (1, 0)], [1, 0])
+        reactive_system = deepcopy(learner.pta)
+        predecessors = _build_predecessors(reactive_system)
+        checker = CheckMergeability(reactive_system)
+        # 2, 3, and 5 are the states after 0, 0 1, and 1
+        self.assertIsNone(checker.mergeable_depth(5, 2))
+        # The merge overwrites the output of 5 by the output of 3
+        touched_states = set()
+        _merge(reactive_system, 5, 3, set(), predecessors, touched_states)
+        self.assertIn(2, touched_states)
+        checker.invalidate(touched_states, predecessors)
+        checker.start_blue_state()
+        self.assertEqual(2, checker.mergeable_depth(5, 2))
+
     # Test case to debug an actual execution of grid world
     def test_addSample_grid_world(self):
         mdp = make_two_robots_grid_world_mdp()
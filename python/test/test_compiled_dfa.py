@@ -0,0 +1,62 @@
+import pickle
+import unittest
+
+from src.model import DFA, CompiledDFA
+from test.safety_game_helpers import evaluate_output
+
+
+class TestCompiledDFA(unittest.TestCase):
+    def setUp(self) -> None:
+        self.dfa = DFA(['p', 'q'])
+        self.dfa.addTransition(1, {'p': True}, 1)
+        self.dfa.addTransition(1, {'p': False, 'q': False}, 1)
+        self.dfa.addTransition(1, {'p': False, 'q': True}, 2)
+        self.dfa.addTransition(2, {'p': True}, 2)
+        self.dfa.addTransition(2, {'q': True}, 3)
+        self.dfa.addSafeState(1)
+        self.dfa.addSafeState(2)
+
+    def test_getSuccessor(self):
+        compiled = self.dfa.compile(evaluate_output, [0b00, 0b01])
+        self.assertEqual(self.dfa.getSinkState(), compiled.getSinkState())
+        self.assertEqual(self.dfa.getInitialState(), compiled.getInitialState())
+        # 0b10 and 0b11 are compiled on demand
+        for output in [0b00, 0b01, 0b10, 0b11]:
+            for state in self.dfa.getStates() + [self.dfa.getSinkState()]:
+                if state in self.dfa.transitions or state == self.dfa.getSinkState():
+                    self.assertEqual(self.dfa.getSuccessor(state, evaluate_output(output)),
+                                     compiled.getSuccessor(state, output))
+        # The state 3 has no outgoing transitions
+        self.assertEqual(compiled.getSinkState(), compiled.getSuccessor(3, 0b00))
+        for state in range(1, compiled.getSinkState() + 1):
+            self.assertEqual(self.dfa.isSafe(state), compiled.isSafe(state))
+
+    def test_table(self):
+        compiled = CompiledDFA(self.dfa, evaluate_output, [0b00, 0b01, 0b10, 0b11])
+        table = compiled.table
+        self.assertEqual((compiled.getSinkState() + 1, 4), table.shape)
+        for output, index in compiled.output_index.items():
+            for state in range(1, compiled.getSinkState() + 1):
+                self.assertEqual(compiled.getSuccessor(state, output), table[state, index])
+
+    def test_withOutputs(self):
+        compiled = self.dfa.compile(evaluate_output, [0b00])
+        copied = compiled.withOutputs([0b01, 0b10])
+        self.assertEqual([0b00], compiled.outputs)
+        self.assertEqual([0b00, 0b01, 0b10], copied.outputs)
+        self.assertEqual(compiled.getSuccessor(1, 0b01), copied.getSuccessor(1, 0b01))
+
+    def test_pickle(self):
+        compiled = pickle.loads(pickle.dumps(self.dfa.compile(evaluate_output, [0b00, 0b01])))
+        self.assertEqual(2, compiled.getSuccessor(1, 0b01))
+        with self.assertRaises(KeyError):
+            compiled.getSuccessor(1, 0b10)
+
+    def test_getStates_cache(self):
+        self.assertEqual(4, self.dfa.getSinkState())
+        self.dfa.addTransition(3, {'p': True}, 4)
+        self.assertEqual(5, self.dfa.getSinkState())
+
+
+if __name__ == '__main__':
+    unittest.main()
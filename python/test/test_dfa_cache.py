@@ -0,0 +1,55 @@
+import tempfile
+import unittest
+
+from src.logic.dfa_cache import DFACache, dfa_to_dict, dfa_from_dict
+from src.model import DFA
+
+
+class TestDFACache(unittest.TestCase):
+    def setUp(self) -> None:
+        self.translated = []
+
+    def translate(self, formula: str) -> DFA:
+        self.translated.append(formula)
+        dfa = DFA(['p', 'q'])
+        dfa.addTransition(1, {'p': True}, 1)
+        dfa.addTransition(1, {'p': False, 'q': True}, 2)
+        dfa.addTransition(2, {}, 2)
+        dfa.addSafeState(1)
+        return dfa
+
+    def assertSameDFA(self, expected: DFA, actual: DFA):
+        self.assertEqual(expected.getAlphabet(), actual.getAlphabet())
+        self.assertEqual(expected.getInitialState(), actual.getInitialState())
+        self.assertEqual(expected.safeStates, actual.safeStates)
+        self.assertEqual(expected.transitions, actual.transitions)
+
+    def test_serialization(self):
+        dfa = self.translate('G p')
+        self.assertSameDFA(dfa, dfa_from_dict(dfa_to_dict(dfa)))
+
+    def test_memory_cache(self):
+        cache = DFACache()
+        first = cache.get('G p', 'v1', self.translate)
+        second = cache.get('G p', 'v1', self.translate)
+        self.assertEqual(['G p'], self.translated)
+        self.assertSameDFA(first, second)
+        # The cached DFA is not shared
+        first.addSafeState(2)
+        self.assertEqual([1], cache.get('G p', 'v1', self.translate).safeStates)
+        # Different formulas and versions are different keys
+        cache.get('G q', 'v1', self.translate)
+        cache.get('G p', 'v2', self.translate)
+        self.assertEqual(['G p', 'G q', 'G p'], self.translated)
+
+    def test_disk_cache(self):
+        with tempfile.TemporaryDirectory() as directory:
+            expected = DFACache(directory).get('G p', 'v1', self.translate)
+            # A new cache instance reads the result from the disk
+            actual = DFACache(directory).get('G p', 'v1', self.translate)
+            self.assertEqual(['G p'], self.translated)
+            self.assertSameDFA(expected, actual)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+import unittest
+
+from py4j.protocol import Py4JNetworkError
+
+from src.logic.gateway_pool import GatewayPool
+
+
+class _System:
+    def __init__(self, gateway: '_Gateway') -> None:
+        self.gateway = gateway
+
+    def currentTimeMillis(self) -> int:
+        if not self.gateway.alive:
+            raise Py4JNetworkError('The JVM is dead')
+        return 0
+
+
+class _Gateway:
+    """
+    The gateway-like object to test the leasing without launching a JVM
+    """
+
+    def __init__(self) -> None:
+        self.alive = True
+        self.shut_down = False
+        self.jvm = type('JVM', (), {})()
+        self.jvm.java = type('Java', (), {})()
+        self.jvm.java.lang = type('Lang', (), {})()
+        self.jvm.java.lang.System = _System(self)
+
+    def shutdown(self) -> None:
+        self.shut_down = True
+
+
+class TestGatewayPool(unittest.TestCase):
+    def test_lease(self):
+        pool = GatewayPool(3, launcher=_Gateway)
+        self.assertEqual(3, len(pool))
+        gateways = [pool.lease() for _ in range(6)]
+        # The gateways are leased in the round-robin order
+        self.assertEqual(gateways[:3], gateways[3:])
+        self.assertEqual(3, len(set(map(id, gateways))))
+        pool.release(gateways[1])
+        pool.release(gateways[4])
+        # The gateway with the fewest leases is leased first
+        self.assertIs(gateways[1], pool.lease())
+
+    def test_health_check(self):
+        pool = GatewayPool(2, launcher=_Gateway)
+        first, second = pool.lease(), pool.lease()
+        first.alive = False
+        self.assertEqual(1, pool.check_health())
+        self.assertTrue(first.shut_down)
+        self.assertNotIn(first, pool.gateways)
+        self.assertIn(second, pool.gateways)
+        # Releasing the relaunched gateway does not change the leases
+        pool.release(first)
+        self.assertEqual([0, 1], pool.leases)
+        # A dead gateway is relaunched when it is leased
+        second.alive = False
+        pool.release(second)
+        pool.lease()
+        pool.lease()
+        self.assertNotIn(second, pool.gateways)
+        with pool:
+            gateways = list(pool.gateways)
+        self.assertTrue(all(gateway.shut_down for gateway in gateways))
+        self.assertEqual(0, len(pool))
+
+
+if __name__ == '__main__':
+    unittest.main()
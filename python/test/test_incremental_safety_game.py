@@ -0,0 +1,76 @@
+import random
+import unittest
+
+from src.logic.incremental_safety_game import IncrementalSafetyGameSolver
+from src.logic.solve_safety_game import solve_game
+from src.model import DFA, SafetyGame, ReactiveSystem, ArrayPTA
+from test.safety_game_helpers import evaluate_output, make_dfa
+
+
+class TestIncrementalSafetyGameSolver(unittest.TestCase):
+    def assertSameSolution(self, reactive_system: ReactiveSystem, dfa: DFA, actual_game: SafetyGame,
+                           actual_win_set, actual_win_strategy):
+        expected_game = SafetyGame.fromReactiveSystemAndDFA(reactive_system, dfa, evaluate_output)
+        expected_win_set, expected_win_strategy = solve_game(expected_game)
+        self.assertEqual(expected_game.getInitialState() in expected_win_set,
+                         actual_game.getInitialState() in actual_win_set)
+        for pair, expected_state in expected_game.state_mapper.items():
+            actual_state = actual_game.state_mapper[pair]
+            self.assertEqual(expected_state in expected_win_set, actual_state in actual_win_set)
+            self.assertEqual(expected_win_strategy.get(expected_state), actual_win_strategy.get(actual_state))
+
+    def test_growing_reactive_system(self):
+        # A tree-shaped reactive system growing as the PTA in PTADynamicShield
+        rng = random.Random(0)
+        dfa = make_dfa()
+        reactive_system = ReactiveSystem([1, 2], [0, 3], [0, 1, 2, 3])
+        solver = IncrementalSafetyGameSolver(dfa, evaluate_output)
+        next_state = 2
+        for _ in range(30):
+            for _ in range(5):
+                state = reactive_system.getInitialState()
+                for _ in range(rng.randint(1, 8)):
+                    p1_action, p2_action = rng.choice([1, 2]), rng.choice([0, 3])
+                    if state in reactive_system.transitions and \
+                            (p1_action, p2_action) in reactive_system.transitions[state]:
+                        state = reactive_system.getSuccessor(state, p1_action, p2_action)
+                    else:
+                        reactive_system.addTransition(state, p1_action, p2_action, rng.choice([0, 1, 2, 3]),
+                                                      next_state)
+                        state = next_state
+                        next_state += 1
+            self.assertSameSolution(reactive_system, dfa, *solver.solve(reactive_system))
+
+    def test_growing_array_pta(self):
+        rng = random.Random(0)
+        dfa = make_dfa()
+        pta = ArrayPTA([1, 2], [0, 3], [0, 1, 2, 3])
+        solver = IncrementalSafetyGameSolver(dfa, evaluate_output)
+        for _ in range(30):
+            for _ in range(5):
+                length = rng.randint(1, 8)
+                pta.addTrace([(rng.choice([1, 2]), rng.choice([0, 3])) for _ in range(length)],
+                             [rng.choice([0, 1, 2, 3]) for _ in range(length)])
+            self.assertSameSolution(pta, dfa, *solver.solve(pta))
+
+    def test_modified_reactive_system(self):
+        # A reactive system with cycles, where a few transitions are redirected in each round
+        rng = random.Random(1)
+        dfa = make_dfa()
+        reactive_system = ReactiveSystem([1, 2], [0, 3], [0, 1, 2, 3])
+        for state in range(1, 30):
+            for p1_action in [1, 2]:
+                for p2_action in [0, 3]:
+                    if rng.random() < 0.9:
+                        reactive_system.addTransition(state, p1_action, p2_action, rng.choice([0, 1, 2, 3]),
+                                                      rng.randint(1, 29))
+        solver = IncrementalSafetyGameSolver(dfa, evaluate_output)
+        for _ in range(30):
+            for _ in range(2):
+                reactive_system.addTransition(rng.randint(1, 35), rng.choice([1, 2]), rng.choice([0, 3]),
+                                              rng.choice([0, 1, 2, 3]), rng.randint(1, 35))
+            self.assertSameSolution(reactive_system, dfa, *solver.solve(reactive_system))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+import random
+import unittest
+
+from src.logic.local_safety_game import LocalSafetyGame
+from src.logic.solve_safety_game import solve_game
+from src.model import SafetyGame, ReactiveSystem
+from test.safety_game_helpers import evaluate_output, make_dfa
+
+
+def make_reactive_system(seed: int) -> ReactiveSystem:
+    rng = random.Random(seed)
+    # The initial state is often winning for the even seeds and losing for the odd seeds
+    outputs = [0, 0, 0, 0, 1, 2, 3] if seed % 2 == 0 else [0, 1, 1, 2, 3]
+    reactive_system = ReactiveSystem([1, 2, 3], [0, 4], [0, 1, 2, 3])
+    for state in range(1, 40):
+        for p1_action in [1, 2, 3]:
+            for p2_action in [0, 4]:
+                if rng.random() < 0.95:
+                    reactive_system.addTransition(state, p1_action, p2_action, rng.choice(outputs),
+                                                  rng.randint(1, 39))
+    return reactive_system
+
+
+class TestLocalSafetyGame(unittest.TestCase):
+    def test_same_as_eager_construction(self):
+        dfa = make_dfa()
+        for seed in range(30):
+            reactive_system = make_reactive_system(seed)
+            expected_game = SafetyGame.fromReactiveSystemAndDFA(reactive_system, dfa, evaluate_output)
+            expected_win_set, expected_win_strategy = solve_game(expected_game)
+            game = LocalSafetyGame(reactive_system, dfa, evaluate_output)
+            win_set, win_strategy = game.solve()
+            with self.subTest(seed=seed):
+                self.assertEqual(expected_game.getInitialState() in expected_win_set,
+                                 game.getInitialState() in win_set)
+                self.assertLessEqual(len(game.expanded), len(expected_game.state_mapper) + 1)
+                for state in game.expanded:
+                    if game.isUnexploredState(state) or not game.is_decided(state):
+                        # The exploration stops without deciding some states if the initial state is losing
+                        continue
+                    expected_state = expected_game.state_mapper[game.inverse_state_mapper[state]]
+                    self.assertEqual(expected_state in expected_win_set, state in win_set)
+                    self.assertEqual(expected_win_strategy.get(expected_state), win_strategy.get(state))
+
+    def test_resume_on_move(self):
+        # Move by random actions, including the ones outside the winning strategy
+        dfa = make_dfa()
+        rng = random.Random(0)
+        for seed in range(30):
+            reactive_system = make_reactive_system(seed)
+            expected_game = SafetyGame.fromReactiveSystemAndDFA(reactive_system, dfa, evaluate_output)
+            expected_win_set, expected_win_strategy = solve_game(expected_game)
+            game = LocalSafetyGame(reactive_system, dfa, evaluate_output)
+            win_set, win_strategy = game.solve()
+            expected_state, state = expected_game.getInitialState(), game.getInitialState()
+            for _ in range(100):
+                p1_action, p2_action = rng.choice([1, 2, 3]), rng.choice([0, 4])
+                self.assertEqual(expected_game.hasSuccessor(expected_state, p1_action, p2_action),
+                                 game.hasSuccessor(state, p1_action, p2_action))
+                if not game.hasSuccessor(state, p1_action, p2_action):
+                    break
+                expected_state = expected_game.getSuccessor(expected_state, p1_action, p2_action)
+                state = game.getSuccessor(state, p1_action, p2_action)
+                with self.subTest(seed=seed, state=state):
+                    self.assertEqual(expected_state in expected_win_set, state in win_set)
+                    self.assertEqual(expected_win_strategy.get(expected_state), win_strategy.get(state))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,4 +1,12 @@
+import unittest
+
+import numpy as np
+
+from src.exceptions.shielding_exceptions import UnknownOutputError, UnknownStateError
 from src.logic import PassiveLearning
+from src.logic.make_transition_cover import make_transition_cover
+from src.model import MealyMachine, ReactiveSystem
+from src.model.mealy_machine import UNDEFINED, UNDEFINED_OUTPUT
 from test.base_tests import Py4JTestCase
 
 
@@ -11,3 +19,46 @@ class TestMealyMachine(Py4JTestCase):
             learner.addSample(inputWord, outputChar)
         mealy = learner.computeMealy()
         self.assertListEqual(list(range(len(mealy.getStates()))), list(mealy.getStates()))
+
+    def test_export(self):
+        learner = PassiveLearning(self.gateway, 1, 2)
+        training_data = [([1], 0), ([2], 11), ([1, 1], 0), ([1, 2], 11), ([2, 1], 1), ([2, 2], 11)]
+        learner.addSamples(training_data)
+        mealy = learner.computeMealy()
+        self.assertEqual([1, 2], mealy.getInputAlphabet())
+        self.assertEqual(mealy.mealy.getInitialState(), mealy.getInitialState())
+        self.assertEqual([0, 1, 11], mealy.getOutputAlphabet())
+        for state in mealy.getStates():
+            for c in mealy.getInputAlphabet():
+                transition = mealy.mealy.getTransition(state, mealy.getCharId(c))
+                self.assertEqual(mealy.mealy.getSuccessor(transition), mealy.getSuccessor(state, c))
+                self.assertEqual(mealy.mealy.getTransitionOutput(transition), mealy.getOutput(state, c))
+
+
+class TestMealyMachineFromArrays(unittest.TestCase):
+    def setUp(self) -> None:
+        self.mealy = MealyMachine.fromArrays([1, 2], 0,
+                                             np.array([[1, 0], [UNDEFINED, 1]]),
+                                             np.array([[5, 6], [UNDEFINED_OUTPUT, 7]]))
+
+    def test_transitions(self):
+        self.assertEqual([0, 1], self.mealy.getStates())
+        self.assertEqual(0, self.mealy.getInitialState())
+        self.assertEqual(1, self.mealy.getSuccessor(0, 1))
+        self.assertEqual(7, self.mealy.getOutput(1, 2))
+        self.assertEqual([5, 6, 7], self.mealy.getOutputAlphabet())
+        with self.assertRaises(UnknownStateError):
+            self.mealy.getSuccessor(1, 1)
+        with self.assertRaises(UnknownOutputError):
+            self.mealy.getOutput(1, 1)
+        with self.assertRaises(ValueError):
+            self.mealy.getSuccessor(0, 3)
+
+    def test_fromMealyMachine(self):
+        reactive_system = ReactiveSystem.fromMealyMachine(self.mealy, lambda c: (c, 0))
+        self.assertEqual({0: {(1, 0): 1, (2, 0): 0}, 1: {(2, 0): 1}}, reactive_system.getTransitions())
+        self.assertEqual({0: {(1, 0): 5, (2, 0): 6}, 1: {(2, 0): 7}}, reactive_system.output)
+
+    def test_make_transition_cover(self):
+        self.assertEqual({((1,), 5), ((2,), 6), ((1, 2), 7)},
+                         {(tuple(input_word), output) for input_word, output in make_transition_cover(self.mealy)})
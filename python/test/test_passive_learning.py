@@ -1,7 +1,10 @@
 import string
 import unittest
 
-from src.logic import PassiveLearning
+import numpy as np
+
+from src.logic import PassiveLearning, GatewayPool
+from src.logic.passive_learning import pack_samples, pack_words
 from test.base_tests import Py4JTestCase
 
 
@@ -18,6 +21,15 @@ class TestPassiveLearning(Py4JTestCase):
         learner = PassiveLearning(self.gateway, 0, 10)
         self.assertEqual(list(learner.alphabet), list(range(0, 11)))
 
+    def test_gateway_pool(self):
+        # The pool does not launch a JVM but uses the gateway of the test
+        pool = GatewayPool(1, launcher=lambda: self.gateway)
+        learner = PassiveLearning(pool, 0, 1)
+        self.assertIs(self.gateway, learner.gateway)
+        self.assertEqual([1], pool.leases)
+        learner.close()
+        self.assertEqual([0], pool.leases)
+
     def test_addSamples(self):
         learner = PassiveLearning(self.gateway, 'a', 'b')
         training_data = [("a", "0"), ("b", "b"), ("aa", "0"), ("ab", "b"), ("ba", "1"), ("bb", "b"), ("baa", "1"),
@@ -111,14 +123,13 @@ __start0 -> s0;
     }"""
         self.assertEqual(remove_blanks(learner.computeMealy().getDot()), remove_blanks(expected_dot))
 
-    def test_getSamples_unimplemented(self):
+    def test_getSamples_min_depth_zero(self):
         learner = PassiveLearning(self.gateway, 'a', 'b')
         training_data = [("a", "0"), ("b", "b"), ("aa", "0"), ("ab", "b"), ("ba", "1"), ("bb", "b"), ("baa", "1"),
                          ("bab", "b"), ("bba", "0"), ("bbb", "b"), ]
         learner.addSamples(training_data)
         learner.computeMealy()
-        with self.assertRaises(NotImplementedError):
-            learner.getSamples()
+        self.assertEqual(sorted((list(map(ord, i)), ord(o)) for i, o in training_data), sorted(learner.getSamples()))
 
     def test_getSamples(self):
         learner = PassiveLearning(self.gateway, 0, 1, min_depth=5)
@@ -131,6 +142,111 @@ __start0 -> s0;
         for elem in training_data:
             self.assertIn(elem, java_samples)
 
+    def test_bulk_transfer(self):
+        training_data = [("abbab", "0"), ("baaba", "1"), ("aabaa", "0"), ("ababb", "1"), ("aabbb", "0"),
+                         ("abaab", "1")]
+        for min_depth in range(3):
+            bulk_learner = PassiveLearning(self.gateway, 'a', 'b', min_depth)
+            per_letter_learner = PassiveLearning(self.gateway, 'a', 'b', min_depth, bulk_transfer=False)
+            bulk_learner.addSamples(training_data)
+            per_letter_learner.addSamples(training_data)
+            self.assertEqual(per_letter_learner.computeMealy().getDot(), bulk_learner.computeMealy().getDot())
+
+    def test_addTrace(self):
+        traces = [([0, 1, 1, 0], [0, 2, 1, 1]), ([1, 0, 0], [2, 1, 0]), ([0, 0, 1], [0, 0, 2])]
+        for min_depth in range(3):
+            trace_learner = PassiveLearning(self.gateway, 0, 1, min_depth)
+            sample_learner = PassiveLearning(self.gateway, 0, 1, min_depth)
+            for input_word, output_word in traces:
+                trace_learner.addTrace(input_word, output_word)
+                sample_learner.addSamples([(input_word[:i + 1], output) for i, output in enumerate(output_word)])
+            self.assertEqual(sample_learner.computeMealy().getDot(), trace_learner.computeMealy().getDot())
+            if min_depth > 0:
+                self.assertEqual(sorted(sample_learner.getSamples()), sorted(trace_learner.getSamples()))
+
+    def test_deduplication(self):
+        learner = PassiveLearning(self.gateway, 0, 1, min_depth=1)
+        for _ in range(50):
+            learner.addTrace([0, 1, 1, 0], [0, 2, 1, 1])
+            learner.addSample([0, 1], 2)
+        self.assertEqual(100, learner.getNumSamples())
+        learner.computeMealy()
+        self.assertEqual(100, learner.getNumSamples())
+        self.assertEqual([([0], 0), ([0, 1], 2), ([0, 1, 1], 1), ([0, 1, 1, 0], 1)], sorted(learner.getSamples()))
+        footprint = learner.getMemoryFootprint()
+        learner.addTrace([0, 1, 1, 0], [0, 2, 1, 1])
+        learner.computeMealy()
+        self.assertEqual(footprint, learner.getMemoryFootprint())
+
+    def test_parallelism(self):
+        training_data = [("abbab", "0"), ("baaba", "1"), ("aabaa", "0"), ("ababb", "1"), ("aabbb", "0"),
+                         ("abaab", "1")]
+        dots = []
+        for parallelism in [1, 4]:
+            learner = PassiveLearning(self.gateway, 'a', 'b', 1, parallelism=parallelism, deterministic=True)
+            self.assertEqual(parallelism, learner.learner.getParallelism())
+            learner.addSamples(training_data)
+            dots.append(learner.computeMealy().getDot())
+            learner.close()
+        self.assertEqual(dots[0], dots[1])
+
+    def test_timeout(self):
+        traces = [([0, 1, 1, 0], [0, 2, 1, 1]), ([1, 0, 0], [2, 1, 0]), ([0, 0, 1], [0, 0, 2])]
+        learner = PassiveLearning(self.gateway, 0, 1)
+        for input_word, output_word in traces:
+            learner.addTrace(input_word, output_word)
+        merged = learner.computeMealy(timeout=60)
+        self.assertFalse(learner.learner.isTruncated())
+        # With no time, the Mealy machine is the PTA itself
+        truncated = learner.computeMealy(timeout=0)
+        self.assertTrue(learner.learner.isTruncated())
+        self.assertLess(len(merged.getStates()), len(truncated.getStates()))
+        for input_word, output_word in traces:
+            state = truncated.getInitialState()
+            for c, output in zip(input_word, output_word):
+                self.assertEqual(output, truncated.getOutput(state, c))
+                state = truncated.getSuccessor(state, c)
+        # cancel does nothing if computeMealy is not running
+        learner.cancel()
+        learner.computeMealy()
+        self.assertFalse(learner.learner.isTruncated())
+
+    def test_incremental(self):
+        traces = [([0, 1, 1, 0], [0, 2, 1, 1]), ([1, 0, 0], [2, 1, 0]), ([0, 0, 1], [0, 0, 2])]
+        learner = PassiveLearning(self.gateway, 0, 1, incremental=True)
+        expected = PassiveLearning(self.gateway, 0, 1)
+        for input_word, output_word in traces:
+            learner.addTrace(input_word, output_word)
+            expected.addTrace(input_word, output_word)
+        mealy = learner.computeMealy()
+        self.assertEqual(expected.computeMealy().getDot(), mealy.getDot())
+        # A sample already predicted by the Mealy machine does not cause learning
+        learner.addTrace(traces[0][0][:2], traces[0][1][:2])
+        self.assertIs(mealy, learner.computeMealy())
+        # An inconsistent sample causes learning from scratch
+        learner.addSample([0, 1, 1, 0, 0], 3)
+        expected.addSample([0, 1, 1, 0, 0], 3)
+        relearned = learner.computeMealy()
+        self.assertIsNot(mealy, relearned)
+        self.assertEqual(expected.computeMealy().getDot(), relearned.getDot())
+
+
+class TestPackSamples(unittest.TestCase):
+    def test_pack_samples(self):
+        inputs, offsets, outputs = pack_samples([("ab", "0"), ([], 3), ([1, 2, 3], 4)])
+        self.assertEqual([ord('a'), ord('b'), 1, 2, 3], np.frombuffer(inputs, dtype='>i4').tolist())
+        self.assertEqual([0, 2, 2, 5], np.frombuffer(offsets, dtype='>i4').tolist())
+        self.assertEqual([ord('0'), 3, 4], np.frombuffer(outputs, dtype='>i4').tolist())
+        # Big-endian
+        self.assertEqual(b'\x00\x00\x00\x03', outputs[4:8])
+
+    def test_pack_words(self):
+        inputs, offsets, outputs, output_offsets = pack_words([([1, 2], [3, 4]), ([], []), ([5, 6], [7])])
+        self.assertEqual([1, 2, 5, 6], np.frombuffer(inputs, dtype='>i4').tolist())
+        self.assertEqual([0, 2, 2, 4], np.frombuffer(offsets, dtype='>i4').tolist())
+        self.assertEqual([3, 4, 7], np.frombuffer(outputs, dtype='>i4').tolist())
+        self.assertEqual([0, 2, 2, 3], np.frombuffer(output_offsets, dtype='>i4').tolist())
+
 
 if __name__ == '__main__':
     unittest.main()
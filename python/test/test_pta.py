@@ -30,6 +30,21 @@ class TestPTA(unittest.TestCase):
                 state = learner.getSuccessor(state, player1_action, '*')
             self.assertEqual(learner.getOutput(state, player1_actions[-1], '*'), output)
 
+    def test_addTrace(self):
+        traces = [("abba", "0101"), ("abc", "010"), ("ba", "11"), ("abbc", "0100"), ("c", "1")]
+        expected = PTA(['a', 'b', 'c'], ['*'], ['0', '1'])
+        learner = PTA(['a', 'b', 'c'], ['*'], ['0', '1'])
+        for player1_actions, outputs in traces:
+            input_word = list(map(lambda x: (x, '*'), player1_actions))
+            for i in range(len(input_word)):
+                expected.addSample(input_word[:i + 1], outputs[i])
+            learner.addTrace(input_word, list(outputs))
+        self.assertEqual(expected.transitions, learner.transitions)
+        self.assertEqual(expected.output, learner.output)
+        # The states are numbered 1, 2, ... in the order of their addition
+        self.assertEqual(list(range(1, len(learner.getStates()) + 1)), sorted(learner.getStates()))
+        self.assertEqual(set(learner.getStates()), learner.state_set)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -137,6 +137,46 @@ class TestPTADynamicShield(unittest.TestCase):
                 # player2_alphabet should be constructed as expected
                 self.assertEqual(nonempty_player2_alphabet, dynamic_shield.safety_game.getPlayer2Alphabet())
 
+    def test_preemptiveMask_deviating(self):
+        def evaluate_binary_output(s: int) -> Callable[[str], bool]:
+            if s == 0:
+                return lambda _: False
+            else:
+                return lambda _: True
+
+        dynamic_shield = PTADynamicShield('[] (p)', [0, 1], [0], [0, 1], evaluate_binary_output)
+        dynamic_shield.not_use_deviating_shield = True
+        dynamic_shield.move(0, 0, 0)
+        dynamic_shield.reset()
+        # The action 0 is unsafe at the initial state
+        self.assertEqual([False, True], dynamic_shield.preemptive_mask(2).tolist())
+        # The transition (1, 0) is not in the learned reactive system
+        dynamic_shield.move(1, 0, 1)
+        self.assertFalse(dynamic_shield.consistent)
+        # The shield is not used while the system deviates from the learned reactive system
+        self.assertEqual([True, True], dynamic_shield.preemptive_mask(2).tolist())
+        dynamic_shield.reset()
+        self.assertEqual([False, True], dynamic_shield.preemptive_mask(2).tolist())
+
+    def test_reset_after_flush(self):
+        dynamic_shield = PTADynamicShield('[] (p)', ['a', 'b'], ['a'], ['0', '1'], evaluate_output)
+        traces = []
+        add_trace = dynamic_shield.add_trace
+        dynamic_shield.add_trace = lambda input_word, output_word: \
+            (traces.append(list(input_word)), add_trace(input_word, output_word))
+        dynamic_shield.move('a', 'a', '1')
+        dynamic_shield.move('b', 'a', '1')
+        dynamic_shield.flush_trace()
+        # The flushed episode is not added again
+        dynamic_shield.reset()
+        self.assertEqual([[('a', 'a'), ('b', 'a')]], traces)
+        # The steps after the flush are added with the episode
+        dynamic_shield.move('a', 'a', '1')
+        dynamic_shield.flush_trace()
+        dynamic_shield.move('a', 'a', '1')
+        dynamic_shield.reset()
+        self.assertEqual([[('a', 'a'), ('b', 'a')], [('a', 'a')], [('a', 'a'), ('a', 'a')]], traces)
+
 
 if __name__ == '__main__':
     unittest.main()
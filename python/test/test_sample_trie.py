@@ -0,0 +1,61 @@
+import unittest
+
+from src.exceptions.shielding_exceptions import InvalidInputError
+from src.model import SampleTrie
+
+
+class TestSampleTrie(unittest.TestCase):
+    def test_deduplication(self):
+        trie = SampleTrie()
+        for _ in range(100):
+            trie.addTrace([0, 1, 1], [0, 1, 2])
+        self.assertEqual(100, trie.getNumSamples())
+        self.assertEqual(3, len(trie))
+        footprint = trie.getMemoryFootprint()
+        trie.addSample([0, 1], 1)
+        self.assertEqual(3, len(trie))
+        self.assertEqual(footprint, trie.getMemoryFootprint())
+        self.assertEqual(101, trie.getVisits([0, 1]))
+        self.assertEqual(100, trie.getVisits([0, 1, 1]))
+        self.assertEqual(0, trie.getVisits([1]))
+        self.assertEqual(2, trie.getOutput([0, 1, 1]))
+        self.assertIsNone(trie.getOutput([1]))
+
+    def test_inconsistent(self):
+        trie = SampleTrie()
+        trie.addSample([0, 1], 1)
+        with self.assertRaises(InvalidInputError):
+            trie.addSample([0, 1], 0)
+        with self.assertRaises(InvalidInputError):
+            trie.addTrace([0, 1], [0])
+
+    def test_reject_without_modification(self):
+        trie = SampleTrie()
+        trie.addTrace([0, 1], [0, 1])
+        # The conflict is at the second letter and the third letter is new
+        with self.assertRaises(InvalidInputError):
+            trie.addTrace([0, 1, 1], [0, 0, 2])
+        self.assertEqual(2, len(trie))
+        self.assertEqual(1, trie.getNumSamples())
+        self.assertEqual(1, trie.getVisits([0, 1]))
+        self.assertIsNone(trie.getNode([0, 1, 1]))
+
+    def test_str(self):
+        trie = SampleTrie()
+        trie.addSample("ab", "0")
+        self.assertEqual(ord('0'), trie.getOutput([ord('a'), ord('b')]))
+        self.assertEqual(ord('0'), trie.getOutput("ab"))
+
+    def test_words(self):
+        trie = SampleTrie()
+        trie.addTrace([0, 1, 1], [0, 1, 2])
+        trie.addSample([0, 0], 3)
+        trie.addSample([1, 0, 1], 4)
+        trie.addSample([1], 5)
+        self.assertEqual([([0, 1, 1], [0, 1, 2]), ([0, 0], [0, 3]), ([1, 0, 1], [4]), ([1], [5])], list(trie.words()))
+        self.assertEqual(sorted([([0], 0), ([0, 1], 1), ([0, 1, 1], 2), ([0, 0], 3), ([1, 0, 1], 4), ([1], 5)]),
+                         sorted(trie.samples()))
+
+
+if __name__ == '__main__':
+    unittest.main()
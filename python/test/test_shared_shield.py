@@ -0,0 +1,80 @@
+import os
+import unittest
+
+import numpy as np
+
+from src.shields import ShieldTables, SharedShieldPublisher, SharedShieldSubscriber
+
+
+class TestSharedShield(unittest.TestCase):
+    def setUp(self) -> None:
+        self.name = f'test_shared_shield_{os.getpid()}'
+        # The initial state is 1 and the state 0 is the unexplored state
+        self.successors = np.array([[[0], [0]], [[2], [1]], [[2], [1]]], dtype=np.int32)
+
+    def makeTables(self, action_masks) -> ShieldTables:
+        return ShieldTables(self.successors, np.array(action_masks, dtype=bool), np.array([True, True, True]), 1,
+                            np.array([0, 1]), np.array([0]))
+
+    def test_buffer(self):
+        tables = self.makeTables([[True, True], [True, False], [False, True]])
+        buffer = bytearray(tables.nbytes)
+        tables.write(buffer)
+        read = ShieldTables.fromBuffer(buffer)
+        self.assertEqual(tables.successors.tolist(), read.successors.tolist())
+        self.assertEqual(tables.action_masks.tolist(), read.action_masks.tolist())
+        self.assertEqual(tables.winning.tolist(), read.winning.tolist())
+        self.assertEqual(1, read.initial_state)
+        self.assertEqual(2, read.successor(1, 0, 0))
+        # The state does not change by an unknown action
+        self.assertEqual(1, read.successor(1, 3, 0))
+        # The tables are read-only views of the buffer
+        with self.assertRaises(ValueError):
+            read.action_masks[0, 0] = False
+        # The arrays are not copied
+        buffer[:] = bytes(len(buffer))
+        self.assertEqual(0, read.successors[1, 0, 0])
+
+    def test_publish(self):
+        with SharedShieldPublisher(self.name) as publisher:
+            subscriber = SharedShieldSubscriber(self.name)
+            # Nothing is published yet
+            self.assertIsNone(subscriber.poll())
+            self.assertEqual(1, publisher.publish(self.makeTables([[True, True], [True, False], [False, True]])))
+            tables = subscriber.poll()
+            self.assertEqual([True, False], tables.action_masks[1].tolist())
+            # The generation is not changed
+            self.assertIsNone(subscriber.poll())
+            # Only the latest generation is read
+            publisher.publish(self.makeTables([[True, True], [False, True], [False, True]]))
+            self.assertEqual(3, publisher.publish(self.makeTables([[True, True], [True, True], [True, True]])))
+            tables = subscriber.poll()
+            self.assertEqual(3, subscriber.generation)
+            self.assertEqual([True, True], tables.action_masks[1].tolist())
+            del tables
+            subscriber.close()
+
+    def test_keep_previous_generation(self):
+        with SharedShieldPublisher(self.name) as publisher:
+            subscriber = SharedShieldSubscriber(self.name)
+            publisher.publish(self.makeTables([[True, True], [True, False], [False, True]]))
+            old_tables = subscriber.poll()
+            old_mask = old_tables.action_masks[1]
+            publisher.publish(self.makeTables([[True, True], [True, True], [True, True]]))
+            tables = subscriber.poll()
+            # The views of the previous generation are still valid after the switch
+            self.assertEqual([True, False], old_mask.tolist())
+            self.assertEqual(2, old_tables.successor(1, 0, 0))
+            self.assertEqual([True, True], tables.action_masks[1].tolist())
+            del old_tables, old_mask
+            # The previous generation is released at the next switch
+            publisher.publish(self.makeTables([[True, True], [False, True], [False, True]]))
+            new_tables = subscriber.poll()
+            self.assertEqual([True, True], tables.action_masks[1].tolist())
+            self.assertEqual([False, True], new_tables.action_masks[1].tolist())
+            del tables, new_tables
+            subscriber.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
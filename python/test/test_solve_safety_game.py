@@ -0,0 +1,130 @@
+import pickle
+import random
+import unittest
+from typing import Callable
+
+from src.logic.solve_safety_game import SafetyGameSolver, solve_game, construct_and_solve_game, \
+    construct_and_solve_strategy_table
+from src.model import SafetyGame, ReactiveSystem, DFA
+
+
+def make_random_game(num_states: int, seed: int) -> SafetyGame:
+    rng = random.Random(seed)
+    player1_alphabet = [1, 2, 3]
+    player2_alphabet = [4, 5]
+    game = SafetyGame(player1_alphabet, player2_alphabet)
+    game.setSafeStates([state for state in range(num_states) if rng.random() > 0.1])
+    for state in range(2, num_states):
+        for p1_action in player1_alphabet:
+            for p2_action in player2_alphabet:
+                # Some transitions are missing, as in the safety games made from learned reactive systems
+                if rng.random() > 0.1:
+                    game.add_transition(state, p1_action, p2_action, rng.randrange(num_states))
+    return game
+
+
+class TestSolveSafetyGame(unittest.TestCase):
+    def test_dummy_game(self):
+        game = SafetyGame([1, 2], [3, 4])
+        game.setSafeStates([0, 1, 2, 3])
+        game.add_transition(1, 1, 3, 2)
+        game.add_transition(1, 2, 4, 3)
+        game.add_transition(2, 1, 3, 2)
+        game.add_transition(2, 1, 4, 2)
+        game.add_transition(2, 2, 4, 1)
+        game.add_transition(3, 1, 3, 3)
+        game.add_transition(3, 1, 4, 4)
+        for solver in SafetyGameSolver:
+            with self.subTest(solver=solver):
+                win_set, win_strategy = solve_game(game, solver)
+                self.assertEqual({0, 1, 2}, win_set)
+                self.assertEqual({0: [1, 2], 1: [1], 2: [1, 2]}, win_strategy)
+
+    def test_same_as_fixpoint(self):
+        for seed in range(20):
+            game = make_random_game(200, seed)
+            expected = solve_game(game, SafetyGameSolver.FIXPOINT)
+            for solver in SafetyGameSolver:
+                with self.subTest(seed=seed, solver=solver):
+                    self.assertEqual(expected, solve_game(game, solver))
+
+    def test_construct_and_solve_game(self):
+        reactive_system = ReactiveSystem([1, 2], [0], [0b00, 0b01, 0b10, 0b11])
+        reactive_system.addTransition(1, 1, 0, 0b11, 2)
+        reactive_system.addTransition(1, 2, 0, 0b01, 3)
+        reactive_system.addTransition(2, 1, 0, 0b00, 1)
+        reactive_system.addTransition(2, 2, 0, 0b10, 3)
+        reactive_system.addTransition(3, 1, 0, 0b11, 1)
+        dfa = DFA(['p', 'q'])
+        dfa.addTransition(1, {'p': True}, 1)
+        dfa.addTransition(1, {'p': False, 'q': False}, 1)
+        dfa.addTransition(1, {'p': False, 'q': True}, 2)
+        dfa.addTransition(2, {'p': True}, 2)
+        dfa.addTransition(2, {'p': False}, 1)
+        dfa.addSafeState(1)
+
+        def evaluate_output(output: int) -> Callable[[str], bool]:
+            return lambda ap: output // 2 == 1 if ap == 'p' else output % 2 == 1
+
+        expected_game, expected_win_set, expected_win_strategy = construct_and_solve_game(reactive_system, dfa,
+                                                                                          evaluate_output)
+        for solver in SafetyGameSolver:
+            with self.subTest(solver=solver):
+                game, win_set, win_strategy = construct_and_solve_game(reactive_system, dfa, evaluate_output, solver)
+                self.assertEqual(expected_game.getInitialState() in expected_win_set,
+                                 game.getInitialState() in win_set)
+                for pair, expected_state in expected_game.state_mapper.items():
+                    if pair not in game.state_mapper or solver == SafetyGameSolver.ON_THE_FLY and \
+                            game.state_mapper[pair] not in game.expanded:
+                        # The on-the-fly solver does not expand the losing or irrelevant states
+                        continue
+                    state = game.state_mapper[pair]
+                    self.assertEqual(expected_state in expected_win_set, state in win_set)
+                    self.assertEqual(expected_win_strategy.get(expected_state), win_strategy.get(state))
+
+    def test_construct_and_solve_strategy_table(self):
+        reactive_system = ReactiveSystem([1, 2], [0], [0b00, 0b01, 0b10, 0b11])
+        reactive_system.addTransition(1, 1, 0, 0b11, 2)
+        reactive_system.addTransition(1, 2, 0, 0b01, 3)
+        reactive_system.addTransition(2, 1, 0, 0b00, 1)
+        reactive_system.addTransition(2, 2, 0, 0b10, 3)
+        reactive_system.addTransition(3, 1, 0, 0b11, 1)
+        unsafe_dfa = DFA(['p', 'q'])
+        # q must not hold, which is violated by all the transitions from the initial state
+        unsafe_dfa.addTransition(1, {'q': False}, 1)
+        unsafe_dfa.addTransition(1, {'q': True}, 2)
+        unsafe_dfa.addTransition(2, {'q': True}, 2)
+        unsafe_dfa.addTransition(2, {'q': False}, 2)
+        unsafe_dfa.addSafeState(1)
+        dfa = DFA(['p', 'q'])
+        dfa.addTransition(1, {'p': True}, 1)
+        dfa.addTransition(1, {'p': False, 'q': False}, 1)
+        dfa.addTransition(1, {'p': False, 'q': True}, 2)
+        dfa.addTransition(2, {'p': True}, 2)
+        dfa.addTransition(2, {'p': False}, 1)
+        dfa.addSafeState(1)
+
+        def evaluate_output(output: int) -> Callable[[str], bool]:
+            return lambda ap: output // 2 == 1 if ap == 'p' else output % 2 == 1
+
+        compiled_dfas = [unsafe_dfa.compile(evaluate_output), dfa.compile(evaluate_output)]
+        for compiled_dfa in compiled_dfas:
+            compiled_dfa.compileOutputs(reactive_system.getOutputAlphabet())
+        # The DFAs are sent to the worker process without evaluate_output
+        compiled_dfas = pickle.loads(pickle.dumps(compiled_dfas))
+        index, game, strategy_table = construct_and_solve_strategy_table(reactive_system, compiled_dfas)
+        self.assertEqual(1, index)
+        expected_game, expected_win_set, expected_win_strategy = \
+            construct_and_solve_game(reactive_system, dfa, evaluate_output, SafetyGameSolver.VECTORIZED)
+        self.assertTrue((expected_game.successors == game.successors).all())
+        self.assertEqual(expected_win_set, set(strategy_table.win_set))
+        self.assertEqual(expected_win_strategy, dict(strategy_table.win_strategy))
+        self.assertIn(game.getInitialState(), strategy_table.win_set)
+
+        index, game, strategy_table = construct_and_solve_strategy_table(reactive_system, compiled_dfas[:1])
+        self.assertEqual(1, index)
+        self.assertNotIn(game.getInitialState(), strategy_table.win_set)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,8 @@
 import unittest
 from typing import Callable
 
+import numpy as np
+
 from src.model import ReactiveSystem
 from src.shields import StaticShield
 
@@ -182,6 +184,64 @@ class TestStaticShield(unittest.TestCase):
         # only 1 is allowed at this state
         self.assertEqual([1], static_shield.preemptive())
 
+    def test_preemptiveMask_Gp(self):
+        ltl_formula = 'G(p)'
+        reactive_system = self.makeSimpleSystem()
+
+        def evaluate_output(s: int) -> Callable[[str], bool]:
+            if s == 10:
+                return lambda _: False
+            else:
+                return lambda _: True
+
+        static_shield = StaticShield(ltl_formula, reactive_system, evaluate_output)
+
+        # only 1 is allowed at state 1. The action 0 is not in the alphabet.
+        mask = static_shield.preemptive_mask(3)
+        self.assertEqual([False, True, False], mask.tolist())
+        # The mask is a row of the compiled strategy, which is padded for the actions winning nowhere
+        self.assertTrue(np.shares_memory(mask, static_shield.strategy_mask))
+        self.assertEqual([False, True, False, False], static_shield.preemptive_mask(4).tolist())
+        self.assertEqual((static_shield.strategy_mask.shape[0], 4), static_shield.strategy_mask.shape)
+        with self.assertRaises(ValueError):
+            mask[0] = True
+        # go to state 2
+        static_shield.move(1, 1, 11)
+        # only 2 is allowed at state 2
+        self.assertEqual([False, False, True], static_shield.preemptive_mask(3).tolist())
+        # The mask is rebuilt when the winning strategy is updated
+        static_shield.reset()
+        static_shield.win_strategy = dict(static_shield.win_strategy)
+        static_shield.win_strategy[static_shield.state] = [1, 2]
+        self.assertIsNot(mask, static_shield.preemptive_mask(3))
+        self.assertEqual([False, True, True], static_shield.preemptive_mask(3).tolist())
+
+    def test_compileStrategy_Gp(self):
+        ltl_formula = 'G(p)'
+        reactive_system = self.makeSimpleSystem()
+
+        def evaluate_output(s: int) -> Callable[[str], bool]:
+            if s == 10:
+                return lambda _: False
+            else:
+                return lambda _: True
+
+        static_shield = StaticShield(ltl_formula, reactive_system, evaluate_output)
+
+        # The tables are compiled when they are used for the first time
+        self.assertEqual(1, static_shield.tick(np.int64(2)))
+        self.assertTrue(static_shield.strategy_compiled)
+        for state, actions in static_shield.win_strategy.items():
+            self.assertEqual(actions, static_shield.fallback_actions[state])
+            self.assertEqual(sorted(actions), np.flatnonzero(static_shield.strategy_mask[state]).tolist())
+        with self.assertRaises(ValueError):
+            static_shield.tick(1.0)
+        # The tables are compiled again when the winning strategy is replaced
+        static_shield.win_strategy = {state: [2] for state in static_shield.win_strategy}
+        self.assertFalse(static_shield.strategy_compiled)
+        self.assertEqual([2], static_shield.preemptive())
+        self.assertEqual(2, static_shield.tick(1))
+
 
 if __name__ == '__main__':
     unittest.main()
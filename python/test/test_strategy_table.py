@@ -0,0 +1,32 @@
+import pickle
+import unittest
+
+from src.model import StrategyTable
+
+
+class TestStrategyTable(unittest.TestCase):
+    def setUp(self) -> None:
+        self.win_set = {0, 1, 3}
+        self.win_strategy = {0: ['a', 'b'], 1: ['b'], 3: ['a', 'c']}
+        self.table = StrategyTable.fromStrategy(['a', 'b', 'c'], 5, self.win_set, self.win_strategy)
+
+    def test_views(self):
+        self.assertEqual(self.win_set, self.table.win_set)
+        self.assertEqual(self.win_strategy, self.table.win_strategy)
+        self.assertEqual(3, len(self.table.win_set))
+        self.assertIn(3, self.table.win_set)
+        self.assertNotIn(2, self.table.win_set)
+        self.assertNotIn(5, self.table.win_set)
+        self.assertNotIn(-1, self.table.win_strategy)
+        self.assertEqual(['a', 'c'], self.table.win_strategy[3])
+        with self.assertRaises(KeyError):
+            _ = self.table.win_strategy[2]
+
+    def test_pickle(self):
+        table = pickle.loads(pickle.dumps(self.table))
+        self.assertEqual(self.win_set, set(table.win_set))
+        self.assertEqual(self.win_strategy, dict(table.win_strategy))
+
+
+if __name__ == '__main__':
+    unittest.main()
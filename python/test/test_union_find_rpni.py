@@ -0,0 +1,156 @@
+import random
+import unittest
+
+from src.logic import BlueFringeRPNI, UnionFindRPNI
+from src.logic.union_find_rpni import ArrayPTAMerger
+
+
+class TestUnionFindRPNI(unittest.TestCase):
+    def setUp(self) -> None:
+        self.player1_alphabet = ['a', 'b', 'c']
+        self.player2_alphabet = ['*']
+        self.output_alphabet = ['0', '1']
+
+    def make_learners(self, training_data):
+        learners = [BlueFringeRPNI(self.player1_alphabet, self.player2_alphabet, self.output_alphabet),
+                    UnionFindRPNI(self.player1_alphabet, self.player2_alphabet, self.output_alphabet)]
+        for player1_actions, output_action in training_data:
+            input_word = list(map(lambda x: (x, '*'), player1_actions))
+            for learner in learners:
+                learner.addSample(input_word, output_action)
+        return learners
+
+    def assert_consistent(self, reactive_system, training_data):
+        for player1_actions, output_action in training_data:
+            state: int = reactive_system.getInitialState()
+            for player1_action in player1_actions[:-1]:
+                state = reactive_system.getSuccessor(state, player1_action, '*')
+            self.assertEqual(output_action, reactive_system.getOutput(state, player1_actions[-1], '*'))
+
+    def assert_same_outputs(self, expected, reactive_system, training_data, length: int = 4):
+        """
+        Check that the reactive systems give the same outputs for all the input words up to the length whose prefixes
+        are in the training data
+        """
+        prefixes = {player1_actions[:i] for player1_actions, _ in training_data for i in range(len(player1_actions))}
+        words = [""]
+        for _ in range(length):
+            words = [word + action for word in words if word in prefixes for action in self.player1_alphabet]
+            for word in words:
+                states = [system.getInitialState() for system in [expected, reactive_system]]
+                outputs = []
+                for system, state in zip([expected, reactive_system], states):
+                    for player1_action in word[:-1]:
+                        state = system.getSuccessor(state, player1_action, '*')
+                    try:
+                        outputs.append(system.getOutput(state, word[-1], '*'))
+                    except KeyError:
+                        outputs.append(None)
+                self.assertEqual(outputs[0], outputs[1], word)
+
+    def test_equivalence_addSample(self):
+        # The same training data as TestBlueFringeRPNI.test_addSample
+        training_data = [("a", "0"), ("b", "b"), ("aa", "0"), ("ab", "b"), ("ba", "1"), ("bb", "b"), ("baa", "1"),
+                         ("bab", "b"), ("bba", "0"), ("bbb", "b"), ]
+        expected_learner, learner = self.make_learners(training_data)
+        expected = expected_learner.compute_model(3)
+        reactive_system = learner.compute_model(3)
+        # BlueFringeRPNI is consistent here and the merges do not depend on the order of the states. See UnionFindRPNI
+        # for the cases where the results differ.
+        self.assert_consistent(expected, training_data)
+        self.assert_consistent(reactive_system, training_data)
+        self.assert_same_outputs(expected, reactive_system, training_data)
+        self.assertEqual(len(expected.getStates()), len(reactive_system.getStates()))
+
+    def test_equivalence_mergeable_depth(self):
+        # The same training data as TestBlueFringeRPNI.test_addSample_mergeable_depth1
+        training_data = [("a", "1"), ("b", "1"), ("aa", "0"), ("ab", "0"), ("ba", "0"), ("bb", "0"), ("baa", "1"),
+                         ("bab", "1"), ("bba", "1"), ("bbb", "1"), ]
+        expected_learner, learner = self.make_learners(training_data)
+        for depth in range(5):
+            expected = expected_learner.compute_model(depth)
+            reactive_system = learner.compute_model(depth)
+            self.assert_consistent(expected, training_data)
+            self.assert_consistent(reactive_system, training_data)
+            self.assert_same_outputs(expected, reactive_system, training_data)
+            self.assertEqual(len(expected.getStates()), len(reactive_system.getStates()))
+
+    def test_no_merging(self):
+        learner = UnionFindRPNI([0, 1], [0], [0, 1])
+        learner.addTrace([(0, 0), (1, 0), (1, 0)], [0, 1, 1])
+        learner.addTrace([(1, 0), (0, 0)], [1, 0])
+        reactive_system = learner.compute_model(999999999999999)
+        self.assertEqual(learner.pta.transitions, reactive_system.transitions)
+        self.assertEqual(learner.pta.output, reactive_system.output)
+
+    @staticmethod
+    def signature(reactive_system):
+        """
+        Returns the sorted list of the labelled transitions of each state, which is the same for isomorphic reactive
+        systems
+        """
+        return sorted(sorted((action, reactive_system.output[state][action])
+                             for action in reactive_system.transitions.get(state, {}))
+                      for state in reactive_system.getStates())
+
+    def test_random_equivalence_no_merging(self):
+        rng = random.Random(1)
+        for _ in range(20):
+            learners = [BlueFringeRPNI([0, 1], [0], [0, 1]), UnionFindRPNI([0, 1], [0], [0, 1])]
+            for _ in range(rng.randint(1, 10)):
+                input_word = [(rng.randrange(2), 0) for _ in range(rng.randint(1, 8))]
+                output_word = [sum(action for action, _ in input_word[:i + 1]) % 2 for i in range(len(input_word))]
+                for learner in learners:
+                    learner.addTrace(input_word, output_word)
+            # Both learners return the PTA if no merge is possible
+            expected, reactive_system = [learner.compute_model(999999999999999) for learner in learners]
+            self.assertEqual(len(expected.getStates()), len(reactive_system.getStates()))
+            self.assertEqual(self.signature(expected), self.signature(reactive_system))
+
+    def test_random_consistency(self):
+        rng = random.Random(0)
+        for _ in range(50):
+            num_states = rng.randint(1, 4)
+            target = {(s, a): (rng.randrange(num_states), rng.randrange(2)) for s in range(num_states) for a in range(2)}
+            learner = UnionFindRPNI([0, 1], [0], [0, 1])
+            traces = []
+            for _ in range(rng.randint(1, 10)):
+                state, input_word, output_word = 0, [], []
+                for _ in range(rng.randint(1, 8)):
+                    action = rng.randrange(2)
+                    state, output = target[state, action]
+                    input_word.append((action, 0))
+                    output_word.append(output)
+                learner.addTrace(input_word, output_word)
+                traces.append((input_word, output_word))
+            for min_depth in range(4):
+                reactive_system = learner.compute_model(min_depth)
+                for input_word, output_word in traces:
+                    state = reactive_system.getInitialState()
+                    for (player1_action, player2_action), output in zip(input_word, output_word):
+                        self.assertEqual(output, reactive_system.getOutput(state, player1_action, player2_action))
+                        state = reactive_system.getSuccessor(state, player1_action, player2_action)
+
+
+class TestArrayPTAMerger(unittest.TestCase):
+    def test_rollback(self):
+        learner = UnionFindRPNI([0, 1], [0], [0, 1])
+        learner.addTrace([(0, 0), (0, 0)], [0, 1])
+        learner.addTrace([(1, 0), (1, 0)], [1, 1])
+        merger = ArrayPTAMerger(learner.pta)
+        transitions = [dict(t) for t in merger.transitions]
+        outputs = [dict(o) for o in merger.outputs]
+        # The outputs of 0 after the empty word and 0 are different
+        self.assertFalse(merger.try_merge(merger.initial_state, merger.transitions[merger.initial_state][0], 0))
+        self.assertEqual(transitions, merger.transitions)
+        self.assertEqual(outputs, merger.outputs)
+        self.assertEqual(list(range(len(merger.state_ids))), [merger.find(s) for s in range(len(merger.state_ids))])
+        # The matched subgraphs are too shallow
+        self.assertFalse(merger.try_merge(merger.initial_state, merger.transitions[merger.initial_state][1], 5))
+        self.assertEqual(transitions, merger.transitions)
+        self.assertTrue(merger.try_merge(merger.initial_state, merger.transitions[merger.initial_state][1], 2))
+        self.assertEqual(merger.initial_state, merger.find(merger.transitions[merger.initial_state][1]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,216 @@
+import random
+import unittest
+from concurrent.futures import Future
+from typing import Callable, List, Tuple
+
+import gym
+import numpy as np
+from stable_baselines3.common.vec_env import DummyVecEnv
+
+from src.exceptions.shielding_exceptions import UnsafeStateError
+from src.model import ReactiveSystem
+from src.shields import StaticShield, VectorizedShield, PTADynamicShield
+from src.wrappers.vec_shield_wrapper import VecPreemptiveShieldWrapper
+
+
+def evaluate_output(s: int) -> Callable[[str], bool]:
+    if s == 10:
+        return lambda _: False
+    else:
+        return lambda _: True
+
+
+def evaluate_binary_output(s: int) -> Callable[[str], bool]:
+    if s == 0:
+        return lambda _: False
+    else:
+        return lambda _: True
+
+
+class RecordingPTADynamicShield(PTADynamicShield):
+    """
+    PTADynamicShield recording the finished episodes
+    """
+
+    def __init__(self, *args, **kwargs):
+        self.finished_episodes: List[Tuple[List[Tuple[int, int]], List[int]]] = []
+        super().__init__(*args, **kwargs)
+
+    def finish_episode(self, input_word: List[Tuple[int, int]], output_word: List[int],
+                       flushed_length: int = 0) -> None:
+        self.finished_episodes.append((list(input_word), list(output_word)))
+        super().finish_episode(input_word, output_word, flushed_length)
+
+
+class ReactiveSystemEnv(gym.Env):
+    """
+    The environment running a reactive system with a random player 2
+    """
+
+    def __init__(self, reactive_system: ReactiveSystem, episode_length: int = 5):
+        self.reactive_system = reactive_system
+        self.episode_length = episode_length
+        self.action_space = gym.spaces.Discrete(3)
+        self.observation_space = gym.spaces.Discrete(1)
+        self.state = reactive_system.getInitialState()
+        self.steps = 0
+
+    def reset(self):
+        self.state = self.reactive_system.getInitialState()
+        self.steps = 0
+        return 0
+
+    def step(self, action):
+        player2_action = random.choice([1, 2])
+        output = self.reactive_system.getOutput(self.state, action, player2_action)
+        self.state = self.reactive_system.getSuccessor(self.state, action, player2_action)
+        self.steps += 1
+        info = {'p1_action': action, 'p2_action': player2_action, 'output': output}
+        return 0, 0.0, self.steps >= self.episode_length, info
+
+
+class TestVectorizedShield(unittest.TestCase):
+    def setUp(self) -> None:
+        random.seed(0)
+        self.reactive_system = ReactiveSystem([1, 2], [1, 2], [10, 11])
+        self.reactive_system.setInitialState(1)
+        self.reactive_system.addTransition(1, 1, 1, 11, 2)
+        self.reactive_system.addTransition(1, 1, 2, 11, 1)
+        self.reactive_system.addTransition(1, 2, 1, 11, 1)
+        self.reactive_system.addTransition(1, 2, 2, 11, 3)
+
+        self.reactive_system.addTransition(2, 1, 1, 11, 4)
+        self.reactive_system.addTransition(2, 1, 2, 11, 2)
+        self.reactive_system.addTransition(2, 2, 1, 11, 2)
+        self.reactive_system.addTransition(2, 2, 2, 11, 1)
+
+        self.reactive_system.addTransition(3, 1, 1, 10, 4)
+        self.reactive_system.addTransition(3, 1, 2, 10, 2)
+        self.reactive_system.addTransition(3, 2, 1, 10, 2)
+        self.reactive_system.addTransition(3, 2, 2, 10, 1)
+
+        self.reactive_system.addTransition(4, 1, 1, 10, 2)
+        self.reactive_system.addTransition(4, 1, 2, 10, 1)
+        self.reactive_system.addTransition(4, 2, 1, 10, 1)
+        self.reactive_system.addTransition(4, 2, 2, 10, 3)
+
+    def test_preemptive_batch(self):
+        ltl_formula = 'G(!p => X(p))'
+        num_envs = 4
+        shields = [StaticShield(ltl_formula, self.reactive_system, evaluate_output) for _ in range(num_envs)]
+        vectorized_shield = VectorizedShield(StaticShield(ltl_formula, self.reactive_system, evaluate_output),
+                                             num_envs, 3)
+        for _ in range(50):
+            masks = vectorized_shield.preemptive_batch()
+            self.assertEqual((num_envs, 3), masks.shape)
+            for env, shield in enumerate(shields):
+                if shield.current_is_winning():
+                    self.assertEqual(shield.preemptive_mask(3).tolist(), masks[env].tolist())
+                else:
+                    self.assertFalse(masks[env].any())
+            player1_actions = [random.choice([1, 2]) for _ in range(num_envs)]
+            player2_actions = [random.choice([1, 2]) for _ in range(num_envs)]
+            dones = [random.random() < 0.2 for _ in range(num_envs)]
+            for env, shield in enumerate(shields):
+                try:
+                    shield.move(player1_actions[env], player2_actions[env])
+                except UnsafeStateError:
+                    pass
+                if dones[env]:
+                    shield.reset()
+            vectorized_shield.move_batch(player1_actions, player2_actions, [11] * num_envs, dones)
+            self.assertEqual([shield.state for shield in shields], vectorized_shield.states.tolist())
+
+    def test_update_strategy(self):
+        shield = StaticShield('G(p)', self.reactive_system, evaluate_output)
+        vectorized_shield = VectorizedShield(shield, 2, 3)
+        vectorized_shield.move_batch([1, 2], [1, 1], [11, 11], [False, False])
+        states = vectorized_shield.states.tolist()
+        # The tables are compiled again when the winning strategy is replaced
+        shield.win_strategy = {state: [1, 2] for state in shield.win_strategy}
+        self.assertEqual([[False, True, True] if state in shield.win_strategy else [False, False, False]
+                          for state in states], vectorized_shield.preemptive_batch().tolist())
+        self.assertEqual(states, vectorized_shield.states.tolist())
+
+    def test_replay_after_reconstruction(self):
+        shield = PTADynamicShield('G(p)', [0, 1], [0, 1], [0, 1], evaluate_binary_output)
+        reference = PTADynamicShield('G(p)', [0, 1], [0, 1], [0, 1], evaluate_binary_output)
+        vectorized_shield = VectorizedShield(shield, 2, 2)
+        # The first environment finishes an unsafe episode while the second one is in the middle of an episode
+        vectorized_shield.move_batch([0, 1], [0, 0], [0, 1], [True, False])
+        reference.move(0, 0, 0)
+        reference.reset()
+        reference.move(1, 0, 1)
+        self.assertIsNotNone(shield.reactive_system)
+        # The current episode of the second environment is replayed in the reconstructed shield
+        self.assertEqual([reference.safety_game.getInitialState(), reference.state],
+                         vectorized_shield.states.tolist())
+        masks = vectorized_shield.preemptive_batch()
+        self.assertFalse(masks[0, 0])
+        if reference.current_is_winning():
+            self.assertEqual(reference.preemptive_mask(2).tolist(), masks[1].tolist())
+
+    def test_consistency(self):
+        shield = PTADynamicShield('G(p)', [0, 1], [0, 1], [0, 1], evaluate_binary_output)
+        vectorized_shield = VectorizedShield(shield, 2, 2)
+        vectorized_shield.move_batch([0, 1], [0, 0], [0, 1], [True, False])
+        reactive_system = shield.reactive_system
+        self.assertTrue(shield.consistent_from_latest_construction)
+        # The transition (0, 1) from the initial state is not in the learned reactive system
+        vectorized_shield.move_batch([0, 1], [1, 0], [1, 1], [False, False])
+        self.assertFalse(shield.consistent_from_latest_construction)
+        self.assertIs(reactive_system, shield.reactive_system)
+        # The reactive system is learned again when an episode is finished
+        vectorized_shield.move_batch([1, 1], [1, 0], [1, 1], [True, False])
+        self.assertIsNot(reactive_system, shield.reactive_system)
+        reactive_system = shield.reactive_system
+        self.assertEqual(1, reactive_system.getOutput(reactive_system.getInitialState(), 0, 1))
+
+    def test_finish_episode(self):
+        shield = RecordingPTADynamicShield('G(p)', [0, 1], [0, 1], [0, 1], evaluate_binary_output)
+        vectorized_shield = VectorizedShield(shield, 3, 2)
+        vectorized_shield.move_batch([1, 1, 1], [0, 1, 0], [1, 1, 1], [False, False, False])
+        vectorized_shield.move_batch([1, 0, 1], [1, 0, 1], [1, 0, 1], [True, True, False])
+        # The shield is notified of each finished episode
+        self.assertEqual([([(1, 0), (1, 1)], [1, 1]), ([(1, 1), (0, 0)], [1, 0])], shield.finished_episodes)
+        vectorized_shield.reset()
+        self.assertEqual(([(1, 0), (1, 1)], [1, 1]), shield.finished_episodes[2])
+        # The shield life in episodes is decreased by the number of the finished episodes
+        shield.concurrent_reconstruction = True
+        shield.future = Future()
+        shield.consistent_from_latest_construction = False
+        shield.current_shield_life = 100
+        vectorized_shield.move_batch([1, 1, 1], [0, 0, 0], [1, 1, 1], [True, True, False])
+        self.assertEqual(98, shield.current_shield_life)
+
+    def test_vec_wrapper(self):
+        num_envs = 3
+        venv = VecPreemptiveShieldWrapper(
+            DummyVecEnv([lambda: ReactiveSystemEnv(self.reactive_system)] * num_envs),
+            StaticShield('G(!p => X(p))', self.reactive_system, evaluate_output))
+        shields = [StaticShield('G(!p => X(p))', self.reactive_system, evaluate_output) for _ in range(num_envs)]
+        venv.reset()
+        for _ in range(30):
+            masks = venv.get_action_masks()
+            self.assertEqual((num_envs, 3), masks.shape)
+            for env, shield in enumerate(shields):
+                if shield.current_is_winning():
+                    self.assertEqual(shield.preemptive_mask(3).tolist(), masks[env].tolist())
+            # The action 0 is not in the alphabet and it is blocked when any action is allowed
+            if masks.any():
+                with self.assertRaises(Exception):
+                    venv.step_async(np.zeros(num_envs, dtype=np.int64))
+            actions = np.array([random.choice(np.flatnonzero(mask).tolist() or [1, 2]) for mask in masks])
+            _, _, dones, infos = venv.step(actions)
+            for env, shield in enumerate(shields):
+                try:
+                    shield.move(infos[env]['p1_action'], infos[env]['p2_action'])
+                except UnsafeStateError:
+                    pass
+                if dones[env]:
+                    shield.reset()
+            self.assertEqual([shield.state for shield in shields], venv.shield.states.tolist())
+
+
+if __name__ == '__main__':
+    unittest.main()